@@ -0,0 +1,680 @@
+"""Micro-benchmarks del gestor de articulos
+
+Uso: python benchmarks.py hash [--mb 8]
+     python benchmarks.py carga [--registros 100000 1000000]
+     python benchmarks.py almacenamiento [--registros 100000]
+     python benchmarks.py particiones [--registros 200000] [--particiones 1 2 4]
+     python benchmarks.py formatos [--registros 200000]
+     python benchmarks.py corpus DIRECTORIO [--registros 100000] [--cuerpos 1000]
+     python benchmarks.py suite [--registros 10000] [--salida resultados.json]
+     python benchmarks.py comparar base.json nuevo.json [--tolerancia 0.2]
+
+``suite`` mide las operaciones del gestor y de la tabla hash y emite un
+JSON con latencias por operacion (media, p50, p95, p99); ``comparar``
+contrasta dos de esos archivos y termina con codigo 1 si alguna operacion
+empeora mas que la tolerancia.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import proyecto2
+from proyecto2 import (ALGORITMOS_HASH, FORMATOS_EXPORTACION, AlmacenamientoSQLite,
+                       AlmacenamientoTexto, CatalogoParticionado, GestorArticulos, HashTable,
+                       hash_archivo_fnv, leer_exportacion, migrar_a_sqlite, particion_de)
+
+
+def _fnv1_original(ruta):
+    """Implementacion previa: lectura completa, re-codificacion y modulo por byte"""
+    with open(ruta, 'r', encoding='utf-8') as file:
+        contenido = file.read()
+
+    hash_value = 2166136261
+    for byte in contenido.encode('utf-8'):
+        hash_value = (hash_value * 16777619) % (2 ** 32)
+        hash_value = hash_value ^ byte
+    return str(hash_value)
+
+
+def _generar_texto(ruta, megabytes):
+    """Escribir un archivo de texto ASCII de tamaño aproximado"""
+    linea = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 2 + "\n").encode('ascii')
+    repeticiones = megabytes * (1 << 20) // len(linea)
+    with open(ruta, 'wb') as file:
+        for _ in range(repeticiones):
+            file.write(linea)
+
+
+def _medir(funcion, ruta, tamaño):
+    inicio = time.perf_counter()
+    resultado = funcion(ruta)
+    duracion = time.perf_counter() - inicio
+    return resultado, tamaño / (1 << 20) / duracion
+
+
+def bench_hash(megabytes=8):
+    """Comparar el throughput (MB/s) del hash original contra el streaming"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "articulo.txt")
+        _generar_texto(ruta, megabytes)
+        tamaño = os.path.getsize(ruta)
+
+        referencia, mbs = _medir(_fnv1_original, ruta, tamaño)
+        print(f"{'original fnv1-32':<20} {mbs:8.2f} MB/s")
+
+        for algoritmo in ALGORITMOS_HASH:
+            resultado, mbs = _medir(lambda r: hash_archivo_fnv(r, algoritmo), ruta, tamaño)
+            igual = " (mismo hash_id)" if resultado == referencia else ""
+            print(f"{'streaming ' + algoritmo:<20} {mbs:8.2f} MB/s{igual}")
+
+
+def _vocabulario(aleatorio, palabras=5000):
+    """Palabras pseudo-aleatorias pronunciables para titulos y cuerpos"""
+    silabas = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "zo"]
+    return ["".join(aleatorio.choice(silabas) for _ in range(aleatorio.randint(2, 4)))
+            for _ in range(palabras)]
+
+
+def _generar_catalogo(directorio, registros, semilla=1, coautores=0.0):
+    """Escribir una base de datos sintetica con autores y años sesgados
+
+    Con ``coautores`` > 0, esa fraccion de los articulos tiene un segundo
+    autor; los titulos empiezan con palabras del vocabulario para que las
+    busquedas por prefijo sean realistas.
+    """
+    aleatorio = random.Random(semilla)
+    autores = [f"Autor {i}" for i in range(max(10, registros // 20))]
+    palabras = _vocabulario(aleatorio)
+
+    def autor_sesgado():
+        # Pocos autores concentran la mayoria de los articulos
+        return autores[min(int(aleatorio.paretovariate(1.2)) - 1, len(autores) - 1)]
+
+    ruta = os.path.join(directorio, "articulos_db.txt")
+    with open(ruta, 'w', encoding='utf-8') as file:
+        for i in range(registros):
+            autor = autor_sesgado()
+            if coautores and aleatorio.random() < coautores:
+                coautor = autor_sesgado()
+                if coautor != autor:
+                    autor = f"{autor}, {coautor}"
+            año = 2024 - min(int(aleatorio.expovariate(0.15)), 60)
+            titulo = f"{aleatorio.choice(palabras).capitalize()} {aleatorio.choice(palabras)}"
+            file.write(f"{i}|{titulo} {aleatorio.getrandbits(40):x}|{autor}|{año}|{i}.txt\n")
+    return ruta
+
+
+def _generar_cuerpos(directorio, cantidad, semilla=1, palabras_por_cuerpo=400):
+    """Escribir ``cantidad`` cuerpos de articulo distintos; devuelve sus rutas
+
+    Las palabras siguen una distribucion de Zipf aproximada, como en texto real.
+    """
+    aleatorio = random.Random(semilla)
+    vocabulario = _vocabulario(aleatorio)
+    pesos = [1 / rango for rango in range(1, len(vocabulario) + 1)]
+    os.makedirs(directorio, exist_ok=True)
+    rutas = []
+    for i in range(cantidad):
+        ruta = os.path.join(directorio, f"cuerpo_{i:07d}.txt")
+        texto = " ".join(aleatorio.choices(vocabulario, pesos, k=palabras_por_cuerpo))
+        with open(ruta, 'w', encoding='utf-8') as file:
+            file.write(f"{texto}\n")
+        rutas.append(ruta)
+    return rutas
+
+
+def generar_corpus(directorio, registros, cuerpos=0, semilla=1):
+    """Catalogo sintetico en ``directorio`` y cuerpos en ``directorio/fuentes``
+
+    Los cuerpos no forman parte del catalogo: sirven para medir altas o para
+    importarlos con ``proyecto2.py importar``. Devuelve (catalogo, rutas).
+    """
+    os.makedirs(directorio, exist_ok=True)
+    catalogo = _generar_catalogo(directorio, registros, semilla, coautores=0.3)
+    rutas = _generar_cuerpos(os.path.join(directorio, "fuentes"), cuerpos, semilla)
+    return catalogo, rutas
+
+
+def _abrir(directorio, perezosa, instantanea=False):
+    return GestorArticulos(os.path.join(directorio, "articulos_db.txt"),
+                           os.path.join(directorio, "articulos"),
+                           texto_completo=False, carga_perezosa=perezosa,
+                           instantanea=instantanea)
+
+
+def bench_carga(tamaños=(100_000, 1_000_000)):
+    """Tiempo de arranque y memoria: carga completa, perezosa y desde la instantanea
+
+    La instantanea binaria se escribe antes de medirla (arranque en
+    caliente); la primera consulta es un listado por titulo, que con la
+    carga completa ya tiene su indice y con la perezosa lo construye.
+    """
+    print(f"{'registros':>10} {'modo':<11} {'arranque s':>11} {'1a consulta s':>14} {'memoria MB':>11}")
+    for registros in tamaños:
+        with tempfile.TemporaryDirectory() as directorio:
+            _generar_catalogo(directorio, registros)
+            _abrir(directorio, True, instantanea=True).cerrar()
+            for modo, perezosa, instantanea in (("completa", False, False),
+                                                ("perezosa", True, False),
+                                                ("instantanea", False, True)):
+                gc.collect()
+                inicio = time.perf_counter()
+                gestor = _abrir(directorio, perezosa, instantanea)
+                arranque = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                gestor.tabla_hash.get(str(registros // 2)).titulo
+                gestor.listar_por_titulo(registros // 2, 20)
+                consulta = time.perf_counter() - inicio
+                del gestor
+                gc.collect()
+
+                tracemalloc.start()
+                gestor = _abrir(directorio, perezosa, instantanea)
+                memoria = tracemalloc.get_traced_memory()[0] / (1 << 20)
+                tracemalloc.stop()
+                del gestor
+
+                print(f"{registros:>10} {modo:<11} {arranque:>11.2f} {consulta:>14.5f} {memoria:>11.1f}")
+
+
+def _particionar_catalogo(origen, destino, particiones):
+    """Repartir las lineas de una base sintetica entre las particiones de ``destino``"""
+    CatalogoParticionado(destino, particiones, procesos=False, texto_completo=False,
+                         instantanea=False).cerrar()
+    archivos = [open(CatalogoParticionado.rutas(destino, numero)[0], 'w', encoding='utf-8')
+                for numero in range(particiones)]
+    try:
+        with open(origen, encoding='utf-8') as file:
+            for linea in file:
+                archivos[particion_de(linea.split('|', 1)[0], particiones)].write(linea)
+    finally:
+        for archivo in archivos:
+            archivo.close()
+
+
+def bench_particiones(registros=200_000, particiones=(1, 2, 4), consultas=2000, clientes=8):
+    """Arranque y throughput de un catalogo particionado segun la cantidad de particiones
+
+    Cada particion carga y consulta en su propio proceso; ``clientes`` hilos
+    consultan a la vez. Las lecturas puntuales van a una sola particion, los
+    listados y busquedas por año se reparten entre todas y se mezclan.
+    """
+    print(f"{'particiones':>11} {'arranque s':>11} {'puntual op/s':>13} "
+          f"{'por año op/s':>13} {'listado op/s':>13}")
+    with tempfile.TemporaryDirectory() as directorio:
+        _generar_catalogo(directorio, registros)
+        aleatorio = random.Random(1)
+        claves = [str(aleatorio.randrange(registros)) for _ in range(consultas)]
+        años = [2024 - aleatorio.randrange(30) for _ in range(consultas)]
+        # Cada particion envia offset + limit filas: se miden las primeras paginas
+        paginas = [aleatorio.randrange(min(1000, registros - 50)) for _ in range(consultas)]
+        for cantidad in particiones:
+            destino = os.path.join(directorio, f"p{cantidad}")
+            _particionar_catalogo(os.path.join(directorio, "articulos_db.txt"), destino, cantidad)
+            inicio = time.perf_counter()
+            catalogo = CatalogoParticionado(destino, texto_completo=False, instantanea=False)
+            arranque = time.perf_counter() - inicio
+            catalogo.listar_por_titulo(0, 1)  # Construye los indices de cada particion
+
+            def throughput(funcion, argumentos):
+                inicio = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=clientes) as executor:
+                    list(executor.map(funcion, argumentos))
+                return len(argumentos) / (time.perf_counter() - inicio)
+
+            puntual = throughput(catalogo.obtener_articulo, claves)
+            por_año = throughput(lambda año: catalogo.buscar_por_año(año, 0, 20), años)
+            listado = throughput(lambda offset: catalogo.listar_por_titulo(offset, 20), paginas)
+            catalogo.cerrar()
+            print(f"{cantidad:>11} {arranque:>11.2f} {puntual:>13.0f} {por_año:>13.0f} "
+                  f"{listado:>13.0f}")
+
+
+def bench_formatos(registros=200_000):
+    """Exportar, leer e importar el catalogo en cada formato frente a la base de texto
+
+    La fila ``texto`` es la ruta actual: cargar la base de datos completa.
+    ``lectura`` solo recorre la exportacion; ``importar`` la carga en un
+    catalogo vacio, con sus indices y el journal. Parquet y Arrow se miden
+    solo si pyarrow esta instalado.
+    """
+    formatos = [formato for formato in ("jsonl", "columnar", "parquet", "arrow")
+                if formato in ("jsonl", "columnar") or proyecto2._cargar_pyarrow() is not None]
+    extensiones = {formato: extension for extension, formato in FORMATOS_EXPORTACION.items()}
+    print(f"{'formato':<9} {'tamaño MB':>10} {'exportar reg/s':>15} {'lectura reg/s':>14} "
+          f"{'importar reg/s':>15}")
+    with tempfile.TemporaryDirectory() as directorio:
+        texto = _generar_catalogo(directorio, registros)
+        gc.collect()
+        inicio = time.perf_counter()
+        gestor = _abrir(directorio, False)
+        carga = registros / (time.perf_counter() - inicio)
+        print(f"{'texto':<9} {os.path.getsize(texto) / (1 << 20):>10.1f} {'-':>15} {'-':>14} "
+              f"{carga:>15.0f}")
+
+        for formato in formatos:
+            ruta = os.path.join(directorio, f"exportacion{extensiones[formato]}")
+            exportacion = gestor.exportar(ruta)
+
+            inicio = time.perf_counter()
+            for _ in leer_exportacion(ruta):
+                pass
+            lectura = registros / (time.perf_counter() - inicio)
+
+            destino = os.path.join(directorio, formato)
+            os.makedirs(destino)
+            vacio = GestorArticulos(os.path.join(destino, "articulos_db.txt"),
+                                    os.path.join(destino, "articulos"), texto_completo=False,
+                                    instantanea=False)
+            gc.collect()
+            importacion = vacio.importar_catalogo(ruta)
+            vacio.cerrar()
+            print(f"{formato:<9} {exportacion['bytes'] / (1 << 20):>10.1f} "
+                  f"{exportacion['registros_por_segundo']:>15.0f} {lectura:>14.0f} "
+                  f"{importacion['registros_por_segundo']:>15.0f}")
+
+
+def _registros_alta(cantidad, desde):
+    return [('A', f"n{i}", f"Articulo nuevo {i}", "Autor nuevo", 2024, f"n{i}.txt")
+            for i in range(desde, desde + cantidad)]
+
+
+def bench_almacenamiento(registros=100_000, consultas=2000, altas=2000):
+    """Arranque, lectura puntual, consulta por autor y costo de alta por almacenamiento"""
+    with tempfile.TemporaryDirectory() as directorio:
+        texto = _generar_catalogo(directorio, registros)
+        sqlite = os.path.join(directorio, "articulos.sqlite")
+        articulos_dir = os.path.join(directorio, "articulos")
+        migrar_a_sqlite(texto, sqlite, articulos_dir)
+        aleatorio = random.Random(2)
+        claves = [str(aleatorio.randrange(registros)) for _ in range(consultas)]
+
+        print(f"{'almacenamiento':<15} {'modo':<9} {'arranque s':>11} {'lectura us':>11} "
+              f"{'por autor ms':>13}")
+        for almacenamiento, ruta in (("texto", texto), ("sqlite", sqlite)):
+            for perezosa in (False, True):
+                gc.collect()
+                inicio = time.perf_counter()
+                gestor = GestorArticulos(ruta, articulos_dir, texto_completo=False,
+                                         carga_perezosa=perezosa, almacenamiento=almacenamiento)
+                arranque = time.perf_counter() - inicio
+
+                inicio = time.perf_counter()
+                for clave in claves:
+                    gestor.obtener_articulo(clave).titulo
+                lectura = (time.perf_counter() - inicio) / consultas * 1e6
+
+                # En texto perezoso incluye construir los indices en memoria
+                inicio = time.perf_counter()
+                gestor.buscar_por_autor("Autor 0", 0, 50)
+                por_autor = (time.perf_counter() - inicio) * 1e3
+                del gestor
+
+                modo = "perezosa" if perezosa else "completa"
+                print(f"{almacenamiento:<15} {modo:<9} {arranque:>11.2f} {lectura:>11.1f} "
+                      f"{por_autor:>13.2f}")
+
+        # Costo de persistir altas: de a una (un registro por llamada) y en lote
+        print(f"\n{'almacenamiento':<15} {'alta unitaria us':>17} {'alta en lote us':>16}")
+        for nombre, almacenamiento in (("texto", AlmacenamientoTexto(texto)),
+                                       ("sqlite", AlmacenamientoSQLite(sqlite))):
+            inicio = time.perf_counter()
+            for registro in _registros_alta(altas, 0):
+                almacenamiento.registrar([registro])
+            unitaria = (time.perf_counter() - inicio) / altas * 1e6
+
+            inicio = time.perf_counter()
+            almacenamiento.registrar(_registros_alta(altas, altas))
+            lote = (time.perf_counter() - inicio) / altas * 1e6
+            almacenamiento.cerrar()
+            print(f"{nombre:<15} {unitaria:>17.1f} {lote:>16.1f}")
+
+
+def _percentil(ordenadas, fraccion):
+    return ordenadas[min(len(ordenadas) - 1, int(fraccion * len(ordenadas)))]
+
+
+def _resumen(operacion, muestras_ns, bytes_procesados=None):
+    """Estadisticas de una operacion a partir de las duraciones de cada llamada"""
+    ordenadas = sorted(muestras_ns)
+    total = sum(ordenadas) / 1e9
+    resumen = {
+        "operacion": operacion,
+        "n": len(ordenadas),
+        "total_s": round(total, 6),
+        "media_us": round(total / len(ordenadas) * 1e6, 3),
+        "p50_us": round(_percentil(ordenadas, 0.50) / 1e3, 3),
+        "p95_us": round(_percentil(ordenadas, 0.95) / 1e3, 3),
+        "p99_us": round(_percentil(ordenadas, 0.99) / 1e3, 3),
+        "max_us": round(ordenadas[-1] / 1e3, 3),
+        "ops_s": round(len(ordenadas) / total, 1) if total else None,
+    }
+    if bytes_procesados is not None:
+        resumen["mb_s"] = round(bytes_procesados / (1 << 20) / total, 2) if total else None
+    return resumen
+
+
+def _cronometrar(resultados, operacion, funcion, argumentos, bytes_procesados=None):
+    """Medir cada llamada ``funcion(*args)`` por separado y agregar el resumen
+
+    La sobrecarga del reloj (~50 ns) queda incluida en cada muestra.
+    """
+    reloj = time.perf_counter_ns
+    muestras = []
+    for args in argumentos:
+        inicio = reloj()
+        funcion(*args)
+        muestras.append(reloj() - inicio)
+    resultados.append(_resumen(operacion, muestras, bytes_procesados))
+    return resultados[-1]
+
+
+def _entorno():
+    """Metadatos para poder comparar resultados entre versiones y maquinas"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    np = proyecto2._cargar_numpy()
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "sistema": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def _bench_tabla_hash(resultados, registros, operaciones, aleatorio):
+    for open_addressing in (False, True):
+        modo = "open_addressing" if open_addressing else "encadenamiento"
+        tabla = HashTable(open_addressing=open_addressing)
+        claves = [str(i) for i in range(registros)]
+        _cronometrar(resultados, f"hashtable_{modo}_insert",
+                     tabla.insert, ((clave, clave) for clave in claves))
+        muestra = [(aleatorio.choice(claves),) for _ in range(operaciones)]
+        _cronometrar(resultados, f"hashtable_{modo}_get", tabla.get, muestra)
+        _cronometrar(resultados, f"hashtable_{modo}_get_ausente", tabla.get,
+                     ((f"x{i}",) for i in range(operaciones)))
+        _cronometrar(resultados, f"hashtable_{modo}_delete", tabla.delete,
+                     dict.fromkeys(muestra))
+        del tabla, claves
+
+
+def bench_suite(registros=10_000, operaciones=1000, cuerpos=200, cargas=3,
+                almacenamiento="texto", perezosa=False, semilla=1, metricas=False):
+    """Medir las operaciones principales sobre un corpus sintetico
+
+    Devuelve un dict serializable a JSON con los parametros, el entorno y
+    una entrada por operacion. Las busquedas de texto completo se miden
+    sobre un gestor aparte con los ``cuerpos`` importados, para no tener
+    que generar un cuerpo por cada registro del catalogo. Con ``metricas``
+    el gestor corre instrumentado, para medir el costo de la instrumentacion.
+    """
+    aleatorio = random.Random(semilla)
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        catalogo, fuentes = generar_corpus(directorio, registros, cuerpos + operaciones, semilla)
+        articulos_dir = os.path.join(directorio, "articulos")
+        ruta_db = catalogo
+        if almacenamiento == "sqlite":
+            ruta_db = os.path.join(directorio, "articulos.sqlite")
+            migrar_a_sqlite(catalogo, ruta_db, articulos_dir)
+
+        _bench_tabla_hash(resultados, registros, operaciones, aleatorio)
+
+        def abrir():
+            return GestorArticulos(ruta_db, articulos_dir, texto_completo=False,
+                                   carga_perezosa=perezosa, almacenamiento=almacenamiento,
+                                   metricas=metricas)
+
+        gestores = []
+        _cronometrar(resultados, "cargar_base_datos", lambda: gestores.append(abrir()),
+                     [()] * cargas)
+        for gestor in gestores[:-1]:
+            gestor.cerrar()
+        gestor = gestores[-1]
+        # Con texto, los cierres anteriores dejaron la instantanea binaria:
+        # se mide abrir el catalogo y responder la primera consulta
+        _cronometrar(resultados, "arranque_caliente",
+                     lambda: abrir().listar_por_titulo(0, 50), [()] * cargas)
+
+        # Hash FNV: en memoria (calcular_hash_fnv1) y en streaming desde disco
+        texto = open(fuentes[0], encoding='utf-8').read() * 64
+        _cronometrar(resultados, "calcular_hash_fnv1", gestor.calcular_hash_fnv1,
+                     [(texto,)] * 20, bytes_procesados=len(texto.encode('utf-8')) * 20)
+        tamaño = sum(os.path.getsize(ruta) for ruta in fuentes[:operaciones])
+        _cronometrar(resultados, "hash_archivo_fnv", hash_archivo_fnv,
+                     ((ruta,) for ruta in fuentes[:operaciones]), bytes_procesados=tamaño)
+
+        claves = [str(aleatorio.randrange(registros)) for _ in range(operaciones)]
+        _cronometrar(resultados, "obtener_articulo", gestor.obtener_articulo,
+                     ((clave,) for clave in claves))
+
+        # La primera consulta puede construir indices (carga perezosa); se mide aparte
+        autores = [gestor.obtener_articulo(clave).autores.split(",")[0] for clave in claves]
+        _cronometrar(resultados, "primera_consulta", gestor.buscar_por_autor, [(autores[0], 0, 50)])
+        _cronometrar(resultados, "buscar_por_autor", gestor.buscar_por_autor,
+                     ((autor, 0, 50) for autor in autores))
+        _cronometrar(resultados, "buscar_por_año", gestor.buscar_por_año,
+                     ((2024 - aleatorio.randrange(30), 0, 50) for _ in range(operaciones)))
+        paginas = [(aleatorio.randrange(max(1, registros - 50)), 50) for _ in range(operaciones)]
+        _cronometrar(resultados, "listar_por_titulo", gestor.listar_por_titulo, paginas)
+        _cronometrar(resultados, "listar_por_autor", gestor.listar_por_autor, paginas)
+        titulos = [gestor.obtener_articulo(clave).titulo for clave in claves]
+        _cronometrar(resultados, "nombres_con_prefijo", gestor.nombres_con_prefijo,
+                     ((autor[:5],) for autor in autores))
+        _cronometrar(resultados, "buscar", lambda prefijo, desde: gestor.buscar(
+                         titulo_prefijo=prefijo, año_desde=desde, limit=50),
+                     ((titulo[:3], 2024 - aleatorio.randrange(30)) for titulo in titulos))
+
+        # Analitica: la primera consulta construye las columnas
+        _cronometrar(resultados, "construir_analitica", gestor.conteo_por_año, [()])
+        _cronometrar(resultados, "conteo_por_año", gestor.conteo_por_año, [()] * 20)
+        _cronometrar(resultados, "top_autores", gestor.top_autores,
+                     ((20, 2024 - aleatorio.randrange(30)) for _ in range(20)))
+        _cronometrar(resultados, "histograma_años", gestor.histograma_años,
+                     ((autor,) for autor in autores[:20]))
+
+        # Busqueda aproximada: la primera consulta construye los trigramas
+        def con_error(texto):
+            i = aleatorio.randrange(len(texto))  # Un error de tipeo: una letra cambiada
+            return texto[:i] + "x" + texto[i + 1:]
+
+        _cronometrar(resultados, "construir_trigramas", gestor.sugerir_autores, [("autor",)])
+        _cronometrar(resultados, "buscar_aproximado", gestor.buscar_aproximado,
+                     ((con_error(titulo),) for titulo in titulos))
+        # Prefijos de largo creciente, como al escribir; los repetidos salen de la cache
+        _cronometrar(resultados, "sugerir_autores", gestor.sugerir_autores,
+                     ((autor[:aleatorio.randint(2, len(autor))],) for autor in autores))
+
+        nuevos = fuentes[cuerpos:cuerpos + operaciones]
+        _cronometrar(resultados, "agregar_articulo", gestor.agregar_articulo,
+                     ((f"Nuevo {i}", "Autor nuevo", 2024, ruta) for i, ruta in enumerate(nuevos)))
+        _cronometrar(resultados, "modificar_articulo", gestor.modificar_articulo,
+                     ((clave, "Autor modificado", 2000) for clave in dict.fromkeys(claves)))
+        # Las mismas modificaciones agrupadas: una sola escritura al confirmar
+        inicio = time.perf_counter_ns()
+        with gestor.transaccion():
+            for clave in dict.fromkeys(claves):
+                gestor.modificar_articulo(clave, "Autor en lote", 2001)
+        resultados.append(_resumen("transaccion_modificaciones",
+                                   [time.perf_counter_ns() - inicio]))
+        _cronometrar(resultados, "renombrar_autor", gestor.renombrar_autor,
+                     [("Autor en lote", "Autor renombrado")])
+        _cronometrar(resultados, "eliminar_articulo", gestor.eliminar_articulo,
+                     ((clave,) for clave in dict.fromkeys(claves)))
+        gestor.cerrar()
+
+        # Texto completo sobre un catalogo con cuerpos reales
+        texto_dir = os.path.join(directorio, "texto")
+        gestor = GestorArticulos(os.path.join(texto_dir, "articulos_db.txt"),
+                                 os.path.join(texto_dir, "articulos"))
+        inicio = time.perf_counter_ns()
+        reporte = gestor.importar_filas([(f"Cuerpo {i}", "Autor", 2024, ruta)
+                                         for i, ruta in enumerate(fuentes[:cuerpos])])
+        resultados.append(_resumen("importar_filas", [time.perf_counter_ns() - inicio],
+                                   bytes_procesados=reporte["bytes"]))
+        palabras = open(fuentes[0], encoding='utf-8').read().split()
+        _cronometrar(resultados, "buscar_texto", gestor.buscar_texto,
+                     ((" ".join(aleatorio.sample(palabras, 2)),) for _ in range(operaciones)))
+        gestor.cerrar()
+
+    return {
+        "parametros": {"registros": registros, "operaciones": operaciones, "cuerpos": cuerpos,
+                       "cargas": cargas, "almacenamiento": almacenamiento,
+                       "perezosa": perezosa, "semilla": semilla, "metricas": metricas},
+        "entorno": _entorno(),
+        "resultados": resultados,
+    }
+
+
+def _imprimir_resultados(resultados, salida=sys.stderr):
+    print(f"{'operacion':<38} {'n':>8} {'media us':>11} {'p50 us':>10} {'p95 us':>10} "
+          f"{'p99 us':>10} {'MB/s':>8}", file=salida)
+    for r in resultados:
+        mbs = f"{r['mb_s']:>8.1f}" if r.get("mb_s") else ""
+        print(f"{r['operacion']:<38} {r['n']:>8} {r['media_us']:>11.2f} {r['p50_us']:>10.2f} "
+              f"{r['p95_us']:>10.2f} {r['p99_us']:>10.2f} {mbs}", file=salida)
+
+
+def comparar(base, nuevo, tolerancia=0.2, metrica="p50_us"):
+    """Comparar dos resultados de ``suite``; devuelve las operaciones que empeoran
+
+    Una operacion empeora si ``metrica`` crece mas de ``tolerancia`` (0.2 = 20%).
+    """
+    if base["parametros"] != nuevo["parametros"]:
+        print(f"Aviso: parametros distintos: {base['parametros']} / {nuevo['parametros']}",
+              file=sys.stderr)
+    anteriores = {r["operacion"]: r for r in base["resultados"]}
+    regresiones = []
+    print(f"{'operacion':<38} {'base':>11} {'nuevo':>11} {'cambio':>8}")
+    for r in nuevo["resultados"]:
+        anterior = anteriores.get(r["operacion"])
+        if anterior is None or not anterior[metrica]:
+            continue
+        cambio = r[metrica] / anterior[metrica] - 1
+        marca = "  <-- regresion" if cambio > tolerancia else ""
+        print(f"{r['operacion']:<38} {anterior[metrica]:>11.2f} {r[metrica]:>11.2f} "
+              f"{cambio:>+8.1%}{marca}")
+        if marca:
+            regresiones.append(r["operacion"])
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del gestor de articulos")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    parser_hash = subparsers.add_parser("hash", help="Throughput del hash FNV")
+    parser_hash.add_argument("--mb", type=int, default=8, help="Tamaño del archivo en MB")
+
+    parser_carga = subparsers.add_parser("carga", help="Arranque y memoria por modo de carga")
+    parser_carga.add_argument("--registros", type=int, nargs="+", default=[100_000, 1_000_000],
+                              help="Tamaños de catalogo sintetico")
+
+    parser_almacenamiento = subparsers.add_parser(
+        "almacenamiento", help="Texto frente a SQLite: arranque, lecturas y altas")
+    parser_almacenamiento.add_argument("--registros", type=int, default=100_000,
+                                       help="Tamaño del catalogo sintetico")
+
+    parser_particiones = subparsers.add_parser(
+        "particiones", help="Arranque y throughput segun la cantidad de particiones")
+    parser_particiones.add_argument("--registros", type=int, default=200_000,
+                                    help="Tamaño del catalogo sintetico")
+    parser_particiones.add_argument("--particiones", type=int, nargs="+", default=[1, 2, 4],
+                                    help="Cantidades de particiones a medir")
+    parser_particiones.add_argument("--clientes", type=int, default=8,
+                                    help="Hilos que consultan a la vez")
+
+    parser_formatos = subparsers.add_parser(
+        "formatos", help="Exportar e importar en JSONL, columnar, Parquet y Arrow frente al texto")
+    parser_formatos.add_argument("--registros", type=int, default=200_000,
+                                 help="Tamaño del catalogo sintetico")
+
+    parser_corpus = subparsers.add_parser(
+        "corpus", help="Generar un catalogo y cuerpos sinteticos en un directorio")
+    parser_corpus.add_argument("directorio")
+    parser_corpus.add_argument("--registros", type=int, default=100_000,
+                               help="Registros del catalogo (10k a 10M)")
+    parser_corpus.add_argument("--cuerpos", type=int, default=1000,
+                               help="Cuerpos de articulo en directorio/fuentes")
+    parser_corpus.add_argument("--semilla", type=int, default=1)
+
+    parser_suite = subparsers.add_parser(
+        "suite", help="Medir todas las operaciones y emitir resultados en JSON")
+    parser_suite.add_argument("--registros", type=int, default=10_000,
+                              help="Registros del catalogo sintetico (10k a 10M)")
+    parser_suite.add_argument("--operaciones", type=int, default=1000,
+                              help="Llamadas medidas por operacion")
+    parser_suite.add_argument("--cuerpos", type=int, default=200,
+                              help="Cuerpos importados para la busqueda de texto")
+    parser_suite.add_argument("--cargas", type=int, default=3,
+                              help="Repeticiones de la carga de la base de datos")
+    parser_suite.add_argument("--almacenamiento", choices=("texto", "sqlite"), default="texto")
+    parser_suite.add_argument("--perezosa", action="store_true")
+    parser_suite.add_argument("--semilla", type=int, default=1)
+    parser_suite.add_argument("--metricas", action="store_true",
+                              help="Instrumentar el gestor (costo de las metricas)")
+    parser_suite.add_argument("--salida", help="Archivo JSON de resultados (por defecto stdout)")
+
+    parser_comparar = subparsers.add_parser(
+        "comparar", help="Comparar dos resultados de suite")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("nuevo")
+    parser_comparar.add_argument("--tolerancia", type=float, default=0.2,
+                                 help="Empeoramiento relativo admitido (0.2 = 20%%)")
+    parser_comparar.add_argument("--metrica", default="p50_us",
+                                 choices=("media_us", "p50_us", "p95_us", "p99_us"))
+
+    args = parser.parse_args()
+    if args.comando == "hash":
+        bench_hash(args.mb)
+    elif args.comando == "carga":
+        bench_carga(args.registros)
+    elif args.comando == "almacenamiento":
+        bench_almacenamiento(args.registros)
+    elif args.comando == "particiones":
+        bench_particiones(args.registros, args.particiones, clientes=args.clientes)
+    elif args.comando == "formatos":
+        bench_formatos(args.registros)
+    elif args.comando == "corpus":
+        catalogo, rutas = generar_corpus(args.directorio, args.registros, args.cuerpos,
+                                         args.semilla)
+        print(f"{catalogo}: {args.registros} registros; {len(rutas)} cuerpos en "
+              f"{os.path.join(args.directorio, 'fuentes')}")
+    elif args.comando == "suite":
+        reporte = bench_suite(args.registros, args.operaciones, args.cuerpos, args.cargas,
+                              args.almacenamiento, args.perezosa, args.semilla, args.metricas)
+        _imprimir_resultados(reporte["resultados"])
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as file:
+                json.dump(reporte, file, indent=2, ensure_ascii=False)
+        else:
+            json.dump(reporte, sys.stdout, indent=2, ensure_ascii=False)
+            print()
+    elif args.comando == "comparar":
+        with open(args.base, encoding='utf-8') as file:
+            base = json.load(file)
+        with open(args.nuevo, encoding='utf-8') as file:
+            nuevo = json.load(file)
+        if comparar(base, nuevo, args.tolerancia, args.metrica):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,283 +1,6253 @@
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
 import os
+import re
+import sys
+import csv
+import json
+import math
+import mmap
+import time
+import zlib
+import heapq
+import random
+import operator
+import struct
+import bisect
+import shutil
+import sqlite3
+import base64
 import hashlib
-from collections import defaultdict
+import argparse
+import queue
+import functools
+import itertools
+import asyncio
+import tempfile
+import threading
+import unicodedata
+import multiprocessing
+import contextlib
+import codecs
+import urllib.parse
+from array import array
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
 
+try:
+    import fcntl  # Reflinks en Linux; no existe en Windows
+except ImportError:
+    fcntl = None
+
+# NumPy (opcional, vectoriza la analitica del catalogo) se importa recien
+# al construir las columnas analiticas: el servidor y la importacion no lo usan
+np = None
+_numpy_buscado = False
+
+# pyarrow (opcional, exportar e importar en Parquet y Arrow) se importa
+# recien al validar uno de esos formatos
+pa = pq = None
+_pyarrow_buscado = False
+
+
+_VACIO = object()  # Marca de casilla nunca usada (direccionamiento abierto)
+_BORRADO = object()  # Marca de casilla borrada (lapida)
+
+
+class _ChainedStore:
+    """Almacenamiento de tamaño fijo con encadenamiento (una lista por cubeta)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.table = [[] for _ in range(size)]
+        self.count = 0
+
+    def get(self, index, key):
+        for k, v in self.table[index]:
+            if k == key:
+                return v, True
+        return None, False
+
+    def probes(self, index, key):
+        """Entradas de la cadena examinadas al buscar la clave"""
+        bucket = self.table[index]
+        for i, (k, _) in enumerate(bucket, 1):
+            if k == key:
+                return i
+        return len(bucket)
+
+    def insert(self, index, key, value):
+        """Insertar o actualizar; devuelve (es_nuevo, longitud_de_cadena)"""
+        bucket = self.table[index]
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                bucket[i] = (key, value)
+                return False, len(bucket)
+        bucket.append((key, value))
+        self.count += 1
+        return True, len(bucket)
+
+    def delete(self, index, key):
+        bucket = self.table[index]
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                del bucket[i]
+                self.count -= 1
+                return True
+        return False
+
+    def pop_slot(self, index):
+        """Vaciar una cubeta y devolver sus pares (usado al migrar)"""
+        bucket = self.table[index]
+        self.table[index] = []
+        self.count -= len(bucket)
+        return bucket
+
+    def items(self):
+        for bucket in self.table:
+            yield from bucket
+
+    def max_chain(self):
+        return max((len(bucket) for bucket in self.table), default=0)
+
+    def used_slots(self):
+        return self.count
+
+
+class _OpenAddressingStore:
+    """Almacenamiento compacto con sondeo lineal sobre arreglos paralelos"""
+
+    def __init__(self, size):
+        self.size = size
+        self.keys = [_VACIO] * size
+        self.values = [None] * size
+        self.count = 0
+        self.tombstones = 0
+
+    def _find(self, index, key):
+        """Devolver (posicion, encontrado, sondeos) para la clave"""
+        keys = self.keys
+        size = self.size
+        first_free = -1
+        for probes in range(1, size + 1):
+            k = keys[index]
+            if k is _VACIO:
+                return (index if first_free < 0 else first_free), False, probes
+            if k is _BORRADO:
+                if first_free < 0:
+                    first_free = index
+            elif k == key:
+                return index, True, probes
+            index += 1
+            if index == size:
+                index = 0
+        return first_free, False, size
+
+    def get(self, index, key):
+        pos, found, _ = self._find(index, key)
+        if found:
+            return self.values[pos], True
+        return None, False
+
+    def probes(self, index, key):
+        """Casillas examinadas al buscar la clave"""
+        return self._find(index, key)[2]
+
+    def insert(self, index, key, value):
+        """Insertar o actualizar; devuelve (es_nuevo, longitud_de_sondeo)"""
+        pos, found, probes = self._find(index, key)
+        if pos < 0:
+            raise RuntimeError("Tabla de direccionamiento abierto llena")
+        if not found:
+            if self.keys[pos] is _BORRADO:
+                self.tombstones -= 1
+            self.keys[pos] = key
+            self.count += 1
+        self.values[pos] = value
+        return not found, probes
+
+    def delete(self, index, key):
+        pos, found, _ = self._find(index, key)
+        if not found:
+            return False
+        self.keys[pos] = _BORRADO
+        self.values[pos] = None
+        self.count -= 1
+        self.tombstones += 1
+        return True
+
+    def pop_slot(self, index):
+        k = self.keys[index]
+        if k is _VACIO or k is _BORRADO:
+            return ()
+        # Dejar una lapida: vaciar la posicion cortaria el sondeo de las
+        # claves que aun no se migraron y que estan mas adelante
+        self.keys[index] = _BORRADO
+        v = self.values[index]
+        self.values[index] = None
+        self.count -= 1
+        self.tombstones += 1
+        return ((k, v),)
+
+    def items(self):
+        for k, v in zip(self.keys, self.values):
+            if k is not _VACIO and k is not _BORRADO:
+                yield k, v
+
+    def max_chain(self):
+        """Longitud maxima de sondeo de las claves almacenadas"""
+        longest = 0
+        for pos, k in enumerate(self.keys):
+            if k is _VACIO or k is _BORRADO:
+                continue
+            home = hash(k) % self.size
+            longest = max(longest, (pos - home) % self.size + 1)
+        return longest
+
+    def used_slots(self):
+        return self.count + self.tombstones
+
 
 class HashTable:
-    """Implementacion de tabla hash con encadenamiento"""
+    """Implementacion de tabla hash redimensionable
+
+    Por defecto usa encadenamiento; con ``open_addressing=True`` usa sondeo
+    lineal sobre arreglos paralelos de claves y valores. La tabla crece o se
+    reduce segun el factor de carga y el rehash se hace de forma incremental:
+    cada insercion o eliminacion migra unas pocas cubetas de la tabla
+    anterior a la nueva.
+
+    Las lecturas (``get``, ``exists``, ``items``) no modifican la tabla, asi
+    varios hilos pueden leer a la vez bajo un bloqueo compartido; solo las
+    escrituras, que requieren acceso exclusivo, avanzan el rehash.
+    """
+
+    REHASH_STEP = 8  # Cubetas migradas por escritura durante un rehash
+
+    def __init__(self, size=100, max_load_factor=0.75, min_load_factor=0.1,
+                 open_addressing=False):
+        if open_addressing and max_load_factor >= 1:
+            raise ValueError("El factor de carga maximo debe ser < 1 con direccionamiento abierto")
+        self.initial_size = size
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.open_addressing = open_addressing
+        self._store = self._new_store(size)
+        self._old = None  # Tabla anterior mientras dura el rehash
+        self._rehash_pos = 0
+        self.resize_count = 0
+        self.max_probe_length = 0  # Mayor cadena/sondeo observado al insertar
+
+    def _new_store(self, size):
+        if self.open_addressing:
+            return _OpenAddressingStore(size)
+        return _ChainedStore(size)
+
+    @property
+    def size(self):
+        return self._store.size
+
+    @property
+    def count(self):
+        if self._old is not None:
+            return self._store.count + self._old.count
+        return self._store.count
+
+    @property
+    def load_factor(self):
+        return self.count / self.size
+
+    @property
+    def rehashing(self):
+        return self._old is not None
+
+    def __len__(self):
+        return self.count
+
+    def _hash(self, key, size=None):
+        """Funcion hash usando metodo de division"""
+        return hash(key) % (size or self.size)
+
+    def _rehash_step(self, steps=REHASH_STEP):
+        """Migrar algunas cubetas de la tabla anterior a la actual"""
+        old = self._old
+        if old is None:
+            return
+        store = self._store
+        end = min(self._rehash_pos + steps, old.size)
+        for index in range(self._rehash_pos, end):
+            for k, v in old.pop_slot(index):
+                store.insert(self._hash(k, store.size), k, v)
+        self._rehash_pos = end
+        if end >= old.size:
+            self._old = None
+
+    def _finish_rehash(self):
+        while self._old is not None:
+            self._rehash_step(self._old.size)
+
+    def _start_resize(self, new_size):
+        self._finish_rehash()
+        self._old = self._store
+        self._store = self._new_store(new_size)
+        self._rehash_pos = 0
+        self.resize_count += 1
+
+    def _check_load(self, shrink=False):
+        """Iniciar un rehash si el factor de carga sale del rango permitido
+
+        Solo las eliminaciones (``shrink=True``) pueden reducir la tabla, asi
+        una tabla reservada con ``reserve`` no se encoge mientras se llena.
+        """
+        if self._old is not None:
+            # Seguridad: nunca dejar que la tabla nueva se llene durante el rehash
+            if self._store.used_slots() + 1 > self._store.size * self.max_load_factor:
+                self._finish_rehash()
+            else:
+                return
+        size = self._store.size
+        if self._store.used_slots() > size * self.max_load_factor:
+            new_size = size * 2
+            # Con muchas lapidas basta con reconstruir al mismo tamaño
+            if self._store.count <= size * self.max_load_factor / 2:
+                new_size = size
+            self._start_resize(new_size)
+        elif shrink and size > self.initial_size and self._store.count < size * self.min_load_factor:
+            self._start_resize(max(self.initial_size, size // 2))
+
+    def reserve(self, n):
+        """Dimensionar la tabla para ``n`` elementos antes de una carga masiva"""
+        size = self.size
+        while n > size * self.max_load_factor:
+            size *= 2
+        if size != self.size:
+            self._start_resize(size)
+            self._finish_rehash()
+
+    def insert(self, key, value):
+        """Insertar elemento en la tabla hash"""
+        if self._old is not None:
+            self._rehash_step()
+        if self._old is not None:
+            # La clave se mueve a la tabla nueva si aun vivia en la anterior
+            self._old.delete(self._hash(key, self._old.size), key)
+        _, probes = self._store.insert(self._hash(key), key, value)
+        if probes > self.max_probe_length:
+            self.max_probe_length = probes
+        self._check_load()
+
+    def get(self, key):
+        """Obtener elemento de la tabla hash (sin modificarla)"""
+        value, found = self._store.get(self._hash(key), key)
+        if not found and self._old is not None:
+            value, found = self._old.get(self._hash(key, self._old.size), key)
+        return value
+
+    def delete(self, key):
+        """Eliminar elemento de la tabla hash"""
+        if self._old is not None:
+            self._rehash_step()
+        deleted = self._store.delete(self._hash(key), key)
+        if not deleted and self._old is not None:
+            deleted = self._old.delete(self._hash(key, self._old.size), key)
+        if deleted:
+            self._check_load(shrink=True)
+        return deleted
+
+    def exists(self, key):
+        """Verificar si una clave existe en la tabla"""
+        return self.get(key) is not None
+
+    def items(self):
+        """Iterar pares (clave, valor) de la tabla"""
+        yield from self._store.items()
+        if self._old is not None:
+            yield from self._old.items()
+
+    def keys(self):
+        """Iterar las claves de la tabla"""
+        for key, _ in self.items():
+            yield key
+
+    def get_all_values(self):
+        """Obtener todos los valores de la tabla"""
+        return [v for k, v in self.items()]
+
+    def max_chain_length(self):
+        """Longitud maxima de cadena (o de sondeo) en la tabla actual"""
+        longest = self._store.max_chain()
+        if self._old is not None:
+            longest = max(longest, self._old.max_chain())
+        return longest
+
+    def instrumentar(self, metricas, nombre="tabla"):
+        """Registrar operaciones y longitud de sondeo en ``metricas``
+
+        Las versiones instrumentadas se instalan en la instancia, asi la
+        tabla sin instrumentar no paga ningun costo; ``metricas=None`` las
+        quita. La longitud de sondeo de cada busqueda se calcula aparte y
+        solo mientras la instrumentacion esta activa.
+        """
+        for operacion in ("insert", "get", "delete"):
+            self.__dict__.pop(operacion, None)
+        if metricas is None:
+            return
+
+        etiquetas = {operacion: (("tabla", nombre), ("operacion", operacion))
+                     for operacion in ("insert", "get", "delete")}
+        limites = Metricas.LIMITES_SONDEO
+        clase = type(self)
+
+        def sondeo(key):
+            probes = self._store.probes(self._hash(key), key)
+            if self._old is not None and not self._store.get(self._hash(key), key)[1]:
+                probes += self._old.probes(self._hash(key, self._old.size), key)
+            return probes
+
+        def get(key):
+            metricas.observar("hashtable_sondeo_longitud", sondeo(key), etiquetas["get"], limites)
+            return clase.get(self, key)
+
+        def insert(key, value):
+            metricas.contar("hashtable_operaciones_total", etiquetas["insert"])
+            clase.insert(self, key, value)
+
+        def delete(key):
+            metricas.observar("hashtable_sondeo_longitud", sondeo(key), etiquetas["delete"], limites)
+            return clase.delete(self, key)
+
+        self.get, self.insert, self.delete = get, insert, delete
+
+    def stats(self):
+        """Estadisticas de ocupacion para verificar el comportamiento"""
+        return {
+            "mode": "open_addressing" if self.open_addressing else "chaining",
+            "size": self.size,
+            "count": self.count,
+            "load_factor": self.load_factor,
+            "resize_count": self.resize_count,
+            "rehashing": self.rehashing,
+            "max_chain_length": self.max_chain_length(),
+            "max_probe_length": self.max_probe_length,
+        }
+
+
+class ListaOrdenada:
+    """Lista ordenada por bloques para indices que se recorren en orden
+
+    Los elementos (tuplas comparables) se guardan en bloques ordenados de
+    tamaño acotado, de modo que insertar o eliminar cuesta O(log n + B) y
+    recorrer un rango cuesta O(log n + k), sin reordenar toda la lista.
+    """
+
+    TAMAÑO_BLOQUE = 512
+
+    def __init__(self, elementos=()):
+        self._bloques = []
+        self._maximos = []  # Ultimo elemento de cada bloque
+        self._total = 0
+        ordenados = sorted(elementos)
+        for i in range(0, len(ordenados), self.TAMAÑO_BLOQUE):
+            bloque = ordenados[i:i + self.TAMAÑO_BLOQUE]
+            self._bloques.append(bloque)
+            self._maximos.append(bloque[-1])
+        self._total = len(ordenados)
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        for bloque in self._bloques:
+            yield from bloque
+
+    def agregar(self, elemento):
+        """Insertar un elemento manteniendo el orden"""
+        if not self._bloques:
+            self._bloques.append([elemento])
+            self._maximos.append(elemento)
+            self._total = 1
+            return
+
+        i = bisect.bisect_left(self._maximos, elemento)
+        if i == len(self._bloques):
+            i -= 1
+        bloque = self._bloques[i]
+        bisect.insort(bloque, elemento)
+        self._maximos[i] = bloque[-1]
+        self._total += 1
+
+        # Partir el bloque cuando crece demasiado
+        if len(bloque) > 2 * self.TAMAÑO_BLOQUE:
+            mitad = len(bloque) // 2
+            self._bloques[i:i + 1] = [bloque[:mitad], bloque[mitad:]]
+            self._maximos[i:i + 1] = [bloque[mitad - 1], bloque[-1]]
+
+    def eliminar(self, elemento):
+        """Eliminar un elemento; devuelve False si no estaba"""
+        i = bisect.bisect_left(self._maximos, elemento)
+        if i == len(self._bloques):
+            return False
+        bloque = self._bloques[i]
+        j = bisect.bisect_left(bloque, elemento)
+        if j == len(bloque) or bloque[j] != elemento:
+            return False
+        del bloque[j]
+        self._total -= 1
+        if bloque:
+            self._maximos[i] = bloque[-1]
+        else:
+            del self._bloques[i]
+            del self._maximos[i]
+        return True
+
+    def iterar_desde(self, valor):
+        """Recorrer en orden los elementos mayores o iguales a ``valor``"""
+        i = bisect.bisect_left(self._maximos, valor)
+        if i == len(self._bloques):
+            return
+        bloque = self._bloques[i]
+        yield from bloque[bisect.bisect_left(bloque, valor):]
+        for bloque in self._bloques[i + 1:]:
+            yield from bloque
+
+    def posicion(self, valor):
+        """Cantidad de elementos menores que ``valor``"""
+        i = bisect.bisect_left(self._maximos, valor)
+        anteriores = sum(len(bloque) for bloque in self._bloques[:i])
+        if i == len(self._bloques):
+            return anteriores
+        return anteriores + bisect.bisect_left(self._bloques[i], valor)
+
+    def rebanada(self, offset=0, limit=None):
+        """Elementos en las posiciones [offset, offset + limit)"""
+        resultado = []
+        if limit is not None and limit <= 0:
+            return resultado
+        for bloque in self._bloques:
+            if offset >= len(bloque):
+                offset -= len(bloque)
+                continue
+            parte = bloque[offset:] if limit is None else bloque[offset:offset + limit - len(resultado)]
+            resultado.extend(parte)
+            offset = 0
+            if limit is not None and len(resultado) >= limit:
+                break
+        return resultado
+
+
+# Parametros FNV por ancho de palabra: (primo, base de desplazamiento)
+FNV_PARAMETROS = {
+    32: (16777619, 2166136261),
+    64: (1099511628211, 14695981039346656037),
+}
+
+# Algoritmos de hash seleccionables por catalogo: (bits, variante 1a)
+ALGORITMOS_HASH = {
+    "fnv1-32": (32, False),
+    "fnv1a-32": (32, True),
+    "fnv1-64": (64, False),
+    "fnv1a-64": (64, True),
+}
+
+
+class HasherFNV:
+    """Hash FNV-1 / FNV-1a incremental de 32 o 64 bits
+
+    Se alimenta con bloques de bytes mediante ``update``. El truncado al ancho
+    de palabra se hace con una mascara en lugar de un modulo por byte.
+    """
+
+    def __init__(self, bits=32, variante_a=False):
+        if bits not in FNV_PARAMETROS:
+            raise ValueError(f"Ancho de FNV no soportado: {bits}")
+        self.primo, self.valor = FNV_PARAMETROS[bits]
+        self.mascara = (1 << bits) - 1
+        self.variante_a = variante_a
+
+    def update(self, datos):
+        """Incorporar un bloque de bytes al hash"""
+        h = self.valor
+        primo = self.primo
+        mascara = self.mascara
+        if self.variante_a:
+            for byte in datos:
+                h = ((h ^ byte) * primo) & mascara
+        else:
+            for byte in datos:
+                h = (h * primo & mascara) ^ byte
+        self.valor = h
+
+    def hexdigest(self):
+        return format(self.valor, 'x')
+
+    def digest_str(self):
+        """Valor decimal usado como hash_id"""
+        return str(self.valor)
+
+
+def _normalizar_saltos(bloques):
+    """Convertir ``\\r\\n`` y ``\\r`` en ``\\n`` a lo largo de una secuencia de bloques"""
+    pendiente_cr = False
+    for bloque in bloques:
+        if pendiente_cr:
+            bloque = b'\r' + bloque
+            pendiente_cr = False
+        if b'\r' in bloque:
+            # Un \r al final del bloque puede ser la mitad de un \r\n
+            if bloque.endswith(b'\r'):
+                bloque = bloque[:-1]
+                pendiente_cr = True
+            bloque = bloque.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        yield bloque
+    if pendiente_cr:
+        yield b'\n'
+
+
+MUESTRA_TEXTO = 8192  # Bytes iniciales que deciden si un cuerpo es texto
+
+
+def _es_texto(muestra):
+    """Un cuerpo es texto si su comienzo es UTF-8 valido y no tiene bytes nulos
+
+    Un caracter cortado al final de la muestra no cuenta como error.
+    """
+    if b'\0' in muestra:
+        return False
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(muestra)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _hashear_bloques(bloques, algoritmo="fnv1-32", normalizar_saltos=True):
+    """Hash FNV de una secuencia de bloques de bytes
+
+    Con ``normalizar_saltos`` los finales de linea se normalizan solo si el
+    cuerpo es texto (ver ``_es_texto``): asi se conservan los hash_id de los
+    articulos de texto leidos historicamente en modo texto, y dos binarios
+    que difieren en ``\\r\\n`` frente a ``\\n`` no comparten hash_id.
+    """
+    bits, variante_a = ALGORITMOS_HASH[algoritmo]
+    hasher = HasherFNV(bits, variante_a)
+    if normalizar_saltos:
+        bloques = iter(bloques)
+        iniciales = []
+        leidos = 0
+        while leidos < MUESTRA_TEXTO:
+            bloque = next(bloques, None)
+            if bloque is None:
+                break
+            iniciales.append(bloque)
+            leidos += len(bloque)
+        muestra = b"".join(iniciales)[:MUESTRA_TEXTO]
+        bloques = itertools.chain(iniciales, bloques)
+        if _es_texto(muestra):
+            bloques = _normalizar_saltos(bloques)
+    for bloque in bloques:
+        hasher.update(bloque)
+    return hasher.digest_str()
+
+
+def hash_archivo_fnv(ruta, algoritmo="fnv1-32", tamaño_bloque=1 << 20, normalizar_saltos=True):
+    """Calcular el hash FNV de un archivo leyendolo por bloques binarios
+
+    Con ``normalizar_saltos`` los finales de linea ``\\r\\n`` y ``\\r`` de
+    un cuerpo de texto se tratan como ``\\n``, igual que la lectura en modo
+    texto usada historicamente, para que los hash_id existentes sigan
+    siendo validos. Los cuerpos binarios se hashean tal cual.
+    """
+    with open(ruta, 'rb') as file:
+        return _hashear_bloques(iter(functools.partial(file.read, tamaño_bloque), b''),
+                                algoritmo, normalizar_saltos)
+
+
+_NOMBRE_EN_ALMACEN = re.compile(r"^\d+(\.txt)?$")  # <hash_id> o el antiguo <hash_id>.txt
+
+
+def ruta_en_almacen(hash_id, algoritmo="fnv1-32"):
+    """Ruta relativa de un articulo en el almacen: ``ab/cd/<hash_id>``
+
+    Los dos niveles salen de los bits altos del hash en hexadecimal, asi
+    ningun directorio acumula millones de entradas.
+    """
+    bits = ALGORITMOS_HASH[algoritmo][0]
+    hexa = format(int(hash_id), f"0{bits // 4}x")
+    return f"{hexa[:2]}/{hexa[2:4]}/{hash_id}"
+
+
+_FICLONE = 0x40049409  # ioctl de Linux para clonar un archivo (reflink)
+
+
+def _clonar(origen, destino):
+    """Intentar un reflink entre descriptores: copia sin mover datos"""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(destino, _FICLONE, origen)
+    except OSError:
+        return False
+    return True
+
+
+def _copiando(origen, destino, tamaño_bloque):
+    """Recorrer los bloques de ``origen`` escribiendolos a la vez en ``destino``"""
+    for bloque in iter(functools.partial(origen.read, tamaño_bloque), b''):
+        destino.write(bloque)
+        yield bloque
+
+
+def copiar_articulo(ruta_origen, ruta_destino):
+    """Copiar los bytes de un articulo al almacen mediante renombrado atomico
+
+    Se intenta un reflink; si no es posible, ``shutil.copyfile`` usa
+    ``sendfile`` donde existe y los datos no pasan por Python.
+    """
+    os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+    temporal = f"{ruta_destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(ruta_origen, 'rb') as origen, open(temporal, 'wb') as destino:
+            clonado = _clonar(origen.fileno(), destino.fileno())
+        if not clonado:
+            shutil.copyfile(ruta_origen, temporal)
+        os.replace(temporal, ruta_destino)
+    except Exception:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def ingresar_archivo(ruta, articulos_dir, algoritmo="fnv1-32", enlazar=False,
+                     tamaño_bloque=1 << 20):
+    """Guardar un archivo en el almacen direccionado por contenido
+
+    Se copian bytes (sirve para PDFs y otros binarios) y el hash se calcula
+    en la misma pasada, asi cada archivo se lee una sola vez. Si el sistema
+    de archivos admite reflinks el archivo se clona sin copiar datos y solo
+    se lee para hashearlo. Con ``enlazar`` se usa un enlace duro cuando el
+    origen esta en el mismo sistema de archivos: no se escribe nada, pero
+    modificar el origen alteraria el almacen. Si el contenido ya estaba en
+    el almacen no se guarda otra copia.
+
+    Devuelve ``(hash_id, archivo_nombre, tamaño)``.
+    """
+    if enlazar:
+        hash_id = hash_archivo_fnv(ruta, algoritmo, tamaño_bloque)
+        archivo_nombre = ruta_en_almacen(hash_id, algoritmo)
+        ruta_destino = os.path.join(articulos_dir, archivo_nombre)
+        if not os.path.exists(ruta_destino):
+            os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+            try:
+                os.link(ruta, ruta_destino)
+            except OSError:
+                copiar_articulo(ruta, ruta_destino)
+        return hash_id, archivo_nombre, os.path.getsize(ruta)
+
+    descriptor, temporal = tempfile.mkstemp(suffix=".tmp", dir=articulos_dir)
+    try:
+        with open(ruta, 'rb') as origen, os.fdopen(descriptor, 'wb') as destino:
+            if _clonar(origen.fileno(), destino.fileno()):
+                bloques = iter(functools.partial(origen.read, tamaño_bloque), b'')
+            else:
+                bloques = _copiando(origen, destino, tamaño_bloque)
+            hash_id = _hashear_bloques(bloques, algoritmo)
+            tamaño = origen.tell()
+        archivo_nombre = ruta_en_almacen(hash_id, algoritmo)
+        ruta_destino = os.path.join(articulos_dir, archivo_nombre)
+        if os.path.exists(ruta_destino):
+            os.remove(temporal)
+        else:
+            os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+            os.replace(temporal, ruta_destino)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    return hash_id, archivo_nombre, tamaño
+
+
+def _procesar_archivo_lote(tarea):
+    """Trabajo de un proceso del pool: hashear y copiar un archivo del lote
+
+    Con ``parametros_firma`` (permutaciones, k) tambien calcula la firma
+    MinHash, que es trabajo de CPU y conviene hacer en paralelo.
+    """
+    ruta, algoritmo, articulos_dir, enlazar, parametros_firma = tarea
+    try:
+        hash_id, archivo_nombre, tamaño = ingresar_archivo(ruta, articulos_dir, algoritmo, enlazar)
+        firma = None
+        if parametros_firma is not None:
+            firma = firma_de_archivo(os.path.join(articulos_dir, archivo_nombre), *parametros_firma)
+        return True, hash_id, archivo_nombre, tamaño, firma
+    except Exception as e:
+        return False, str(e), None, 0, None
+
+
+def _campo(fila, *nombres):
+    """Primer campo presente del manifiesto entre varios nombres aceptados"""
+    for nombre in nombres:
+        valor = fila.get(nombre)
+        if valor not in (None, ""):
+            return valor
+    return None
+
+
+def leer_manifiesto(ruta):
+    """Leer un manifiesto CSV o JSONL con titulo, autores, año y ruta
+
+    Devuelve filas ``(titulo, autores, año, ruta_archivo)``; las rutas relativas
+    se resuelven contra el directorio del manifiesto.
+    """
+    base = os.path.dirname(os.path.abspath(ruta))
+    with open(ruta, 'r', encoding='utf-8', newline='') as file:
+        if ruta.lower().endswith(('.jsonl', '.json')):
+            filas = (json.loads(linea) for linea in file if linea.strip())
+        else:
+            filas = csv.DictReader(file)
+        for fila in filas:
+            ruta_archivo = _campo(fila, "path", "ruta", "archivo")
+            if ruta_archivo is not None:
+                ruta_archivo = os.path.join(base, ruta_archivo)
+            yield (_campo(fila, "title", "titulo"),
+                   _campo(fila, "authors", "autores"),
+                   _campo(fila, "year", "año", "anio"),
+                   ruta_archivo)
+
+
+def filas_de_origen(origen, autores_defecto="Desconocido", año_defecto=None):
+    """Filas ``(titulo, autores, año, ruta)`` de un directorio o de un manifiesto
+
+    De un directorio se toma cada archivo, con el nombre como titulo y los
+    autores y el año por defecto (el año actual si no se indica).
+    """
+    if not os.path.isdir(origen):
+        return list(leer_manifiesto(origen))
+    if año_defecto is None:
+        año_defecto = datetime.now().year
+    return [(os.path.splitext(nombre)[0], autores_defecto, año_defecto,
+             os.path.join(origen, nombre))
+            for nombre in sorted(os.listdir(origen))
+            if os.path.isfile(os.path.join(origen, nombre))]
+
+
+# Separadores aceptados entre coautores: "A, B", "A; B", "A y B", "A and B", "A & B"
+_SEPARADORES_AUTORES = re.compile(r"\s*(?:,|;|&|\s+y\s+|\s+and\s+)\s*", re.IGNORECASE)
+# Igual, pero conservando los separadores al dividir (para reescribir autores)
+_SEPARADORES_AUTORES_PARTES = re.compile(f"({_SEPARADORES_AUTORES.pattern})", re.IGNORECASE)
+
+# Caracter mayor que cualquier otro: cierra un rango de prefijo en un indice ordenado
+_FIN_PREFIJO = "\U0010ffff"
+
+
+def separar_autores(autores):
+    """Dividir el campo de autores en nombres individuales normalizados"""
+    nombres = []
+    for nombre in _SEPARADORES_AUTORES.split(autores.lower()):
+        nombre = " ".join(nombre.split())
+        if nombre and nombre not in nombres:
+            nombres.append(nombre)
+    return nombres
+
+
+def nombres_autores(autores):
+    """[(nombre normalizado, grafia original)] de cada autor individual
+
+    Los nombres normalizados coinciden con ``separar_autores``; de un autor
+    repetido se conserva la primera grafia.
+    """
+    nombres = {}
+    for nombre in _SEPARADORES_AUTORES.split(autores):
+        nombre = " ".join(nombre.split())
+        if nombre:
+            nombres.setdefault(nombre.lower(), nombre)
+    return list(nombres.items())
+
+
+# Corridas de mas de 100 caracteres no son palabras (p. ej. datos codificados)
+# y no entrarian en el campo de longitud del termino del archivo de indice
+_TOKEN = re.compile(r"\b\w{1,100}\b")
+
+
+def tokenizar(texto):
+    """Dividir un texto en terminos en minusculas"""
+    return _TOKEN.findall(texto.lower())
+
+
+def _escribir_varint(salida, valor):
+    while valor >= 0x80:
+        salida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    salida.append(valor)
+
+
+def _leer_varints(datos):
+    """Decodificar una secuencia completa de varints"""
+    valores = []
+    valor = desplazamiento = 0
+    for byte in datos:
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte & 0x80:
+            desplazamiento += 7
+        else:
+            valores.append(valor)
+            valor = desplazamiento = 0
+    return valores
+
+
+def _reportar_en_stderr(operacion, error):
+    """Informar un error recuperado por stderr, sin mezclarlo con la salida de los comandos"""
+    print(f"Error al {operacion.replace('_', ' ')}: {error}", file=sys.stderr)
+
+
+class IndiceTextoCompleto:
+    """Indice invertido de texto completo con posiciones y ranking BM25
+
+    El indice base vive en un archivo binario que se mapea en memoria al
+    arrancar: solo se decodifican las listas de los terminos consultados.
+    Las altas recientes se acumulan en un delta en memoria y las bajas se
+    marcan como borradas; ``guardar`` fusiona todo en un archivo nuevo.
+
+    Formato (little endian)::
+
+        cabecera  FTI1, version, n_docs, n_terminos, total_tokens, offsets
+        docs      por documento: len(hash_id) u16, hash_id, longitud u32
+        terminos  entradas fijas ordenadas por termino:
+                  offset u64, len u16, offset_postings u64, len u32, df u32
+        blob      bytes de terminos y postings; cada posting es
+                  varint(delta doc), varint(tf), tf varints(delta posicion)
+    """
+
+    MAGICO = b"FTI1"
+    VERSION = 1
+    _CABECERA = struct.Struct("<4sIIIQQQQ")
+    _ENTRADA = struct.Struct("<QHQII")
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, ruta, reportar_error=_reportar_en_stderr):
+        self.ruta = ruta
+        self.reportar_error = reportar_error  # reportar_error(operacion, error)
+        self._archivo = None
+        self._mapa = None
+        self._docs_base = []  # hash_id por indice de documento del archivo
+        self._longitudes_base = {}  # hash_id -> cantidad de tokens
+        self._n_terminos = 0
+        self._dir_off = 0
+        self._total_base = 0
+
+        self._delta = defaultdict(dict)  # termino -> {hash_id: [posiciones]}
+        self._longitudes_delta = {}
+        self._terminos_delta = {}  # hash_id -> terminos (para poder borrarlo)
+        self._borrados = set()  # hash_id del archivo base dados de baja
+        self.modificado = False
+
+        self.cargar()
+
+    # --- Persistencia ---------------------------------------------------
+
+    def cargar(self):
+        """Mapear en memoria el indice base, si existe y es valido"""
+        self.cerrar()
+        if not os.path.exists(self.ruta) or os.path.getsize(self.ruta) < self._CABECERA.size:
+            return
+        try:
+            self._archivo = open(self.ruta, 'rb')
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            (magico, version, n_docs, self._n_terminos, self._total_base,
+             docs_off, self._dir_off, _) = self._CABECERA.unpack_from(self._mapa, 0)
+            if magico != self.MAGICO or version != self.VERSION:
+                raise ValueError("Formato de indice desconocido")
+
+            pos = docs_off
+            for _ in range(n_docs):
+                (largo,) = struct.unpack_from("<H", self._mapa, pos)
+                hash_id = self._mapa[pos + 2:pos + 2 + largo].decode('utf-8')
+                (longitud,) = struct.unpack_from("<I", self._mapa, pos + 2 + largo)
+                pos += 6 + largo
+                self._docs_base.append(hash_id)
+                self._longitudes_base[hash_id] = longitud
+        except Exception as e:
+            self.reportar_error("cargar_indice_de_texto_completo", e)
+            self.cerrar()
+
+    def cerrar(self):
+        if self._mapa is not None:
+            self._mapa.close()
+        if self._archivo is not None:
+            self._archivo.close()
+        self._archivo = self._mapa = None
+        self._docs_base = []
+        self._longitudes_base = {}
+        self._n_terminos = self._total_base = 0
+
+    def _termino_base(self, i):
+        termino_off, termino_len, post_off, post_len, df = self._ENTRADA.unpack_from(
+            self._mapa, self._dir_off + i * self._ENTRADA.size)
+        return self._mapa[termino_off:termino_off + termino_len], post_off, post_len
+
+    def _postings_base(self, termino):
+        """Postings del archivo base para un termino: {hash_id: [posiciones]}"""
+        if self._mapa is None:
+            return {}
+        buscado = termino.encode('utf-8')
+        bajo, alto = 0, self._n_terminos
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._termino_base(medio)[0] < buscado:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo == self._n_terminos:
+            return {}
+        actual, post_off, post_len = self._termino_base(bajo)
+        if actual != buscado:
+            return {}
+        return self._decodificar(self._mapa[post_off:post_off + post_len])
+
+    def _decodificar(self, datos):
+        postings = {}
+        valores = _leer_varints(datos)
+        i = doc = 0
+        while i < len(valores):
+            doc += valores[i]
+            tf = valores[i + 1]
+            posiciones = []
+            posicion = 0
+            for delta in valores[i + 2:i + 2 + tf]:
+                posicion += delta
+                posiciones.append(posicion)
+            i += 2 + tf
+            hash_id = self._docs_base[doc]
+            if hash_id not in self._borrados:
+                postings[hash_id] = posiciones
+        return postings
+
+    def _iterar_terminos_base(self):
+        for i in range(self._n_terminos):
+            termino, post_off, post_len = self._termino_base(i)
+            yield termino.decode('utf-8'), post_off, post_len
+
+    def guardar(self):
+        """Fusionar base y delta en un archivo nuevo con renombrado atomico"""
+        if not self.modificado:
+            return
+        docs = [h for h in self._docs_base if h not in self._borrados]
+        docs.extend(self._longitudes_delta)
+        posicion_doc = {hash_id: i for i, hash_id in enumerate(docs)}
+        longitudes = {h: self._longitudes_base[h] for h in docs if h in self._longitudes_base}
+        longitudes.update(self._longitudes_delta)
+
+        base = {termino: (off, largo) for termino, off, largo in self._iterar_terminos_base()}
+        terminos = sorted(set(base) | set(self._delta))
+
+        directorio = bytearray()
+        blob = bytearray()
+        n_terminos = 0
+        for termino in terminos:
+            postings = {}
+            if termino in base:
+                off, largo = base[termino]
+                postings = self._decodificar(self._mapa[off:off + largo])
+            postings.update(self._delta.get(termino, {}))
+            if not postings:
+                continue
+
+            termino_bytes = termino.encode('utf-8')
+            termino_off = len(blob)
+            blob += termino_bytes
+            post_off = len(blob)
+            anterior = 0
+            for doc in sorted(posicion_doc[h] for h in postings):
+                posiciones = postings[docs[doc]]
+                _escribir_varint(blob, doc - anterior)
+                _escribir_varint(blob, len(posiciones))
+                previa = 0
+                for posicion in posiciones:
+                    _escribir_varint(blob, posicion - previa)
+                    previa = posicion
+                anterior = doc
+            directorio += self._ENTRADA.pack(termino_off, len(termino_bytes), post_off,
+                                             len(blob) - post_off, len(postings))
+            n_terminos += 1
+
+        seccion_docs = bytearray()
+        for hash_id in docs:
+            codificado = hash_id.encode('utf-8')
+            seccion_docs += struct.pack("<H", len(codificado)) + codificado
+            seccion_docs += struct.pack("<I", longitudes[hash_id])
+
+        docs_off = self._CABECERA.size
+        dir_off = docs_off + len(seccion_docs)
+        blob_off = dir_off + len(directorio)
+        # Los offsets del directorio son relativos al blob: se ajustan al final
+        directorio_abs = bytearray()
+        for i in range(n_terminos):
+            t_off, t_len, p_off, p_len, df = self._ENTRADA.unpack_from(directorio, i * self._ENTRADA.size)
+            directorio_abs += self._ENTRADA.pack(t_off + blob_off, t_len, p_off + blob_off, p_len, df)
+
+        temporal = self.ruta + ".tmp"
+        with open(temporal, 'wb') as file:
+            file.write(self._CABECERA.pack(self.MAGICO, self.VERSION, len(docs), n_terminos,
+                                           sum(longitudes.values()), docs_off, dir_off, blob_off))
+            file.write(seccion_docs)
+            file.write(directorio_abs)
+            file.write(blob)
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.cerrar()
+        os.replace(temporal, self.ruta)
+        self._delta = defaultdict(dict)
+        self._longitudes_delta = {}
+        self._terminos_delta = {}
+        self._borrados = set()
+        self.modificado = False
+        self.cargar()
+
+    # --- Mantenimiento incremental ----------------------------------------
+
+    def __contains__(self, hash_id):
+        return hash_id in self._longitudes_delta or (
+            hash_id in self._longitudes_base and hash_id not in self._borrados)
+
+    def documentos(self):
+        """Hash ID de todos los documentos indexados"""
+        vivos = {h for h in self._docs_base if h not in self._borrados}
+        return vivos | set(self._longitudes_delta)
+
+    def agregar(self, hash_id, texto):
+        """Indexar el cuerpo de un documento"""
+        if hash_id in self:
+            self.eliminar(hash_id)
+        posiciones = defaultdict(list)
+        tokens = tokenizar(texto)
+        for i, termino in enumerate(tokens):
+            posiciones[termino].append(i)
+        for termino, lista in posiciones.items():
+            self._delta[termino][hash_id] = lista
+        self._longitudes_delta[hash_id] = len(tokens)
+        self._terminos_delta[hash_id] = list(posiciones)
+        if hash_id in self._longitudes_base:
+            self._borrados.add(hash_id)
+        self.modificado = True
+
+    def eliminar(self, hash_id):
+        """Dar de baja un documento del indice"""
+        if hash_id in self._longitudes_delta:
+            for termino in self._terminos_delta.pop(hash_id):
+                postings = self._delta[termino]
+                postings.pop(hash_id, None)
+                if not postings:
+                    del self._delta[termino]
+            del self._longitudes_delta[hash_id]
+            self.modificado = True
+        if hash_id in self._longitudes_base and hash_id not in self._borrados:
+            self._borrados.add(hash_id)
+            self.modificado = True
+
+    # --- Consultas --------------------------------------------------------
+
+    def postings(self, termino):
+        postings = self._postings_base(termino)
+        postings.update(self._delta.get(termino, {}))
+        return postings
+
+    def buscar(self, consulta, limit=20):
+        """Buscar por palabras clave y frases entre comillas, rankeando con BM25
+
+        Las frases son obligatorias; las palabras sueltas suman al puntaje.
+        Devuelve pares (hash_id, puntaje) ordenados de mayor a menor.
+        """
+        frases = [tokenizar(frase) for frase in re.findall(r'"([^"]*)"', consulta)]
+        frases = [frase for frase in frases if frase]
+        sueltas = tokenizar(re.sub(r'"[^"]*"', " ", consulta))
+        terminos = list(dict.fromkeys(sueltas + [t for frase in frases for t in frase]))
+        if not terminos:
+            return []
+
+        listas = {termino: self.postings(termino) for termino in terminos}
+
+        candidatos = set()
+        for lista in listas.values():
+            candidatos.update(lista)
+        for frase in frases:
+            candidatos = {doc for doc in candidatos if self._contiene_frase(listas, frase, doc)}
+        if not candidatos:
+            return []
+
+        n_docs = len(self._longitudes_delta) + len(self._longitudes_base) - len(self._borrados)
+        total = self._total_base + sum(self._longitudes_delta.values()) - sum(
+            self._longitudes_base[h] for h in self._borrados)
+        promedio = total / n_docs if n_docs else 1
+
+        puntajes = {}
+        for termino, lista in listas.items():
+            idf = math.log((n_docs - len(lista) + 0.5) / (len(lista) + 0.5) + 1)
+            for doc, posiciones in lista.items():
+                if doc not in candidatos:
+                    continue
+                longitud = self._longitudes_delta.get(doc, self._longitudes_base.get(doc, 0))
+                tf = len(posiciones)
+                puntaje = idf * tf * (self.K1 + 1) / (
+                    tf + self.K1 * (1 - self.B + self.B * longitud / promedio))
+                puntajes[doc] = puntajes.get(doc, 0.0) + puntaje
+
+        return heapq.nlargest(limit, puntajes.items(), key=lambda par: par[1])
+
+    @staticmethod
+    def _contiene_frase(listas, frase, doc):
+        """Verificar que los terminos de la frase aparezcan consecutivos"""
+        posiciones = [listas[termino].get(doc) for termino in frase]
+        if not all(posiciones):
+            return False
+        siguientes = [set(lista) for lista in posiciones[1:]]
+        return any(all(inicio + i + 1 in siguiente for i, siguiente in enumerate(siguientes))
+                   for inicio in posiciones[0])
+
+
+_PRIMO_MINHASH = (1 << 61) - 1
+
+
+@functools.lru_cache(maxsize=None)
+def _coeficientes_minhash(permutaciones):
+    """Coeficientes (a, b) de las permutaciones; con semilla fija son iguales
+    en todos los procesos y entre ejecuciones, asi las firmas se pueden guardar"""
+    aleatorio = random.Random(permutaciones)
+    return tuple((aleatorio.randrange(1, _PRIMO_MINHASH), aleatorio.randrange(_PRIMO_MINHASH))
+                 for _ in range(permutaciones))
+
+
+def shingles(texto, k=5):
+    """Conjunto de k-shingles de palabras como hashes CRC32
+
+    Se usan los terminos de ``tokenizar``, asi las diferencias de espacios,
+    mayusculas o puntuacion no cambian los shingles.
+    """
+    terminos = tokenizar(texto)
+    if len(terminos) < k:
+        return {zlib.crc32(" ".join(terminos).encode('utf-8'))} if terminos else set()
+    return {zlib.crc32(" ".join(terminos[i:i + k]).encode('utf-8'))
+            for i in range(len(terminos) - k + 1)}
+
+
+def firma_minhash(texto, permutaciones=128, k=5):
+    """Firma MinHash: el minimo de cada permutacion sobre los shingles, o None"""
+    conjunto = shingles(texto, k)
+    if not conjunto:
+        return None
+    p = _PRIMO_MINHASH
+    return array('Q', (min((a * x + b) % p for x in conjunto)
+                       for a, b in _coeficientes_minhash(permutaciones)))
+
+
+def firma_de_archivo(ruta, permutaciones=128, k=5):
+    """Firma MinHash del texto de un archivo; None si es binario o no se puede leer"""
+    try:
+        with open(ruta, 'r', encoding='utf-8') as file:
+            return firma_minhash(file.read(), permutaciones, k)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def parametros_lsh(umbral, permutaciones):
+    """Elegir (bandas, filas) con bandas * filas = permutaciones
+
+    Dos firmas con similitud s comparten alguna banda con probabilidad
+    1 - (1 - s^filas)^bandas, que sube bruscamente cerca de
+    (1 / bandas)^(1 / filas). Se toma el corte mas alto que no supere el
+    umbral, para perder pocos casi duplicados reales.
+    """
+    opciones = []
+    for filas in range(1, permutaciones + 1):
+        if permutaciones % filas == 0:
+            bandas = permutaciones // filas
+            opciones.append(((1 / bandas) ** (1 / filas), bandas, filas))
+    debajo = [opcion for opcion in opciones if opcion[0] <= umbral]
+    _, bandas, filas = max(debajo) if debajo else min(opciones)
+    return bandas, filas
+
+
+class IndiceSimilitud:
+    """Deteccion de casi duplicados con firmas MinHash y LSH por bandas
+
+    La fraccion de posiciones iguales entre dos firmas estima la similitud
+    de Jaccard entre los shingles de los articulos. Cada firma se corta en
+    bandas y cada banda es la clave de una tabla hash: solo se comparan los
+    articulos que comparten alguna banda, sin recorrer el catalogo.
+
+    Formato del archivo (little endian)::
+
+        cabecera  MNH1, version u32, permutaciones u32, k u32, n u32
+        firmas    por articulo: len(hash_id) u16, hash_id, permutaciones u64
+    """
+
+    MAGICO = b"MNH1"
+    VERSION = 1
+    _CABECERA = struct.Struct("<4sIIII")
+
+    def __init__(self, ruta, umbral=0.9, permutaciones=128, k=5,
+                 reportar_error=_reportar_en_stderr):
+        if not 0 < umbral <= 1:
+            raise ValueError("El umbral de similitud debe estar entre 0 y 1")
+        self.ruta = ruta
+        self.reportar_error = reportar_error  # reportar_error(operacion, error)
+        self.umbral = umbral
+        self.permutaciones = permutaciones
+        self.k = k
+        self.bandas, self.filas = parametros_lsh(umbral, permutaciones)
+        self.firmas = {}  # hash_id -> array('Q')
+        self._cubetas = [defaultdict(set) for _ in range(self.bandas)]  # clave -> {hash_id}
+        self.modificado = False
+        self.cargar()
+
+    # --- Persistencia ---------------------------------------------------
+
+    def cargar(self):
+        """Leer las firmas guardadas; un archivo con otros parametros se ignora"""
+        if not os.path.exists(self.ruta):
+            return
+        try:
+            with open(self.ruta, 'rb') as file:
+                datos = file.read()
+            magico, version, permutaciones, k, n = self._CABECERA.unpack_from(datos, 0)
+            if magico != self.MAGICO or version != self.VERSION:
+                raise ValueError("Formato de indice desconocido")
+            if (permutaciones, k) != (self.permutaciones, self.k):
+                return  # Firmas incomparables: se recalculan al sincronizar
+            pos = self._CABECERA.size
+            ancho = 8 * permutaciones
+            for _ in range(n):
+                (largo,) = struct.unpack_from("<H", datos, pos)
+                hash_id = datos[pos + 2:pos + 2 + largo].decode('utf-8')
+                pos += 2 + largo
+                firma = array('Q')
+                firma.frombytes(datos[pos:pos + ancho])
+                pos += ancho
+                self.agregar(hash_id, firma)
+            self.modificado = False
+        except Exception as e:
+            self.reportar_error("cargar_indice_de_similitud", e)
+
+    def guardar(self):
+        """Escribir las firmas con renombrado atomico si hubo cambios"""
+        if not self.modificado:
+            return
+        temporal = self.ruta + ".tmp"
+        with open(temporal, 'wb') as file:
+            file.write(self._CABECERA.pack(self.MAGICO, self.VERSION, self.permutaciones,
+                                           self.k, len(self.firmas)))
+            for hash_id, firma in self.firmas.items():
+                codificado = hash_id.encode('utf-8')
+                file.write(struct.pack("<H", len(codificado)) + codificado)
+                file.write(firma.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporal, self.ruta)
+        self.modificado = False
+
+    # --- Mantenimiento incremental ----------------------------------------
+
+    def __contains__(self, hash_id):
+        return hash_id in self.firmas
+
+    def documentos(self):
+        return set(self.firmas)
+
+    def _claves(self, firma):
+        filas = self.filas
+        return [hash(tuple(firma[i:i + filas])) for i in range(0, self.bandas * filas, filas)]
+
+    def agregar(self, hash_id, firma):
+        if hash_id in self.firmas:
+            self.eliminar(hash_id)
+        self.firmas[hash_id] = firma
+        for cubeta, clave in zip(self._cubetas, self._claves(firma)):
+            cubeta[clave].add(hash_id)
+        self.modificado = True
+
+    def eliminar(self, hash_id):
+        firma = self.firmas.pop(hash_id, None)
+        if firma is None:
+            return
+        for cubeta, clave in zip(self._cubetas, self._claves(firma)):
+            ids = cubeta.get(clave)
+            if ids is not None:
+                ids.discard(hash_id)
+                if not ids:
+                    del cubeta[clave]
+        self.modificado = True
+
+    # --- Consultas ---------------------------------------------------------
+
+    @staticmethod
+    def similitud(firma_a, firma_b):
+        """Estimacion de Jaccard: fraccion de minimos coincidentes"""
+        return sum(map(operator.eq, firma_a, firma_b)) / len(firma_a)
+
+    def _candidatos(self, firma):
+        candidatos = set()
+        for cubeta, clave in zip(self._cubetas, self._claves(firma)):
+            candidatos.update(cubeta.get(clave, ()))
+        return candidatos
+
+    def similares(self, firma, umbral=None, excluir=None):
+        """Articulos con similitud >= umbral, de mayor a menor: [(hash_id, similitud)]"""
+        umbral = self.umbral if umbral is None else umbral
+        resultados = []
+        for hash_id in self._candidatos(firma):
+            if hash_id == excluir:
+                continue
+            valor = self.similitud(firma, self.firmas[hash_id])
+            if valor >= umbral:
+                resultados.append((hash_id, valor))
+        resultados.sort(key=lambda par: -par[1])
+        return resultados
+
+    def grupos(self, umbral=None):
+        """Agrupar los casi duplicados de todo el indice (union-find sobre pares)
+
+        Solo se verifican los pares que comparten una cubeta; los grupos se
+        devuelven de mayor a menor tamaño.
+        """
+        umbral = self.umbral if umbral is None else umbral
+        padre = {}
+
+        def raiz(x):
+            while padre.get(x, x) != x:
+                padre[x] = padre.get(padre[x], padre[x])
+                x = padre[x]
+            return x
+
+        verificados = set()
+        for cubeta in self._cubetas:
+            for ids in cubeta.values():
+                if len(ids) < 2:
+                    continue
+                ordenados = sorted(ids)
+                for i, a in enumerate(ordenados):
+                    for b in ordenados[i + 1:]:
+                        if (a, b) in verificados:
+                            continue
+                        verificados.add((a, b))
+                        raiz_a, raiz_b = raiz(a), raiz(b)
+                        if (raiz_a != raiz_b
+                                and self.similitud(self.firmas[a], self.firmas[b]) >= umbral):
+                            padre[raiz_a] = raiz_b
+                            padre.setdefault(raiz_b, raiz_b)
+
+        grupos = defaultdict(list)
+        for hash_id in padre:
+            grupos[raiz(hash_id)].append(hash_id)
+        return sorted((sorted(grupo) for grupo in grupos.values() if len(grupo) > 1),
+                      key=lambda grupo: (-len(grupo), grupo))
+
+
+def plegar_acentos(texto):
+    """Minusculas sin acentos ni diacriticos y con espacios colapsados ("Platón" -> "platon")"""
+    if not texto.isascii():
+        texto = "".join(caracter for caracter in unicodedata.normalize("NFKD", texto)
+                        if not unicodedata.combining(caracter))
+    return " ".join(texto.casefold().split())
+
+
+_PALABRA = re.compile(r"\w+")
+
+
+def trigramas(texto, prefijo=False):
+    """Trigramas de las palabras de ``texto`` plegado, con relleno como pg_trgm
+
+    Cada palabra se rellena con dos espacios al inicio y uno al final. Con
+    ``prefijo`` la ultima palabra se considera incompleta (se esta
+    escribiendo) y no lleva el relleno final.
+    """
+    palabras = _PALABRA.findall(plegar_acentos(texto))
+    abierta = len(palabras) - 1 if prefijo and not texto[-1:].isspace() else -1
+    resultado = set()
+    for i, palabra in enumerate(palabras):
+        relleno = "  " + palabra if i == abierta else f"  {palabra} "
+        resultado.update(relleno[j:j + 3] for j in range(len(relleno) - 2))
+    return resultado
+
+
+class IndiceTrigramas:
+    """Indice de trigramas para busqueda aproximada de nombres y titulos
+
+    Cada termino distinto (un autor individual o un titulo) recibe un id y
+    cada trigrama apunta al conjunto de ids que lo contienen; el termino
+    guarda los hash_id de sus articulos. La similitud es la fraccion de
+    trigramas de la consulta presentes en el termino (como
+    ``word_similarity`` de pg_trgm): "nietszche" encuentra a "friedrich
+    nietzsche" aunque el nombre completo tenga muchos mas trigramas. A
+    igual similitud va primero el termino con menos trigramas, que es el
+    de mayor similitud de Jaccard. Con ``prefijo``, ademas, la ultima
+    palabra de la consulta puede estar incompleta ("plat" puntua 1.0
+    contra "platon").
+
+    Para no recorrer todos los terminos se usa el filtro de prefijo: con
+    similitud minima ``umbral`` un termino comparte al menos
+    ``ceil(umbral * |Q|)`` trigramas con la consulta, por lo que alcanza con
+    juntar candidatos de las ``|Q| - ceil(umbral * |Q|) + 1`` listas mas
+    cortas y verificar solo esos.
+
+    Cada termino guarda ademas una forma para mostrar (la primera grafia
+    original con que se agrego, p. ej. "Platón" para el termino "platón"),
+    que es la que devuelven ``buscar`` y ``sugerir``.
+
+    Las sugerencias (consultas con ``prefijo``) se guardan en una cache LRU
+    por texto consultado que se vacia cuando aparece o desaparece un termino.
+    """
+
+    CACHE_SUGERENCIAS = 512
+
+    def __init__(self):
+        self._ids = {}  # termino -> id
+        self._terminos = []  # id -> termino (None si el id esta libre)
+        self._formas = []  # id -> forma para mostrar del termino
+        self._tamaños = []  # id -> cantidad de trigramas del termino
+        self._documentos = []  # id -> set de hash_id
+        self._libres = []
+        self._listas = defaultdict(set)  # trigrama -> ids de terminos
+        self._sugerencias = OrderedDict()
+        self._lock = threading.Lock()  # La cache se consulta con el bloqueo de lectura
+
+    def __len__(self):
+        return len(self._ids)
+
+    def agregar(self, termino, hash_id, forma=None):
+        """Asociar ``hash_id`` a ``termino``, que se muestra como ``forma`` (o tal cual)"""
+        id_termino = self._ids.get(termino)
+        if id_termino is None:
+            grupos = trigramas(termino)
+            if not grupos:
+                return  # Sin letras ni digitos no hay nada que comparar
+            if self._libres:
+                id_termino = self._libres.pop()
+                self._terminos[id_termino] = termino
+                self._formas[id_termino] = forma or termino
+                self._tamaños[id_termino] = len(grupos)
+                self._documentos[id_termino] = set()
+            else:
+                id_termino = len(self._terminos)
+                self._terminos.append(termino)
+                self._formas.append(forma or termino)
+                self._tamaños.append(len(grupos))
+                self._documentos.append(set())
+            self._ids[termino] = id_termino
+            for grupo in grupos:
+                self._listas[grupo].add(id_termino)
+            self._sugerencias.clear()
+        self._documentos[id_termino].add(hash_id)
+
+    def quitar(self, termino, hash_id):
+        id_termino = self._ids.get(termino)
+        if id_termino is None:
+            return
+        documentos = self._documentos[id_termino]
+        documentos.discard(hash_id)
+        if documentos:
+            return
+        del self._ids[termino]
+        for grupo in trigramas(termino):
+            lista = self._listas[grupo]
+            lista.discard(id_termino)
+            if not lista:
+                del self._listas[grupo]
+        self._terminos[id_termino] = self._formas[id_termino] = None
+        self._documentos[id_termino] = None
+        self._libres.append(id_termino)
+        self._sugerencias.clear()
+
+    def buscar(self, consulta, limite=10, umbral=0.5, prefijo=False, empates=False):
+        """Los ``limite`` terminos mas parecidos: [(forma, similitud, hash_ids)]
+
+        ``forma`` es la grafia para mostrar del termino. Ordenados por
+        similitud descendente y, a igual similitud, por cantidad de
+        trigramas y alfabeticamente. Con ``empates`` tambien se devuelven
+        los terminos con la misma similitud que el ultimo.
+        """
+        if not 0 < umbral <= 1:
+            raise ValueError("El umbral debe estar entre 0 y 1")
+        consulta = trigramas(consulta, prefijo)
+        if not consulta or limite <= 0:
+            return []
+        necesarios = math.ceil(umbral * len(consulta))
+        listas = sorted((self._listas.get(grupo, ()) for grupo in consulta), key=len)
+        filtro = len(consulta) - necesarios + 1
+        comunes = Counter()
+        for lista in listas[:filtro]:
+            comunes.update(lista)
+        # En las listas restantes solo se cuentan los candidatos que todavia
+        # pueden llegar a ``necesarios``; las mas cortas van primero
+        for restantes, lista in zip(range(len(listas) - filtro - 1, -1, -1), listas[filtro:]):
+            for id_termino, cantidad in list(comunes.items()):
+                if id_termino in lista:
+                    comunes[id_termino] = cantidad + 1
+                elif cantidad + restantes < necesarios:
+                    del comunes[id_termino]
+
+        puntuados = [(-cantidad / len(consulta), self._tamaños[id_termino],
+                      self._terminos[id_termino], id_termino)
+                     for id_termino, cantidad in comunes.items() if cantidad >= necesarios]
+        mejores = heapq.nsmallest(limite, puntuados)
+        if empates and len(mejores) == limite:
+            corte = mejores[-1]
+            mejores += sorted(entrada for entrada in puntuados
+                              if entrada[0] == corte[0] and entrada > corte)
+        return [(self._formas[id_termino], -similitud, set(self._documentos[id_termino]))
+                for similitud, _, _, id_termino in mejores]
+
+    def sugerir(self, prefijo, limite=10, umbral=0.5):
+        """Terminos que completan ``prefijo`` (tolerando errores): [(forma, similitud)]"""
+        clave = (plegar_acentos(prefijo) + (" " if prefijo[-1:].isspace() else ""),
+                 limite, umbral)
+        with self._lock:
+            sugerencias = self._sugerencias.get(clave)
+            if sugerencias is not None:
+                self._sugerencias.move_to_end(clave)
+                return list(sugerencias)
+        sugerencias = [(termino, similitud) for termino, similitud, _ in
+                       self.buscar(prefijo, limite, umbral, prefijo=True)]
+        with self._lock:
+            self._sugerencias[clave] = sugerencias
+            if len(self._sugerencias) > self.CACHE_SUGERENCIAS:
+                self._sugerencias.popitem(last=False)
+        return list(sugerencias)
+
+
+def _cargar_numpy():
+    """Importar NumPy la primera vez que se necesita; devuelve el modulo o None"""
+    global np, _numpy_buscado
+    if not _numpy_buscado:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        _numpy_buscado = True
+    return np
+
+
+class _Columna:
+    """Columna numerica que crece al agregar: arreglo de NumPy o, sin NumPy, ``array``
+
+    Puede crearse ya llena desde una lista. Con NumPy se dimensiona por
+    duplicacion y ``valores()`` devuelve una vista de la parte usada. Un
+    valor que no entra en el tipo ensancha la columna a 64 bits en lugar de
+    truncarse.
+    """
+
+    __slots__ = ("datos", "n", "limite")
+
+    def __init__(self, tipo, valores=()):
+        self.n = len(valores)
+        self.limite = 1 << (8 * array(tipo).itemsize - 1)
+        if valores and not -self.limite <= min(valores) <= max(valores) < self.limite:
+            tipo, self.limite = 'q', 1 << 63
+        if np is None:
+            self.datos = array(tipo, valores)
+        else:
+            self.datos = np.zeros(max(16, self.n), dtype=tipo)
+            self.datos[:self.n] = valores
+
+    def agregar(self, valor):
+        if not -self.limite <= valor < self.limite:
+            self.limite = 1 << 63
+            self.datos = self.datos.astype('q') if np is not None else array('q', self.datos)
+        if np is None:
+            self.datos.append(valor)
+        else:
+            if self.n == len(self.datos):
+                datos = np.zeros(2 * self.n, dtype=self.datos.dtype)
+                datos[:self.n] = self.datos
+                self.datos = datos
+            self.datos[self.n] = valor
+        self.n += 1
+
+    def __getitem__(self, i):
+        return self.datos[i]
+
+    def __setitem__(self, i, valor):
+        self.datos[i] = valor
+
+    def valores(self):
+        return self.datos[:self.n] if np is not None else self.datos
+
+    def lista(self):
+        return self.valores().tolist()
+
+
+def _histograma(valores, ancho):
+    """[(inicio del intervalo, cantidad)] contiguos de ``ancho`` desde el minimo"""
+    if not len(valores):
+        return []
+    if np is not None:
+        valores = np.asarray(valores, dtype=np.int64)
+        inicio = int(valores.min()) // ancho * ancho
+        cuentas = np.bincount((valores - inicio) // ancho).tolist()
+    else:
+        inicio = min(valores) // ancho * ancho
+        conteo = Counter((valor - inicio) // ancho for valor in valores)
+        cuentas = [conteo.get(i, 0) for i in range(max(conteo) + 1)]
+    return [(inicio + i * ancho, cantidad) for i, cantidad in enumerate(cuentas)]
+
+
+class AnaliticaCatalogo:
+    """Columnas del catalogo para conteos, rankings e histogramas
+
+    Cada articulo ocupa una posicion en columnas paralelas: año (int16),
+    largo del titulo, cantidad de autores y una marca de vigencia. Los
+    autores individuales se codifican con un diccionario (nombre -> id
+    int32) en una tabla aparte de pares (posicion, autor). Una baja solo
+    apaga la marca; cuando la mitad de las posiciones esta dada de baja las
+    columnas se compactan.
+
+    Con NumPy las consultas son operaciones vectoriales (mascaras,
+    bincount, unique, partition); sin NumPy se recorren los mismos arreglos
+    en Python y el resultado es identico.
+    """
+
+    COMPACTAR_DESDE = 1024  # Posiciones minimas antes de considerar compactar
+
+    def __init__(self, articulos=()):
+        _cargar_numpy()
+        self.nombres = []  # id -> nombre normalizado
+        self._ids = {}  # nombre -> id
+        self._cargar((articulo.hash_id, articulo.año, len(articulo.titulo),
+                      [self._id(nombre) for nombre in separar_autores(articulo.autores)])
+                     for articulo in articulos)
+
+    def _cargar(self, filas):
+        """Armar las columnas de una vez desde filas (hash_id, año, largo, ids de autores)"""
+        self._posiciones = {}  # hash_id -> posicion en las columnas
+        años, largos, cantidades, vigente, par_posicion, par_autor = [], [], [], [], [], []
+        for hash_id, año, largo, ids in filas:
+            anterior = self._posiciones.get(hash_id)
+            if anterior is not None:
+                vigente[anterior] = 0
+            self._posiciones[hash_id] = posicion = len(años)
+            años.append(año)
+            largos.append(largo)
+            cantidades.append(len(ids))
+            vigente.append(1)
+            par_posicion.extend([posicion] * len(ids))
+            par_autor.extend(ids)
+        self._años = _Columna('h', años)
+        self._largos = _Columna('i', largos)
+        self._cantidad_autores = _Columna('h', cantidades)
+        self._vigente = _Columna('b', vigente)
+        self._par_posicion = _Columna('i', par_posicion)
+        self._par_autor = _Columna('i', par_autor)
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def _id(self, nombre):
+        id_nombre = self._ids.get(nombre)
+        if id_nombre is None:
+            id_nombre = self._ids[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+        return id_nombre
+
+    def agregar(self, articulo):
+        """Registrar un articulo (o reemplazar sus valores si ya estaba)"""
+        if articulo.hash_id in self._posiciones:
+            self.quitar(articulo.hash_id)
+        posicion = self._posiciones[articulo.hash_id] = self._años.n
+        ids = [self._id(nombre) for nombre in separar_autores(articulo.autores)]
+        self._años.agregar(articulo.año)
+        self._largos.agregar(len(articulo.titulo))
+        self._cantidad_autores.agregar(len(ids))
+        self._vigente.agregar(1)
+        for id_nombre in ids:
+            self._par_posicion.agregar(posicion)
+            self._par_autor.agregar(id_nombre)
+
+    def quitar(self, hash_id):
+        posicion = self._posiciones.pop(hash_id, None)
+        if posicion is None:
+            return
+        self._vigente[posicion] = 0
+        if self._años.n > self.COMPACTAR_DESDE and len(self._posiciones) < self._años.n // 2:
+            self._compactar()
+
+    def _compactar(self):
+        """Reescribir las columnas solo con las posiciones vigentes"""
+        años, largos = self._años.lista(), self._largos.lista()
+        ids = defaultdict(list)
+        vigentes = set(self._posiciones.values())
+        for posicion, id_nombre in zip(self._par_posicion.lista(), self._par_autor.lista()):
+            if posicion in vigentes:
+                ids[posicion].append(id_nombre)
+        filas = sorted(self._posiciones.items(), key=operator.itemgetter(1))
+        self._cargar((hash_id, años[posicion], largos[posicion], ids[posicion])
+                     for hash_id, posicion in filas)
+
+    # --- Consultas --------------------------------------------------------
+
+    def _mascara(self, año_desde=None, año_hasta=None):
+        """Mascara de NumPy de las posiciones vigentes dentro del rango de años"""
+        mascara = self._vigente.valores().astype(bool)
+        años = self._años.valores()
+        if año_desde is not None:
+            mascara &= años >= año_desde
+        if año_hasta is not None:
+            mascara &= años <= año_hasta
+        return mascara
+
+    def _en_rango(self, año_desde=None, año_hasta=None):
+        """Predicado de Python equivalente a ``_mascara``"""
+        años, vigente = self._años.datos, self._vigente.datos
+        return lambda posicion: (vigente[posicion]
+                                 and (año_desde is None or años[posicion] >= año_desde)
+                                 and (año_hasta is None or años[posicion] <= año_hasta))
+
+    def conteo_por_año(self):
+        """[(año, articulos)] ordenado por año"""
+        if np is not None:
+            años, cuentas = np.unique(self._años.valores()[self._mascara()], return_counts=True)
+            return list(zip(años.tolist(), cuentas.tolist()))
+        vigente = self._vigente.datos
+        return sorted(Counter(año for año, vivo in zip(self._años.datos, vigente) if vivo).items())
+
+    def _cuentas_autores(self, año_desde=None, año_hasta=None):
+        """{id: articulos} (o su arreglo de NumPy) de los autores con articulos en el rango"""
+        if np is not None:
+            pares = self._mascara(año_desde, año_hasta)[self._par_posicion.valores()]
+            return np.bincount(self._par_autor.valores()[pares], minlength=len(self.nombres))
+        en_rango = self._en_rango(año_desde, año_hasta)
+        return Counter(id_nombre for posicion, id_nombre
+                       in zip(self._par_posicion.datos, self._par_autor.datos)
+                       if en_rango(posicion))
+
+    def top_autores(self, k=100, año_desde=None, año_hasta=None):
+        """Los ``k`` autores individuales con mas articulos: [(nombre, articulos)]
+
+        Los empates se ordenan por nombre.
+        """
+        cuentas = self._cuentas_autores(año_desde, año_hasta)
+        if np is not None:
+            candidatos = np.flatnonzero(cuentas)
+            if 0 < k < len(candidatos):
+                # Solo se ordenan los que alcanzan la k-esima cuenta
+                umbral = np.partition(cuentas[candidatos], len(candidatos) - k)[len(candidatos) - k]
+                candidatos = candidatos[cuentas[candidatos] >= umbral]
+            cuentas = dict(zip(candidatos.tolist(), cuentas[candidatos].tolist()))
+        return heapq.nsmallest(k, ((self.nombres[i], cantidad) for i, cantidad in cuentas.items()),
+                               key=lambda par: (-par[1], par[0]))
+
+    def cantidad_autores(self):
+        """Autores individuales con al menos un articulo vigente"""
+        cuentas = self._cuentas_autores()
+        return int(np.count_nonzero(cuentas)) if np is not None else len(cuentas)
+
+    def _años_de(self, autor):
+        """Años de los articulos vigentes de un autor individual (o de todos)"""
+        if autor is None:
+            if np is not None:
+                return self._años.valores()[self._mascara()]
+            return [año for año, vivo in zip(self._años.datos, self._vigente.datos) if vivo]
+        id_nombre = self._ids.get(" ".join(autor.lower().split()))
+        if id_nombre is None:
+            return []
+        if np is not None:
+            posiciones = self._par_posicion.valores()[self._par_autor.valores() == id_nombre]
+            posiciones = posiciones[self._vigente.valores()[posiciones].astype(bool)]
+            return self._años.valores()[posiciones]
+        años, vigente = self._años.datos, self._vigente.datos
+        return [años[posicion] for posicion, otro
+                in zip(self._par_posicion.datos, self._par_autor.datos)
+                if otro == id_nombre and vigente[posicion]]
+
+    def histograma_años(self, autor=None, ancho=1):
+        """[(primer año del intervalo, articulos)] de un autor individual o de todo el catalogo"""
+        return _histograma(self._años_de(autor), ancho)
+
+    def autores_por_articulo(self):
+        """[(cantidad de autores, articulos)] de los articulos vigentes"""
+        if np is not None:
+            cuentas = np.bincount(self._cantidad_autores.valores()[self._mascara()])
+            return [(cantidad, int(total)) for cantidad, total in enumerate(cuentas.tolist())
+                    if total]
+        vigente = self._vigente.datos
+        return sorted(Counter(cantidad for cantidad, vivo
+                              in zip(self._cantidad_autores.datos, vigente) if vivo).items())
+
+    def estadisticas_titulos(self, ancho=10):
+        """Largo de los titulos en caracteres: media, mediana, extremos e histograma"""
+        if np is not None:
+            largos = self._largos.valores()[self._mascara()]
+        else:
+            largos = [largo for largo, vivo in zip(self._largos.datos, self._vigente.datos) if vivo]
+        n = len(largos)
+        if not n:
+            return {"articulos": 0}
+        if np is not None:
+            media, mediana = float(largos.mean()), float(np.median(largos))
+            minimo, maximo = int(largos.min()), int(largos.max())
+        else:
+            ordenados = sorted(largos)
+            media = sum(ordenados) / n
+            mediana = (ordenados[(n - 1) // 2] + ordenados[n // 2]) / 2
+            minimo, maximo = ordenados[0], ordenados[-1]
+        return {"articulos": n, "media": media, "mediana": mediana, "minimo": minimo,
+                "maximo": maximo, "histograma": _histograma(largos, ancho)}
+
+    def resumen(self, top=20):
+        """Reporte completo del catalogo como dict serializable a JSON"""
+        return {"articulos": len(self), "autores": self.cantidad_autores(),
+                "motor": "numpy" if np is not None else "python",
+                "por_año": self.conteo_por_año(), "top_autores": self.top_autores(top),
+                "autores_por_articulo": self.autores_por_articulo(),
+                "titulos": self.estadisticas_titulos()}
+
+
+class CacheContenidos:
+    """Cache LRU de cuerpos de articulos con presupuesto en bytes
+
+    Guarda los bytes de cada archivo por ruta y desaloja los usados hace mas
+    tiempo cuando el total supera ``presupuesto``; un archivo mas grande que
+    el presupuesto se entrega sin guardarlo. Los archivos de al menos
+    ``umbral_mmap`` bytes se mapean en memoria en lugar de leerse, asi solo
+    se traen de disco las paginas que se consultan. El almacen direcciona
+    por contenido: una ruta siempre tiene los mismos bytes y no hace falta
+    revalidarla, solo invalidarla cuando se borra o se mueve.
+
+    ``precargar`` lee en segundo plano las rutas que aun no estan, asi el
+    proximo ``obtener`` de esas rutas no espera al disco.
+    """
+
+    LECTURA_ANTICIPADA = 64 << 10  # Comienzo de un archivo mapeado que se pide al kernel
+
+    def __init__(self, presupuesto=32 << 20, umbral_mmap=256 << 10, lectores=1):
+        self.presupuesto = presupuesto
+        self.umbral_mmap = umbral_mmap
+        self.lectores = lectores
+        self._entradas = OrderedDict()  # ruta -> bytes o mmap, de la menos a la mas reciente
+        self._bytes = 0
+        self._en_curso = {}  # ruta -> Future de su precarga
+        self._hilos = None  # Pool de precarga, creado en el primer uso
+        self._lock = threading.Lock()
+        self.aciertos = self.fallos = self.precargados = self.desalojos = 0
+
+    def _leer(self, ruta):
+        with open(ruta, 'rb') as file:
+            tamaño = os.fstat(file.fileno()).st_size
+            if not tamaño or tamaño < self.umbral_mmap:
+                return file.read()
+            datos = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_WILLNEED"):
+            datos.madvise(mmap.MADV_WILLNEED, 0, min(tamaño, self.LECTURA_ANTICIPADA))
+        return datos
+
+    def _guardar(self, ruta, datos):
+        """Agregar como la mas reciente y desalojar hasta entrar en el presupuesto"""
+        if len(datos) > self.presupuesto:
+            return
+        anterior = self._entradas.pop(ruta, None)
+        if anterior is not None:
+            self._bytes -= len(anterior)
+        self._entradas[ruta] = datos
+        self._bytes += len(datos)
+        while self._bytes > self.presupuesto:
+            # Un mmap desalojado se cierra solo cuando nadie lo usa
+            _, desalojado = self._entradas.popitem(last=False)
+            self._bytes -= len(desalojado)
+            self.desalojos += 1
+
+    def obtener(self, ruta):
+        """Contenido del archivo (``bytes`` o ``mmap``); lanza OSError si no se puede leer"""
+        with self._lock:
+            datos = self._entradas.get(ruta)
+            if datos is not None:
+                self._entradas.move_to_end(ruta)
+                self.aciertos += 1
+                return datos
+            futuro = self._en_curso.get(ruta)
+        if futuro is not None:
+            # Ya se esta leyendo en segundo plano: esperar esa lectura
+            try:
+                datos = futuro.result()
+            except Exception:
+                datos = None  # Se reintenta la lectura aqui para informar el error
+            if datos is not None:
+                with self._lock:
+                    self.aciertos += 1
+                return datos
+        datos = self._leer(ruta)
+        with self._lock:
+            self.fallos += 1
+            self._guardar(ruta, datos)
+        return datos
+
+    def precargar(self, rutas):
+        """Leer en segundo plano las rutas que aun no estan en la cache"""
+        with self._lock:
+            pendientes = [ruta for ruta in dict.fromkeys(rutas)
+                          if ruta not in self._entradas and ruta not in self._en_curso]
+            if not pendientes:
+                return
+            if self._hilos is None:
+                self._hilos = ThreadPoolExecutor(self.lectores, thread_name_prefix="precarga")
+            for ruta in pendientes:
+                self._en_curso[ruta] = self._hilos.submit(self._precargar, ruta)
+
+    def _precargar(self, ruta):
+        try:
+            datos = self._leer(ruta)
+        except OSError:
+            with self._lock:
+                self._en_curso.pop(ruta, None)
+            raise
+        with self._lock:
+            # Una invalidacion durante la lectura la quita de _en_curso
+            if self._en_curso.pop(ruta, None) is not None:
+                self._guardar(ruta, datos)
+                self.precargados += 1
+        return datos
+
+    def invalidar(self, ruta):
+        """Olvidar una ruta borrada o movida"""
+        with self._lock:
+            self._en_curso.pop(ruta, None)
+            datos = self._entradas.pop(ruta, None)
+            if datos is not None:
+                self._bytes -= len(datos)
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._en_curso.clear()
+            self._bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {"entradas": len(self._entradas), "bytes": self._bytes,
+                    "presupuesto": self.presupuesto,
+                    "mapeadas": sum(isinstance(datos, mmap.mmap)
+                                    for datos in self._entradas.values()),
+                    "aciertos": self.aciertos, "fallos": self.fallos,
+                    "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                    "precargados": self.precargados, "desalojos": self.desalojos}
+
+    def cerrar(self):
+        """Cancelar las precargas pendientes"""
+        if self._hilos is not None:
+            self._hilos.shutdown(wait=False, cancel_futures=True)
+            self._hilos = None
+        self.limpiar()
+
+
+class Articulo:
+    """Clase para representar un artículo cientifico"""
+
+    __slots__ = ("hash_id", "titulo", "autores", "año", "archivo_nombre")
+
+    def __init__(self, hash_id, titulo, autores, año, archivo_nombre):
+        self.hash_id = hash_id
+        self.titulo = titulo
+        self.autores = autores
+        self.año = año
+        self.archivo_nombre = archivo_nombre
+
+    def __str__(self):
+        return f"Título: {self.titulo}\nAutores: {self.autores}\nAño: {self.año}\nHash: {self.hash_id}"
+
+
+def parsear_linea(linea):
+    """Convertir una linea de la base de datos en sus campos, o None si es invalida"""
+    partes = linea.strip().split('|')
+    if len(partes) != 5:
+        return None
+    hash_id, titulo, autores, año, archivo_nombre = partes
+    # Los autores se repiten mucho: internarlos comparte una sola cadena
+    return hash_id, titulo, sys.intern(autores), int(año), archivo_nombre
+
+
+class _LectorRegistros:
+    """Acceso por offset a las lineas de la base de datos mapeada en memoria"""
+
+    def __init__(self, ruta):
+        with open(ruta, 'rb') as file:
+            self.mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def linea(self, offset):
+        fin = self.mapa.find(b'\n', offset)
+        if fin < 0:
+            fin = len(self.mapa)
+        return self.mapa[offset:fin].decode('utf-8')
+
+    def campos(self, offset):
+        return parsear_linea(self.linea(offset))
+
+
+class ArticuloPerezoso(Articulo):
+    """Articulo que solo conoce su hash_id y su posicion en el almacenamiento
+
+    La posicion es el offset de su linea en el archivo de texto o su rowid
+    en SQLite. Los demas campos se leen del almacenamiento en el primer
+    acceso. Los campos asignados antes de esa lectura se respetan.
+    """
+
+    __slots__ = ("_lector", "_offset")
+
+    def __init__(self, hash_id, lector, offset):
+        self.hash_id = hash_id
+        self._lector = lector
+        self._offset = offset
+
+    def precargar(self, campos):
+        """Completar los campos que aun no tienen valor con ``campos`` ya leidos"""
+        if self._lector is None or campos is None:
+            return
+        self._lector = None
+        for slot, valor in zip(Articulo.__slots__[1:], campos[1:]):
+            try:
+                object.__getattribute__(self, slot)
+            except AttributeError:
+                setattr(self, slot, valor)
+
+    def __getattr__(self, nombre):
+        # Solo se llama cuando el slot aun no tiene valor
+        if nombre in Articulo.__slots__ and self._lector is not None:
+            self.precargar(self._lector.campos(self._offset))
+            return object.__getattribute__(self, nombre)
+        raise AttributeError(nombre)
+
+
+class AlmacenamientoTexto:
+    """Formato original: archivo delimitado por '|' mas journal de mutaciones
+
+    El snapshot solo se reescribe completo al compactar; entre tanto cada
+    mutacion se agrega al journal (``<db>.log``) y se reaplica al cargar.
+    """
+
+    nombre = "texto"
+    consultas_indexadas = False
+
+    def __init__(self, db_file, usar_journal=True, fsync_journal=False):
+        self.db_file = db_file
+        self.usar_journal = usar_journal
+        self.fsync_journal = fsync_journal
+        self.journal_file = db_file + ".log"
+        self.registros_journal = 0
+
+    def validar(self, *campos):
+        """Mensaje de error si algun campo no se puede guardar en este formato"""
+        if any('|' in campo or '\n' in campo for campo in campos):
+            return "Los campos no pueden contener '|' ni saltos de linea"
+        return None
+
+    def cargar(self, perezosa=False):
+        """Leer el snapshot como Articulo completos o, en modo perezoso, por offset"""
+        if not os.path.exists(self.db_file):
+            return []
+        if perezosa and os.path.getsize(self.db_file):
+            return self._cargar_offsets()
+        with open(self.db_file, 'r', encoding='utf-8') as file:
+            return [Articulo(*campos) for campos in map(parsear_linea, file) if campos]
+
+    def _cargar_offsets(self):
+        """Registrar cada articulo con el offset de su linea, sin parsearla"""
+        lector = _LectorRegistros(self.db_file)
+        articulos = []
+        offset = 0
+        with open(self.db_file, 'rb') as file:
+            for linea in file:
+                if linea.count(b'|') == 4:
+                    hash_id = linea[:linea.index(b'|')].decode('utf-8')
+                    articulos.append(ArticuloPerezoso(hash_id, lector, offset))
+                offset += len(linea)
+        return articulos
+
+    def registros_pendientes(self):
+        """Recorrer en orden los registros del journal para reaplicarlos"""
+        self.registros_journal = 0
+        if not os.path.exists(self.journal_file):
+            return
+        valido = 0
+        with open(self.journal_file, 'rb') as file:
+            for linea in file:
+                # Un registro sin salto de linea quedo a medias por una caida
+                if not linea.endswith(b'\n'):
+                    break
+                yield linea[:-1].decode('utf-8').split('|')
+                self.registros_journal += 1
+                valido += len(linea)
+
+        # Descartar la cola incompleta para que el proximo registro no se pegue a ella
+        if valido < os.path.getsize(self.journal_file):
+            os.truncate(self.journal_file, valido)
+
+    def registrar(self, registros):
+        """Agregar mutaciones al journal; False si hay que volcar todo el estado"""
+        if not self.usar_journal:
+            return False
+        with open(self.journal_file, 'a', encoding='utf-8') as file:
+            file.write(''.join('|'.join(str(campo) for campo in campos) + '\n'
+                               for campos in registros))
+            file.flush()
+            if self.fsync_journal:
+                os.fsync(file.fileno())
+        self.registros_journal += len(registros)
+        return True
+
+    def requiere_compactar(self, total):
+        """Compactacion automatica cuando el journal supera al catalogo"""
+        return self.registros_journal > max(1000, total)
+
+    def hay_pendientes(self):
+        return self.usar_journal and self.registros_journal > 0
+
+    def volcar(self, articulos):
+        """Escribir el snapshot completo y vaciar el journal
+
+        Se escribe a un archivo temporal y se renombra de forma atomica, asi
+        una caida a mitad de escritura nunca deja la base truncada.
+        """
+        temporal = self.db_file + ".tmp"
+        with open(temporal, 'w', encoding='utf-8') as file:
+            for articulo in articulos:
+                linea = f"{articulo.hash_id}|{articulo.titulo}|{articulo.autores}|{articulo.año}|{articulo.archivo_nombre}\n"
+                file.write(linea)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporal, self.db_file)
+        # Reaplicar el journal sobre el snapshot nuevo es inofensivo, asi que
+        # una caida entre el renombrado y este borrado no pierde datos
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.registros_journal = 0
+
+    def compactar(self, articulos):
+        self.volcar(articulos)
+
+    def cerrar(self):
+        pass
+
+    def estadisticas(self):
+        return {"tipo": self.nombre, "registros_journal": self.registros_journal}
+
+
+class AlmacenamientoSQLite:
+    """Catalogo en SQLite (modo WAL) indexado por hash_id, autor, año y titulo
+
+    Cada lote de mutaciones se aplica en una transaccion, asi que no hace
+    falta journal propio ni compactacion. Con carga perezosa el gestor solo
+    carga los hash_id y resuelve listados y busquedas con consultas SQL
+    indexadas en lugar de construir sus indices en memoria. Los titulos y
+    autores pueden contener cualquier caracter.
+    """
+
+    nombre = "sqlite"
+    consultas_indexadas = True
+
+    # titulo_orden y autores_orden guardan el lower() de Python para que el
+    # orden coincida con el de los indices en memoria
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS articulos (
+            hash_id TEXT NOT NULL UNIQUE,
+            titulo TEXT NOT NULL,
+            autores TEXT NOT NULL,
+            año INTEGER NOT NULL,
+            archivo TEXT NOT NULL,
+            titulo_orden TEXT NOT NULL,
+            autores_orden TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS articulos_titulo ON articulos (titulo_orden, hash_id);
+        CREATE INDEX IF NOT EXISTS articulos_autores
+            ON articulos (autores_orden, titulo_orden, hash_id);
+        CREATE INDEX IF NOT EXISTS articulos_año ON articulos (año, titulo_orden, hash_id);
+        CREATE TABLE IF NOT EXISTS autores_articulo (
+            nombre TEXT NOT NULL,
+            hash_id TEXT NOT NULL,
+            PRIMARY KEY (nombre, hash_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS autores_articulo_hash ON autores_articulo (hash_id);
+    """
+    CAMPOS = "SELECT hash_id, titulo, autores, año, archivo FROM articulos"
+
+    def __init__(self, ruta, sincrono=False):
+        self.ruta = ruta
+        # Los lectores del gestor comparten la conexion; un bloqueo la serializa
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self._bloqueo = threading.Lock()
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute(f"PRAGMA synchronous={'FULL' if sincrono else 'NORMAL'}")
+        self._conexion.executescript(self.ESQUEMA)
+
+    def validar(self, *campos):
+        return None
+
+    def _consultar(self, sql, parametros=()):
+        with self._bloqueo:
+            return self._conexion.execute(sql, parametros).fetchall()
+
+    @staticmethod
+    def _fila(campos):
+        hash_id, titulo, autores, año, archivo = campos
+        return hash_id, titulo, sys.intern(autores), año, archivo
+
+    def cargar(self, perezosa=False):
+        """Leer todo el catalogo o, en modo perezoso, solo hash_id y rowid"""
+        if perezosa:
+            return [ArticuloPerezoso(hash_id, self, rowid) for rowid, hash_id
+                    in self._consultar("SELECT rowid, hash_id FROM articulos")]
+        return [Articulo(*self._fila(campos)) for campos in self._consultar(self.CAMPOS)]
+
+    def campos(self, rowid):
+        filas = self._consultar(self.CAMPOS + " WHERE rowid = ?", (rowid,))
+        return self._fila(filas[0]) if filas else None
+
+    def registros_pendientes(self):
+        return iter(())
+
+    def _insertar(self, cursor, hash_id, titulo, autores, año, archivo):
+        # Upsert en lugar de REPLACE: conserva el rowid de los ArticuloPerezoso
+        cursor.execute(
+            "INSERT INTO articulos VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (hash_id) DO UPDATE SET "
+            "titulo = excluded.titulo, autores = excluded.autores, año = excluded.año, "
+            "archivo = excluded.archivo, titulo_orden = excluded.titulo_orden, "
+            "autores_orden = excluded.autores_orden",
+            (hash_id, titulo, autores, int(año), archivo, titulo.lower(), autores.lower()))
+        self._nombres(cursor, hash_id, autores)
+
+    @staticmethod
+    def _nombres(cursor, hash_id, autores):
+        cursor.execute("DELETE FROM autores_articulo WHERE hash_id = ?", (hash_id,))
+        cursor.executemany("INSERT OR IGNORE INTO autores_articulo VALUES (?, ?)",
+                           ((nombre, hash_id) for nombre in separar_autores(autores)))
+
+    def _transaccion(self, aplicar):
+        with self._bloqueo:
+            cursor = self._conexion.cursor()
+            cursor.execute("BEGIN")
+            try:
+                aplicar(cursor)
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def registrar(self, registros):
+        """Aplicar un lote de mutaciones en una sola transaccion"""
+        def aplicar(cursor):
+            for operacion, hash_id, *campos in registros:
+                if operacion == 'A':
+                    self._insertar(cursor, hash_id, *campos)
+                elif operacion == 'M':
+                    autores, año = campos
+                    cursor.execute("UPDATE articulos SET autores = ?, autores_orden = ?, año = ? "
+                                   "WHERE hash_id = ?", (autores, autores.lower(), int(año), hash_id))
+                    self._nombres(cursor, hash_id, autores)
+                elif operacion == 'D':
+                    cursor.execute("DELETE FROM articulos WHERE hash_id = ?", (hash_id,))
+                    cursor.execute("DELETE FROM autores_articulo WHERE hash_id = ?", (hash_id,))
+        self._transaccion(aplicar)
+        return True
+
+    def requiere_compactar(self, total):
+        return False
+
+    def hay_pendientes(self):
+        return False
+
+    def volcar(self, articulos):
+        """Reemplazar todo el contenido por ``articulos`` en una transaccion"""
+        def aplicar(cursor):
+            cursor.execute("DELETE FROM articulos")
+            cursor.execute("DELETE FROM autores_articulo")
+            for a in articulos:
+                self._insertar(cursor, a.hash_id, a.titulo, a.autores, a.año, a.archivo_nombre)
+        self._transaccion(aplicar)
+
+    def compactar(self, articulos):
+        """Llevar el WAL al archivo principal; el contenido ya esta al dia"""
+        self._consultar("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def cerrar(self):
+        self.compactar(())
+
+    def estadisticas(self):
+        return {"tipo": self.nombre, "articulos": self.contar()}
+
+    # --- Consultas indexadas, en el mismo orden que los indices en memoria ---
+
+    def contar(self):
+        return self._consultar("SELECT count(*) FROM articulos")[0][0]
+
+    def _pagina(self, sql, parametros, offset, limit):
+        return [self._fila(campos) for campos in self._consultar(
+            sql + " LIMIT ? OFFSET ?", list(parametros) + [-1 if limit is None else limit, offset])]
+
+    def por_autor(self, autores, offset=0, limit=None):
+        return self._pagina(self.CAMPOS + " WHERE autores_orden = ? ORDER BY titulo_orden, hash_id",
+                            [autores.lower()], offset, limit)
+
+    def por_año(self, año, offset=0, limit=None):
+        return self._pagina(self.CAMPOS + " WHERE año = ? ORDER BY titulo_orden, hash_id",
+                            [año], offset, limit)
+
+    def listar(self, orden="titulo", offset=0, limit=None):
+        claves = {"titulo": "titulo_orden, hash_id",
+                  "autor": "autores_orden, titulo_orden, hash_id"}[orden]
+        return self._pagina(f"{self.CAMPOS} ORDER BY {claves}", [], offset, limit)
+
+    def nombres_con_prefijo(self, prefijo):
+        return [nombre for (nombre,) in self._consultar(
+            "SELECT DISTINCT nombre FROM autores_articulo WHERE nombre >= ? AND nombre < ? "
+            "ORDER BY nombre", (prefijo, prefijo + _FIN_PREFIJO))]
+
+    def buscar(self, titulo_prefijo=None, nombres=(), nombre_prefijo=None,
+               año_desde=None, año_hasta=None, offset=0, limit=None):
+        """Filtros ya normalizados (en minusculas); el planificador elige el indice"""
+        condiciones, parametros = [], []
+        if titulo_prefijo:
+            condiciones.append("titulo_orden >= ? AND titulo_orden < ?")
+            parametros += [titulo_prefijo, titulo_prefijo + _FIN_PREFIJO]
+        for nombre in nombres:
+            condiciones.append("hash_id IN (SELECT hash_id FROM autores_articulo WHERE nombre = ?)")
+            parametros.append(nombre)
+        if nombre_prefijo:
+            condiciones.append("hash_id IN (SELECT hash_id FROM autores_articulo "
+                               "WHERE nombre >= ? AND nombre < ?)")
+            parametros += [nombre_prefijo, nombre_prefijo + _FIN_PREFIJO]
+        if año_desde is not None:
+            condiciones.append("año >= ?")
+            parametros.append(año_desde)
+        if año_hasta is not None:
+            condiciones.append("año <= ?")
+            parametros.append(año_hasta)
+        donde = " WHERE " + " AND ".join(condiciones) if condiciones else ""
+        return self._pagina(f"{self.CAMPOS}{donde} ORDER BY titulo_orden, hash_id",
+                            parametros, offset, limit)
+
+
+ALMACENAMIENTOS = ("texto", "sqlite")
+
+
+def migrar_a_sqlite(db_file, destino, articulos_dir="articulos"):
+    """Copiar una base de texto (snapshot mas journal) a un archivo SQLite
+
+    El indice de texto completo se copia junto a la base nueva para no
+    tener que reconstruirlo. Devuelve la cantidad de articulos migrados.
+    """
+    if os.path.exists(destino):
+        raise FileExistsError(f"El destino ya existe: {destino}")
+    origen = GestorArticulos(db_file, articulos_dir, texto_completo=False)
+    try:
+        articulos = origen.tabla_hash.get_all_values()
+        almacenamiento = AlmacenamientoSQLite(destino)
+        try:
+            almacenamiento.volcar(articulos)
+        finally:
+            almacenamiento.cerrar()
+    finally:
+        origen.cerrar()
+    if os.path.exists(db_file + ".fti"):
+        shutil.copyfile(db_file + ".fti", destino + ".fti")
+    return len(articulos)
+
+
+class InstantaneaCatalogo:
+    """Copia binaria del catalogo ya indexado, mapeada en memoria
+
+    Guarda los articulos junto con una tabla hash por hash_id y los mismos
+    ordenes que los indices en memoria (titulo, autores, año y autores
+    individuales), asi un arranque en caliente responde consultas sin
+    parsear la base de texto ni construir indices. Al abrirla solo se
+    valida la cabecera y la suma CRC32 de cada seccion. Es valida mientras
+    la base de texto tenga el tamaño y la fecha de modificacion registrados.
+
+    Formato (little endian, secciones alineadas a 8 bytes)::
+
+        cabecera   SNP1, version u32, registros u64, tamaño u64 y mtime_ns
+                   i64 de la base, ranuras u64, nombres u64
+        secciones  por cada seccion: offset u64, longitud u64, crc32 u32
+        crc32      u32 de la cabecera y las secciones
+        cadenas    bytes utf-8 de los campos y de los nombres de autores
+        registros  offset u64 de sus cadenas contiguas, longitudes u32 de
+                   hash_id, titulo, autores y archivo, año i32
+        tabla      u32 por ranura (registro + 1, 0 libre); sondeo lineal
+                   desde crc32(hash_id)
+        por_titulo, por_autores, por_año
+                   u32 por posicion: registro en ese orden
+        rango      u32 por registro: su posicion en por_titulo
+        nombres    autores individuales ordenados: offset u64, longitud
+                   u32, inicio u32 de sus postings; una entrada final marca
+                   el fin de los postings
+        postings   u32: posiciones en por_titulo, ascendentes por nombre
+    """
+
+    MAGICO = b"SNP1"
+    VERSION = 1
+    SECCIONES = ("cadenas", "registros", "tabla", "por_titulo", "por_autores", "por_año",
+                 "rango", "nombres", "postings")
+    _CABECERA = struct.Struct("<4sIQQqQQ")
+    _SECCION = struct.Struct("<QQI")
+    _CRC = struct.Struct("<I")
+    _REGISTRO = struct.Struct("<QIIIIi")
+    _NOMBRE = struct.Struct("<QII")
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._mapa = None
+        self._vistas = []  # memoryview sobre el mapa; se liberan antes de cerrarlo
+        with open(ruta, 'rb') as file:
+            self._mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._validar()
+        except Exception:
+            self.cerrar()
+            raise
+
+    @classmethod
+    def abrir(cls, ruta, origen, reportar_error=_reportar_en_stderr):
+        """Instantanea valida y al dia con la base ``origen``, o None
+
+        Una instantanea ilegible o corrupta se informa con
+        ``reportar_error(operacion, error)`` y se ignora.
+        """
+        if not os.path.exists(ruta):
+            return None
+        try:
+            instantanea = cls(ruta)
+        except Exception as e:
+            reportar_error("cargar_instantanea_del_catalogo", e)
+            return None
+        if not instantanea.vigente(origen):
+            instantanea.cerrar()
+            return None
+        return instantanea
+
+    def _vista(self, vista, formato=None):
+        vista = vista.cast(formato) if formato else vista
+        self._vistas.append(vista)
+        return vista
+
+    def _validar(self):
+        if sys.byteorder != "little":
+            raise ValueError("La instantanea solo se puede mapear en equipos little endian")
+        mapa = self._mapa
+        fin = self._CABECERA.size + len(self.SECCIONES) * self._SECCION.size
+        if len(mapa) < fin + self._CRC.size:
+            raise ValueError("Instantanea truncada")
+        (magico, version, self.registros, self.tamaño_origen, self.mtime_origen,
+         self.ranuras, self.nombres) = self._CABECERA.unpack_from(mapa, 0)
+        if magico != self.MAGICO or version != self.VERSION:
+            raise ValueError("Formato de instantanea desconocido")
+        if zlib.crc32(mapa[:fin]) != self._CRC.unpack_from(mapa, fin)[0]:
+            raise ValueError("Cabecera de instantanea corrupta")
+
+        esperadas = {"registros": self.registros * self._REGISTRO.size,
+                     "tabla": 4 * self.ranuras, "por_titulo": 4 * self.registros,
+                     "por_autores": 4 * self.registros, "por_año": 4 * self.registros,
+                     "rango": 4 * self.registros,
+                     "nombres": (self.nombres + 1) * self._NOMBRE.size}
+        todo = self._vista(memoryview(mapa))
+        secciones = {}
+        for i, nombre in enumerate(self.SECCIONES):
+            offset, longitud, crc = self._SECCION.unpack_from(
+                mapa, self._CABECERA.size + i * self._SECCION.size)
+            if offset + longitud > len(mapa) or esperadas.get(nombre, longitud) != longitud:
+                raise ValueError(f"Seccion {nombre} de la instantanea invalida")
+            secciones[nombre] = self._vista(todo[offset:offset + longitud])
+            if zlib.crc32(secciones[nombre]) != crc:
+                raise ValueError(f"Seccion {nombre} de la instantanea corrupta")
+
+        self._cadenas = secciones["cadenas"]
+        self._registros = secciones["registros"]
+        self._nombres = secciones["nombres"]
+        self._tabla = self._vista(secciones["tabla"], 'I')
+        self._por_titulo = self._vista(secciones["por_titulo"], 'I')
+        self._por_autores = self._vista(secciones["por_autores"], 'I')
+        self._por_año = self._vista(secciones["por_año"], 'I')
+        self._rango = self._vista(secciones["rango"], 'I')
+        self._postings = self._vista(secciones["postings"], 'I')
+
+    def vigente(self, origen):
+        """True si la base ``origen`` no cambio desde que se escribio la instantanea"""
+        try:
+            estado = os.stat(origen)
+        except OSError:
+            return False
+        return (estado.st_size, estado.st_mtime_ns) == (self.tamaño_origen, self.mtime_origen)
+
+    def cerrar(self):
+        for vista in reversed(self._vistas):
+            vista.release()
+        self._vistas = []
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+
+    # --- Escritura --------------------------------------------------------
+
+    @classmethod
+    def escribir(cls, ruta, articulos, origen):
+        """Escribir la instantanea de ``articulos`` con renombrado atomico
+
+        ``origen`` es la base de texto que refleja esos mismos articulos: su
+        tamaño y fecha de modificacion quedan en la cabecera.
+        """
+        articulos = list(articulos)
+        n = len(articulos)
+        cadenas = bytearray()
+        registros = bytearray()
+        claves = []
+        for articulo in articulos:
+            partes = [articulo.hash_id.encode('utf-8'), articulo.titulo.encode('utf-8'),
+                      articulo.autores.encode('utf-8'), articulo.archivo_nombre.encode('utf-8')]
+            registros += cls._REGISTRO.pack(len(cadenas), *map(len, partes), articulo.año)
+            claves.append(partes[0])
+            cadenas += b"".join(partes)
+
+        # Mismas claves que los indices en memoria; los ordenes por autores y
+        # por año parten del de titulo y sort es estable
+        titulos = [(a.titulo.lower(), a.hash_id) for a in articulos]
+        por_titulo = sorted(range(n), key=titulos.__getitem__)
+        autores = [a.autores.lower() for a in articulos]
+        por_autores = sorted(por_titulo, key=autores.__getitem__)
+        años = [a.año for a in articulos]
+        por_año = sorted(por_titulo, key=años.__getitem__)
+        rango = array('I', bytes(4 * n))
+        for posicion, i in enumerate(por_titulo):
+            rango[i] = posicion
+
+        ranuras = 8
+        while ranuras < 2 * n:
+            ranuras *= 2
+        tabla = array('I', bytes(4 * ranuras))
+        mascara = ranuras - 1
+        for i, clave in enumerate(claves):
+            ranura = zlib.crc32(clave) & mascara
+            while tabla[ranura]:
+                ranura = (ranura + 1) & mascara
+            tabla[ranura] = i + 1
+
+        postings_por_nombre = defaultdict(list)
+        for posicion, i in enumerate(por_titulo):
+            for nombre in separar_autores(articulos[i].autores):
+                postings_por_nombre[nombre].append(posicion)
+        nombres = bytearray()
+        postings = array('I')
+        for nombre in sorted(postings_por_nombre):
+            codificado = nombre.encode('utf-8')
+            nombres += cls._NOMBRE.pack(len(cadenas), len(codificado), len(postings))
+            cadenas += codificado
+            postings.extend(postings_por_nombre[nombre])
+        nombres += cls._NOMBRE.pack(len(cadenas), 0, len(postings))
+
+        secciones = [cadenas, registros, tabla.tobytes(), array('I', por_titulo).tobytes(),
+                     array('I', por_autores).tobytes(), array('I', por_año).tobytes(),
+                     rango.tobytes(), nombres, postings.tobytes()]
+        offset = cls._CABECERA.size + len(cls.SECCIONES) * cls._SECCION.size + cls._CRC.size
+        directorio = bytearray()
+        for datos in secciones:
+            offset += -offset % 8
+            directorio += cls._SECCION.pack(offset, len(datos), zlib.crc32(datos))
+            offset += len(datos)
+
+        estado = os.stat(origen)
+        cabecera = cls._CABECERA.pack(cls.MAGICO, cls.VERSION, n, estado.st_size,
+                                      estado.st_mtime_ns, ranuras, len(postings_por_nombre))
+        cabecera += directorio
+        cabecera += cls._CRC.pack(zlib.crc32(cabecera))
+        temporal = ruta + ".tmp"
+        with open(temporal, 'wb') as file:
+            file.write(cabecera)
+            posicion = len(cabecera)
+            for datos in secciones:
+                file.write(bytes(-posicion % 8))
+                posicion += -posicion % 8 + len(datos)
+                file.write(datos)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporal, ruta)
+
+    # --- Lectura de registros ---------------------------------------------
+
+    def _registro(self, i):
+        return self._REGISTRO.unpack_from(self._registros, i * self._REGISTRO.size)
+
+    def _texto(self, offset, longitud):
+        return str(self._cadenas[offset:offset + longitud], 'utf-8')
+
+    def campos(self, i):
+        """(hash_id, titulo, autores, año, archivo) del registro ``i``"""
+        offset, largo_hash, largo_titulo, largo_autores, largo_archivo, año = self._registro(i)
+        datos = self._cadenas[offset:offset + largo_hash + largo_titulo
+                              + largo_autores + largo_archivo].tobytes()
+        titulo = largo_hash + largo_titulo
+        autores = titulo + largo_autores
+        return (datos[:largo_hash].decode('utf-8'), datos[largo_hash:titulo].decode('utf-8'),
+                sys.intern(datos[titulo:autores].decode('utf-8')), año,
+                datos[autores:].decode('utf-8'))
+
+    def clave(self, i):
+        """hash_id del registro ``i``"""
+        offset, largo = self._registro(i)[:2]
+        return self._texto(offset, largo)
+
+    def posicion(self, hash_id):
+        """Registro con ese hash_id, o -1"""
+        clave = hash_id.encode('utf-8')
+        mascara = self.ranuras - 1
+        ranura = zlib.crc32(clave) & mascara
+        while True:
+            i = self._tabla[ranura] - 1
+            if i < 0:
+                return -1
+            offset, largo = self._registro(i)[:2]
+            if self._cadenas[offset:offset + largo] == clave:
+                return i
+            ranura = (ranura + 1) & mascara
+
+    def _titulo_orden(self, i):
+        offset, largo_hash, largo_titulo = self._registro(i)[:3]
+        return self._texto(offset + largo_hash, largo_titulo).lower()
+
+    def _autores_orden(self, i):
+        offset, largo_hash, largo_titulo, largo_autores = self._registro(i)[:4]
+        return self._texto(offset + largo_hash + largo_titulo, largo_autores).lower()
+
+    def _año(self, i):
+        return self._registro(i)[5]
+
+    def _nombre(self, k):
+        offset, largo, _ = self._NOMBRE.unpack_from(self._nombres, k * self._NOMBRE.size)
+        return self._texto(offset, largo)
+
+    def _postings_de(self, desde, hasta):
+        """Postings concatenados de los nombres ``desde`` a ``hasta`` (exclusive)"""
+        inicio = self._NOMBRE.unpack_from(self._nombres, desde * self._NOMBRE.size)[2]
+        fin = self._NOMBRE.unpack_from(self._nombres, hasta * self._NOMBRE.size)[2]
+        return self._postings[inicio:fin]
+
+    def _rango_nombres(self, prefijo):
+        nombres = range(self.nombres)
+        return (bisect.bisect_left(nombres, prefijo, key=self._nombre),
+                bisect.bisect_left(nombres, prefijo + _FIN_PREFIJO, key=self._nombre))
+
+    # --- Consultas, con la misma interfaz que AlmacenamientoSQLite -------
+
+    def _filas(self, registros):
+        return [self.campos(i) for i in registros]
+
+    @staticmethod
+    def _pagina(orden, inicio, fin, offset, limit):
+        inicio += offset
+        if limit is not None:
+            fin = min(fin, inicio + limit)
+        return orden[inicio:fin]
+
+    def contar(self):
+        return self.registros
+
+    def por_autor(self, autores, offset=0, limit=None):
+        autores = autores.lower()
+        orden = self._por_autores
+        inicio = bisect.bisect_left(orden, autores, key=self._autores_orden)
+        fin = bisect.bisect_right(orden, autores, lo=inicio, key=self._autores_orden)
+        return self._filas(self._pagina(orden, inicio, fin, offset, limit))
+
+    def por_año(self, año, offset=0, limit=None):
+        orden = self._por_año
+        inicio = bisect.bisect_left(orden, año, key=self._año)
+        fin = bisect.bisect_right(orden, año, lo=inicio, key=self._año)
+        return self._filas(self._pagina(orden, inicio, fin, offset, limit))
+
+    def listar(self, orden="titulo", offset=0, limit=None):
+        orden = {"titulo": self._por_titulo, "autor": self._por_autores}[orden]
+        return self._filas(self._pagina(orden, 0, len(orden), offset, limit))
+
+    def nombres_con_prefijo(self, prefijo):
+        desde, hasta = self._rango_nombres(prefijo)
+        return [self._nombre(k) for k in range(desde, hasta)]
+
+    def buscar(self, titulo_prefijo=None, nombres=(), nombre_prefijo=None,
+               año_desde=None, año_hasta=None, offset=0, limit=None):
+        """Filtros ya normalizados, como en ``AlmacenamientoSQLite.buscar``
+
+        Cada filtro da sus candidatos como posiciones en el orden por titulo:
+        se recorren los del filtro mas selectivo y los demas se verifican
+        sobre cada uno.
+        """
+        filtros = []  # (estimacion, candidatos ascendentes, predicado sobre la posicion)
+
+        if titulo_prefijo:
+            primero = bisect.bisect_left(self._por_titulo, titulo_prefijo, key=self._titulo_orden)
+            ultimo = bisect.bisect_left(self._por_titulo, titulo_prefijo + _FIN_PREFIJO,
+                                        lo=primero, key=self._titulo_orden)
+            filtros.append((ultimo - primero, lambda: range(primero, ultimo),
+                            lambda posicion: primero <= posicion < ultimo))
+
+        for nombre in nombres:
+            k = bisect.bisect_left(range(self.nombres), nombre, key=self._nombre)
+            encontrado = k < self.nombres and self._nombre(k) == nombre
+            lista = self._postings_de(k, k + 1) if encontrado else self._postings[:0]
+            filtros.append((len(lista), lambda lista=lista: lista,
+                            lambda posicion, lista=lista: _en_lista_ordenada(lista, posicion)))
+
+        if nombre_prefijo:
+            lista = self._postings_de(*self._rango_nombres(nombre_prefijo))
+
+            def con_prefijo(posicion):
+                autores = self.campos(self._por_titulo[posicion])[2]
+                return any(n.startswith(nombre_prefijo) for n in separar_autores(autores))
+
+            filtros.append((len(lista), lambda: sorted(set(lista)), con_prefijo))
+
+        if año_desde is not None or año_hasta is not None:
+            inicio = (0 if año_desde is None
+                      else bisect.bisect_left(self._por_año, año_desde, key=self._año))
+            fin = (self.registros if año_hasta is None
+                   else bisect.bisect_right(self._por_año, año_hasta, key=self._año))
+
+            def en_rango(posicion):
+                año = self._año(self._por_titulo[posicion])
+                return ((año_desde is None or año >= año_desde)
+                        and (año_hasta is None or año <= año_hasta))
+
+            filtros.append((fin - inicio,
+                            lambda: sorted(self._rango[i] for i in self._por_año[inicio:fin]),
+                            en_rango))
+
+        if not filtros:
+            return self.listar("titulo", offset, limit)
+
+        filtros.sort(key=lambda filtro: filtro[0])
+        _, candidatos, _ = filtros[0]
+        predicados = [filtro[2] for filtro in filtros[1:]]
+        necesarios = None if limit is None else offset + limit
+        posiciones = []
+        for posicion in candidatos():
+            if all(predicado(posicion) for predicado in predicados):
+                posiciones.append(posicion)
+                if necesarios is not None and len(posiciones) >= necesarios:
+                    break
+        return self._filas(self._por_titulo[posicion] for posicion in posiciones[offset:])
+
+
+def _en_lista_ordenada(lista, valor):
+    i = bisect.bisect_left(lista, valor)
+    return i < len(lista) and lista[i] == valor
+
+
+class TablaInstantanea(HashTable):
+    """Tabla hash sobre una ``InstantaneaCatalogo``, con los cambios en memoria
+
+    Una clave que no esta en la tabla propia se busca en la tabla mapeada de
+    la instantanea y su articulo se materializa una sola vez, asi cada
+    hash_id conserva un unico objeto. Las altas y modificaciones van a la
+    tabla propia; las bajas de articulos de la instantanea se recuerdan
+    aparte para que no reaparezcan.
+    """
+
+    def __init__(self, instantanea, size=200, **kwargs):
+        super().__init__(size, **kwargs)
+        self.instantanea = instantanea
+        self._materializados = {}  # hash_id -> Articulo leido de la instantanea
+        self._borrados = set()  # hash_id de la instantanea dados de baja
+        self._solo_memoria = 0  # Claves propias que no estan en la instantanea
+
+    @property
+    def count(self):
+        return self.instantanea.registros - len(self._borrados) + self._solo_memoria
+
+    @property
+    def load_factor(self):
+        return HashTable.count.fget(self) / self.size
+
+    def _materializar(self, key, i):
+        articulo = self._materializados.get(key)
+        if articulo is None:
+            # setdefault es atomico: lectores concurrentes obtienen el mismo objeto
+            articulo = self._materializados.setdefault(
+                key, Articulo(*self.instantanea.campos(i)))
+        return articulo
+
+    def get(self, key):
+        """Obtener elemento de la tabla propia o, si no esta, de la instantanea"""
+        value = HashTable.get(self, key)
+        if value is None and key not in self._borrados:
+            value = self._materializados.get(key)
+            if value is None:
+                i = self.instantanea.posicion(key)
+                if i >= 0:
+                    value = self._materializar(key, i)
+        return value
+
+    def insert(self, key, value):
+        if self.instantanea.posicion(key) >= 0:
+            self._borrados.discard(key)
+            self._materializados.pop(key, None)
+        elif HashTable.get(self, key) is None:
+            self._solo_memoria += 1
+        HashTable.insert(self, key, value)
+
+    def delete(self, key):
+        deleted = HashTable.delete(self, key)
+        if self.instantanea.posicion(key) >= 0:
+            if key in self._borrados:
+                return False
+            self._borrados.add(key)
+            self._materializados.pop(key, None)
+            return True
+        if deleted:
+            self._solo_memoria -= 1
+        return deleted
+
+    def items(self):
+        """Iterar pares (clave, valor); los de la instantanea se materializan"""
+        instantanea = self.instantanea
+        for i in range(instantanea.registros):
+            key = instantanea.clave(i)
+            if key not in self._borrados:
+                value = HashTable.get(self, key)
+                yield key, value if value is not None else self._materializar(key, i)
+        for key, value in HashTable.items(self):
+            if instantanea.posicion(key) < 0:
+                yield key, value
+
+    def keys(self):
+        instantanea = self.instantanea
+        for i in range(instantanea.registros):
+            key = instantanea.clave(i)
+            if key not in self._borrados:
+                yield key
+        for key, _ in HashTable.items(self):
+            if instantanea.posicion(key) < 0:
+                yield key
+
+    def stats(self):
+        stats = super().stats()
+        stats["snapshot"] = {"records": self.instantanea.registros,
+                             "slots": self.instantanea.ranuras,
+                             "deleted": len(self._borrados),
+                             "materialized": len(self._materializados)}
+        return stats
+
+
+@contextlib.contextmanager
+def _reemplazo_atomico(ruta):
+    """Entregar un temporal que reemplaza a ``ruta`` solo si el bloque termina bien"""
+    temporal = ruta + ".tmp"
+    try:
+        yield temporal
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def _lotes(iterable, tamaño):
+    """Agrupar un iterable en listas de hasta ``tamaño`` elementos, de a una por vez"""
+    iterador = iter(iterable)
+    while lote := list(itertools.islice(iterador, tamaño)):
+        yield lote
+
+
+def _little_endian(arreglo):
+    if sys.byteorder == "big":
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+class ArchivoColumnar:
+    """Formato columnar binario por bloques para exportar e importar el catalogo
+
+    Cada bloque guarda sus registros columna por columna, y cada columna va
+    comprimida con zlib por separado: los años, los autores repetidos y
+    los prefijos de las rutas se comprimen mucho mejor juntos que
+    intercalados por fila. Los bloques se escriben y se leen de a uno, asi
+    exportar e importar usan memoria constante.
+
+    Formato (little endian)::
+
+        cabecera  ACB1, version u16, flags u16 (1: incluye contenidos)
+        bloque    registros u32, crc32 u32 de sus columnas y, por columna,
+                  longitud u32 y los bytes comprimidos
+        fin       un bloque de 0 registros
+
+    Columnas: hash_id, titulo, autores, año, archivo y, con contenidos,
+    contenido. Las cadenas se guardan como longitudes u32 seguidas de los
+    bytes; los autores con un diccionario por bloque (las cadenas
+    distintas y un indice u32 por registro); el año como i32.
+    """
+
+    MAGICO = b"ACB1"
+    VERSION = 1
+    CON_CONTENIDOS = 1
+    _CABECERA = struct.Struct("<4sHH")
+    _BLOQUE = struct.Struct("<II")
+    _LONGITUD = struct.Struct("<I")
+
+    @staticmethod
+    def _cadenas(valores):
+        return _little_endian(array('I', map(len, valores))) + b"".join(valores)
+
+    @staticmethod
+    def _leer_cadenas(datos, cantidad):
+        longitudes = array('I')
+        longitudes.frombytes(datos[:4 * cantidad])
+        _little_endian(longitudes)
+        valores = []
+        inicio = 4 * cantidad
+        for longitud in longitudes:
+            valores.append(datos[inicio:inicio + longitud])
+            inicio += longitud
+        return valores
+
+    @classmethod
+    def escribir(cls, ruta, registros, contenidos=False, lote=4096):
+        """Escribir registros ``(hash_id, titulo, autores, año, archivo, contenido)``
+
+        La escritura es atomica (archivo temporal y renombrado). Devuelve la
+        cantidad de registros escritos.
+        """
+        total = 0
+        with _reemplazo_atomico(ruta) as temporal, open(temporal, 'wb') as file:
+            file.write(cls._CABECERA.pack(cls.MAGICO, cls.VERSION,
+                                          cls.CON_CONTENIDOS if contenidos else 0))
+            for bloque in _lotes(registros, lote):
+                hash_ids, titulos, autores, años, archivos, cuerpos = zip(*bloque)
+                diccionario = {}
+                indices = array('I', (diccionario.setdefault(valor, len(diccionario))
+                                      for valor in autores))
+                columnas = [
+                    cls._cadenas([valor.encode('utf-8') for valor in hash_ids]),
+                    cls._cadenas([valor.encode('utf-8') for valor in titulos]),
+                    cls._LONGITUD.pack(len(diccionario))
+                    + cls._cadenas([valor.encode('utf-8') for valor in diccionario])
+                    + _little_endian(indices),
+                    _little_endian(array('i', años)),
+                    cls._cadenas([valor.encode('utf-8') for valor in archivos]),
+                ]
+                if contenidos:
+                    columnas.append(cls._cadenas([cuerpo or b"" for cuerpo in cuerpos]))
+                comprimidas = [zlib.compress(columna, 1) for columna in columnas]
+                crc = 0
+                for columna in comprimidas:
+                    crc = zlib.crc32(columna, crc)
+                file.write(cls._BLOQUE.pack(len(bloque), crc))
+                for columna in comprimidas:
+                    file.write(cls._LONGITUD.pack(len(columna)))
+                    file.write(columna)
+                total += len(bloque)
+            file.write(cls._BLOQUE.pack(0, 0))
+        return total
+
+    @classmethod
+    def leer(cls, ruta):
+        """Generar los registros del archivo bloque por bloque
+
+        Lanza ValueError si el archivo no tiene el formato, un bloque no
+        pasa su CRC o el archivo termina antes del bloque final.
+        """
+        with open(ruta, 'rb') as file:
+            cabecera = file.read(cls._CABECERA.size)
+            if len(cabecera) < cls._CABECERA.size:
+                raise ValueError("Archivo columnar truncado")
+            magico, version, flags = cls._CABECERA.unpack(cabecera)
+            if magico != cls.MAGICO or version != cls.VERSION:
+                raise ValueError("No es un archivo columnar del catalogo")
+            con_contenidos = bool(flags & cls.CON_CONTENIDOS)
+            columnas = 6 if con_contenidos else 5
+
+            while True:
+                encabezado = file.read(cls._BLOQUE.size)
+                if len(encabezado) < cls._BLOQUE.size:
+                    raise ValueError("Archivo columnar truncado")
+                cantidad, crc = cls._BLOQUE.unpack(encabezado)
+                if cantidad == 0:
+                    return
+                comprimidas = []
+                for _ in range(columnas):
+                    longitud = file.read(cls._LONGITUD.size)
+                    if len(longitud) < cls._LONGITUD.size:
+                        raise ValueError("Archivo columnar truncado")
+                    longitud, = cls._LONGITUD.unpack(longitud)
+                    comprimidas.append(file.read(longitud))
+                    if len(comprimidas[-1]) < longitud:
+                        raise ValueError("Archivo columnar truncado")
+                calculado = 0
+                for columna in comprimidas:
+                    calculado = zlib.crc32(columna, calculado)
+                if calculado != crc:
+                    raise ValueError("Bloque corrupto en el archivo columnar")
+                datos = [zlib.decompress(columna) for columna in comprimidas]
+
+                hash_ids = [valor.decode('utf-8') for valor in cls._leer_cadenas(datos[0], cantidad)]
+                titulos = [valor.decode('utf-8') for valor in cls._leer_cadenas(datos[1], cantidad)]
+                distintos = cls._LONGITUD.unpack_from(datos[2])[0]
+                diccionario = [sys.intern(valor.decode('utf-8'))
+                               for valor in cls._leer_cadenas(datos[2][4:], distintos)]
+                indices = array('I')
+                indices.frombytes(datos[2][len(datos[2]) - 4 * cantidad:])
+                _little_endian(indices)
+                años = array('i')
+                años.frombytes(datos[3])
+                _little_endian(años)
+                archivos = [valor.decode('utf-8') for valor in cls._leer_cadenas(datos[4], cantidad)]
+                cuerpos = (cls._leer_cadenas(datos[5], cantidad) if con_contenidos
+                           else [None] * cantidad)
+                yield from zip(hash_ids, titulos, [diccionario[i] for i in indices], años,
+                               archivos, cuerpos)
+
+
+def _cargar_pyarrow():
+    """Importar pyarrow la primera vez que se necesita; devuelve el modulo o None"""
+    global pa, pq, _pyarrow_buscado
+    if not _pyarrow_buscado:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            pa = pq = None
+        _pyarrow_buscado = True
+    return pa
+
+
+def _esquema_arrow(contenidos):
+    campos = [("hash_id", pa.string()), ("titulo", pa.string()), ("autores", pa.string()),
+              ("año", pa.int32()), ("archivo", pa.string())]
+    if contenidos:
+        campos.append(("contenido", pa.binary()))
+    return pa.schema(campos)
+
+
+def _escribir_arrow(ruta, registros, formato, contenidos, lote):
+    """Escribir Parquet o Arrow IPC por lotes (un row group o record batch por lote)"""
+    esquema = _esquema_arrow(contenidos)
+    total = 0
+    with _reemplazo_atomico(ruta) as temporal:
+        if formato == "parquet":
+            escritor = pq.ParquetWriter(temporal, esquema, compression="zstd")
+        else:
+            escritor = pa.ipc.new_file(temporal, esquema)
+        with escritor:
+            for bloque in _lotes(registros, lote):
+                columnas = list(zip(*bloque))[:len(esquema)]
+                escritor.write_batch(pa.record_batch(
+                    [pa.array(columna, tipo) for columna, tipo in zip(columnas, esquema.types)],
+                    schema=esquema))
+                total += len(bloque)
+    return total
+
+
+def _leer_arrow(ruta, formato, lote):
+    if formato == "parquet":
+        lotes = pq.ParquetFile(ruta).iter_batches(batch_size=lote)
+    else:
+        lector = pa.ipc.open_file(pa.memory_map(ruta))
+        lotes = (lector.get_batch(i) for i in range(lector.num_record_batches))
+    for bloque in lotes:
+        columnas = [columna.to_pylist() for columna in bloque.columns]
+        if len(columnas) == 5:
+            columnas.append([None] * bloque.num_rows)
+        yield from zip(*columnas)
+
+
+def _escribir_jsonl(ruta, registros):
+    total = 0
+    with _reemplazo_atomico(ruta) as temporal, open(temporal, 'w', encoding='utf-8') as file:
+        for hash_id, titulo, autores, año, archivo, contenido in registros:
+            fila = {"hash_id": hash_id, "titulo": titulo, "autores": autores, "año": año,
+                    "archivo": archivo}
+            if contenido is not None:
+                try:
+                    fila["contenido"] = contenido.decode('utf-8')
+                except UnicodeDecodeError:
+                    fila["contenido_base64"] = base64.b64encode(contenido).decode('ascii')
+            file.write(json.dumps(fila, ensure_ascii=False))
+            file.write("\n")
+            total += 1
+    return total
+
+
+def _leer_jsonl(ruta):
+    with open(ruta, encoding='utf-8') as file:
+        for numero, linea in enumerate(file, 1):
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+                contenido = fila.get("contenido")
+                if contenido is not None:
+                    contenido = contenido.encode('utf-8')
+                elif fila.get("contenido_base64") is not None:
+                    contenido = base64.b64decode(fila["contenido_base64"])
+                registro = (fila["hash_id"], fila["titulo"], fila["autores"], int(fila["año"]),
+                            fila["archivo"], contenido)
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Linea {numero} invalida: {e}") from None
+            yield registro
+
+
+# Extension -> formato de exportacion; parquet y arrow requieren pyarrow
+FORMATOS_EXPORTACION = {".jsonl": "jsonl", ".acb": "columnar", ".parquet": "parquet",
+                        ".arrow": "arrow"}
+
+
+def formato_exportacion(ruta, formato=None):
+    """Validar ``formato`` o deducirlo de la extension de ``ruta``"""
+    formato = formato or FORMATOS_EXPORTACION.get(os.path.splitext(ruta)[1].lower())
+    if formato not in FORMATOS_EXPORTACION.values():
+        raise ValueError(f"Formato desconocido para {ruta}; use uno de: "
+                         f"{', '.join(FORMATOS_EXPORTACION.values())}")
+    if formato in ("parquet", "arrow") and _cargar_pyarrow() is None:
+        raise ValueError(f"El formato {formato} requiere pyarrow")
+    return formato
+
+
+def escribir_exportacion(ruta, registros, formato=None, contenidos=False, lote=4096):
+    """Escribir registros ``(hash_id, titulo, autores, año, archivo, contenido)``
+
+    ``registros`` puede ser un generador: se consume de a ``lote``
+    registros. ``contenido`` es bytes o None; solo se guarda con
+    ``contenidos``. Devuelve la cantidad de registros escritos.
+    """
+    formato = formato_exportacion(ruta, formato)
+    if not contenidos:
+        registros = (registro[:5] + (None,) for registro in registros)
+    if formato == "jsonl":
+        return _escribir_jsonl(ruta, registros)
+    if formato == "columnar":
+        return ArchivoColumnar.escribir(ruta, registros, contenidos, lote)
+    return _escribir_arrow(ruta, registros, formato, contenidos, lote)
+
+
+def leer_exportacion(ruta, formato=None, lote=4096):
+    """Generar los registros de una exportacion; ``contenido`` es None si no se guardo"""
+    formato = formato_exportacion(ruta, formato)
+    if formato == "jsonl":
+        return _leer_jsonl(ruta)
+    if formato == "columnar":
+        return ArchivoColumnar.leer(ruta)
+    return _leer_arrow(ruta, formato, lote)
+
+
+class BloqueoLecturaEscritura:
+    """Bloqueo de varios lectores o un solo escritor, reentrante por hilo
+
+    Da preferencia a los escritores: un escritor en espera frena a los
+    lectores nuevos. Un hilo que ya tiene el bloqueo (de lectura o de
+    escritura) puede volver a tomar lectura sin esperar; pasar de lectura a
+    escritura no esta permitido.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition()
+        self._lectores = 0
+        self._escritor = None
+        self._profundidad = 0
+        self._escritores_esperando = 0
+        self._local = threading.local()
+
+    def _lecturas(self):
+        if not hasattr(self._local, "lecturas"):
+            self._local.lecturas = []
+        return self._local.lecturas
+
+    def adquirir_lectura(self):
+        lecturas = self._lecturas()
+        if lecturas or self._escritor == threading.get_ident():
+            lecturas.append(False)  # Ya protegido: no cuenta como lector nuevo
+            return
+        with self._condicion:
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        lecturas.append(True)
+
+    def liberar_lectura(self):
+        if self._lecturas().pop():
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    def adquirir_escritura(self):
+        yo = threading.get_ident()
+        if self._escritor == yo:
+            self._profundidad += 1
+            return
+        if any(self._lecturas()):
+            raise RuntimeError("No se puede pasar de lectura a escritura")
+        with self._condicion:
+            self._escritores_esperando += 1
+            while self._escritor is not None or self._lectores:
+                self._condicion.wait()
+            self._escritores_esperando -= 1
+            self._escritor = yo
+            self._profundidad = 1
+
+    def liberar_escritura(self):
+        self._profundidad -= 1
+        if not self._profundidad:
+            with self._condicion:
+                self._escritor = None
+                self._condicion.notify_all()
+
+    @contextlib.contextmanager
+    def lectura(self):
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+
+    @contextlib.contextmanager
+    def escritura(self):
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
+
+
+def _con_escritura(metodo):
+    """Ejecutar un metodo del gestor como unico escritor"""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self.lock.escritura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _con_lectura(metodo):
+    """Ejecutar una consulta del gestor junto a otros lectores
+
+    Si los indices secundarios aun no existen se construyen antes, como
+    escritor, porque no se puede pasar de lectura a escritura. Cuando las
+    consultas se delegan al almacenamiento no hacen falta.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if not self._indices_listos and not self.consultas_delegadas:
+            with self.lock.escritura():
+                self._asegurar_indices()
+        with self.lock.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _con_analitica(metodo):
+    """Consulta sobre las columnas analiticas, construyendolas antes si faltan"""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if self.analitica is None:
+            with self.lock.escritura():
+                self._asegurar_analitica()
+        with self.lock.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _orden_aproximado(resultado):
+    """Orden de los resultados aproximados: mas parecidos primero, luego por titulo"""
+    articulo, similitud = resultado
+    return -similitud, articulo.titulo.lower(), articulo.hash_id
+
+
+def _con_trigramas(metodo):
+    """Consulta aproximada, construyendo antes los indices de trigramas si faltan"""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if self.trigramas_autores is None:
+            with self.lock.escritura():
+                self._asegurar_trigramas()
+        with self.lock.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+class Metricas:
+    """Contadores e histogramas de latencia en memoria, al estilo Prometheus
+
+    Cada serie se identifica por nombre y etiquetas (una tupla de pares
+    ``(clave, valor)``). Los histogramas usan cubetas fijas, asi registrar
+    una observacion cuesta una busqueda binaria y no guarda las muestras;
+    los percentiles se estiman con el limite superior de la cubeta. Los
+    colectores agregan valores instantaneos (gauges) al leer las metricas.
+    """
+
+    LIMITES_SEGUNDOS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                        1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    LIMITES_SONDEO = (1, 2, 3, 4, 6, 8, 12, 16, 32, 64)
+
+    def __init__(self, errores_recientes=50):
+        self._lock = threading.Lock()
+        self._contadores = {}  # (nombre, etiquetas) -> valor
+        self._histogramas = {}  # (nombre, etiquetas) -> [limites, cubetas, suma, maximo]
+        self._colectores = []
+        self.errores = deque(maxlen=errores_recientes)  # (fecha, operacion, mensaje)
+        self.inicio = time.time()
+
+    def contar(self, nombre, etiquetas=(), valor=1):
+        clave = (nombre, etiquetas)
+        with self._lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + valor
+
+    def observar(self, nombre, valor, etiquetas=(), limites=LIMITES_SEGUNDOS):
+        clave = (nombre, etiquetas)
+        with self._lock:
+            histograma = self._histogramas.get(clave)
+            if histograma is None:
+                histograma = self._histogramas[clave] = [limites, [0] * (len(limites) + 1), 0, 0]
+            histograma[1][bisect.bisect_left(histograma[0], valor)] += 1
+            histograma[2] += valor
+            if valor > histograma[3]:
+                histograma[3] = valor
+
+    def registrar_error(self, operacion, error):
+        self.contar("errores_total", (("operacion", operacion),))
+        self.errores.append((datetime.now().isoformat(timespec="seconds"), operacion, str(error)))
+
+    def agregar_colector(self, colector):
+        """``colector()`` devuelve ``[(nombre, etiquetas, valor)]`` al leer"""
+        self._colectores.append(colector)
+
+    @contextlib.contextmanager
+    def cronometro(self, nombre, etiquetas=()):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nombre, time.perf_counter() - inicio, etiquetas)
+
+    def envolver(self, funcion, nombre, etiquetas=(), contador=None):
+        """Version de ``funcion`` que registra su latencia en ``nombre``
+
+        Con ``contador`` tambien cuenta las llamadas por resultado: "error"
+        si lanza una excepcion, "fallo" si devuelve ``(False, mensaje)`` y
+        "ok" en otro caso.
+        """
+        reloj = time.perf_counter
+        resultados = {resultado: etiquetas + (("resultado", resultado),)
+                      for resultado in ("ok", "fallo", "error")}
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = reloj()
+            resultado = "error"
+            try:
+                valor = funcion(*args, **kwargs)
+                resultado = ("fallo" if isinstance(valor, tuple) and len(valor) == 2
+                             and valor[0] is False else "ok")
+                return valor
+            finally:
+                self.observar(nombre, reloj() - inicio, etiquetas)
+                if contador:
+                    self.contar(contador, resultados[resultado])
+        return envoltura
+
+    def reiniciar(self):
+        with self._lock:
+            self._contadores.clear()
+            self._histogramas.clear()
+            self.errores.clear()
+            self.inicio = time.time()
+
+    def _valores(self):
+        """Copia consistente de contadores e histogramas, mas los gauges"""
+        with self._lock:
+            contadores = dict(self._contadores)
+            histogramas = {clave: (h[0], list(h[1]), h[2], h[3])
+                           for clave, h in self._histogramas.items()}
+        gauges = {}
+        for colector in self._colectores:
+            for nombre, etiquetas, valor in colector():
+                gauges[(nombre, etiquetas)] = valor
+        return contadores, histogramas, gauges
+
+    @staticmethod
+    def _serie(nombre, etiquetas):
+        if not etiquetas:
+            return nombre
+        def escapar(valor):
+            return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return nombre + "{" + ",".join(f'{k}="{escapar(v)}"' for k, v in etiquetas) + "}"
+
+    @staticmethod
+    def _percentil(limites, cubetas, maximo, fraccion):
+        objetivo = fraccion * sum(cubetas)
+        acumulado = 0
+        for limite, cantidad in zip(limites, cubetas):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return min(limite, maximo)
+        return maximo
+
+    def instantanea(self):
+        """Metricas como dict serializable a JSON (para APIs y diagnostico)"""
+        contadores, histogramas, gauges = self._valores()
+        resumen = {}
+        for (nombre, etiquetas), (limites, cubetas, suma, maximo) in sorted(histogramas.items()):
+            cantidad = sum(cubetas)
+            resumen[self._serie(nombre, etiquetas)] = {
+                "cantidad": cantidad,
+                "suma": suma,
+                "media": suma / cantidad if cantidad else 0,
+                "p50": self._percentil(limites, cubetas, maximo, 0.50),
+                "p95": self._percentil(limites, cubetas, maximo, 0.95),
+                "p99": self._percentil(limites, cubetas, maximo, 0.99),
+                "maximo": maximo,
+            }
+        return {
+            "segundos_activo": time.time() - self.inicio,
+            "contadores": {self._serie(n, e): v for (n, e), v in sorted(contadores.items())},
+            "gauges": {self._serie(n, e): v for (n, e), v in sorted(gauges.items())},
+            "histogramas": resumen,
+            "errores": list(self.errores),
+        }
+
+    def prometheus(self):
+        """Volcado en el formato de texto de exposicion de Prometheus"""
+        contadores, histogramas, gauges = self._valores()
+        lineas = []
+        tipos = set()
+
+        def tipo(nombre, clase):
+            if nombre not in tipos:
+                tipos.add(nombre)
+                lineas.append(f"# TYPE {nombre} {clase}")
+
+        for (nombre, etiquetas), valor in sorted(contadores.items()):
+            tipo(nombre, "counter")
+            lineas.append(f"{self._serie(nombre, etiquetas)} {valor}")
+        for (nombre, etiquetas), valor in sorted(gauges.items()):
+            tipo(nombre, "gauge")
+            lineas.append(f"{self._serie(nombre, etiquetas)} {valor}")
+        for (nombre, etiquetas), (limites, cubetas, suma, _) in sorted(histogramas.items()):
+            tipo(nombre, "histogram")
+            acumulado = 0
+            for limite, cantidad in zip(limites + ("+Inf",), cubetas):
+                acumulado += cantidad
+                lineas.append(f"{self._serie(nombre + '_bucket', etiquetas + (('le', limite),))} "
+                              f"{acumulado}")
+            lineas.append(f"{self._serie(nombre + '_sum', etiquetas)} {suma}")
+            lineas.append(f"{self._serie(nombre + '_count', etiquetas)} {acumulado}")
+        return "\n".join(lineas) + "\n"
+
+
+_SIN_MEDICION = contextlib.nullcontext()  # Reutilizable: no guarda estado
+
+
+class _Transaccion:
+    """Estado de una transaccion del gestor (ver ``GestorArticulos.transaccion``)"""
+
+    __slots__ = ("registros", "deshacer", "archivos_borrar", "mutaciones", "reconstruir")
+
+    def __init__(self):
+        self.registros = []  # Registros del journal, se escriben al confirmar
+        self.deshacer = []  # (funcion, args) en orden de aplicacion
+        self.archivos_borrar = []  # Cuerpos de articulos eliminados
+        self.mutaciones = 0
+        self.reconstruir = False  # Indices secundarios suspendidos durante la transaccion
+
+
+class GestorArticulos:
+    """Gestor principal de articulos cientificos"""
+
+    # Operaciones publicas medidas con ``metricas`` activas (latencia y resultado)
+    OPERACIONES_MEDIDAS = (
+        "cargar_base_datos", "guardar_base_datos", "compactar", "agregar_articulo",
+        "modificar_articulo", "eliminar_articulo", "renombrar_autor", "importar_filas",
+        "verificar_almacen", "guardar_instantanea",
+        "obtener_articulo", "buscar_por_autor", "buscar_por_año", "listar_por_titulo",
+        "listar_por_autor", "nombres_con_prefijo", "buscar", "buscar_texto", "casi_duplicados",
+        "vista_previa", "conteo_por_año", "top_autores", "histograma_años", "reporte_catalogo",
+        "exportar", "importar_catalogo", "buscar_aproximado", "sugerir_autores")
+    # Fases internas: metodo -> nombre de la fase
+    FASES_MEDIDAS = {"calcular_hash_archivo": "hash", "_indexar": "indices",
+                     "_desindexar": "indices", "_asegurar_indices": "indices_secundarios",
+                     "_indexar_texto": "texto_completo", "_firma": "similitud",
+                     "_asegurar_analitica": "analitica", "_asegurar_trigramas": "trigramas"}
+    PERSISTENCIA_MEDIDA = ("registrar", "volcar", "compactar")
+    VISTA_PREVIA = 4000  # Caracteres de la vista previa de un articulo
+
+    def __init__(self, db_file="articulos_db.txt", articulos_dir="articulos",
+                 usar_journal=True, fsync_journal=False, algoritmo_hash="fnv1-32",
+                 texto_completo=True, carga_perezosa=False, almacenamiento="texto",
+                 umbral_similitud=None, rechazar_similares=False, metricas=False,
+                 instantanea=True, presupuesto_contenidos=32 << 20):
+        if algoritmo_hash not in ALGORITMOS_HASH:
+            raise ValueError(f"Algoritmo de hash desconocido: {algoritmo_hash}")
+        if almacenamiento not in ALMACENAMIENTOS:
+            raise ValueError(f"Almacenamiento desconocido: {almacenamiento}")
+        self.algoritmo_hash = algoritmo_hash  # Fijo por catalogo: define los hash_id
+        self.tabla_hash = HashTable(200)  # Tabla hash principal
+        self.indice_autores = defaultdict(list)  # Indice secundario por autor
+        self.indice_años = defaultdict(list)  # Indice secundario por año
+        # Indices ordenados para listar sin reordenar en cada consulta
+        self.orden_titulos = ListaOrdenada()  # (titulo, hash_id, articulo)
+        self.orden_autores = ListaOrdenada()  # (autores, titulo, hash_id, articulo)
+        # Indice invertido por autor individual y nombres ordenados para prefijos
+        self.indice_invertido_autores = defaultdict(set)  # nombre -> {hash_id}
+        self.nombres_autores = ListaOrdenada()  # (nombre,)
+        self.años_ordenados = []  # Años distintos, para consultas por rango
+        # Los indices secundarios se construyen de una vez tras la carga
+        self._indices_listos = False
+        # Columnas para estadisticas; se construyen en la primera consulta
+        self.analitica = None
+        # Trigramas de autores individuales y titulos para la busqueda aproximada;
+        # tambien se construyen en la primera consulta
+        self.trigramas_autores = self.trigramas_titulos = None
+        self.carga_perezosa = carga_perezosa
+        self.db_file = db_file
+        self.articulos_dir = articulos_dir
+
+        # Varios lectores o un solo escritor sobre la tabla hash y los indices
+        self.lock = BloqueoLecturaEscritura()
+        self._transaccion = None  # Transaccion en curso del hilo escritor
+
+        # Donde se persiste el catalogo: texto con journal o SQLite
+        if almacenamiento == "sqlite":
+            self.almacenamiento = AlmacenamientoSQLite(db_file, sincrono=fsync_journal)
+        else:
+            self.almacenamiento = AlmacenamientoTexto(db_file, usar_journal, fsync_journal)
+        # Con SQLite en carga perezosa las consultas se resuelven con SQL y
+        # los indices secundarios en memoria nunca se construyen
+        self.consultas_delegadas = carga_perezosa and self.almacenamiento.consultas_indexadas
+        self._consultas = self.almacenamiento  # Quien resuelve las consultas delegadas
+        # Copia binaria del catalogo ya indexado (solo texto): un arranque en
+        # caliente la mapea en lugar de parsear la base y construir indices
+        self.ruta_instantanea = db_file + ".snap" if instantanea and almacenamiento == "texto" else None
+        self.instantanea = None
+
+        # Crear directorio de articulos si no existe
+        if not os.path.exists(self.articulos_dir):
+            os.makedirs(self.articulos_dir)
+        # Cuerpos recientes para la vista previa, con presupuesto en bytes
+        self.contenidos = CacheContenidos(presupuesto_contenidos)
+
+        # Instrumentacion opcional; apagada no agrega costo a las operaciones
+        self.metricas = None
+        if metricas:
+            self.activar_metricas(metricas if isinstance(metricas, Metricas) else None)
+
+        self.cargar_base_datos()
+
+        # Indice de texto completo sobre los cuerpos de los articulos
+        self.texto_completo = None
+        if texto_completo:
+            self.texto_completo = IndiceTextoCompleto(db_file + ".fti", self._reportar_error)
+            self._sincronizar_texto_completo()
+
+        # Indice de casi duplicados (MinHash/LSH), solo si se pide un umbral;
+        # las altas por encima del umbral se avisan o, si se pide, se rechazan
+        self.similitud = None
+        self.rechazar_similares = rechazar_similares
+        if umbral_similitud is not None:
+            self.similitud = IndiceSimilitud(db_file + ".minhash", umbral_similitud,
+                                             reportar_error=self._reportar_error)
+            self._sincronizar_similitud()
+
+    def activar_metricas(self, metricas=None):
+        """Registrar latencias, resultados y errores en ``metricas``
+
+        Envuelve en la instancia las operaciones publicas, las fases
+        internas (hash, indices, texto completo, similitud), la persistencia
+        del almacenamiento y la tabla hash principal. Devuelve las metricas.
+        """
+        self.desactivar_metricas()
+        self.metricas = metricas = metricas or Metricas()
+        for nombre in self.OPERACIONES_MEDIDAS:
+            setattr(self, nombre, metricas.envolver(
+                getattr(self, nombre), "gestor_operacion_segundos",
+                (("operacion", nombre),), contador="gestor_operaciones_total"))
+        for nombre, fase in self.FASES_MEDIDAS.items():
+            setattr(self, nombre, metricas.envolver(getattr(self, nombre), "gestor_fase_segundos",
+                                                    (("fase", fase),)))
+        for nombre in self.PERSISTENCIA_MEDIDA:
+            setattr(self.almacenamiento, nombre, metricas.envolver(
+                getattr(self.almacenamiento, nombre), "almacenamiento_segundos",
+                (("almacenamiento", self.almacenamiento.nombre), ("operacion", nombre))))
+        self.tabla_hash.instrumentar(metricas, "articulos")
+        metricas.agregar_colector(self._colectar_metricas)
+        return metricas
+
+    def desactivar_metricas(self):
+        """Quitar la instrumentacion y volver a los metodos originales"""
+        if self.metricas is None:
+            return
+        for nombre in self.OPERACIONES_MEDIDAS + tuple(self.FASES_MEDIDAS):
+            self.__dict__.pop(nombre, None)
+        for nombre in self.PERSISTENCIA_MEDIDA:
+            self.almacenamiento.__dict__.pop(nombre, None)
+        self.tabla_hash.instrumentar(None)
+        self.metricas = None
+
+    def _colectar_metricas(self):
+        """Valores instantaneos para ``Metricas`` (gauges)"""
+        tabla = (("tabla", "articulos"),)
+        valores = [("gestor_articulos", (), len(self.tabla_hash)),
+                   ("hashtable_cubetas", tabla, self.tabla_hash.size),
+                   ("hashtable_factor_carga", tabla, self.tabla_hash.load_factor),
+                   ("hashtable_redimensionamientos", tabla, self.tabla_hash.resize_count),
+                   ("hashtable_sondeo_maximo_insercion", tabla, self.tabla_hash.max_probe_length),
+                   ("gestor_indices_listos", (), int(self._indices_listos))]
+        cache = self.contenidos.estadisticas()
+        valores += [(f"gestor_cache_contenidos_{clave}", (), cache[clave])
+                    for clave in ("bytes", "entradas", "aciertos", "fallos", "precargados",
+                                  "desalojos")]
+        if self.texto_completo is not None:
+            valores.append(("gestor_texto_completo_documentos", (),
+                            len(self.texto_completo.documentos())))
+        if self.similitud is not None:
+            valores.append(("gestor_similitud_documentos", (), len(self.similitud.documentos())))
+        return valores
+
+    def _medir(self, fase):
+        """Cronometro de una fase interna, o un contexto vacio sin metricas"""
+        if self.metricas is None:
+            return _SIN_MEDICION
+        return self.metricas.cronometro("gestor_fase_segundos", (("fase", fase),))
+
+    def _reportar_error(self, operacion, error):
+        """Informar un error recuperado por stderr y contarlo si hay metricas"""
+        _reportar_en_stderr(operacion, error)
+        if self.metricas is not None:
+            self.metricas.registrar_error(operacion, error)
+
+    def calcular_hash_fnv1(self, contenido):
+        """Implementacion del algoritmo FNV-1 para generar hash"""
+        bits, variante_a = ALGORITMOS_HASH[self.algoritmo_hash]
+        hasher = HasherFNV(bits, variante_a)
+        hasher.update(contenido.encode('utf-8'))
+        return hasher.digest_str()
+
+    def calcular_hash_archivo(self, ruta_archivo):
+        """Calcular el hash del archivo por bloques, sin cargarlo completo"""
+        return hash_archivo_fnv(ruta_archivo, self.algoritmo_hash)
+
+    def cargar_base_datos(self):
+        """Cargar articulos desde la base de datos y reaplicar el journal
+
+        En modo de carga perezosa solo se registra cada hash_id con su
+        posicion; cada articulo se lee en su primer acceso y los indices
+        secundarios se construyen en la primera consulta que los necesite.
+        Con una instantanea al dia con la base no se lee la base: se mapea
+        la instantanea y las consultas se resuelven sobre ella.
+        """
+        if not self._cargar_instantanea():
+            try:
+                self._insertar_masivo(self.almacenamiento.cargar(self.carga_perezosa))
+            except Exception as e:
+                self._reportar_error("cargar_base_de_datos", e)
+
+        self._reaplicar_journal()
+        if not self.carga_perezosa and not self.consultas_delegadas:
+            self._asegurar_indices()
+
+    def _cargar_instantanea(self):
+        """Mapear la instantanea si sigue al dia con la base; False si no sirve"""
+        if self.ruta_instantanea is None:
+            return False
+        instantanea = InstantaneaCatalogo.abrir(self.ruta_instantanea, self.db_file,
+                                                self._reportar_error)
+        if instantanea is None:
+            return False
+        self.instantanea = instantanea
+        self.tabla_hash = TablaInstantanea(instantanea)
+        if self.metricas is not None:
+            self.tabla_hash.instrumentar(self.metricas, "articulos")
+        self.consultas_delegadas = True
+        self._consultas = instantanea
+        return True
+
+    def _dejar_instantanea(self):
+        """Tras la primera mutacion las consultas pasan a los indices en memoria
+
+        La instantanea sigue respaldando la tabla hash; los indices se
+        construyen desde ella en la siguiente consulta que los necesite.
+        """
+        self.consultas_delegadas = False
+        self._consultas = self.almacenamiento
+
+    def _insertar_masivo(self, articulos):
+        """Insertar muchos articulos en la tabla hash dimensionandola una vez"""
+        self.tabla_hash.reserve(self.tabla_hash.count + len(articulos))
+        insertar = self.tabla_hash.insert
+        for articulo in articulos:
+            insertar(articulo.hash_id, articulo)
+
+    def _reaplicar_journal(self):
+        """Aplicar en orden los registros del journal sobre el snapshot cargado"""
+        try:
+            for partes in self.almacenamiento.registros_pendientes():
+                self._aplicar_registro(partes)
+        except Exception as e:
+            self._reportar_error("reaplicar_journal", e)
+
+    def _aplicar_registro(self, partes):
+        """Aplicar un registro del journal (idempotente)"""
+        operacion = partes[0]
+        if operacion == 'A' and len(partes) == 6:
+            _, hash_id, titulo, autores, año, archivo_nombre = partes
+            anterior = self.tabla_hash.get(hash_id)
+            if anterior:
+                self._desindexar(anterior)
+            self._indexar(Articulo(hash_id, titulo, autores, int(año), archivo_nombre))
+        elif operacion == 'M' and len(partes) == 4:
+            _, hash_id, autores, año = partes
+            articulo = self.tabla_hash.get(hash_id)
+            if articulo:
+                self._desindexar(articulo)
+                articulo.autores = autores
+                articulo.año = int(año)
+                self._indexar(articulo)
+        elif operacion == 'D' and len(partes) == 2:
+            articulo = self.tabla_hash.get(partes[1])
+            if articulo:
+                self._desindexar(articulo)
+
+    @staticmethod
+    def _clave_titulo(articulo):
+        return articulo.titulo.lower(), articulo.hash_id
+
+    def _asegurar_indices(self):
+        """Construir los indices secundarios de una vez si aun no existen
+
+        Se ordena una sola vez todo el catalogo en lugar de insertar uno a
+        uno; las listas por autor y por año quedan ordenadas por titulo.
+        """
+        if self._indices_listos:
+            return
+        self._indices_listos = True
+        clave = self._clave_titulo
+        por_titulo = sorted(self.tabla_hash.get_all_values(), key=clave)
+
+        self.indice_autores = defaultdict(list)
+        self.indice_años = defaultdict(list)
+        self.indice_invertido_autores = defaultdict(set)
+        for articulo in por_titulo:
+            self.indice_autores[articulo.autores.lower()].append(articulo)
+            self.indice_años[articulo.año].append(articulo)
+            for nombre in separar_autores(articulo.autores):
+                self.indice_invertido_autores[nombre].add(articulo.hash_id)
+
+        self.orden_titulos = ListaOrdenada(clave(a) + (a,) for a in por_titulo)
+        self.orden_autores = ListaOrdenada((a.autores.lower(),) + clave(a) + (a,) for a in por_titulo)
+        self.nombres_autores = ListaOrdenada((nombre,) for nombre in self.indice_invertido_autores)
+        self.años_ordenados = sorted(self.indice_años)
+
+    def _indexar(self, articulo):
+        """Insertar articulo en la tabla hash y en los indices secundarios"""
+        if self._consultas is self.instantanea:
+            self._dejar_instantanea()
+        self.tabla_hash.insert(articulo.hash_id, articulo)
+        if self.analitica is not None:
+            self.analitica.agregar(articulo)
+        if self.trigramas_autores is not None:
+            self._indexar_trigramas(articulo)
+        if not self._indices_listos:
+            return
+        clave = self._clave_titulo(articulo)
+        # Las listas por autor y por año se mantienen ordenadas por titulo
+        bisect.insort(self.indice_autores[articulo.autores.lower()], articulo, key=self._clave_titulo)
+        bisect.insort(self.indice_años[articulo.año], articulo, key=self._clave_titulo)
+        self.orden_titulos.agregar(clave + (articulo,))
+        self.orden_autores.agregar((articulo.autores.lower(),) + clave + (articulo,))
+
+        for nombre in separar_autores(articulo.autores):
+            ids = self.indice_invertido_autores[nombre]
+            if not ids:
+                self.nombres_autores.agregar((nombre,))
+            ids.add(articulo.hash_id)
+        if len(self.indice_años[articulo.año]) == 1:
+            bisect.insort(self.años_ordenados, articulo.año)
+
+    def _quitar_de_lista(self, indice, llave, articulo):
+        """Quitar un articulo de una lista de indice ordenada por titulo"""
+        lista = indice.get(llave)
+        if lista is None:
+            return
+        i = bisect.bisect_left(lista, self._clave_titulo(articulo), key=self._clave_titulo)
+        if i < len(lista) and lista[i] is articulo:
+            del lista[i]
+        elif articulo in lista:
+            lista.remove(articulo)
+        if not lista:
+            del indice[llave]
+
+    def _desindexar(self, articulo):
+        """Quitar articulo de la tabla hash y de los indices secundarios"""
+        if self._consultas is self.instantanea:
+            self._dejar_instantanea()
+        if self.analitica is not None:
+            self.analitica.quitar(articulo.hash_id)
+        if self.trigramas_autores is not None:
+            for nombre in separar_autores(articulo.autores):
+                self.trigramas_autores.quitar(nombre, articulo.hash_id)
+            self.trigramas_titulos.quitar(articulo.titulo, articulo.hash_id)
+        if not self._indices_listos:
+            self.tabla_hash.delete(articulo.hash_id)
+            return
+        clave = self._clave_titulo(articulo)
+        self._quitar_de_lista(self.indice_autores, articulo.autores.lower(), articulo)
+        self._quitar_de_lista(self.indice_años, articulo.año, articulo)
+        self.orden_titulos.eliminar(clave + (articulo,))
+        self.orden_autores.eliminar((articulo.autores.lower(),) + clave + (articulo,))
+
+        for nombre in separar_autores(articulo.autores):
+            ids = self.indice_invertido_autores.get(nombre)
+            if ids is None:
+                continue
+            ids.discard(articulo.hash_id)
+            if not ids:
+                del self.indice_invertido_autores[nombre]
+                self.nombres_autores.eliminar((nombre,))
+        if articulo.año not in self.indice_años:
+            i = bisect.bisect_left(self.años_ordenados, articulo.año)
+            if i < len(self.años_ordenados) and self.años_ordenados[i] == articulo.año:
+                del self.años_ordenados[i]
+
+        self.tabla_hash.delete(articulo.hash_id)
+
+    def guardar_base_datos(self):
+        """Guardar el catalogo completo en el almacenamiento"""
+        try:
+            self.almacenamiento.volcar(self.tabla_hash.get_all_values())
+        except Exception as e:
+            self._reportar_error("guardar_base_de_datos", e)
+            return False
+        return True
+
+    @_con_escritura
+    def compactar(self):
+        """Volcar el estado actual a un nuevo snapshot y vaciar el journal
+
+        Con SQLite no hay snapshot que reescribir: solo se vacia el WAL.
+        """
+        try:
+            self.almacenamiento.compactar(self.tabla_hash.get_all_values())
+        except Exception as e:
+            self._reportar_error("compactar_base_de_datos", e)
+            return False
+        self.guardar_indice_texto()
+        self.guardar_indice_similitud()
+        self.guardar_instantanea()
+        return True
+
+    @_con_escritura
+    def cerrar(self):
+        """Dejar todo persistido antes de salir"""
+        if self.almacenamiento.hay_pendientes():
+            self.compactar()
+        else:
+            self.guardar_indice_texto()
+            self.guardar_indice_similitud()
+            self.guardar_instantanea()
+        self.contenidos.cerrar()
+        self.almacenamiento.cerrar()
+
+    @_con_escritura
+    def guardar_instantanea(self):
+        """Escribir la instantanea binaria del catalogo si no esta al dia
+
+        Solo con almacenamiento de texto y sin registros pendientes en el
+        journal: la instantanea copia la base tal como quedo en disco.
+        """
+        if (self.ruta_instantanea is None or self.almacenamiento.hay_pendientes()
+                or not os.path.exists(self.db_file)):
+            return False
+        if self._consultas is self.instantanea and self.instantanea.vigente(self.db_file):
+            return True  # Mapeada y sin mutaciones desde entonces
+        try:
+            InstantaneaCatalogo.escribir(self.ruta_instantanea, self.tabla_hash.get_all_values(),
+                                         self.db_file)
+        except Exception as e:
+            self._reportar_error("guardar_instantanea", e)
+            return False
+        return True
+
+    def leer_contenido(self, articulo):
+        """Leer el texto almacenado de un articulo"""
+        ruta = os.path.join(self.articulos_dir, articulo.archivo_nombre)
+        with open(ruta, 'r', encoding='utf-8') as file:
+            return file.read()
+
+    def _ruta_contenido(self, hash_id):
+        with self.lock.lectura():
+            articulo = self.tabla_hash.get(hash_id)
+            return None if articulo is None else os.path.join(self.articulos_dir,
+                                                              articulo.archivo_nombre)
+
+    def vista_previa(self, hash_id, caracteres=VISTA_PREVIA):
+        """Comienzo del texto de un articulo, leido a traves de la cache
+
+        Devuelve None si el articulo no existe y lanza OSError si su archivo
+        no se puede leer. De un contenido binario solo se informa el tamaño.
+        """
+        ruta = self._ruta_contenido(hash_id)
+        if ruta is None:
+            return None
+        datos = self.contenidos.obtener(ruta)
+        # Un caracter UTF-8 ocupa hasta 4 bytes; el decodificador incremental
+        # descarta el caracter que el corte deja a medias
+        try:
+            texto = codecs.getincrementaldecoder('utf-8')().decode(datos[:4 * caracteres])
+        except UnicodeDecodeError:
+            return f"(Contenido binario, {len(datos)} bytes)"
+        if len(texto) > caracteres or len(datos) > 4 * caracteres:
+            return texto[:caracteres] + "\n[...]"
+        return texto
+
+    def precargar_contenidos(self, hash_ids):
+        """Leer en segundo plano los cuerpos de estos articulos"""
+        rutas = (self._ruta_contenido(hash_id) for hash_id in hash_ids)
+        self.contenidos.precargar([ruta for ruta in rutas if ruta is not None])
+
+    def _indexar_texto(self, articulo):
+        if self.texto_completo is None:
+            return
+        try:
+            self.texto_completo.agregar(articulo.hash_id, self.leer_contenido(articulo))
+        except UnicodeDecodeError:
+            pass  # Contenido binario (p. ej. un PDF): no hay texto que indexar
+        except OSError as e:
+            self._reportar_error("indexar_texto", f"{articulo.hash_id}: {e}")
+
+    def _sincronizar_texto_completo(self):
+        """Reconciliar el indice de texto con el catalogo tras cargarlo
+
+        Cubre los cambios reaplicados desde el journal o hechos sin guardar
+        el indice: solo se leen los articulos que faltan.
+        """
+        indexados = self.texto_completo.documentos()
+        catalogo = set(self.tabla_hash.keys())
+        for hash_id in indexados - catalogo:
+            self.texto_completo.eliminar(hash_id)
+        for hash_id in catalogo - indexados:
+            self._indexar_texto(self.tabla_hash.get(hash_id))
+        self.guardar_indice_texto()
+
+    def guardar_indice_texto(self):
+        """Persistir el indice de texto completo si tuvo cambios"""
+        if self.texto_completo is None:
+            return
+        try:
+            self.texto_completo.guardar()
+        except Exception as e:
+            self._reportar_error("guardar_indice_de_texto_completo", e)
+
+    def _firma(self, archivo_nombre):
+        """Firma MinHash de un archivo del almacen, o None sin indice de similitud"""
+        if self.similitud is None:
+            return None
+        return firma_de_archivo(os.path.join(self.articulos_dir, archivo_nombre),
+                                self.similitud.permutaciones, self.similitud.k)
+
+    def _sincronizar_similitud(self):
+        """Reconciliar las firmas con el catalogo: solo se leen las que faltan"""
+        firmados = self.similitud.documentos()
+        catalogo = set(self.tabla_hash.keys())
+        for hash_id in firmados - catalogo:
+            self.similitud.eliminar(hash_id)
+        for hash_id in catalogo - firmados:
+            firma = self._firma(self.tabla_hash.get(hash_id).archivo_nombre)
+            if firma is not None:
+                self.similitud.agregar(hash_id, firma)
+        self.guardar_indice_similitud()
+
+    def guardar_indice_similitud(self):
+        """Persistir las firmas MinHash si tuvieron cambios"""
+        if self.similitud is None:
+            return
+        try:
+            self.similitud.guardar()
+        except Exception as e:
+            self._reportar_error("guardar_indice_de_similitud", e)
+
+    def _casi_duplicado(self, firma):
+        """El articulo mas parecido por encima del umbral: (hash_id, similitud) o None"""
+        if firma is None:
+            return None
+        similares = self.similitud.similares(firma)
+        return similares[0] if similares else None
+
+    @_con_lectura
+    def casi_duplicados(self, umbral=None):
+        """Grupos de articulos casi duplicados de todo el catalogo
+
+        Devuelve listas de articulos (de mayor a menor grupo); requiere el
+        indice de similitud (``umbral_similitud``).
+        """
+        if self.similitud is None:
+            raise ValueError("El indice de similitud no esta habilitado")
+        return [self._articulos_por_ids(grupo) for grupo in self.similitud.grupos(umbral)]
+
+    @_con_lectura
+    def buscar_texto(self, consulta, limit=20):
+        """Buscar en el texto completo; devuelve pares (articulo, puntaje)"""
+        if self.texto_completo is None:
+            return []
+        resultados = []
+        for hash_id, puntaje in self.texto_completo.buscar(consulta, limit):
+            articulo = self.tabla_hash.get(hash_id)
+            if articulo:
+                resultados.append((articulo, puntaje))
+        return resultados
+
+    def _asegurar_analitica(self):
+        """Construir las columnas analiticas desde la tabla hash si aun no existen"""
+        if self.analitica is None:
+            self.analitica = AnaliticaCatalogo(self.tabla_hash.get_all_values())
+
+    def _indexar_trigramas(self, articulo):
+        for nombre, forma in nombres_autores(articulo.autores):
+            self.trigramas_autores.agregar(nombre, articulo.hash_id, forma)
+        self.trigramas_titulos.agregar(articulo.titulo, articulo.hash_id)
+
+    def _asegurar_trigramas(self):
+        """Construir los indices de trigramas desde la tabla hash si aun no existen"""
+        if self.trigramas_autores is None:
+            self.trigramas_autores = IndiceTrigramas()
+            self.trigramas_titulos = IndiceTrigramas()
+            for articulo in self.tabla_hash.get_all_values():
+                self._indexar_trigramas(articulo)
+
+    @_con_trigramas
+    def buscar_aproximado(self, consulta, campo=None, limit=20, umbral=0.5):
+        """Articulos cuyo autor o titulo se parece a ``consulta``: [(articulo, similitud)]
+
+        Tolera errores de tipeo y diferencias de acentos y mayusculas
+        ("Platon" encuentra a "Platón"). ``campo`` limita la comparacion a
+        "autor" (cada autor individual) o "titulo". La similitud es la
+        fraccion de trigramas de la consulta presentes en el mejor termino
+        del articulo (ver ``IndiceTrigramas``); a igual similitud se ordena
+        por titulo.
+        """
+        if campo not in (None, "autor", "titulo"):
+            raise ValueError(f"Campo desconocido: {campo}")
+        indices = [indice for nombre, indice in (("autor", self.trigramas_autores),
+                                                 ("titulo", self.trigramas_titulos))
+                   if campo in (None, nombre)]
+        terminos = limit
+        while True:
+            similitudes = {}
+            corte = 0  # Los articulos con similitud >= corte tienen su puntaje exacto
+            for indice in indices:
+                encontrados = indice.buscar(consulta, terminos, umbral, empates=True)
+                if len(encontrados) >= terminos:
+                    corte = max(corte, encontrados[-1][1])
+                for _, similitud, hash_ids in encontrados:
+                    for hash_id in hash_ids:
+                        if similitud > similitudes.get(hash_id, 0):
+                            similitudes[hash_id] = similitud
+            # Varios terminos pueden ser del mismo articulo: si por encima del
+            # corte no hay ``limit`` articulos, se piden mas terminos
+            if corte == 0 or sum(s >= corte for s in similitudes.values()) >= limit:
+                break
+            terminos *= 2
+        resultados = [(articulo, similitudes[articulo.hash_id])
+                      for articulo in self._articulos_por_ids(similitudes)]
+        return heapq.nsmallest(limit, resultados, key=_orden_aproximado)
+
+    @_con_trigramas
+    def sugerir_autores(self, prefijo, limit=10, umbral=0.5):
+        """Autores individuales que completan ``prefijo``: [(nombre, similitud)]
+
+        Pensado para sugerir mientras se escribe: tolera errores de tipeo y
+        acentos, y devuelve el nombre con su grafia original ("Platón", no
+        "platón"), listo para usar en ``buscar(autor=...)``. Los resultados
+        quedan en cache por prefijo hasta que cambia el conjunto de autores.
+        """
+        return self.trigramas_autores.sugerir(prefijo, limit, umbral)
+
+    @_con_analitica
+    def conteo_por_año(self):
+        """[(año, articulos)] de todo el catalogo, ordenado por año"""
+        return self.analitica.conteo_por_año()
+
+    @_con_analitica
+    def top_autores(self, k=20, año_desde=None, año_hasta=None):
+        """Los ``k`` autores individuales con mas articulos: [(nombre, articulos)]"""
+        return self.analitica.top_autores(k, año_desde, año_hasta)
+
+    @_con_analitica
+    def histograma_años(self, autor=None, ancho=1):
+        """Articulos por intervalo de ``ancho`` años, de un autor individual o de todos"""
+        if ancho < 1:
+            raise ValueError("El ancho del intervalo debe ser positivo")
+        return self.analitica.histograma_años(autor, ancho)
+
+    @_con_analitica
+    def reporte_catalogo(self, top=20, autor=None, ancho=1):
+        """Resumen estadistico del catalogo como dict serializable a JSON
+
+        Incluye totales, articulos por año, los ``top`` autores, autores
+        por articulo, largo de los titulos y el histograma por año (de
+        ``autor`` si se indica).
+        """
+        if ancho < 1:
+            raise ValueError("El ancho del intervalo debe ser positivo")
+        reporte = self.analitica.resumen(top)
+        reporte["histograma_años"] = self.analitica.histograma_años(autor, ancho)
+        if autor:
+            reporte["autor"] = " ".join(autor.lower().split())
+        return reporte
+
+    def _registrar(self, *campos):
+        """Persistir una mutacion: registro en el journal o reescritura completa"""
+        self._registrar_varios([campos])
+
+    def _registrar_varios(self, registros):
+        """Persistir varias mutaciones con una sola escritura
+
+        Dentro de una transaccion solo se acumulan y se escriben al
+        confirmarla. Lanza una excepcion si no quedaron persistidas.
+        """
+        if self._transaccion is not None:
+            self._transaccion.registros.extend(registros)
+            return
+        if not self.almacenamiento.registrar(registros):
+            self.almacenamiento.volcar(self.tabla_hash.get_all_values())
+        elif self.almacenamiento.requiere_compactar(self.tabla_hash.count):
+            self.compactar()
+
+    # Fraccion del catalogo a partir de la cual una transaccion deja de
+    # mantener los indices secundarios y los reconstruye una vez al final
+    REINDEXAR_FRACCION = 4
+
+    @contextlib.contextmanager
+    def transaccion(self):
+        """Agrupar altas, modificaciones y bajas en una unidad atomica
+
+        ``with gestor.transaccion():`` toma el bloqueo de escritura hasta el
+        final del bloque. Los registros se escriben una sola vez al salir y
+        los cuerpos de los articulos eliminados se borran recien entonces.
+        Si el bloque lanza una excepcion, o si la persistencia falla, se
+        deshacen en orden inverso todos los cambios en memoria (tabla hash,
+        indices, texto completo y similitud) y la excepcion se propaga.
+
+        Las transacciones anidadas funcionan como puntos de guardado: un
+        error dentro de la interior solo deshace sus propios cambios. Con
+        muchas mutaciones los indices secundarios se suspenden y se
+        reconstruyen de una vez al terminar.
+        """
+        with self.lock.escritura():
+            exterior = self._transaccion
+            if exterior is not None:
+                marca = len(exterior.deshacer), len(exterior.registros)
+                try:
+                    yield exterior
+                except BaseException:
+                    self._deshacer(exterior, *marca)
+                    raise
+                return
+
+            transaccion = self._transaccion = _Transaccion()
+            try:
+                yield transaccion
+                self._transaccion = None
+                if transaccion.registros:
+                    self._registrar_varios(transaccion.registros)
+            except BaseException:
+                self._transaccion = None
+                self._deshacer(transaccion, 0, 0)
+                raise
+            finally:
+                if transaccion.reconstruir and not self.consultas_delegadas:
+                    self._asegurar_indices()
+
+            for ruta in transaccion.archivos_borrar:
+                self.contenidos.invalidar(ruta)
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+
+    def _al_deshacer(self, funcion, *args):
+        """Anotar como deshacer un cambio si hay una transaccion en curso"""
+        transaccion = self._transaccion
+        if transaccion is None:
+            return
+        transaccion.deshacer.append((funcion, args))
+        transaccion.mutaciones += 1
+        # Muchas mutaciones: mas barato reconstruir los indices una sola vez
+        if (self._indices_listos and transaccion.mutaciones
+                > max(256, len(self.tabla_hash) // self.REINDEXAR_FRACCION)):
+            self._indices_listos = False
+            transaccion.reconstruir = True
+
+    def _deshacer(self, transaccion, hasta, registros):
+        """Revertir los cambios anotados despues de la marca ``hasta``"""
+        while len(transaccion.deshacer) > hasta:
+            funcion, args = transaccion.deshacer.pop()
+            funcion(*args)
+        del transaccion.registros[registros:]
+
+    def _deshacer_alta(self, articulo, ruta_archivo):
+        if self.tabla_hash.get(articulo.hash_id) is articulo:
+            self._desindexar(articulo)
+        if self.texto_completo is not None:
+            self.texto_completo.eliminar(articulo.hash_id)
+        if self.similitud is not None:
+            self.similitud.eliminar(articulo.hash_id)
+        if ruta_archivo and not self.tabla_hash.exists(articulo.hash_id):
+            try:
+                os.remove(ruta_archivo)  # Contenido que solo este alta referenciaba
+            except FileNotFoundError:
+                pass
+
+    def _deshacer_modificacion(self, articulo, autores, año):
+        self._desindexar(articulo)
+        articulo.autores = autores
+        articulo.año = año
+        self._indexar(articulo)
+
+    def _deshacer_baja(self, transaccion, articulo, ruta_archivo, firma):
+        transaccion.archivos_borrar.remove(ruta_archivo)
+        self._indexar(articulo)
+        self._indexar_texto(articulo)
+        if firma is not None:
+            self.similitud.agregar(articulo.hash_id, firma)
+
+    def _alta(self, articulo, firma, ruta_archivo=None):
+        """Indexar un articulo nuevo en todos los indices, como cambio deshacible"""
+        self._indexar(articulo)
+        self._indexar_texto(articulo)
+        if firma is not None:
+            self.similitud.agregar(articulo.hash_id, firma)
+        self._al_deshacer(self._deshacer_alta, articulo, ruta_archivo)
+
+    def agregar_articulo(self, titulo, autores, año, ruta_archivo, hash_id=None):
+        """Agregar nuevo articulo al sistema
+
+        ``hash_id`` permite pasar un hash ya calculado (por ejemplo por
+        ``ingresar_archivo`` en un proceso aparte, que tambien deja el
+        archivo en el almacen). El hash y la copia se hacen sin tomar el
+        bloqueo; solo la actualizacion de indices y el registro lo requieren.
+        """
+        error = self.almacenamiento.validar(titulo, autores)
+        if error:
+            return False, error
+
+        try:
+            if hash_id is None:
+                # Una sola lectura: se hashea mientras se copia al almacen
+                with self._medir("ingesta"):
+                    hash_id, archivo_nombre, tamaño = ingresar_archivo(
+                        ruta_archivo, self.articulos_dir, self.algoritmo_hash)
+                if self.metricas is not None:
+                    self.metricas.contar("gestor_ingesta_bytes_total", valor=tamaño)
+            else:
+                archivo_nombre = ruta_en_almacen(hash_id, self.algoritmo_hash)
+
+            # Verificar duplicados
+            with self.lock.lectura():
+                existe = self.tabla_hash.exists(hash_id)
+            if existe:
+                return False, "El articulo ya existe en el sistema"
+
+            ruta_destino = os.path.join(self.articulos_dir, archivo_nombre)
+            if not os.path.exists(ruta_destino):
+                with self._medir("copia"):
+                    copiar_articulo(ruta_archivo, ruta_destino)
+            firma = self._firma(archivo_nombre)
+
+            with self.lock.escritura():
+                # Otro trabajo pudo agregar el mismo contenido mientras se copiaba
+                if self.tabla_hash.exists(hash_id):
+                    return False, "El articulo ya existe en el sistema"
+
+                similar = self._casi_duplicado(firma)
+                if similar and self.rechazar_similares:
+                    os.remove(ruta_destino)  # Nadie mas referencia este contenido
+                    return False, f"Casi duplicado de {similar[0]} (similitud {similar[1]:.2f})"
+
+                # Crear objeto artículo e insertarlo en tabla hash e indices,
+                # y guardarlo; si la persistencia falla el alta se deshace
+                with self.transaccion():
+                    articulo = Articulo(hash_id, titulo, autores, año, archivo_nombre)
+                    self._alta(articulo, firma, ruta_destino)
+                    self._registrar('A', hash_id, titulo, autores, año, archivo_nombre)
+
+            if similar:
+                return True, (f"Artículo agregado exitosamente (similar a {similar[0]}, "
+                              f"similitud {similar[1]:.2f})")
+            return True, "Artículo agregado exitosamente"
+
+        except Exception as e:
+            return False, f"Error al agregar artículo: {e}"
+
+    @_con_escritura
+    def modificar_articulo(self, hash_id, nuevo_autor=None, nuevo_año=None):
+        """Modificar datos de un articulo existente"""
+        articulo = self.tabla_hash.get(hash_id)
+        if not articulo:
+            return False, "Artículo no encontrado"
+        error = nuevo_autor and self.almacenamiento.validar(nuevo_autor)
+        if error:
+            return False, error
+
+        try:
+            with self.transaccion():
+                # Remover de indices antiguos
+                self._desindexar(articulo)
+                self._al_deshacer(self._deshacer_modificacion, articulo,
+                                  articulo.autores, articulo.año)
+
+                # Actualizar datos
+                if nuevo_autor:
+                    articulo.autores = nuevo_autor
+                if nuevo_año:
+                    articulo.año = nuevo_año
+
+                # Agregar a nuevos indices
+                self._indexar(articulo)
+
+                # Guardar cambios
+                self._registrar('M', hash_id, articulo.autores, articulo.año)
+
+            return True, "Articulo modificado exitosamente"
+
+        except Exception as e:
+            return False, f"Error al modificar articulo: {e}"
+
+    @_con_escritura
+    def eliminar_articulo(self, hash_id):
+        """Eliminar un artículo del sistema"""
+        articulo = self.tabla_hash.get(hash_id)
+        if not articulo:
+            return False, "Articulo no encontrado"
+
+        try:
+            with self.transaccion() as transaccion:
+                # El archivo fisico se borra al confirmar, por si hay que deshacer
+                ruta_archivo = os.path.join(self.articulos_dir, articulo.archivo_nombre)
+                transaccion.archivos_borrar.append(ruta_archivo)
+                firma = self.similitud.firmas.get(hash_id) if self.similitud is not None else None
+
+                # Remover de indices y de la tabla hash principal
+                self._desindexar(articulo)
+                if self.texto_completo is not None:
+                    self.texto_completo.eliminar(hash_id)
+                if self.similitud is not None:
+                    self.similitud.eliminar(hash_id)
+                self._al_deshacer(self._deshacer_baja, transaccion, articulo, ruta_archivo, firma)
+
+                # Guardar cambios
+                self._registrar('D', hash_id)
+
+            return True, "Artículo eliminado exitosamente"
+
+        except Exception as e:
+            return False, f"Error al eliminar artículo: {e}"
+
+    @_con_escritura
+    def renombrar_autor(self, actual, nuevo):
+        """Reemplazar un autor por otro en todos sus articulos, en una transaccion
+
+        ``actual`` se compara como autor individual (sin distinguir
+        mayusculas ni espacios); los coautores y separadores de cada
+        articulo se conservan. Si alguna modificacion falla no se aplica
+        ninguna. Devuelve (exito, mensaje).
+        """
+        objetivo = " ".join(actual.lower().split())
+        nuevo = " ".join(nuevo.split())
+        if not objetivo or not nuevo:
+            return False, "Indique el autor actual y el nuevo"
+        error = self.almacenamiento.validar(nuevo)
+        if error:
+            return False, error
+
+        try:
+            articulos = self.buscar(autor=objetivo)
+            with self.transaccion():
+                for articulo in articulos:
+                    # Partes pares: nombres; impares: separadores originales
+                    partes = _SEPARADORES_AUTORES_PARTES.split(articulo.autores)
+                    for i in range(0, len(partes), 2):
+                        if " ".join(partes[i].lower().split()) == objetivo:
+                            partes[i] = nuevo
+                    exito, mensaje = self.modificar_articulo(articulo.hash_id, "".join(partes))
+                    if not exito:
+                        raise RuntimeError(f"{articulo.hash_id}: {mensaje}")
+        except Exception as e:
+            return False, f"Error al renombrar autor: {e}"
+        return True, f"Autor renombrado en {len(articulos)} artículos"
+
+    def importar_lote(self, origen, trabajadores=None, autores_defecto="Desconocido",
+                      año_defecto=None, progreso=None, cancelado=None, enlazar=False):
+        """Importar un directorio o un manifiesto (CSV/JSONL) en paralelo
+
+        Los archivos se hashean y copian en un ProcessPoolExecutor; los
+        duplicados se descartan contra la tabla hash y dentro del mismo lote,
+        y la base de datos se persiste una sola vez al final. Los fallos por
+        archivo se reportan sin abortar el lote.
+
+        ``progreso(hechos, total)`` se llama por cada archivo y, si el evento
+        ``cancelado`` se activa, se conserva lo importado hasta ese momento.
+        """
+        filas = filas_de_origen(origen, autores_defecto, año_defecto)
+        return self.importar_filas(filas, trabajadores, progreso, cancelado, enlazar)
+
+    def importar_filas(self, filas, trabajadores=None, progreso=None, cancelado=None,
+                       enlazar=False):
+        """Importar filas ``(titulo, autores, año, ruta)`` persistiendo una sola vez
+
+        El lote es una transaccion: el bloqueo de escritura se mantiene desde
+        la primera alta hasta persistir todos los registros, asi una baja o
+        modificacion de una fila importada (por ejemplo desde ``progreso``)
+        se registra despues de su alta. Si la persistencia falla, el lote
+        entero se deshace y sus filas quedan como fallos.
+
+        Ademas de los totales, ``reporte["estados"]`` trae por cada fila, en
+        el mismo orden, ``("importado"|"duplicado", hash_id)`` o
+        ``("fallo", mensaje)``; las filas no procesadas por una cancelacion
+        quedan como ``("cancelado", None)``. Con el indice de similitud,
+        ``reporte["similares"]`` lista ``(ruta, hash_id, parecido, similitud)``
+        y, si se rechazan, la fila queda como ``("similar", parecido)``.
+        """
+        inicio = time.perf_counter()
+        reporte = {"importados": 0, "duplicados": [], "fallos": [], "similares": [],
+                   "bytes": 0, "segundos": 0.0}
+        estados = [("cancelado", None)] * len(filas)
+        reporte["estados"] = estados
+
+        # Validar metadatos antes de gastar trabajo en hashear
+        validas = []
+        for i, (titulo, autores, año, ruta) in enumerate(filas):
+            if not all([titulo, autores, año, ruta]):
+                reporte["fallos"].append((ruta, "Faltan campos obligatorios"))
+                estados[i] = ("fallo", "Faltan campos obligatorios")
+                continue
+            error = self.almacenamiento.validar(titulo, autores)
+            if error:
+                reporte["fallos"].append((ruta, error))
+                estados[i] = ("fallo", error)
+                continue
+            try:
+                validas.append((i, titulo, autores, int(año), ruta))
+            except ValueError:
+                reporte["fallos"].append((ruta, "El año debe ser un número válido"))
+                estados[i] = ("fallo", "El año debe ser un número válido")
+
+        parametros_firma = None
+        if self.similitud is not None:
+            parametros_firma = (self.similitud.permutaciones, self.similitud.k)
+        tareas = [(ruta, self.algoritmo_hash, self.articulos_dir, enlazar, parametros_firma)
+                  for *_, ruta in validas]
+        executor = None
+        if trabajadores == 1 or len(tareas) < 2:
+            resultados = map(_procesar_archivo_lote, tareas)
+        else:
+            trabajadores = trabajadores or os.cpu_count() or 1
+            executor = ProcessPoolExecutor(max_workers=trabajadores)
+            resultados = executor.map(_procesar_archivo_lote, tareas,
+                                      chunksize=max(1, len(tareas) // (trabajadores * 4)))
+
+        altas = []  # (fila, ruta) importadas, para informarlas si el lote no se guarda
+        reporte["cancelado"] = False
+        completo = False
+        try:
+            with self.transaccion():
+                for hechos, ((i, titulo, autores, año, ruta),
+                             (ok, valor, archivo_nombre, tamaño, firma)) in enumerate(
+                        zip(validas, resultados), 1):
+                    if cancelado is not None and cancelado.is_set():
+                        reporte["cancelado"] = True
+                        break
+                    if progreso is not None:
+                        progreso(hechos, len(validas))
+                    if not ok:
+                        reporte["fallos"].append((ruta, valor))
+                        estados[i] = ("fallo", valor)
+                        continue
+                    if self.tabla_hash.exists(valor):
+                        reporte["duplicados"].append((ruta, valor))
+                        estados[i] = ("duplicado", valor)
+                        continue
+                    ruta_destino = os.path.join(self.articulos_dir, archivo_nombre)
+                    similar = self._casi_duplicado(firma)
+                    if similar:
+                        reporte["similares"].append((ruta, valor) + similar)
+                        if self.rechazar_similares:
+                            os.remove(ruta_destino)
+                            estados[i] = ("similar", similar[0])
+                            continue
+                    articulo = Articulo(valor, titulo, autores, año, archivo_nombre)
+                    self._alta(articulo, firma, ruta_destino)
+                    self._registrar('A', valor, titulo, autores, año, archivo_nombre)
+                    altas.append((i, ruta))
+                    estados[i] = ("importado", valor)
+                    reporte["bytes"] += tamaño
+                completo = True
+        except Exception as e:
+            if not completo:
+                raise
+            # Fallo la persistencia al confirmar: la transaccion ya deshizo el lote
+            for i, ruta in altas:
+                reporte["fallos"].append((ruta, f"Error al guardar: {e}"))
+                estados[i] = ("fallo", f"Error al guardar: {e}")
+            altas = []
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if altas:
+            self.guardar_indice_texto()
+            self.guardar_indice_similitud()
+
+        reporte["importados"] = len(altas)
+        reporte["segundos"] = time.perf_counter() - inicio
+        if self.metricas is not None:
+            self.metricas.contar("gestor_ingesta_bytes_total", valor=reporte["bytes"])
+        if reporte["segundos"] > 0:
+            reporte["articulos_por_segundo"] = len(tareas) / reporte["segundos"]
+            reporte["mb_por_segundo"] = reporte["bytes"] / (1 << 20) / reporte["segundos"]
+        return reporte
+
+    LOTE_IMPORTACION = 4096  # Registros por transaccion al importar una exportacion
+
+    def registros_exportacion(self, contenidos=False):
+        """Generar ``(hash_id, titulo, autores, año, archivo, contenido)`` por articulo
+
+        Recorre la tabla hash sin copiarla, con el bloqueo de lectura tomado
+        hasta agotar el generador: no se debe modificar el catalogo desde
+        el mismo hilo mientras se consume. Con ``contenidos`` se leen los
+        cuerpos del almacen (sin pasar por la cache); si uno no se puede
+        leer, su ``contenido`` es None.
+        """
+        with self.lock.lectura():
+            for hash_id, articulo in self.tabla_hash.items():
+                contenido = None
+                if contenidos:
+                    try:
+                        with open(os.path.join(self.articulos_dir, articulo.archivo_nombre),
+                                  'rb') as file:
+                            contenido = file.read()
+                    except OSError as e:
+                        self._reportar_error("exportar_contenido", f"{hash_id}: {e}")
+                yield (hash_id, articulo.titulo, articulo.autores, articulo.año,
+                       articulo.archivo_nombre, contenido)
+
+    def exportar(self, ruta, formato=None, contenidos=False):
+        """Exportar el catalogo en streaming a JSONL, columnar, Parquet o Arrow
+
+        El formato se deduce de la extension si no se indica (ver
+        ``FORMATOS_EXPORTACION``). Devuelve un reporte con los registros,
+        los bytes escritos, la duracion y los articulos sin contenido.
+        """
+        formato = formato_exportacion(ruta, formato)
+        inicio = time.perf_counter()
+        sin_contenido = []
+
+        def registros():
+            for registro in self.registros_exportacion(contenidos):
+                if contenidos and registro[5] is None:
+                    sin_contenido.append(registro[0])
+                yield registro
+
+        total = escribir_exportacion(ruta, registros(), formato, contenidos)
+        segundos = time.perf_counter() - inicio
+        return {"formato": formato, "registros": total, "bytes": os.path.getsize(ruta),
+                "segundos": segundos, "sin_contenido": sin_contenido,
+                "registros_por_segundo": total / segundos if segundos > 0 else None}
+
+    def _guardar_contenido(self, hash_id, contenido):
+        """Dejar un cuerpo importado en el almacen, verificando su hash"""
+        if _hashear_bloques(iter([contenido]), self.algoritmo_hash) != hash_id:
+            raise ValueError("El contenido no coincide con su hash")
+        archivo_nombre = ruta_en_almacen(hash_id, self.algoritmo_hash)
+        ruta_destino = os.path.join(self.articulos_dir, archivo_nombre)
+        if not os.path.exists(ruta_destino):
+            os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(suffix=".tmp", dir=self.articulos_dir)
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    file.write(contenido)
+                os.replace(temporal, ruta_destino)
+            except BaseException:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+        return archivo_nombre, ruta_destino
+
+    def importar_catalogo(self, ruta, formato=None):
+        """Cargar una exportacion directamente en la tabla hash y los indices
+
+        Los registros se leen en streaming y entran de a
+        ``LOTE_IMPORTACION`` por transaccion, sin listas intermedias del
+        catalogo completo; si una transaccion falla solo se pierde su lote.
+        Los indices secundarios se suspenden y se reconstruyen una sola vez
+        al final. Los cuerpos incluidos se verifican contra su hash y se
+        guardan en el almacen; sin cuerpo se conserva el nombre de archivo
+        exportado, que debe existir ya en ``articulos_dir``. Los articulos
+        ya presentes cuentan como duplicados.
+
+        Lanza ValueError si el formato no es valido o el archivo esta
+        truncado o corrupto; los lotes ya confirmados se conservan.
+        """
+        formato = formato_exportacion(ruta, formato)
+        inicio = time.perf_counter()
+        reporte = {"formato": formato, "importados": 0, "duplicados": 0, "fallos": [],
+                   "segundos": 0.0}
+
+        with self.lock.escritura():
+            reindexar = self._indices_listos and not self.consultas_delegadas
+            if reindexar:
+                self._indices_listos = False
+        try:
+            for lote in _lotes(leer_exportacion(ruta, formato), self.LOTE_IMPORTACION):
+                importados = duplicados = 0
+                fallos = []
+                try:
+                    with self.transaccion():
+                        for hash_id, titulo, autores, año, archivo_nombre, contenido in lote:
+                            error = self.almacenamiento.validar(titulo, autores)
+                            if not error and not (isinstance(hash_id, str) and hash_id.isdigit()):
+                                error = "hash_id invalido"
+                            if not error and (os.path.isabs(archivo_nombre)
+                                              or ".." in archivo_nombre.split("/")):
+                                error = "Nombre de archivo fuera del almacen"
+                            if error:
+                                fallos.append((hash_id, error))
+                                continue
+                            if self.tabla_hash.exists(hash_id):
+                                duplicados += 1
+                                continue
+                            ruta_archivo = None
+                            if contenido is not None:
+                                try:
+                                    archivo_nombre, ruta_archivo = self._guardar_contenido(
+                                        hash_id, contenido)
+                                except (ValueError, OSError) as e:
+                                    fallos.append((hash_id, str(e)))
+                                    continue
+                            try:
+                                firma = self._firma(archivo_nombre)
+                            except OSError:
+                                firma = None  # Sin cuerpo en el almacen todavia
+                            articulo = Articulo(hash_id, titulo, autores, int(año), archivo_nombre)
+                            self._alta(articulo, firma, ruta_archivo)
+                            self._registrar('A', hash_id, titulo, autores, articulo.año,
+                                            archivo_nombre)
+                            importados += 1
+                except Exception as e:
+                    fallos = [(registro[0], f"Error al guardar: {e}") for registro in lote]
+                    importados = duplicados = 0
+                reporte["importados"] += importados
+                reporte["duplicados"] += duplicados
+                reporte["fallos"].extend(fallos)
+        finally:
+            if reindexar:
+                with self.lock.escritura():
+                    self._asegurar_indices()
+            self.guardar_indice_texto()
+            self.guardar_indice_similitud()
+
+        reporte["segundos"] = time.perf_counter() - inicio
+        if reporte["segundos"] > 0:
+            reporte["registros_por_segundo"] = (
+                (reporte["importados"] + reporte["duplicados"] + len(reporte["fallos"]))
+                / reporte["segundos"])
+        return reporte
+
+    GRACIA_SEGUNDOS = 60
+
+    def verificar_almacen(self, reparar=False, verificar_contenido=False):
+        """Conciliar el almacen de archivos con la tabla hash (fsck)
+
+        Reporta los articulos cuyo archivo falta, los archivos que nadie
+        referencia (huerfanos), los temporales abandonados, los archivos con
+        el formato plano anterior (``<hash>.txt``) y, con
+        ``verificar_contenido``, los que ya no coinciden con su hash. Con
+        ``reparar`` borra huerfanos, temporales y directorios vacios (la
+        recoleccion de basura) y mueve los archivos planos a su ruta
+        fragmentada. Los archivos faltantes o corruptos solo se reportan, y
+        los que no tienen nombre de articulo (``desconocidos``) nunca se borran.
+
+        El recorrido y el hasheo se hacen sin bloquear el catalogo; los
+        archivos mas nuevos que ``GRACIA_SEGUNDOS`` se ignoran porque pueden
+        pertenecer a un alta que todavia no se indexo.
+        """
+        with self.lock.lectura():
+            referenciados = {os.path.normpath(articulo.archivo_nombre): articulo.hash_id
+                             for articulo in self.tabla_hash.get_all_values()}
+
+        reporte = {"revisados": len(referenciados), "faltantes": [], "corruptos": [],
+                   "huerfanos": [], "temporales": [], "desconocidos": [], "planos": []}
+        limite = time.time() - self.GRACIA_SEGUNDOS
+        presentes = set()
+        for directorio, _, archivos in os.walk(self.articulos_dir):
+            for nombre in archivos:
+                ruta = os.path.join(directorio, nombre)
+                relativa = os.path.relpath(ruta, self.articulos_dir)
+                if relativa in referenciados:
+                    presentes.add(relativa)
+                elif os.stat(ruta).st_ctime >= limite:
+                    continue
+                elif nombre.endswith(".tmp"):
+                    reporte["temporales"].append(relativa)
+                elif _NOMBRE_EN_ALMACEN.match(nombre):
+                    reporte["huerfanos"].append(relativa)
+                else:
+                    reporte["desconocidos"].append(relativa)
+
+        for relativa, hash_id in referenciados.items():
+            if relativa not in presentes:
+                reporte["faltantes"].append(hash_id)
+                continue
+            if os.path.dirname(relativa) == "":
+                reporte["planos"].append(hash_id)
+            if verificar_contenido:
+                ruta = os.path.join(self.articulos_dir, relativa)
+                if hash_archivo_fnv(ruta, self.algoritmo_hash) != hash_id:
+                    reporte["corruptos"].append(hash_id)
+
+        if reparar:
+            reporte["directorios_borrados"] = self._reparar_almacen(reporte, limite)
+        return reporte
+
+    @_con_escritura
+    def _reparar_almacen(self, reporte, limite):
+        referenciados = {os.path.normpath(articulo.archivo_nombre)
+                         for articulo in self.tabla_hash.get_all_values()}
+        for relativa in reporte["huerfanos"] + reporte["temporales"]:
+            # Pudo quedar referenciado mientras se recorria el almacen
+            if relativa not in referenciados:
+                try:
+                    os.remove(os.path.join(self.articulos_dir, relativa))
+                except FileNotFoundError:
+                    pass
+
+        registros = []
+        for hash_id in reporte["planos"]:
+            articulo = self.tabla_hash.get(hash_id)
+            if articulo is None or hash_id in reporte["corruptos"]:
+                continue
+            archivo_nombre = ruta_en_almacen(hash_id, self.algoritmo_hash)
+            destino = os.path.join(self.articulos_dir, archivo_nombre)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            origen = os.path.join(self.articulos_dir, articulo.archivo_nombre)
+            os.replace(origen, destino)
+            self.contenidos.invalidar(origen)
+            articulo.archivo_nombre = archivo_nombre
+            registros.append(('A', hash_id, articulo.titulo, articulo.autores, articulo.año,
+                              archivo_nombre))
+        if registros:
+            try:
+                self._registrar_varios(registros)
+            except Exception as e:
+                self._reportar_error("registrar_reubicaciones", e)
+
+        # Directorios de fragmento vacios, de abajo hacia arriba; los recientes
+        # se respetan porque un alta en curso pudo crearlos
+        borrados = set()
+        for directorio, subdirectorios, archivos in os.walk(self.articulos_dir, topdown=False):
+            if directorio == self.articulos_dir or archivos:
+                continue
+            if not all(os.path.join(directorio, sub) in borrados for sub in subdirectorios):
+                continue
+            try:
+                # Si se vacio en esta pasada su ctime es nuestro, no de un alta
+                if subdirectorios or os.stat(directorio).st_ctime < limite:
+                    os.rmdir(directorio)
+                    borrados.add(directorio)
+            except OSError:
+                pass  # Ya no esta vacio
+        return len(borrados)
+
+    def __len__(self):
+        return len(self.tabla_hash)
+
+    def estadisticas(self):
+        """Tamaño del catalogo y estado del almacenamiento, la tabla hash y la cache"""
+        with self.lock.lectura():
+            return {"articulos": len(self.tabla_hash),
+                    "almacenamiento": self.almacenamiento.estadisticas(),
+                    "tabla_hash": self.tabla_hash.stats(),
+                    "cache_contenidos": self.contenidos.estadisticas()}
+
+    def obtener_articulo(self, hash_id):
+        """Devolver el articulo con ese hash_id, o None"""
+        # Solo usa la tabla hash: no fuerza la construccion de los indices
+        with self.lock.lectura():
+            return self.tabla_hash.get(hash_id)
+
+    def _articulos_de_filas(self, filas):
+        """Articulos de la tabla hash para filas leidas del almacenamiento"""
+        articulos = []
+        for campos in filas:
+            articulo = self.tabla_hash.get(campos[0])
+            if articulo is not None:
+                if type(articulo) is ArticuloPerezoso:
+                    articulo.precargar(campos)  # Evita releer la fila
+                articulos.append(articulo)
+        return articulos
+
+    @_con_lectura
+    def buscar_por_autor(self, autor, offset=0, limit=None):
+        """Buscar articulos por autor (ya ordenados por titulo)"""
+        if self.consultas_delegadas:
+            return self._articulos_de_filas(self._consultas.por_autor(autor, offset, limit))
+        self._asegurar_indices()
+        articulos = self.indice_autores.get(autor.lower(), [])
+        return articulos[offset:None if limit is None else offset + limit]
+
+    @_con_lectura
+    def buscar_por_año(self, año, offset=0, limit=None):
+        """Buscar articulos por año (ya ordenados por titulo)"""
+        if self.consultas_delegadas:
+            return self._articulos_de_filas(self._consultas.por_año(año, offset, limit))
+        self._asegurar_indices()
+        articulos = self.indice_años.get(año, [])
+        return articulos[offset:None if limit is None else offset + limit]
+
+    @_con_lectura
+    def listar_por_titulo(self, offset=0, limit=None):
+        """Listar articulos ordenados por titulo, paginando con offset/limit"""
+        if self.consultas_delegadas:
+            return self._articulos_de_filas(self._consultas.listar("titulo", offset, limit))
+        self._asegurar_indices()
+        return [entrada[-1] for entrada in self.orden_titulos.rebanada(offset, limit)]
+
+    @_con_lectura
+    def listar_por_autor(self, offset=0, limit=None):
+        """Listar articulos ordenados por autor, paginando con offset/limit"""
+        if self.consultas_delegadas:
+            return self._articulos_de_filas(self._consultas.listar("autor", offset, limit))
+        self._asegurar_indices()
+        return [entrada[-1] for entrada in self.orden_autores.rebanada(offset, limit)]
+
+    def _articulos_por_ids(self, ids):
+        articulos = (self.tabla_hash.get(hash_id) for hash_id in ids)
+        return [articulo for articulo in articulos if articulo is not None]
+
+    def _titulos_con_prefijo(self, prefijo):
+        """Recorrer en orden los articulos cuyo titulo empieza con ``prefijo``"""
+        for entrada in self.orden_titulos.iterar_desde((prefijo,)):
+            if not entrada[0].startswith(prefijo):
+                break
+            yield entrada[-1]
+
+    @_con_lectura
+    def nombres_con_prefijo(self, prefijo):
+        """Nombres de autores individuales que empiezan con ``prefijo``"""
+        prefijo = " ".join(prefijo.lower().split())
+        if self.consultas_delegadas:
+            return self._consultas.nombres_con_prefijo(prefijo)
+        self._asegurar_indices()
+        nombres = []
+        for (nombre,) in self.nombres_autores.iterar_desde((prefijo,)):
+            if not nombre.startswith(prefijo):
+                break
+            nombres.append(nombre)
+        return nombres
+
+    @_con_lectura
+    def buscar(self, titulo_prefijo=None, autor=None, autor_prefijo=None, coautores=None,
+               año=None, año_desde=None, año_hasta=None, offset=0, limit=None):
+        """Busqueda combinada por prefijo de titulo, autores y rango de años
+
+        ``autor`` y ``coautores`` se comparan contra los autores individuales
+        (un articulo de "Ana, Bo" aparece al buscar "bo"). Cada filtro estima
+        sus candidatos a partir de su indice; solo el mas selectivo se
+        materializa y los demas se aplican sobre esos candidatos. Los
+        resultados se devuelven ordenados por titulo.
+        """
+        if self.consultas_delegadas:
+            if año is not None:
+                año_desde = año_hasta = año
+            nombres = [" ".join(nombre.lower().split())
+                       for nombre in ([autor] if autor else []) + list(coautores or [])]
+            filas = self._consultas.buscar(
+                titulo_prefijo.lower() if titulo_prefijo else None, nombres,
+                " ".join(autor_prefijo.lower().split()) if autor_prefijo else None,
+                año_desde, año_hasta, offset, limit)
+            return self._articulos_de_filas(filas)
+
+        self._asegurar_indices()
+        filtros = []  # (estimacion, en_orden_de_titulo, candidatos, predicado)
+
+        if titulo_prefijo:
+            prefijo_titulo = titulo_prefijo.lower()
+            estimacion = (self.orden_titulos.posicion((prefijo_titulo + _FIN_PREFIJO,))
+                          - self.orden_titulos.posicion((prefijo_titulo,)))
+            filtros.append((estimacion, True,
+                            lambda: self._titulos_con_prefijo(prefijo_titulo),
+                            lambda a: a.titulo.lower().startswith(prefijo_titulo)))
+
+        for nombre in ([autor] if autor else []) + list(coautores or []):
+            nombre = " ".join(nombre.lower().split())
+            ids = self.indice_invertido_autores.get(nombre, set())
+            filtros.append((len(ids), False,
+                            lambda ids=ids: self._articulos_por_ids(ids),
+                            lambda a, nombre=nombre: nombre in separar_autores(a.autores)))
+
+        if autor_prefijo:
+            nombres = self.nombres_con_prefijo(autor_prefijo)
+            conjuntos = [self.indice_invertido_autores[nombre] for nombre in nombres]
+            filtros.append((sum(len(ids) for ids in conjuntos), False,
+                            lambda: self._articulos_por_ids(set().union(*conjuntos)),
+                            lambda a: any(n in nombres for n in separar_autores(a.autores))))
+
+        if año is not None:
+            año_desde = año_hasta = año
+        if año_desde is not None or año_hasta is not None:
+            inicio = 0 if año_desde is None else bisect.bisect_left(self.años_ordenados, año_desde)
+            fin = (len(self.años_ordenados) if año_hasta is None
+                   else bisect.bisect_right(self.años_ordenados, año_hasta))
+            años = self.años_ordenados[inicio:fin]
+            filtros.append((sum(len(self.indice_años[a]) for a in años), False,
+                            lambda: [art for a in años for art in self.indice_años[a]],
+                            lambda art: (año_desde is None or art.año >= año_desde)
+                            and (año_hasta is None or art.año <= año_hasta)))
+
+        if not filtros:
+            return self.listar_por_titulo(offset, limit)
+
+        # Intersectar empezando por el indice mas selectivo
+        filtros.sort(key=lambda filtro: filtro[0])
+        estimacion, en_orden, candidatos, _ = filtros[0]
+        if estimacion == 0:
+            return []
+        predicados = [filtro[3] for filtro in filtros[1:]]
+
+        resultados = []
+        necesarios = None if limit is None else offset + limit
+        for articulo in candidatos():
+            if all(predicado(articulo) for predicado in predicados):
+                resultados.append(articulo)
+                # Con candidatos ya ordenados se puede cortar al llenar la pagina
+                if en_orden and necesarios is not None and len(resultados) >= necesarios:
+                    break
+
+        if not en_orden:
+            resultados.sort(key=self._clave_titulo)
+        return resultados[offset:necesarios]
+
+
+def particion_de(hash_id, particiones):
+    """Particion duena de un hash_id: crc32 del hash, asi se reparte parejo"""
+    return zlib.crc32(hash_id.encode('ascii')) % particiones
+
+
+def _portable(valor):
+    """Copiar los articulos de un resultado para enviarlo a otro proceso
+
+    Un ArticuloPerezoso referencia el mapa de su proceso; se envia un
+    Articulo con los campos ya leidos.
+    """
+    if isinstance(valor, Articulo):
+        return Articulo(valor.hash_id, valor.titulo, valor.autores, valor.año,
+                        valor.archivo_nombre)
+    if isinstance(valor, list):
+        return [_portable(elemento) for elemento in valor]
+    if isinstance(valor, tuple):
+        return tuple(_portable(elemento) for elemento in valor)
+    return valor
+
+
+def _ejecutar(gestor, metodo, args, kwargs):
+    """Llamar un metodo del gestor y devolver ("ok", resultado) o ("error", excepcion)"""
+    try:
+        return "ok", getattr(gestor, metodo)(*args, **kwargs)
+    except Exception as e:
+        return "error", e
+
+
+def _servir_particion(conexion, db_file, articulos_dir, opciones):
+    """Bucle de un proceso de particion: atiende llamadas hasta recibir None
+
+    Al abrir su gestor avisa ("listo", articulos) o ("error", excepcion).
+    """
+    try:
+        gestor = GestorArticulos(db_file, articulos_dir, **opciones)
+    except Exception as e:
+        conexion.send(("error", e))
+        return
+    conexion.send(("listo", len(gestor)))
+    try:
+        while True:
+            try:
+                mensaje = conexion.recv()
+            except EOFError:
+                break
+            if mensaje is None:
+                break
+            estado, valor = _ejecutar(gestor, *mensaje)
+            try:
+                conexion.send((estado, _portable(valor)))
+            except Exception as e:  # Un resultado o una excepcion que no se serializa
+                conexion.send(("error", RuntimeError(f"{mensaje[0]}: {e}")))
+    finally:
+        gestor.cerrar()
+        conexion.close()
+
+
+class _Particion:
+    """Una particion del catalogo: su gestor, en este proceso o en uno propio
+
+    ``enviar`` toma la particion y ``recibir`` la libera, asi varios hilos
+    pueden usar el mismo catalogo y una consulta repartida envia a todas
+    las particiones antes de esperar la primera respuesta.
+    """
+
+    def __init__(self, numero, db_file, articulos_dir, opciones, proceso=True):
+        self.numero = numero
+        self._lock = threading.Lock()
+        self.gestor = None
+        self._proceso = None
+        self._respuesta = None
+        if not proceso:
+            self.gestor = GestorArticulos(db_file, articulos_dir, **opciones)
+            return
+        self._conexion, remota = multiprocessing.Pipe()
+        self._proceso = multiprocessing.Process(
+            target=_servir_particion, args=(remota, db_file, articulos_dir, opciones),
+            name=f"particion-{numero}", daemon=True)
+        self._proceso.start()
+        remota.close()
+
+    def esperar_inicio(self):
+        """Esperar a que el proceso abra su gestor; devuelve sus articulos"""
+        if self._proceso is None:
+            return len(self.gestor)
+        estado, valor = self._recibir_mensaje()
+        if estado == "error":
+            self._proceso.join()
+            raise valor
+        return valor
+
+    def _recibir_mensaje(self):
+        try:
+            return self._conexion.recv()
+        except (EOFError, OSError) as e:
+            return "error", RuntimeError(f"La particion {self.numero} termino inesperadamente "
+                                         f"({e or 'sin respuesta'})")
+
+    def enviar(self, metodo, args=(), kwargs=None):
+        self._lock.acquire()
+        try:
+            if self._proceso is None:
+                self._respuesta = _ejecutar(self.gestor, metodo, args, kwargs or {})
+            else:
+                self._conexion.send((metodo, args, kwargs or {}))
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def recibir(self):
+        """("ok", resultado) o ("error", excepcion) de la ultima llamada enviada"""
+        try:
+            if self._proceso is None:
+                respuesta, self._respuesta = self._respuesta, None
+                return respuesta
+            return self._recibir_mensaje()
+        finally:
+            self._lock.release()
+
+    def llamar(self, metodo, *args, **kwargs):
+        self.enviar(metodo, args, kwargs)
+        estado, valor = self.recibir()
+        if estado == "error":
+            raise valor
+        return valor
+
+    def cerrar(self):
+        with self._lock:
+            if self._proceso is None:
+                self.gestor.cerrar()
+                return
+            try:
+                self._conexion.send(None)
+            except OSError:
+                pass
+            self._proceso.join()
+            self._conexion.close()
+
+
+class CatalogoParticionado:
+    """Catalogo repartido por hash_id entre N particiones
+
+    Cada particion es un GestorArticulos completo (tabla hash, base de
+    datos, journal y almacen de articulos propios) en
+    ``<directorio>/<nnn>/`` y, con ``procesos``, corre en un proceso
+    aparte, asi las particiones cargan, hashean y consultan en paralelo
+    sobre varios nucleos. ``particiones.json`` fija la cantidad de
+    particiones y el algoritmo de hash; cambiarla requiere
+    ``reparticionar`` con el catalogo cerrado.
+
+    Las operaciones por hash_id van a la particion duena (``particion_de``).
+    Las consultas por autor, año, prefijo o listados se envian a todas y
+    sus resultados, ya ordenados en cada particion, se mezclan con la misma
+    clave de orden que usa el gestor, de modo que la paginacion coincide
+    con la de un catalogo sin particionar. Los duplicados exactos se
+    detectan siempre (el mismo contenido cae en la misma particion); los
+    casi duplicados solo dentro de cada particion.
+
+    Expone la parte de la interfaz de GestorArticulos que usa el servidor
+    HTTP, que puede servir un catalogo particionado sin cambios.
+    """
+
+    MANIFIESTO = "particiones.json"
+    DB = "articulos_db.txt"
+    ARTICULOS = "articulos"
+    VISTA_PREVIA = GestorArticulos.VISTA_PREVIA
+
+    def __init__(self, directorio, particiones=None, procesos=True, algoritmo_hash="fnv1-32",
+                 **opciones):
+        manifiesto = leer_manifiesto_particiones(directorio)
+        if manifiesto is None:
+            manifiesto = {"version": 1, "particiones": particiones or os.cpu_count() or 1,
+                          "algoritmo_hash": algoritmo_hash}
+            os.makedirs(directorio, exist_ok=True)
+            _escribir_manifiesto_particiones(directorio, manifiesto)
+        elif particiones is not None and particiones != manifiesto["particiones"]:
+            raise ValueError(f"El catalogo tiene {manifiesto['particiones']} particiones, no "
+                             f"{particiones}; use reparticionar para cambiarlas")
+        self.directorio = directorio
+        self.cantidad = manifiesto["particiones"]
+        self.algoritmo_hash = manifiesto["algoritmo_hash"]
+        self.metricas = None
+
+        opciones["algoritmo_hash"] = self.algoritmo_hash
+        self.particiones = []
+        try:
+            for numero in range(self.cantidad):
+                db_file, articulos_dir = self.rutas(directorio, numero)
+                os.makedirs(os.path.dirname(db_file), exist_ok=True)
+                self.particiones.append(_Particion(numero, db_file, articulos_dir, opciones,
+                                                   procesos))
+            # Los procesos cargan a la vez; se espera a todos
+            for particion in self.particiones:
+                particion.esperar_inicio()
+        except BaseException:
+            self.cerrar()
+            raise
+
+    @classmethod
+    def rutas(cls, directorio, numero):
+        """(db_file, articulos_dir) de la particion ``numero``"""
+        base = os.path.join(directorio, f"{numero:03d}")
+        return os.path.join(base, cls.DB), os.path.join(base, cls.ARTICULOS)
+
+    def _duena(self, hash_id):
+        return self.particiones[particion_de(hash_id, self.cantidad)]
+
+    def _respuestas(self, metodo, *args, **kwargs):
+        """Enviar ``metodo`` a todas las particiones y luego juntar sus respuestas"""
+        enviadas = []
+        try:
+            for particion in self.particiones:
+                particion.enviar(metodo, args, kwargs)
+                enviadas.append(particion)
+        finally:
+            respuestas = [particion.recibir() for particion in enviadas]
+        return respuestas
+
+    def _en_todas(self, metodo, *args, **kwargs):
+        """Llamar ``metodo`` en todas las particiones a la vez; resultados en orden"""
+        respuestas = self._respuestas(metodo, *args, **kwargs)
+        for estado, valor in respuestas:
+            if estado == "error":
+                raise valor
+        return [valor for _, valor in respuestas]
+
+    def _mezclar(self, metodo, clave, offset, limit, *args, **kwargs):
+        """Consulta paginada repartida: cada particion aporta sus primeros
+        ``offset + limit`` resultados y se mezclan por ``clave``
+
+        Una pagina profunda cuesta proporcional a ``offset`` en cada particion.
+        """
+        necesarios = None if limit is None else offset + limit
+        listas = self._en_todas(metodo, *args, offset=0, limit=necesarios, **kwargs)
+        mezcla = heapq.merge(*listas, key=clave)
+        return list(itertools.islice(mezcla, offset, necesarios))
+
+    def __len__(self):
+        return sum(self._en_todas("__len__"))
+
+    # --- Operaciones por hash_id ---
+
+    def obtener_articulo(self, hash_id):
+        return self._duena(hash_id).llamar("obtener_articulo", hash_id)
+
+    def vista_previa(self, hash_id, caracteres=VISTA_PREVIA):
+        return self._duena(hash_id).llamar("vista_previa", hash_id, caracteres)
+
+    def modificar_articulo(self, hash_id, nuevo_autor=None, nuevo_año=None):
+        return self._duena(hash_id).llamar("modificar_articulo", hash_id, nuevo_autor, nuevo_año)
+
+    def eliminar_articulo(self, hash_id):
+        return self._duena(hash_id).llamar("eliminar_articulo", hash_id)
+
+    def agregar_articulo(self, titulo, autores, año, ruta_archivo):
+        """Agregar un articulo en su particion; el hash se calcula aqui para elegirla"""
+        try:
+            hash_id = hash_archivo_fnv(ruta_archivo, self.algoritmo_hash)
+        except (OSError, TypeError) as e:
+            return False, f"Error al agregar artículo: {e}"
+        return self._duena(hash_id).llamar("agregar_articulo", titulo, autores, año,
+                                           ruta_archivo, hash_id)
+
+    def importar_lote(self, origen, trabajadores=None, autores_defecto="Desconocido",
+                      año_defecto=None, progreso=None, cancelado=None, enlazar=False):
+        """Importar un directorio o un manifiesto (CSV/JSONL) repartido por particion"""
+        filas = filas_de_origen(origen, autores_defecto, año_defecto)
+        return self.importar_filas(filas, trabajadores, progreso, cancelado, enlazar)
+
+    def importar_filas(self, filas, trabajadores=None, progreso=None, cancelado=None,
+                       enlazar=False):
+        """Importar filas ``(titulo, autores, año, ruta)`` repartidas por particion
+
+        Los archivos se hashean aqui para elegir la particion y cada
+        particion importa su parte a la vez que las demas. El reporte tiene
+        la forma del de ``GestorArticulos.importar_filas``; ``progreso`` y
+        ``cancelado`` no cruzan a los procesos y se ignoran.
+        """
+        inicio = time.perf_counter()
+        rutas = [fila[3] if len(fila) == 4 else None for fila in filas]
+        with ThreadPoolExecutor(max_workers=trabajadores or self.cantidad) as executor:
+            hashes = list(executor.map(self._hash_o_none, rutas))
+        grupos = defaultdict(list)  # particion -> [(indice, fila)]
+        for i, (fila, hash_id) in enumerate(zip(filas, hashes)):
+            # Las filas invalidas las rechaza la particion 0 con el mensaje de siempre
+            grupos[0 if hash_id is None else particion_de(hash_id, self.cantidad)].append((i, fila))
+
+        enviadas = []
+        try:
+            for numero, grupo in grupos.items():
+                particion = self.particiones[numero]
+                particion.enviar("importar_filas", ([fila for _, fila in grupo], 1),
+                                 {"enlazar": enlazar})
+                enviadas.append((particion, grupo))
+        finally:
+            respuestas = [(particion.recibir(), grupo) for particion, grupo in enviadas]
+
+        reporte = {"importados": 0, "duplicados": [], "fallos": [], "similares": [],
+                   "bytes": 0, "cancelado": False, "estados": [("cancelado", None)] * len(filas)}
+        for (estado, parcial), grupo in respuestas:
+            if estado == "error":
+                for i, fila in grupo:
+                    reporte["fallos"].append((rutas[i], str(parcial)))
+                    reporte["estados"][i] = ("fallo", str(parcial))
+                continue
+            reporte["importados"] += parcial["importados"]
+            reporte["bytes"] += parcial["bytes"]
+            for clave in ("duplicados", "fallos", "similares"):
+                reporte[clave].extend(parcial[clave])
+            for (i, _), estado_fila in zip(grupo, parcial["estados"]):
+                reporte["estados"][i] = estado_fila
+        reporte["segundos"] = time.perf_counter() - inicio
+        if reporte["segundos"] > 0:
+            reporte["articulos_por_segundo"] = len(filas) / reporte["segundos"]
+            reporte["mb_por_segundo"] = reporte["bytes"] / (1 << 20) / reporte["segundos"]
+        return reporte
+
+    def _hash_o_none(self, ruta):
+        try:
+            return hash_archivo_fnv(ruta, self.algoritmo_hash)
+        except (OSError, TypeError):
+            return None
+
+    # --- Consultas repartidas ---
+
+    @staticmethod
+    def _clave_titulo(articulo):
+        return articulo.titulo.lower(), articulo.hash_id
+
+    @staticmethod
+    def _clave_autor(articulo):
+        return articulo.autores.lower(), articulo.titulo.lower(), articulo.hash_id
+
+    def buscar_por_autor(self, autor, offset=0, limit=None):
+        return self._mezclar("buscar_por_autor", self._clave_titulo, offset, limit, autor)
+
+    def buscar_por_año(self, año, offset=0, limit=None):
+        return self._mezclar("buscar_por_año", self._clave_titulo, offset, limit, año)
+
+    def listar_por_titulo(self, offset=0, limit=None):
+        return self._mezclar("listar_por_titulo", self._clave_titulo, offset, limit)
+
+    def listar_por_autor(self, offset=0, limit=None):
+        return self._mezclar("listar_por_autor", self._clave_autor, offset, limit)
+
+    def buscar(self, offset=0, limit=None, **criterios):
+        """Busqueda combinada de ``GestorArticulos.buscar`` sobre todas las particiones"""
+        return self._mezclar("buscar", self._clave_titulo, offset, limit, **criterios)
+
+    def nombres_con_prefijo(self, prefijo):
+        nombres = heapq.merge(*self._en_todas("nombres_con_prefijo", prefijo))
+        return [nombre for nombre, _ in itertools.groupby(nombres)]
+
+    def buscar_texto(self, consulta, limit=20):
+        """Mejores resultados de texto completo entre todas las particiones
+
+        Cada particion puntua con sus propias frecuencias de terminos; con
+        particiones parejas los puntajes son comparables pero no identicos a
+        los de un catalogo sin particionar.
+        """
+        resultados = itertools.chain.from_iterable(self._en_todas("buscar_texto", consulta, limit))
+        return heapq.nlargest(limit, resultados, key=operator.itemgetter(1))
+
+    def buscar_aproximado(self, consulta, campo=None, limit=20, umbral=0.5):
+        """Mejores coincidencias aproximadas entre todas las particiones
+
+        La similitud depende solo de los trigramas de cada termino, asi que
+        el resultado es el mismo que sin particionar.
+        """
+        resultados = itertools.chain.from_iterable(
+            self._en_todas("buscar_aproximado", consulta, campo, limit, umbral))
+        return heapq.nsmallest(limit, resultados, key=_orden_aproximado)
+
+    def sugerir_autores(self, prefijo, limit=10, umbral=0.5):
+        mejores = {}
+        for parcial in self._en_todas("sugerir_autores", prefijo, limit, umbral):
+            for nombre, similitud in parcial:
+                # Un mismo nombre puntua igual en todas; se muestra la grafia
+                # de la primera particion que lo tiene
+                mejores.setdefault(nombre.lower(), (nombre, similitud))
+        return heapq.nsmallest(limit, mejores.values(),
+                               key=lambda par: (-par[1], len(trigramas(par[0])), par[0].lower()))
+
+    def conteo_por_año(self):
+        conteo = Counter()
+        for parcial in self._en_todas("conteo_por_año"):
+            conteo.update(dict(parcial))
+        return sorted(conteo.items())
+
+    def top_autores(self, k=20, año_desde=None, año_hasta=None):
+        """Ranking exacto: cada particion aporta la cuenta de todos sus autores"""
+        conteo = Counter()
+        for parcial in self._en_todas("top_autores", sys.maxsize, año_desde, año_hasta):
+            conteo.update(dict(parcial))
+        return heapq.nsmallest(k, conteo.items(), key=lambda par: (-par[1], par[0]))
+
+    def reporte_catalogo(self, top=20, autor=None, ancho=1):
+        raise ValueError("El reporte completo no esta disponible en un catalogo particionado; "
+                         "use top_autores o conteo_por_año")
+
+    # --- Mutaciones de todo el catalogo ---
+
+    def renombrar_autor(self, actual, nuevo):
+        """Renombrar en todas las particiones
+
+        Cada particion aplica su parte en una transaccion, pero entre
+        particiones no hay atomicidad: si una falla, las demas ya quedaron
+        renombradas y se informa cuales fallaron.
+        """
+        renombrados = 0
+        fallos = []
+        for numero, (estado, valor) in enumerate(self._respuestas("renombrar_autor", actual, nuevo)):
+            if estado == "error" or not valor[0]:
+                fallos.append(f"particion {numero}: {valor if estado == 'error' else valor[1]}")
+                continue
+            cantidad = re.search(r"\d+", valor[1])  # "Autor renombrado en N artículos"
+            renombrados += int(cantidad.group()) if cantidad else 0
+        if fallos:
+            return False, "Error al renombrar autor: " + "; ".join(fallos)
+        return True, f"Autor renombrado en {renombrados} artículos"
+
+    def compactar(self):
+        return all(self._en_todas("compactar"))
+
+    def estadisticas(self):
+        """Totales y estadisticas de cada particion"""
+        parciales = self._en_todas("estadisticas")
+        return {"articulos": sum(parcial["articulos"] for parcial in parciales),
+                "particiones": parciales}
+
+    def cerrar(self):
+        """Persistir y cerrar todas las particiones (y terminar sus procesos)"""
+        for particion in self.particiones:
+            particion.cerrar()
+        self.particiones = []
+
+
+def leer_manifiesto_particiones(directorio):
+    """Manifiesto de un catalogo particionado, o None si el directorio no tiene uno"""
+    try:
+        with open(os.path.join(directorio, CatalogoParticionado.MANIFIESTO),
+                  encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def _escribir_manifiesto_particiones(directorio, manifiesto):
+    ruta = os.path.join(directorio, CatalogoParticionado.MANIFIESTO)
+    with open(ruta + ".tmp", 'w', encoding='utf-8') as file:
+        json.dump(manifiesto, file)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def reparticionar(directorio, particiones, almacenamiento="texto"):
+    """Redistribuir un catalogo particionado cerrado en ``particiones`` particiones
+
+    Se arma el catalogo nuevo en ``<directorio>.nuevo`` (los articulos se
+    enlazan con enlaces duros cuando se puede, si no se copian) y al final
+    se reemplaza el directorio. Si el proceso se interrumpe el catalogo
+    original queda intacto; ``<directorio>.viejo`` solo existe entre los
+    dos renombrados finales y, si quedo, se termina el cambio al volver a
+    ejecutar. Devuelve la cantidad de articulos redistribuidos.
+    """
+    viejo, nuevo = directorio + ".viejo", directorio + ".nuevo"
+    if os.path.isdir(viejo):
+        if not os.path.exists(directorio):
+            os.replace(nuevo, directorio)  # Se corto entre los dos renombrados
+        shutil.rmtree(viejo)
+    manifiesto = leer_manifiesto_particiones(directorio)
+    if manifiesto is None:
+        raise FileNotFoundError(f"{directorio} no es un catalogo particionado")
+    if particiones < 1:
+        raise ValueError("Se necesita al menos una particion")
+    if particiones == manifiesto["particiones"]:
+        return 0
+    shutil.rmtree(nuevo, ignore_errors=True)
+    algoritmo = manifiesto["algoritmo_hash"]
+    opciones = {"algoritmo_hash": algoritmo, "almacenamiento": almacenamiento,
+                "texto_completo": False, "instantanea": False}
+
+    destinos = []
+    for numero in range(particiones):
+        db_file, articulos_dir = CatalogoParticionado.rutas(nuevo, numero)
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        destinos.append(GestorArticulos(db_file, articulos_dir, **opciones))
+    total = 0
+    try:
+        for numero in range(manifiesto["particiones"]):
+            _, articulos_origen = CatalogoParticionado.rutas(directorio, numero)
+            origen = GestorArticulos(*CatalogoParticionado.rutas(directorio, numero), **opciones)
+            grupos = defaultdict(list)
+            for articulo in _portable(origen.tabla_hash.get_all_values()):
+                grupos[particion_de(articulo.hash_id, particiones)].append(articulo)
+            origen.cerrar()
+            for destino_numero, articulos in grupos.items():
+                destino = destinos[destino_numero]
+                with destino.transaccion():
+                    for articulo in articulos:
+                        ruta_origen = os.path.join(articulos_origen, articulo.archivo_nombre)
+                        ruta_destino = os.path.join(destino.articulos_dir, articulo.archivo_nombre)
+                        os.makedirs(os.path.dirname(ruta_destino), exist_ok=True)
+                        try:
+                            os.link(ruta_origen, ruta_destino)
+                        except OSError:
+                            copiar_articulo(ruta_origen, ruta_destino)
+                        destino._alta(articulo, None, ruta_destino)
+                        destino._registrar('A', articulo.hash_id, articulo.titulo,
+                                           articulo.autores, articulo.año, articulo.archivo_nombre)
+                total += len(articulos)
+    finally:
+        for destino in destinos:
+            destino.cerrar()
+    _escribir_manifiesto_particiones(nuevo, dict(manifiesto, particiones=particiones))
+
+    os.replace(directorio, viejo)
+    os.replace(nuevo, directorio)
+    shutil.rmtree(viejo)
+    return total
+
+
+def articulo_a_dict(articulo):
+    """Representacion JSON de un articulo"""
+    return {"hash_id": articulo.hash_id, "titulo": articulo.titulo,
+            "autores": articulo.autores, "año": articulo.año,
+            "archivo": articulo.archivo_nombre}
+
+
+class ErrorHTTP(Exception):
+    """Error de una solicitud que se responde con su codigo de estado"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class ServidorArticulos:
+    """Servidor HTTP/JSON sin interfaz grafica sobre asyncio
+
+    Las consultas corren en un pool de hilos lectores y pueden ejecutarse
+    en paralelo gracias al bloqueo de lectura/escritura del gestor. Todas
+    las mutaciones pasan por una cola que atiende un unico escritor, asi se
+    aplican en orden de llegada; los altas consecutivas se agrupan en un
+    solo ``importar_filas`` para escribir el journal una vez por lote.
+    ``gestor`` puede ser un GestorArticulos o un CatalogoParticionado.
+
+    Rutas::
+
+        GET    /articulos?orden=titulo|autor&offset=&limit=
+        GET    /articulos/<hash_id>
+        GET    /articulos/<hash_id>/vista-previa?caracteres=
+        POST   /articulos              objeto o lista de objetos
+        PATCH  /articulos/<hash_id>    {"autores": ..., "año": ...}
+        DELETE /articulos/<hash_id>
+        POST   /autores/renombrar      {"actual": ..., "nuevo": ...}
+        GET    /buscar?titulo_prefijo=&autor=&autor_prefijo=&coautores=a,b
+                      &año=&año_desde=&año_hasta=&offset=&limit=
+        GET    /buscar/texto?q=&limit=
+        GET    /buscar/aproximado?q=&campo=autor|titulo&umbral=&limit=
+        GET    /autores/sugerencias?prefijo=&limit=
+        GET    /estadisticas
+        GET    /analitica?top=&autor=&ancho=
+        GET    /metricas               texto de Prometheus (con metricas activas)
+
+    Un alta lleva ``titulo``, ``autores``, ``año`` y ``contenido`` (el
+    texto del articulo). Solo si se indica ``raiz_importacion`` se acepta
+    en cambio ``ruta``, un archivo local al servidor que, resuelto con sus
+    enlaces simbolicos, debe quedar dentro de esa raiz.
+    """
+
+    LOTE_MAXIMO = 256
+    CUERPO_MAXIMO = 64 << 20
+    MOTIVOS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+    def __init__(self, gestor, host="127.0.0.1", puerto=8080, lectores=8,
+                 raiz_importacion=None):
+        self.gestor = gestor
+        self.host = host
+        self.puerto = puerto
+        self.raiz_importacion = (None if raiz_importacion is None
+                                 else os.path.realpath(raiz_importacion))
+        self.lectores = ThreadPoolExecutor(max_workers=lectores, thread_name_prefix="lector")
+        self.escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="escritor")
+        self._cola = None
+        self._servidor = None
+        self._tarea_escritor = None
+
+    async def iniciar(self):
+        """Abrir el socket y arrancar el escritor; devuelve el puerto real"""
+        self._cola = asyncio.Queue()
+        self._tarea_escritor = asyncio.create_task(self._escribir())
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+        return self.puerto
+
+    async def servir(self):
+        """Atender solicitudes hasta que se cancele la tarea"""
+        await self.iniciar()
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.detener()
+
+    async def detener(self):
+        """Cerrar el socket, terminar las escrituras pendientes y persistir"""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        if self._tarea_escritor is not None:
+            await self._cola.join()
+            self._tarea_escritor.cancel()
+            self._tarea_escritor = None
+        bucle = asyncio.get_running_loop()
+        await bucle.run_in_executor(self.escritor, self.gestor.cerrar)
+        self.lectores.shutdown()
+        self.escritor.shutdown()
+
+    # --- Escritor unico ---
+
+    async def _encolar(self, operacion, datos):
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((operacion, datos, futuro))
+        return await futuro
+
+    async def _escribir(self):
+        """Aplicar las mutaciones de a una, agrupando altas consecutivas"""
+        bucle = asyncio.get_running_loop()
+        pendiente = None
+        while True:
+            if pendiente is None:
+                pendiente = await self._cola.get()
+            operacion, datos, futuro = pendiente
+            pendiente = None
+            if operacion == "agregar":
+                lote = [(datos, futuro)]
+                filas = len(datos)
+                while filas < self.LOTE_MAXIMO and not self._cola.empty():
+                    siguiente = self._cola.get_nowait()
+                    if siguiente[0] != "agregar":
+                        pendiente = siguiente
+                        break
+                    lote.append(siguiente[1:])
+                    filas += len(siguiente[1])
+                trabajo = functools.partial(self._agregar_lote, [datos for datos, _ in lote])
+                futuros = [futuro for _, futuro in lote]
+            else:
+                trabajo = functools.partial(operacion, *datos)
+                futuros = [futuro]
+            try:
+                resultado = await bucle.run_in_executor(self.escritor, trabajo)
+            except Exception as e:
+                resultados = [e] * len(futuros)
+            else:
+                resultados = resultado if operacion == "agregar" else [resultado]
+            for futuro, resultado in zip(futuros, resultados):
+                if futuro.done():
+                    continue
+                if isinstance(resultado, Exception):
+                    futuro.set_exception(resultado)
+                else:
+                    futuro.set_result(resultado)
+            for _ in futuros:
+                self._cola.task_done()
+
+    def _validar_alta(self, alta):
+        """Resolver el cuerpo de un alta: ``contenido``, o ``ruta`` dentro de la raiz permitida"""
+        if "ruta" not in alta:
+            if not isinstance(alta.get("contenido", ""), str):
+                raise ErrorHTTP(400, "El contenido debe ser texto")
+            return alta  # Sin contenido el alta falla como cualquier fila incompleta
+        if self.raiz_importacion is None:
+            raise ErrorHTTP(400, "El servidor no acepta rutas locales; envie el contenido")
+        if not isinstance(alta["ruta"], str) or "contenido" in alta:
+            raise ErrorHTTP(400, "Indique ruta o contenido, no ambos")
+        ruta = os.path.realpath(os.path.join(self.raiz_importacion, alta["ruta"]))
+        if os.path.commonpath([ruta, self.raiz_importacion]) != self.raiz_importacion:
+            raise ErrorHTTP(400, "La ruta esta fuera de la raiz de importacion")
+        return dict(alta, ruta=ruta)
+
+    def _agregar_lote(self, solicitudes):
+        """Importar todas las altas de un lote; devuelve estados por solicitud"""
+        with tempfile.TemporaryDirectory() as temporal:
+            filas = []
+            for altas in solicitudes:
+                for alta in altas:
+                    ruta = alta.get("ruta")
+                    if alta.get("contenido") is not None:
+                        ruta = os.path.join(temporal, f"{len(filas)}.txt")
+                        with open(ruta, 'w', encoding='utf-8', newline='') as file:
+                            file.write(alta["contenido"])
+                    filas.append((alta.get("titulo"), alta.get("autores"), alta.get("año"), ruta))
+            # Lotes chicos no justifican levantar un pool de procesos
+            trabajadores = 1 if len(filas) < 32 else None
+            estados = self.gestor.importar_filas(filas, trabajadores)["estados"]
+
+        resultados = []
+        inicio = 0
+        for altas in solicitudes:
+            resultados.append(estados[inicio:inicio + len(altas)])
+            inicio += len(altas)
+        return resultados
+
+    # --- HTTP ---
+
+    async def _atender(self, lector, escritor):
+        """Atender una conexion HTTP/1.1, con keep-alive"""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                partes = linea.decode('latin-1').split()
+                if len(partes) != 3:
+                    await self._responder(escritor, 400, {"error": "Solicitud mal formada"}, False)
+                    break
+                metodo, destino, version = partes
+
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+
+                seguir = (version == "HTTP/1.1"
+                          and cabeceras.get("connection", "").lower() != "close")
+                try:
+                    longitud = int(cabeceras.get("content-length") or 0)
+                except ValueError:
+                    longitud = -1
+                if not 0 <= longitud <= self.CUERPO_MAXIMO:
+                    await self._responder(escritor, 413, {"error": "Cuerpo invalido o demasiado grande"},
+                                          False)
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+
+                inicio = time.perf_counter()
+                estado, respuesta = await self._despachar(metodo.upper(), destino, cuerpo)
+                await self._responder(escritor, estado, respuesta, seguir)
+                metricas = self.gestor.metricas
+                if metricas is not None:
+                    metricas.observar("http_solicitud_segundos", time.perf_counter() - inicio,
+                                      (("metodo", metodo.upper()),))
+                    metricas.contar("http_respuestas_total", (("codigo", str(estado)),))
+                if not seguir:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, escritor, estado, datos, seguir):
+        if isinstance(datos, str):
+            cuerpo = datos.encode('utf-8')
+            tipo = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+            tipo = "application/json; charset=utf-8"
+        cabecera = (f"HTTP/1.1 {estado} {self.MOTIVOS.get(estado, '')}\r\n"
+                    f"Content-Type: {tipo}\r\n"
+                    f"Content-Length: {len(cuerpo)}\r\n"
+                    f"Connection: {'keep-alive' if seguir else 'close'}\r\n\r\n")
+        escritor.write(cabecera.encode('latin-1') + cuerpo)
+        await escritor.drain()
+
+    async def _despachar(self, metodo, destino, cuerpo):
+        url = urllib.parse.urlsplit(destino)
+        ruta = [urllib.parse.unquote(parte) for parte in url.path.split("/") if parte]
+        parametros = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            datos = json.loads(cuerpo) if cuerpo else None
+            return await self._ruta(metodo, ruta, parametros, datos)
+        except ErrorHTTP as e:
+            return e.estado, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"Error interno: {e}"}
 
-    def __init__(self, size=100):
-        self.size = size
-        self.table = [[] for _ in range(size)]
-        self.count = 0
+    async def _leer(self, funcion, *args, **kwargs):
+        bucle = asyncio.get_running_loop()
+        return await bucle.run_in_executor(self.lectores,
+                                           functools.partial(funcion, *args, **kwargs))
 
-    def _hash(self, key):
-        """Funcion hash usando metodo de division"""
-        return hash(key) % self.size
+    async def _ruta(self, metodo, ruta, parametros, datos):
+        gestor = self.gestor
+        offset = int(parametros.get("offset", 0))
+        limit = int(parametros["limit"]) if "limit" in parametros else None
 
-    def insert(self, key, value):
-        """Insertar elemento en la tabla hash"""
-        index = self._hash(key)
-        bucket = self.table[index]
+        if ruta == ["articulos"] and metodo == "GET":
+            orden = parametros.get("orden", "titulo")
+            if orden not in ("titulo", "autor"):
+                raise ErrorHTTP(400, "orden debe ser 'titulo' o 'autor'")
+            listar = gestor.listar_por_titulo if orden == "titulo" else gestor.listar_por_autor
+            articulos = await self._leer(listar, offset, limit)
+            # Con particiones len() consulta a cada proceso: no en el bucle de eventos
+            total = await self._leer(len, gestor)
+            return 200, {"total": total,
+                         "articulos": [articulo_a_dict(a) for a in articulos]}
 
-        # Verificar si la clave ya existe
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)  # Actualizar valor existente
-                return
+        if ruta == ["articulos"] and metodo == "POST":
+            altas = datos if isinstance(datos, list) else [datos]
+            if not all(isinstance(alta, dict) for alta in altas):
+                raise ErrorHTTP(400, "Se espera un objeto o una lista de objetos")
+            altas = [self._validar_alta(alta) for alta in altas]
+            estados = await self._encolar("agregar", altas)
+            resultados = [{"estado": estado, ("hash_id" if estado != "fallo" else "error"): valor}
+                          for estado, valor in estados]
+            if isinstance(datos, list):
+                return 200, {"resultados": resultados}
+            codigos = {"importado": 201, "duplicado": 409, "similar": 409}
+            return codigos.get(resultados[0]["estado"], 400), resultados[0]
 
-        # Insertar nuevo elemento
-        bucket.append((key, value))
-        self.count += 1
+        if len(ruta) == 2 and ruta[0] == "articulos":
+            hash_id = ruta[1]
+            if metodo == "GET":
+                articulo = await self._leer(gestor.obtener_articulo, hash_id)
+                if articulo is None:
+                    raise ErrorHTTP(404, "Articulo no encontrado")
+                return 200, articulo_a_dict(articulo)
+            if metodo in ("PATCH", "PUT"):
+                if not isinstance(datos, dict):
+                    raise ErrorHTTP(400, "Se espera un objeto JSON")
+                año = datos.get("año")
+                exito, mensaje = await self._encolar(
+                    gestor.modificar_articulo,
+                    (hash_id, datos.get("autores"), int(año) if año is not None else None))
+            elif metodo == "DELETE":
+                exito, mensaje = await self._encolar(gestor.eliminar_articulo, (hash_id,))
+            else:
+                raise ErrorHTTP(405, "Metodo no permitido")
+            if not exito:
+                raise ErrorHTTP(404 if "no encontrado" in mensaje else 400, mensaje)
+            return 200, {"mensaje": mensaje}
 
-    def get(self, key):
-        """Obtener elemento de la tabla hash"""
-        index = self._hash(key)
-        bucket = self.table[index]
+        if len(ruta) == 3 and ruta[0] == "articulos" and ruta[2] == "vista-previa":
+            if metodo != "GET":
+                raise ErrorHTTP(405, "Metodo no permitido")
+            caracteres = int(parametros.get("caracteres", gestor.VISTA_PREVIA))
+            try:
+                texto = await self._leer(gestor.vista_previa, ruta[1], caracteres)
+            except OSError as e:
+                raise ErrorHTTP(500, f"No se pudo leer el contenido: {e}")
+            if texto is None:
+                raise ErrorHTTP(404, "Articulo no encontrado")
+            return 200, {"hash_id": ruta[1], "vista_previa": texto}
 
-        for k, v in bucket:
-            if k == key:
-                return v
-        return None
+        if ruta == ["autores", "renombrar"] and metodo == "POST":
+            if not isinstance(datos, dict) or not datos.get("actual") or not datos.get("nuevo"):
+                raise ErrorHTTP(400, "Se espera {\"actual\": ..., \"nuevo\": ...}")
+            exito, mensaje = await self._encolar(gestor.renombrar_autor,
+                                                 (datos["actual"], datos["nuevo"]))
+            if not exito:
+                raise ErrorHTTP(400, mensaje)
+            return 200, {"mensaje": mensaje}
 
-    def delete(self, key):
-        """Eliminar elemento de la tabla hash"""
-        index = self._hash(key)
-        bucket = self.table[index]
+        if ruta == ["buscar"] and metodo == "GET":
+            criterios = {clave: parametros[clave]
+                         for clave in ("titulo_prefijo", "autor", "autor_prefijo")
+                         if clave in parametros}
+            if "coautores" in parametros:
+                criterios["coautores"] = separar_autores(parametros["coautores"])
+            for clave in ("año", "año_desde", "año_hasta"):
+                if clave in parametros:
+                    criterios[clave] = int(parametros[clave])
+            articulos = await self._leer(gestor.buscar, offset=offset, limit=limit, **criterios)
+            return 200, {"articulos": [articulo_a_dict(a) for a in articulos]}
 
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                del bucket[i]
-                self.count -= 1
-                return True
-        return False
+        if ruta == ["buscar", "texto"] and metodo == "GET":
+            if not parametros.get("q"):
+                raise ErrorHTTP(400, "Falta el parametro q")
+            resultados = await self._leer(gestor.buscar_texto, parametros["q"], limit or 20)
+            return 200, {"articulos": [dict(articulo_a_dict(a), puntaje=puntaje)
+                                       for a, puntaje in resultados]}
 
-    def exists(self, key):
-        """Verificar si una clave existe en la tabla"""
-        return self.get(key) is not None
+        if ruta == ["buscar", "aproximado"] and metodo == "GET":
+            if not parametros.get("q"):
+                raise ErrorHTTP(400, "Falta el parametro q")
+            resultados = await self._leer(gestor.buscar_aproximado, parametros["q"],
+                                          parametros.get("campo"), limit or 20,
+                                          float(parametros.get("umbral", 0.5)))
+            return 200, {"articulos": [dict(articulo_a_dict(a), similitud=similitud)
+                                       for a, similitud in resultados]}
 
-    def get_all_values(self):
-        """Obtener todos los valores de la tabla"""
-        values = []
-        for bucket in self.table:
-            for k, v in bucket:
-                values.append(v)
-        return values
+        if ruta == ["autores", "sugerencias"] and metodo == "GET":
+            sugerencias = await self._leer(gestor.sugerir_autores,
+                                           parametros.get("prefijo", ""), limit or 10)
+            return 200, {"autores": [{"nombre": nombre, "similitud": similitud}
+                                     for nombre, similitud in sugerencias]}
 
+        if ruta == ["estadisticas"] and metodo == "GET":
+            estadisticas = await self._leer(gestor.estadisticas)
+            estadisticas["escrituras_pendientes"] = self._cola.qsize()
+            if gestor.metricas is not None:
+                estadisticas["metricas"] = gestor.metricas.instantanea()
+            return 200, estadisticas
 
-class Articulo:
-    """Clase para representar un artículo cientifico"""
+        if ruta == ["analitica"] and metodo == "GET":
+            reporte = await self._leer(gestor.reporte_catalogo, int(parametros.get("top", 20)),
+                                       parametros.get("autor"), int(parametros.get("ancho", 1)))
+            return 200, reporte
 
-    def __init__(self, hash_id, titulo, autores, año, archivo_nombre):
-        self.hash_id = hash_id
-        self.titulo = titulo
-        self.autores = autores
-        self.año = año
-        self.archivo_nombre = archivo_nombre
+        if ruta == ["metricas"] and metodo == "GET":
+            if gestor.metricas is None:
+                raise ErrorHTTP(404, "Metricas desactivadas (iniciar con --metricas)")
+            return 200, gestor.metricas.prometheus()
 
-    def __str__(self):
-        return f"Título: {self.titulo}\nAutores: {self.autores}\nAño: {self.año}\nHash: {self.hash_id}"
+        if ruta and ruta[0] in ("articulos", "autores", "buscar", "estadisticas", "analitica",
+                                   "metricas"):
+            raise ErrorHTTP(405, "Metodo no permitido")
+        raise ErrorHTTP(404, "Ruta no encontrada")
 
 
-class GestorArticulos:
-    """Gestor principal de articulos cientificos"""
+# Tkinter se importa solo al abrir la interfaz, asi el servidor y la linea
+# de comandos funcionan en maquinas sin Tk ni pantalla
+tk = ttk = filedialog = messagebox = None
 
-    def __init__(self):
-        self.tabla_hash = HashTable(200)  # Tabla hash principal
-        self.indice_autores = defaultdict(list)  # Indice secundario por autor
-        self.indice_años = defaultdict(list)  # Indice secundario por año
-        self.db_file = "articulos_db.txt"
-        self.articulos_dir = "articulos"
 
-        # Crear directorio de articulos si no existe
-        if not os.path.exists(self.articulos_dir):
-            os.makedirs(self.articulos_dir)
+def _cargar_tkinter():
+    global tk, ttk, filedialog, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, filedialog as _filedialog, messagebox as _messagebox
+        tk, ttk, filedialog, messagebox = tkinter, _ttk, _filedialog, _messagebox
 
-        self.cargar_base_datos()
 
-    def calcular_hash_fnv1(self, contenido):
-        """Implementacion del algoritmo FNV-1 para generar hash"""
-        FNV_PRIME = 16777619
-        FNV_OFFSET_BASIS = 2166136261
+class TareaCancelada(Exception):
+    """La tarea se cancelo antes de terminar"""
 
-        hash_value = FNV_OFFSET_BASIS
-        for byte in contenido.encode('utf-8'):
-            hash_value = (hash_value * FNV_PRIME) % (2 ** 32)
-            hash_value = hash_value ^ byte
 
-        return str(hash_value)
+class Tarea:
+    """Trabajo enviado a un EjecutorTareas, con progreso y cancelacion"""
 
-    def cargar_base_datos(self):
-        """Cargar articulos desde el archivo de base de datos"""
-        if not os.path.exists(self.db_file):
-            return
+    def __init__(self, descripcion, cola):
+        self.descripcion = descripcion
+        self.cancelado = threading.Event()
+        self.futuro = None
+        self._cola = cola
 
-        try:
-            with open(self.db_file, 'r', encoding='utf-8') as file:
-                for linea in file:
-                    if linea.strip():
-                        partes = linea.strip().split('|')
-                        if len(partes) == 5:
-                            hash_id, titulo, autores, año, archivo_nombre = partes
-                            articulo = Articulo(hash_id, titulo, autores, int(año), archivo_nombre)
+    def cancelar(self):
+        self.cancelado.set()
+        # Si aun no empezo, no llegara a avisar por su cuenta
+        if self.futuro is not None and self.futuro.cancel():
+            self._cola.put(("cancelada", self, None))
 
-                            # Insertar en tabla hash principal
-                            self.tabla_hash.insert(hash_id, articulo)
+    def progreso(self, hechos, total):
+        """Informar avance; se puede llamar desde cualquier hilo"""
+        self._cola.put(("progreso", self, (hechos, total)))
 
-                            # Actualizar indices secundarios
-                            self.indice_autores[autores.lower()].append(articulo)
-                            self.indice_años[int(año)].append(articulo)
-        except Exception as e:
-            print(f"Error al cargar base de datos: {e}")
+    def verificar(self):
+        """Abortar el trabajo si se pidio cancelarlo"""
+        if self.cancelado.is_set():
+            raise TareaCancelada()
 
-    def guardar_base_datos(self):
-        """Guardar articulos en el archivo de base de datos"""
-        try:
-            with open(self.db_file, 'w', encoding='utf-8') as file:
-                articulos = self.tabla_hash.get_all_values()
-                for articulo in articulos:
-                    linea = f"{articulo.hash_id}|{articulo.titulo}|{articulo.autores}|{articulo.año}|{articulo.archivo_nombre}\n"
-                    file.write(linea)
-        except Exception as e:
-            print(f"Error al guardar base de datos: {e}")
+    def esperar(self, futuro):
+        """Esperar un futuro (por ejemplo del pool de procesos) atendiendo la cancelacion"""
+        while True:
+            try:
+                return futuro.result(timeout=0.1)
+            except FuturesTimeoutError:
+                if self.cancelado.is_set():
+                    futuro.cancel()
+                    raise TareaCancelada()
 
-    def agregar_articulo(self, titulo, autores, año, ruta_archivo):
-        """Agregar nuevo articulo al sistema"""
-        try:
-            # Leer contenido del archivo
-            with open(ruta_archivo, 'r', encoding='utf-8') as file:
-                contenido = file.read()
 
-            # Calcular hash del contenido
-            hash_id = self.calcular_hash_fnv1(contenido)
+class EjecutorTareas:
+    """Ejecuta trabajos fuera del hilo de Tk y devuelve sus resultados a ese hilo
 
-            # Verificar duplicados
-            if self.tabla_hash.exists(hash_id):
-                return False, "El articulo ya existe en el sistema"
+    Los trabajos corren en un pool de hilos (E/S y acceso al gestor) y
+    pueden delegar calculo pesado, como el hash, al pool de procesos. Los
+    resultados y el progreso pasan por una cola que el hilo de Tk atiende
+    periodicamente con ``root.after``, porque Tk no es seguro entre hilos.
+    """
 
-            # Crear nombre de archivo basado en hash
-            archivo_nombre = f"{hash_id}.txt"
-            ruta_destino = os.path.join(self.articulos_dir, archivo_nombre)
+    INTERVALO_MS = 50
 
-            # Copiar archivo con nuevo nombre
-            with open(ruta_destino, 'w', encoding='utf-8') as file:
-                file.write(contenido)
+    def __init__(self, root, hilos=4):
+        _cargar_tkinter()
+        self.root = root
+        self.hilos = ThreadPoolExecutor(max_workers=hilos)
+        self._procesos = None
+        self._cola = queue.Queue()
+        self.activas = []
+        self.al_cambiar = None  # al_cambiar(tarea_o_None, (hechos, total)_o_None)
+        self.root.after(self.INTERVALO_MS, self._atender)
 
-            # Crear objeto artículo
-            articulo = Articulo(hash_id, titulo, autores, año, archivo_nombre)
+    @property
+    def procesos(self):
+        """Pool de procesos para trabajo de CPU, creado al primer uso"""
+        if self._procesos is None:
+            self._procesos = ProcessPoolExecutor()
+        return self._procesos
 
-            # Insertar en tabla hash principal
-            self.tabla_hash.insert(hash_id, articulo)
+    def enviar(self, descripcion, funcion, al_terminar=None, al_fallar=None):
+        """Ejecutar ``funcion(tarea)`` en segundo plano
 
-            # Actualizar indices secundarios
-            self.indice_autores[autores.lower()].append(articulo)
-            self.indice_años[año].append(articulo)
+        ``al_terminar(resultado)`` y ``al_fallar(error)`` se llaman en el hilo de Tk.
+        """
+        tarea = Tarea(descripcion, self._cola)
 
-            # Guardar en base de datos
-            self.guardar_base_datos()
+        def ejecutar():
+            try:
+                tarea.verificar()
+                resultado = funcion(tarea)
+                self._cola.put(("fin", tarea, (al_terminar, resultado)))
+            except TareaCancelada:
+                self._cola.put(("cancelada", tarea, None))
+            except Exception as e:
+                self._cola.put(("error", tarea, (al_fallar, e)))
 
-            return True, "Artículo agregado exitosamente"
+        self.activas.append(tarea)
+        tarea.futuro = self.hilos.submit(ejecutar)
+        self._notificar(tarea, None)
+        return tarea
 
-        except Exception as e:
-            return False, f"Error al agregar artículo: {e}"
+    def cancelar_todas(self):
+        for tarea in list(self.activas):
+            tarea.cancelar()
 
-    def modificar_articulo(self, hash_id, nuevo_autor=None, nuevo_año=None):
-        """Modificar datos de un articulo existente"""
-        articulo = self.tabla_hash.get(hash_id)
-        if not articulo:
-            return False, "Artículo no encontrado"
+    def cerrar(self):
+        """Cancelar lo pendiente y esperar a que terminen los trabajos en curso"""
+        self.cancelar_todas()
+        self.hilos.shutdown(wait=True)
+        if self._procesos is not None:
+            self._procesos.shutdown(cancel_futures=True)
 
+    def _notificar(self, tarea, progreso):
+        if self.al_cambiar is not None:
+            self.al_cambiar(tarea, progreso)
+
+    def _atender(self):
+        """Entregar en el hilo de Tk los mensajes de los trabajos"""
         try:
-            # Remover de indices antiguos
-            if articulo.autores.lower() in self.indice_autores:
-                self.indice_autores[articulo.autores.lower()].remove(articulo)
-            if articulo.año in self.indice_años:
-                self.indice_años[articulo.año].remove(articulo)
+            while True:
+                tipo, tarea, datos = self._cola.get_nowait()
+                if tipo == "progreso":
+                    self._notificar(tarea, datos)
+                    continue
 
-            # Actualizar datos
-            if nuevo_autor:
-                articulo.autores = nuevo_autor
-            if nuevo_año:
-                articulo.año = nuevo_año
+                if tarea in self.activas:
+                    self.activas.remove(tarea)
+                self._notificar(self.activas[-1] if self.activas else None, None)
+                try:
+                    if tipo == "fin" and datos[0] is not None:
+                        datos[0](datos[1])
+                    elif tipo == "error":
+                        if datos[0] is not None:
+                            datos[0](datos[1])
+                        else:
+                            messagebox.showerror("Error", f"{tarea.descripcion}: {datos[1]}")
+                except Exception as e:
+                    print(f"Error al procesar resultado de '{tarea.descripcion}': {e}",
+                          file=sys.stderr)
+        except queue.Empty:
+            pass
+        self.root.after(self.INTERVALO_MS, self._atender)
 
-            # Agregar a nuevos indices
-            self.indice_autores[articulo.autores.lower()].append(articulo)
-            self.indice_años[articulo.año].append(articulo)
 
-            # Guardar cambios
-            self.guardar_base_datos()
+class VistaResultados:
+    """Treeview virtualizado para listas de resultados grandes
 
-            return True, "Articulo modificado exitosamente"
+    Solo existen como filas de Tk las que caben en pantalla. Al desplazarse
+    se piden al origen de datos las filas de la nueva ventana y se reutilizan
+    los mismos items, asi el costo de listar depende del alto de la vista y
+    no de la cantidad de resultados.
+    """
 
-        except Exception as e:
-            return False, f"Error al modificar articulo: {e}"
+    ALTO_FILA = 20  # Alto por defecto de una fila del Treeview, en pixeles
+    ALTO_ENCABEZADO = 25
 
-    def eliminar_articulo(self, hash_id):
-        """Eliminar un artículo del sistema"""
-        articulo = self.tabla_hash.get(hash_id)
-        if not articulo:
-            return False, "Articulo no encontrado"
+    def __init__(self, parent, columnas, encabezados):
+        _cargar_tkinter()
+        self.frame = ttk.Frame(parent)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(self.frame, columns=columnas, show="headings")
+        for columna, texto in zip(columnas, encabezados):
+            self.tree.heading(columna, text=texto)
+        self.tree.pack(fill=tk.BOTH, expand=True)
 
-        try:
-            # Eliminar archivo físico
-            ruta_archivo = os.path.join(self.articulos_dir, articulo.archivo_nombre)
-            if os.path.exists(ruta_archivo):
-                os.remove(ruta_archivo)
+        estilo = ttk.Style()
+        self.alto_fila = int(estilo.lookup("Treeview", "rowheight") or self.ALTO_FILA)
 
-            # Remover de indices
-            if articulo.autores.lower() in self.indice_autores:
-                self.indice_autores[articulo.autores.lower()].remove(articulo)
-            if articulo.año in self.indice_años:
-                self.indice_años[articulo.año].remove(articulo)
+        self._obtener = None  # obtener(offset, limit) -> lista de filas (tuplas)
+        self.al_renderizar = None  # al_renderizar(filas) tras cada cambio de ventana
+        self.total = 0
+        self.inicio = 0
+        self.filas_visibles = 1
 
-            # Eliminar de tabla hash principal
-            self.tabla_hash.delete(hash_id)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_rueda)
+        self.tree.bind("<Button-4>", lambda e: self.desplazar(-3))
+        self.tree.bind("<Button-5>", lambda e: self.desplazar(3))
+        self.tree.bind("<Up>", lambda e: self._on_flecha(-1))
+        self.tree.bind("<Down>", lambda e: self._on_flecha(1))
+        self.tree.bind("<Prior>", lambda e: self.desplazar(-self.filas_visibles) or "break")
+        self.tree.bind("<Next>", lambda e: self.desplazar(self.filas_visibles) or "break")
+        self.tree.bind("<Home>", lambda e: self.ir_a(0) or "break")
+        self.tree.bind("<End>", lambda e: self.ir_a(self.total) or "break")
 
-            # Guardar cambios
-            self.guardar_base_datos()
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
 
-            return True, "Artículo eliminado exitosamente"
+    def mostrar(self, obtener, total):
+        """Mostrar un nuevo origen de datos desde el principio"""
+        self._obtener = obtener
+        self.total = total
+        self.inicio = 0
+        self.tree.selection_remove(*self.tree.selection())
+        self._render()
 
-        except Exception as e:
-            return False, f"Error al eliminar artículo: {e}"
+    def mostrar_lista(self, filas):
+        """Mostrar una lista ya materializada de filas"""
+        self.mostrar(lambda offset, limit: filas[offset:offset + limit], len(filas))
 
-    def buscar_por_autor(self, autor):
-        """Buscar articulos por autor"""
-        return sorted(self.indice_autores.get(autor.lower(), []),
-                      key=lambda x: x.titulo.lower())
+    def limpiar(self):
+        self.mostrar(lambda offset, limit: [], 0)
 
-    def buscar_por_año(self, año):
-        """Buscar articulos por año"""
-        return sorted(self.indice_años.get(año, []),
-                      key=lambda x: x.titulo.lower())
+    def ir_a(self, posicion):
+        maximo = max(0, self.total - self.filas_visibles)
+        posicion = min(max(0, int(posicion)), maximo)
+        if posicion != self.inicio:
+            self.inicio = posicion
+            self._render()
 
-    def listar_por_titulo(self):
-        """Listar todos los articulos ordenados por titulo"""
-        articulos = self.tabla_hash.get_all_values()
-        return sorted(articulos, key=lambda x: x.titulo.lower())
+    def desplazar(self, filas):
+        self.ir_a(self.inicio + filas)
 
-    def listar_por_autor(self):
-        """Listar todos los articulos ordenados por autor"""
-        articulos = self.tabla_hash.get_all_values()
-        return sorted(articulos, key=lambda x: x.autores.lower())
+    def siguientes(self, cantidad):
+        """Filas que siguen a la ventana visible, p. ej. para precargarlas"""
+        if self._obtener is None:
+            return []
+        return self._obtener(self.inicio + self.filas_visibles, cantidad)
+
+    def _render(self):
+        """Rellenar los items visibles con la ventana actual de resultados"""
+        filas = self._obtener(self.inicio, self.filas_visibles) if self._obtener else []
+        items = self.tree.get_children()
+        for item, valores in zip(items, filas):
+            self.tree.item(item, values=valores)
+        if len(items) > len(filas):
+            self.tree.delete(*items[len(filas):])
+        for valores in filas[len(items):]:
+            self.tree.insert("", tk.END, values=valores)
+
+        if self.total:
+            self.scrollbar.set(self.inicio / self.total,
+                               min(1.0, (self.inicio + self.filas_visibles) / self.total))
+        else:
+            self.scrollbar.set(0, 1)
+        if self.al_renderizar is not None:
+            self.al_renderizar(filas)
+
+    def _on_configure(self, event):
+        filas = max(1, (event.height - self.ALTO_ENCABEZADO) // self.alto_fila)
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self.inicio = min(self.inicio, max(0, self.total - filas))
+            self._render()
+
+    def _on_scrollbar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self.ir_a(float(cantidad) * self.total)
+        elif unidad == "pages":
+            self.desplazar(int(cantidad) * self.filas_visibles)
+        else:
+            self.desplazar(int(cantidad))
+
+    def _on_rueda(self, event):
+        self.desplazar(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_flecha(self, direccion):
+        """Mover la seleccion; en el borde de la ventana se desplaza la vista"""
+        items = self.tree.get_children()
+        seleccion = self.tree.selection()
+        if not items or not seleccion:
+            return None
+        indice = items.index(seleccion[0])
+        if 0 <= indice + direccion < len(items):
+            return None
+        self.desplazar(direccion)
+        return "break"
 
 
 class InterfazGrafica:
     """Interfaz grafica principal usando Tkinter"""
 
-    def __init__(self):
-        self.gestor = GestorArticulos()
+    PRECARGA_FILAS = 10  # Filas siguientes a la ventana visible cuyo cuerpo se precarga
+    SUGERENCIAS_DEMORA_MS = 200  # Pausa de tipeo tras la cual se piden sugerencias de autor
+    SUGERENCIAS_MAXIMAS = 8
+
+    def __init__(self, gestor=None):
+        _cargar_tkinter()
+        self.gestor = gestor or GestorArticulos()
         self.root = tk.Tk()
         self.root.title("Gestor de Artículos Científicos")
         self.root.geometry("800x600")
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        # Los trabajos largos corren fuera del hilo de Tk
+        self.tareas = EjecutorTareas(self.root)
+        self.tareas.al_cambiar = self._actualizar_estado
 
         self.setup_ui()
 
     def setup_ui(self):
         """Configurar la interfaz de usuario"""
+        # Barra de estado con progreso y cancelacion de trabajos en curso
+        estado_frame = ttk.Frame(self.root)
+        estado_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
+        self.label_estado = ttk.Label(estado_frame, text="Listo")
+        self.label_estado.pack(side=tk.LEFT)
+        self.boton_cancelar = ttk.Button(estado_frame, text="Cancelar", state=tk.DISABLED,
+                                         command=self.tareas.cancelar_todas)
+        self.boton_cancelar.pack(side=tk.RIGHT)
+        self.barra_progreso = ttk.Progressbar(estado_frame, length=200)
+        self.barra_progreso.pack(side=tk.RIGHT, padx=10)
+
         # Notebook para pestañas
         notebook = ttk.Notebook(self.root)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -297,6 +6267,16 @@ class InterfazGrafica:
         notebook.add(self.frame_gestionar, text="Gestionar Artículos")
         self.setup_gestionar_tab()
 
+        # Pestaña de estadisticas del catalogo (columnas analiticas)
+        self.frame_estadisticas = ttk.Frame(notebook)
+        notebook.add(self.frame_estadisticas, text="Estadísticas")
+        self.setup_estadisticas_tab()
+
+        # Pestaña de diagnostico: metricas de las operaciones
+        self.frame_diagnostico = ttk.Frame(notebook)
+        notebook.add(self.frame_diagnostico, text="Diagnóstico")
+        self.setup_diagnostico_tab()
+
     def setup_agregar_tab(self):
         """Configurar pestaña para agregar articulos"""
         # Frame principal
@@ -331,6 +6311,10 @@ class InterfazGrafica:
         ttk.Button(main_frame, text="Agregar Artículo",
                    command=self.agregar_articulo).grid(row=4, column=1, pady=20, sticky=tk.W, padx=(10, 0))
 
+        # Importacion masiva de una carpeta
+        ttk.Button(main_frame, text="Importar Carpeta...",
+                   command=self.importar_carpeta).grid(row=5, column=1, sticky=tk.W, padx=(10, 0))
+
         self.archivo_seleccionado = None
 
     def setup_buscar_tab(self):
@@ -352,8 +6336,11 @@ class InterfazGrafica:
         busqueda_frame.pack(fill=tk.X, pady=(0, 10))
 
         ttk.Label(busqueda_frame, text="Buscar por Autor:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.entry_buscar_autor = ttk.Entry(busqueda_frame, width=30)
+        self.var_buscar_autor = tk.StringVar()
+        self.entry_buscar_autor = ttk.Entry(busqueda_frame, width=30,
+                                            textvariable=self.var_buscar_autor)
         self.entry_buscar_autor.grid(row=0, column=1, padx=5, pady=5)
+        self._configurar_sugerencias()
         ttk.Button(busqueda_frame, text="Buscar",
                    command=self.buscar_por_autor).grid(row=0, column=2, padx=5, pady=5)
 
@@ -363,21 +6350,35 @@ class InterfazGrafica:
         ttk.Button(busqueda_frame, text="Buscar",
                    command=self.buscar_por_año).grid(row=1, column=2, padx=5, pady=5)
 
-        # Lista de resultados
-        self.tree_resultados = ttk.Treeview(main_frame,
-                                            columns=("titulo", "autores", "año", "hash"),
-                                            show="headings")
-        self.tree_resultados.heading("titulo", text="Título")
-        self.tree_resultados.heading("autores", text="Autores")
-        self.tree_resultados.heading("año", text="Año")
-        self.tree_resultados.heading("hash", text="Hash ID")
+        ttk.Label(busqueda_frame, text="Buscar en Texto:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        self.entry_buscar_texto = ttk.Entry(busqueda_frame, width=30)
+        self.entry_buscar_texto.grid(row=2, column=1, padx=5, pady=5)
+        ttk.Button(busqueda_frame, text="Buscar",
+                   command=self.buscar_texto).grid(row=2, column=2, padx=5, pady=5)
+
+        # Resultados arriba y vista previa del articulo seleccionado abajo
+        paneles = ttk.PanedWindow(main_frame, orient=tk.VERTICAL)
+        paneles.pack(fill=tk.BOTH, expand=True)
 
-        self.tree_resultados.pack(fill=tk.BOTH, expand=True)
+        # Lista de resultados virtualizada, con su propia scrollbar
+        self.vista_resultados = VistaResultados(paneles,
+                                                ("titulo", "autores", "año", "hash"),
+                                                ("Título", "Autores", "Año", "Hash ID"))
+        paneles.add(self.vista_resultados.frame, weight=3)
+        self.tree_resultados = self.vista_resultados.tree
+        self.tree_resultados.bind("<<TreeviewSelect>>", self.mostrar_vista_previa)
+        self.vista_resultados.al_renderizar = self._precargar_resultados
 
-        # Scrollbar para la lista
-        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree_resultados.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree_resultados.configure(yscrollcommand=scrollbar.set)
+        previa_frame = ttk.LabelFrame(paneles, text="Vista Previa")
+        paneles.add(previa_frame, weight=2)
+        self.label_cache = ttk.Label(previa_frame, text="")
+        self.label_cache.pack(side=tk.BOTTOM, anchor=tk.W, padx=5, pady=(0, 5))
+        barra = ttk.Scrollbar(previa_frame, orient=tk.VERTICAL)
+        barra.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        self.text_vista_previa = tk.Text(previa_frame, height=8, wrap=tk.WORD, state=tk.DISABLED,
+                                         yscrollcommand=barra.set)
+        self.text_vista_previa.pack(fill=tk.BOTH, expand=True, padx=(5, 0), pady=5)
+        barra.config(command=self.text_vista_previa.yview)
 
     def setup_gestionar_tab(self):
         """Configurar pestaña para gestionar articulos"""
@@ -416,6 +6417,213 @@ class InterfazGrafica:
         ttk.Button(delete_frame, text="Eliminar Artículo",
                    command=self.eliminar_articulo).pack(padx=5, pady=10)
 
+    def setup_estadisticas_tab(self):
+        """Configurar pestaña de estadisticas: ranking de autores e histograma por año"""
+        main_frame = ttk.Frame(self.frame_estadisticas)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        control_frame = ttk.Frame(main_frame)
+        control_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(control_frame, text="Top:").pack(side=tk.LEFT)
+        self.spin_top = ttk.Spinbox(control_frame, from_=1, to=500, width=5)
+        self.spin_top.set(20)
+        self.spin_top.pack(side=tk.LEFT, padx=5)
+        ttk.Label(control_frame, text="Autor:").pack(side=tk.LEFT, padx=(10, 0))
+        self.entry_estadisticas_autor = ttk.Entry(control_frame, width=25)
+        self.entry_estadisticas_autor.pack(side=tk.LEFT, padx=5)
+        ttk.Label(control_frame, text="Años por barra:").pack(side=tk.LEFT, padx=(10, 0))
+        self.spin_ancho = ttk.Spinbox(control_frame, from_=1, to=50, width=4)
+        self.spin_ancho.set(1)
+        self.spin_ancho.pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Actualizar",
+                   command=self.actualizar_estadisticas).pack(side=tk.LEFT, padx=5)
+
+        self.label_resumen = ttk.Label(main_frame, text="")
+        self.label_resumen.pack(fill=tk.X, pady=(0, 5))
+
+        paned = ttk.PanedWindow(main_frame, orient=tk.HORIZONTAL)
+        paned.pack(fill=tk.BOTH, expand=True)
+
+        autores_frame = ttk.LabelFrame(paned, text="Autores con más artículos")
+        self.tree_top_autores = ttk.Treeview(autores_frame, columns=("cantidad",), height=14)
+        self.tree_top_autores.heading("#0", text="Autor")
+        self.tree_top_autores.column("#0", width=200)
+        self.tree_top_autores.heading("cantidad", text="Artículos")
+        self.tree_top_autores.column("cantidad", width=70, anchor=tk.E)
+        barra = ttk.Scrollbar(autores_frame, orient=tk.VERTICAL,
+                              command=self.tree_top_autores.yview)
+        self.tree_top_autores.configure(yscrollcommand=barra.set)
+        barra.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree_top_autores.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Doble clic: histograma de ese autor
+        self.tree_top_autores.bind("<Double-1>", self._histograma_de_autor)
+        paned.add(autores_frame, weight=1)
+
+        histograma_frame = ttk.LabelFrame(paned, text="Artículos por año")
+        self.canvas_histograma = tk.Canvas(histograma_frame, background="white",
+                                           highlightthickness=0)
+        self.canvas_histograma.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.canvas_histograma.bind("<Configure>", lambda event: self._dibujar_histograma())
+        paned.add(histograma_frame, weight=2)
+
+        self._histograma = []
+
+    def actualizar_estadisticas(self):
+        """Calcular el reporte del catalogo en segundo plano y mostrarlo"""
+        try:
+            top, ancho = int(self.spin_top.get()), int(self.spin_ancho.get())
+        except ValueError:
+            messagebox.showerror("Error", "Top y años por barra deben ser números")
+            return
+        autor = self.entry_estadisticas_autor.get().strip() or None
+
+        def al_terminar(reporte):
+            self.tree_top_autores.delete(*self.tree_top_autores.get_children())
+            for nombre, cantidad in reporte["top_autores"]:
+                self.tree_top_autores.insert("", tk.END, text=nombre, values=(cantidad,))
+            titulos = reporte["titulos"]
+            resumen = f"{reporte['articulos']} artículos, {reporte['autores']} autores"
+            if titulos["articulos"]:
+                resumen += f", título medio de {titulos['media']:.0f} caracteres"
+            self.label_resumen.config(text=f"{resumen} (cálculo con {reporte['motor']})")
+            self._histograma = reporte["histograma_años"]
+            self._dibujar_histograma()
+
+        def al_fallar(error):
+            messagebox.showerror("Error", f"No se pudieron calcular las estadísticas: {error}")
+
+        self.tareas.enviar("Calculando estadísticas",
+                           lambda tarea: self.gestor.reporte_catalogo(top, autor, ancho),
+                           al_terminar, al_fallar)
+
+    def _histograma_de_autor(self, event=None):
+        seleccion = self.tree_top_autores.selection()
+        if seleccion:
+            self.entry_estadisticas_autor.delete(0, tk.END)
+            self.entry_estadisticas_autor.insert(0, self.tree_top_autores.item(seleccion[0], "text"))
+            self.actualizar_estadisticas()
+
+    def _dibujar_histograma(self):
+        """Dibujar en el canvas las barras del ultimo histograma calculado"""
+        canvas = self.canvas_histograma
+        canvas.delete("all")
+        if not self._histograma:
+            return
+        ancho, alto = canvas.winfo_width(), canvas.winfo_height()
+        margen_x, margen_y = 40, 20
+        maximo = max(cantidad for _, cantidad in self._histograma) or 1
+        paso = (ancho - 2 * margen_x) / len(self._histograma)
+        alto_util = alto - 2 * margen_y
+        # Sin espacio para todas las etiquetas se muestra una de cada tantas
+        cada = max(1, math.ceil(40 / paso)) if paso > 0 else 1
+        for i, (inicio, cantidad) in enumerate(self._histograma):
+            x0 = margen_x + i * paso
+            y0 = alto - margen_y - cantidad * alto_util / maximo
+            canvas.create_rectangle(x0 + 1, y0, x0 + paso - 1, alto - margen_y,
+                                    fill="steelblue", outline="")
+            if i % cada == 0:
+                canvas.create_text(x0 + paso / 2, alto - margen_y / 2, text=str(inicio),
+                                   font=("TkDefaultFont", 7))
+        canvas.create_text(margen_x / 2, margen_y, text=str(maximo), font=("TkDefaultFont", 7))
+
+    def setup_diagnostico_tab(self):
+        """Configurar pestaña de diagnostico con las metricas del gestor"""
+        main_frame = ttk.Frame(self.frame_diagnostico)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        control_frame = ttk.Frame(main_frame)
+        control_frame.pack(fill=tk.X, pady=(0, 10))
+        self.var_metricas = tk.BooleanVar(value=self.gestor.metricas is not None)
+        ttk.Checkbutton(control_frame, text="Medir operaciones", variable=self.var_metricas,
+                        command=self.alternar_metricas).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Actualizar",
+                   command=self.actualizar_diagnostico).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Reiniciar",
+                   command=self.reiniciar_metricas).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Exportar Prometheus...",
+                   command=self.exportar_metricas).pack(side=tk.LEFT, padx=5)
+
+        # Latencias en milisegundos; contadores y gauges solo llevan valor
+        columnas = ("valor", "media", "p50", "p95", "p99")
+        self.tree_metricas = ttk.Treeview(main_frame, columns=columnas, height=14)
+        self.tree_metricas.heading("#0", text="Métrica")
+        self.tree_metricas.column("#0", width=330)
+        for columna, texto in zip(columnas, ("Valor / Cantidad", "Media ms", "p50 ms", "p95 ms",
+                                             "p99 ms")):
+            self.tree_metricas.heading(columna, text=texto)
+            self.tree_metricas.column(columna, width=90, anchor=tk.E)
+        barra = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree_metricas.yview)
+        self.tree_metricas.configure(yscrollcommand=barra.set)
+        barra.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree_metricas.pack(fill=tk.BOTH, expand=True)
+
+        errores_frame = ttk.LabelFrame(self.frame_diagnostico, text="Errores recientes")
+        errores_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+        self.text_errores = tk.Text(errores_frame, height=5, state=tk.DISABLED)
+        self.text_errores.pack(fill=tk.X, padx=5, pady=5)
+
+        self.actualizar_diagnostico(periodico=True)
+
+    def alternar_metricas(self):
+        """Activar o desactivar la instrumentacion del gestor"""
+        if self.var_metricas.get():
+            self.gestor.activar_metricas()
+        else:
+            self.gestor.desactivar_metricas()
+        self.actualizar_diagnostico()
+
+    def reiniciar_metricas(self):
+        if self.gestor.metricas is not None:
+            self.gestor.metricas.reiniciar()
+        self.actualizar_diagnostico()
+
+    def actualizar_diagnostico(self, periodico=False):
+        """Volver a llenar la tabla de metricas; con ``periodico`` cada 2 s"""
+        if periodico:
+            self.root.after(2000, self.actualizar_diagnostico, True)
+        metricas = self.gestor.metricas
+        tree = self.tree_metricas
+        # Sin metricas o con la pestaña oculta no vale la pena redibujar
+        if periodico and (metricas is None or not tree.winfo_viewable()):
+            return
+        tree.delete(*tree.get_children())
+        if metricas is None:
+            tree.insert("", tk.END, text="Metricas desactivadas")
+            return
+
+        datos = metricas.instantanea()
+        grupos = (("Latencias", "histogramas"), ("Contadores", "contadores"), ("Estado", "gauges"))
+        for titulo, clave in grupos:
+            grupo = tree.insert("", tk.END, text=titulo, open=True)
+            for serie, valor in datos[clave].items():
+                if clave != "histogramas":
+                    fila = (f"{valor:.4g}" if isinstance(valor, float) else valor, "", "", "", "")
+                elif serie.startswith("hashtable_sondeo"):
+                    # Longitudes de sondeo: no son tiempos
+                    fila = (valor["cantidad"], f"{valor['media']:.2f}", valor["p50"],
+                            valor["p95"], valor["p99"])
+                else:
+                    fila = (valor["cantidad"],) + tuple(
+                        f"{valor[campo] * 1e3:.3f}" for campo in ("media", "p50", "p95", "p99"))
+                tree.insert(grupo, tk.END, text=serie, values=fila)
+
+        self.text_errores.config(state=tk.NORMAL)
+        self.text_errores.delete("1.0", tk.END)
+        for fecha, operacion, mensaje in reversed(datos["errores"]):
+            self.text_errores.insert(tk.END, f"{fecha}  {operacion}: {mensaje}\n")
+        self.text_errores.config(state=tk.DISABLED)
+
+    def exportar_metricas(self):
+        """Guardar las metricas en formato de texto de Prometheus"""
+        if self.gestor.metricas is None:
+            messagebox.showerror("Error", "Las métricas están desactivadas")
+            return
+        ruta = filedialog.asksaveasfilename(title="Exportar métricas", defaultextension=".prom",
+                                            filetypes=[("Prometheus", ".prom"),
+                                                       ("Todos los archivos", ".*")])
+        if ruta:
+            _volcar_metricas(self.gestor.metricas, ruta)
+
     def seleccionar_archivo(self):
         """Seleccionar archivo de texto"""
         filename = filedialog.askopenfilename(
@@ -426,13 +6634,44 @@ class InterfazGrafica:
             self.archivo_seleccionado = filename
             self.label_archivo.config(text=os.path.basename(filename))
 
+    def _actualizar_estado(self, tarea, progreso):
+        """Reflejar en la barra de estado el trabajo en curso"""
+        if tarea is None:
+            self.label_estado.config(text="Listo")
+            self.barra_progreso.stop()
+            self.barra_progreso.config(mode="determinate", value=0)
+            self.boton_cancelar.config(state=tk.DISABLED)
+            return
+
+        self.label_estado.config(text=f"{tarea.descripcion}...")
+        self.boton_cancelar.config(state=tk.NORMAL)
+        if progreso is None:
+            if str(self.barra_progreso.cget("mode")) != "indeterminate":
+                self.barra_progreso.config(mode="indeterminate")
+                self.barra_progreso.start(15)
+        else:
+            hechos, total = progreso
+            self.barra_progreso.stop()
+            self.barra_progreso.config(mode="determinate", maximum=max(total, 1), value=hechos)
+            self.label_estado.config(text=f"{tarea.descripcion}: {hechos}/{total}")
+
+    @staticmethod
+    def _mostrar_resultado(resultado):
+        exito, mensaje = resultado
+        if exito:
+            messagebox.showinfo("Éxito", mensaje)
+        else:
+            messagebox.showerror("Error", mensaje)
+        return exito
+
     def agregar_articulo(self):
         """Agregar nuevo articulo"""
         titulo = self.entry_titulo.get().strip()
         autores = self.entry_autores.get().strip()
         año_str = self.entry_año.get().strip()
+        ruta = self.archivo_seleccionado
 
-        if not all([titulo, autores, año_str, self.archivo_seleccionado]):
+        if not all([titulo, autores, año_str, ruta]):
             messagebox.showerror("Error", "Todos los campos son obligatorios")
             return
 
@@ -442,53 +6681,236 @@ class InterfazGrafica:
             messagebox.showerror("Error", "El año debe ser un número válido")
             return
 
-        exito, mensaje = self.gestor.agregar_articulo(titulo, autores, año, self.archivo_seleccionado)
+        def trabajo(tarea):
+            # El hash es trabajo de CPU: se calcula en el pool de procesos,
+            # en la misma pasada que copia el archivo al almacen
+            futuro = self.tareas.procesos.submit(ingresar_archivo, ruta, self.gestor.articulos_dir,
+                                                 self.gestor.algoritmo_hash)
+            hash_id, _, _ = tarea.esperar(futuro)
+            tarea.verificar()
+            return self.gestor.agregar_articulo(titulo, autores, año, ruta, hash_id=hash_id)
 
-        if exito:
-            messagebox.showinfo("Éxito", mensaje)
-            # Limpiar campos
-            self.entry_titulo.delete(0, tk.END)
-            self.entry_autores.delete(0, tk.END)
-            self.entry_año.delete(0, tk.END)
-            self.label_archivo.config(text="Ningún archivo seleccionado")
-            self.archivo_seleccionado = None
-        else:
-            messagebox.showerror("Error", mensaje)
+        def al_terminar(resultado):
+            if self._mostrar_resultado(resultado):
+                # Limpiar campos
+                self.entry_titulo.delete(0, tk.END)
+                self.entry_autores.delete(0, tk.END)
+                self.entry_año.delete(0, tk.END)
+                self.label_archivo.config(text="Ningún archivo seleccionado")
+                self.archivo_seleccionado = None
+
+        self.tareas.enviar("Agregando artículo", trabajo, al_terminar)
+
+    def importar_carpeta(self):
+        """Importar todos los archivos de una carpeta en segundo plano"""
+        carpeta = filedialog.askdirectory(title="Seleccionar carpeta de artículos")
+        if not carpeta:
+            return
+
+        def trabajo(tarea):
+            return self.gestor.importar_lote(carpeta, progreso=tarea.progreso,
+                                             cancelado=tarea.cancelado)
+
+        def al_terminar(reporte):
+            mensaje = (f"Importados: {reporte['importados']}\n"
+                       f"Duplicados: {len(reporte['duplicados'])}\n"
+                       f"Fallos: {len(reporte['fallos'])}")
+            if reporte["cancelado"]:
+                mensaje = "Importación cancelada.\n" + mensaje
+            messagebox.showinfo("Importación", mensaje)
+
+        self.tareas.enviar("Importando carpeta", trabajo, al_terminar)
+
+    @staticmethod
+    def _fila(articulo):
+        return articulo.titulo, articulo.autores, articulo.año, articulo.hash_id
+
+    def _precargar_resultados(self, filas):
+        """Precargar los cuerpos de las filas visibles y de las que siguen"""
+        filas = list(filas) + self.vista_resultados.siguientes(self.PRECARGA_FILAS)
+        self.gestor.precargar_contenidos(fila[3] for fila in filas)
+
+    def mostrar_vista_previa(self, event=None):
+        """Mostrar el comienzo del texto del resultado seleccionado"""
+        seleccion = self.tree_resultados.selection()
+        if not seleccion:
+            return
+        hash_id = str(self.tree_resultados.item(seleccion[0], "values")[3])
+        try:
+            texto = self.gestor.vista_previa(hash_id)
+        except OSError as e:
+            texto = f"No se pudo leer el contenido: {e}"
+        if texto is None:
+            texto = "El artículo ya no existe"
+
+        self.text_vista_previa.config(state=tk.NORMAL)
+        self.text_vista_previa.delete("1.0", tk.END)
+        self.text_vista_previa.insert(tk.END, texto)
+        self.text_vista_previa.config(state=tk.DISABLED)
+
+        cache = self.gestor.contenidos.estadisticas()
+        self.label_cache.config(
+            text=f"Caché: {cache['aciertos']} aciertos, {cache['fallos']} fallos "
+                 f"({cache['tasa_aciertos']:.0%}), {cache['entradas']} cuerpos, "
+                 f"{cache['bytes'] / (1 << 20):.1f} de {cache['presupuesto'] / (1 << 20):.0f} MB")
+
+    def _mostrar_articulos(self, articulos):
+        """Mostrar una lista de articulos; las filas se arman solo al verse"""
+        self.vista_resultados.mostrar(
+            lambda offset, limit: [self._fila(a) for a in articulos[offset:offset + limit]],
+            len(articulos))
+
+    def _mostrar_listado(self, listar):
+        """Mostrar un listado paginado del gestor; la primera pagina se pide en segundo plano"""
+        def al_terminar(total):
+            self.vista_resultados.mostrar(
+                lambda offset, limit: [self._fila(a) for a in listar(offset, limit)], total)
+
+        def trabajo(tarea):
+            # Pedir una pagina vacia construye los indices si aun no existen
+            listar(0, 0)
+            return len(self.gestor)
+
+        self.tareas.enviar("Listando artículos", trabajo, al_terminar)
 
     def listar_por_titulo(self):
         """Listar artículos por titulo"""
-        self.tree_resultados.delete(*self.tree_resultados.get_children())
-        articulos = self.gestor.listar_por_titulo()
-        for articulo in articulos:
-            self.tree_resultados.insert("", tk.END, values=(
-                articulo.titulo, articulo.autores, articulo.año, articulo.hash_id
-            ))
+        self._mostrar_listado(self.gestor.listar_por_titulo)
 
     def listar_por_autor(self):
         """Listar articulos por autor"""
-        self.tree_resultados.delete(*self.tree_resultados.get_children())
-        articulos = self.gestor.listar_por_autor()
-        for articulo in articulos:
-            self.tree_resultados.insert("", tk.END, values=(
-                articulo.titulo, articulo.autores, articulo.año, articulo.hash_id
-            ))
+        self._mostrar_listado(self.gestor.listar_por_autor)
 
     def buscar_por_autor(self):
-        """Buscar articulos por autor"""
+        """Buscar articulos por autor
+
+        Sin coincidencia exacta se prueba con el autor individual (articulos
+        en coautoria) y despues con la busqueda aproximada, que tolera
+        errores de tipeo y acentos.
+        """
+        self._ocultar_sugerencias()
         autor = self.entry_buscar_autor.get().strip()
         if not autor:
             messagebox.showerror("Error", "Ingrese un autor para buscar")
             return
 
-        self.tree_resultados.delete(*self.tree_resultados.get_children())
-        articulos = self.gestor.buscar_por_autor(autor)
-        for articulo in articulos:
-            self.tree_resultados.insert("", tk.END, values=(
-                articulo.titulo, articulo.autores, articulo.año, articulo.hash_id
-            ))
+        def trabajo(tarea):
+            articulos = self.gestor.buscar_por_autor(autor) or self.gestor.buscar(autor=autor)
+            if articulos:
+                return articulos
+            tarea.verificar()
+            return [articulo for articulo, _ in self.gestor.buscar_aproximado(autor, "autor")]
+
+        def al_terminar(articulos):
+            self._mostrar_articulos(articulos)
+            if not articulos:
+                messagebox.showinfo("Resultado", f"No se encontraron artículos del autor: {autor}")
+
+        self.tareas.enviar("Buscando por autor", trabajo, al_terminar)
+
+    def _configurar_sugerencias(self):
+        """Lista desplegable de autores sugeridos mientras se escribe en ``entry_buscar_autor``
+
+        Las sugerencias se piden al gestor (que las guarda en cache por
+        prefijo) recien cuando el tipeo se detiene ``SUGERENCIAS_DEMORA_MS``,
+        y las respuestas de un texto que ya cambio se descartan.
+        """
+        self._sugerencias_pendiente = None  # Id de root.after de la proxima consulta
+        self._eligiendo_sugerencia = False
+        self._ventana_sugerencias = self._lista_sugerencias = None
+        self.var_buscar_autor.trace_add("write", self._al_escribir_autor)
+        entrada = self.entry_buscar_autor
+        entrada.bind("<Return>", lambda evento: self.buscar_por_autor())
+        entrada.bind("<Down>", self._enfocar_sugerencias)
+        entrada.bind("<Escape>", lambda evento: self._ocultar_sugerencias())
+        entrada.bind("<FocusOut>", lambda evento: self.root.after(100, self._ocultar_sin_foco))
+
+    def _al_escribir_autor(self, *_):
+        if self._eligiendo_sugerencia:
+            return
+        if self._sugerencias_pendiente is not None:
+            self.root.after_cancel(self._sugerencias_pendiente)
+        self._sugerencias_pendiente = self.root.after(self.SUGERENCIAS_DEMORA_MS,
+                                                      self._pedir_sugerencias)
+
+    def _pedir_sugerencias(self):
+        self._sugerencias_pendiente = None
+        prefijo = self.var_buscar_autor.get()
+        if len(prefijo.strip()) < 2:
+            self._ocultar_sugerencias()
+            return
 
-        if not articulos:
-            messagebox.showinfo("Resultado", f"No se encontraron artículos del autor: {autor}")
+        def al_terminar(sugerencias):
+            if self.var_buscar_autor.get() == prefijo:  # Si no, ya hay otra consulta en camino
+                self._mostrar_sugerencias([nombre for nombre, _ in sugerencias])
+
+        self.tareas.enviar("Sugiriendo autores",
+                           lambda tarea: self.gestor.sugerir_autores(
+                               prefijo, self.SUGERENCIAS_MAXIMAS),
+                           al_terminar, al_fallar=lambda error: self._ocultar_sugerencias())
+
+    def _mostrar_sugerencias(self, nombres):
+        if not nombres or self.root.focus_get() is not self.entry_buscar_autor:
+            self._ocultar_sugerencias()
+            return
+        if self._ventana_sugerencias is None:
+            ventana = tk.Toplevel(self.root)
+            ventana.overrideredirect(True)
+            lista = tk.Listbox(ventana, exportselection=False, activestyle=tk.DOTBOX)
+            lista.pack(fill=tk.BOTH, expand=True)
+            lista.bind("<ButtonRelease-1>", lambda evento: self._elegir_sugerencia())
+            lista.bind("<Return>", lambda evento: self._elegir_sugerencia())
+            lista.bind("<Escape>", lambda evento: self._ocultar_sugerencias(enfocar=True))
+            lista.bind("<FocusOut>", lambda evento: self.root.after(100, self._ocultar_sin_foco))
+            self._ventana_sugerencias, self._lista_sugerencias = ventana, lista
+
+        lista = self._lista_sugerencias
+        lista.delete(0, tk.END)
+        for nombre in nombres:
+            lista.insert(tk.END, nombre)
+        lista.config(height=len(nombres))
+        entrada = self.entry_buscar_autor
+        self._ventana_sugerencias.geometry(
+            f"{entrada.winfo_width()}x{lista.winfo_reqheight()}"
+            f"+{entrada.winfo_rootx()}+{entrada.winfo_rooty() + entrada.winfo_height()}")
+        self._ventana_sugerencias.deiconify()
+        self._ventana_sugerencias.lift()
+
+    def _enfocar_sugerencias(self, evento=None):
+        if self._ventana_sugerencias is None or not self._ventana_sugerencias.winfo_viewable():
+            return None
+        self._lista_sugerencias.focus_set()
+        self._lista_sugerencias.selection_clear(0, tk.END)
+        self._lista_sugerencias.selection_set(0)
+        self._lista_sugerencias.activate(0)
+        return "break"
+
+    def _elegir_sugerencia(self):
+        seleccion = self._lista_sugerencias.curselection()
+        if not seleccion:
+            return
+        self._eligiendo_sugerencia = True
+        try:
+            self.var_buscar_autor.set(self._lista_sugerencias.get(seleccion[0]))
+        finally:
+            self._eligiendo_sugerencia = False
+        self._ocultar_sugerencias(enfocar=True)
+        self.entry_buscar_autor.icursor(tk.END)
+        self.buscar_por_autor()
+
+    def _ocultar_sin_foco(self):
+        enfocado = self.root.focus_get()
+        if enfocado not in (self.entry_buscar_autor, self._lista_sugerencias):
+            self._ocultar_sugerencias()
+
+    def _ocultar_sugerencias(self, enfocar=False):
+        if self._sugerencias_pendiente is not None:
+            self.root.after_cancel(self._sugerencias_pendiente)
+            self._sugerencias_pendiente = None
+        if self._ventana_sugerencias is not None:
+            self._ventana_sugerencias.withdraw()
+        if enfocar:
+            self.entry_buscar_autor.focus_set()
 
     def buscar_por_año(self):
         """Buscar articulos por año"""
@@ -503,15 +6925,28 @@ class InterfazGrafica:
             messagebox.showerror("Error", "El año debe ser un número válido")
             return
 
-        self.tree_resultados.delete(*self.tree_resultados.get_children())
-        articulos = self.gestor.buscar_por_año(año)
-        for articulo in articulos:
-            self.tree_resultados.insert("", tk.END, values=(
-                articulo.titulo, articulo.autores, articulo.año, articulo.hash_id
-            ))
+        def al_terminar(articulos):
+            self._mostrar_articulos(articulos)
+            if not articulos:
+                messagebox.showinfo("Resultado", f"No se encontraron artículos del año: {año}")
+
+        self.tareas.enviar("Buscando por año",
+                           lambda tarea: self.gestor.buscar_por_año(año), al_terminar)
 
-        if not articulos:
-            messagebox.showinfo("Resultado", f"No se encontraron artículos del año: {año}")
+    def buscar_texto(self):
+        """Buscar palabras o "frases" en el texto completo de los articulos"""
+        consulta = self.entry_buscar_texto.get().strip()
+        if not consulta:
+            messagebox.showerror("Error", "Ingrese palabras para buscar")
+            return
+
+        def al_terminar(resultados):
+            self._mostrar_articulos([articulo for articulo, puntaje in resultados])
+            if not resultados:
+                messagebox.showinfo("Resultado", f"No se encontraron artículos con: {consulta}")
+
+        self.tareas.enviar("Buscando en texto",
+                           lambda tarea: self.gestor.buscar_texto(consulta, limit=200), al_terminar)
 
     def cargar_articulo(self):
         """Cargar datos de un articulo para modificacion"""
@@ -520,7 +6955,7 @@ class InterfazGrafica:
             messagebox.showerror("Error", "Ingrese un Hash ID")
             return
 
-        articulo = self.gestor.tabla_hash.get(hash_id)
+        articulo = self.gestor.obtener_articulo(hash_id)
         if articulo:
             self.entry_nuevo_autor.delete(0, tk.END)
             self.entry_nuevo_autor.insert(0, articulo.autores)
@@ -548,14 +6983,11 @@ class InterfazGrafica:
                 messagebox.showerror("Error", "El año debe ser un número válido")
                 return
 
-        exito, mensaje = self.gestor.modificar_articulo(
-            hash_id, nuevo_autor if nuevo_autor else None, nuevo_año
-        )
-
-        if exito:
-            messagebox.showinfo("Éxito", mensaje)
-        else:
-            messagebox.showerror("Error", mensaje)
+        self.tareas.enviar(
+            "Modificando artículo",
+            lambda tarea: self.gestor.modificar_articulo(
+                hash_id, nuevo_autor if nuevo_autor else None, nuevo_año),
+            self._mostrar_resultado)
 
     def eliminar_articulo(self):
         """Eliminar un articulo"""
@@ -565,23 +6997,328 @@ class InterfazGrafica:
             return
 
         if messagebox.askyesno("Confirmar", "¿Está seguro de que desea eliminar este artículo?"):
-            exito, mensaje = self.gestor.eliminar_articulo(hash_id)
+            def al_terminar(resultado):
+                if self._mostrar_resultado(resultado):
+                    # Limpiar campos
+                    self.entry_hash_gestionar.delete(0, tk.END)
+                    self.entry_nuevo_autor.delete(0, tk.END)
+                    self.entry_nuevo_año.delete(0, tk.END)
 
-            if exito:
-                messagebox.showinfo("Éxito", mensaje)
-                # Limpiar campos
-                self.entry_hash_gestionar.delete(0, tk.END)
-                self.entry_nuevo_autor.delete(0, tk.END)
-                self.entry_nuevo_año.delete(0, tk.END)
-            else:
-                messagebox.showerror("Error", mensaje)
+            self.tareas.enviar("Eliminando artículo",
+                               lambda tarea: self.gestor.eliminar_articulo(hash_id), al_terminar)
+
+    def cerrar(self):
+        """Cancelar trabajos, persistir el catalogo y cerrar la ventana"""
+        self.tareas.cerrar()
+        self.gestor.cerrar()
+        self.root.destroy()
 
     def run(self):
         """Ejecutar la interfaz grafica"""
         self.root.mainloop()
 
 
+def _volcar_metricas(metricas, destino):
+    """Escribir las metricas en formato Prometheus a un archivo o a stderr ("-")"""
+    texto = metricas.prometheus()
+    if destino == "-":
+        sys.stderr.write(texto)
+        return
+    temporal = destino + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as file:
+        file.write(texto)
+    os.replace(temporal, destino)  # Un colector nunca ve un archivo a medias
+
+
+def _imprimir_reporte(reporte, salida=None):
+    """Mostrar el reporte de ``reporte_catalogo`` como texto con barras"""
+    def barras(filas, ancho_barra=40):
+        maximo = max((cantidad for _, cantidad in filas), default=0)
+        for etiqueta, cantidad in filas:
+            barra = "#" * math.ceil(cantidad * ancho_barra / maximo) if cantidad else ""
+            print(f"  {etiqueta:>10}  {cantidad:>8}  {barra}", file=salida)
+
+    print(f"Articulos: {reporte['articulos']}  Autores: {reporte['autores']}  "
+          f"(motor: {reporte['motor']})", file=salida)
+    print(f"\nAutores con mas articulos (top {len(reporte['top_autores'])}):", file=salida)
+    for posicion, (nombre, cantidad) in enumerate(reporte["top_autores"], 1):
+        print(f"  {posicion:>3}. {nombre}  ({cantidad})", file=salida)
+    print(f"\nArticulos por año{' de ' + reporte['autor'] if 'autor' in reporte else ''}:",
+          file=salida)
+    barras(reporte["histograma_años"])
+    print("\nAutores por articulo:", file=salida)
+    barras(reporte["autores_por_articulo"])
+    titulos = reporte["titulos"]
+    if titulos["articulos"]:
+        print(f"\nLargo de los titulos: media {titulos['media']:.1f}, mediana "
+              f"{titulos['mediana']:.1f}, minimo {titulos['minimo']}, maximo {titulos['maximo']}",
+              file=salida)
+
+
+def main(argv=None):
+    """Punto de entrada: sin argumentos abre la interfaz grafica"""
+    parser = argparse.ArgumentParser(description="Gestor de Artículos Científicos")
+    parser.add_argument("--db", default="articulos_db.txt", help="Archivo de base de datos")
+    parser.add_argument("--dir", default="articulos", help="Directorio de articulos")
+    parser.add_argument("--almacenamiento", choices=ALMACENAMIENTOS, default="texto",
+                        help="Formato de la base de datos")
+    parser.add_argument("--perezosa", action="store_true",
+                        help="Carga perezosa (con sqlite, las consultas se resuelven en SQL)")
+    parser.add_argument("--sin-instantanea", action="store_true",
+                        help="No usar ni escribir la instantanea binaria del catalogo (<db>.snap)")
+    parser.add_argument("--umbral-similitud", type=float, default=None,
+                        help="Avisar de altas con similitud de Jaccard >= umbral (MinHash/LSH)")
+    parser.add_argument("--rechazar-similares", action="store_true",
+                        help="Rechazar, en lugar de avisar, las altas casi duplicadas")
+    parser.add_argument("--particionado", default=None, metavar="DIRECTORIO",
+                        help="Usar un catalogo particionado por hash_id en DIRECTORIO, una "
+                             "particion por proceso (servidor, importar, renombrar-autor y "
+                             "buscar-aproximado)")
+    parser.add_argument("--particiones", type=int, default=None,
+                        help="Particiones al crear el catalogo particionado (por defecto, una "
+                             "por CPU)")
+    parser.add_argument("--metricas", nargs="?", const="-", default=None, metavar="ARCHIVO",
+                        help="Medir las operaciones y volcar las metricas al terminar, en formato "
+                             "Prometheus, a ARCHIVO o a stderr (el servidor las expone en /metricas)")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    parser_importar = subparsers.add_parser(
+        "importar", help="Importar un directorio o manifiesto CSV/JSONL sin interfaz")
+    parser_importar.add_argument("origen", help="Directorio o manifiesto CSV/JSONL")
+    parser_importar.add_argument("--trabajadores", type=int, default=None,
+                                 help="Procesos del pool (por defecto, uno por CPU)")
+    parser_importar.add_argument("--autores", default="Desconocido",
+                                 help="Autores para archivos importados desde un directorio")
+    parser_importar.add_argument("--año", type=int, default=None,
+                                 help="Año para archivos importados desde un directorio")
+    parser_importar.add_argument("--enlazar", action="store_true",
+                                 help="Usar enlaces duros en lugar de copiar cuando sea posible")
+
+    parser_servidor = subparsers.add_parser(
+        "servidor", help="Servir el catalogo por HTTP/JSON sin interfaz grafica")
+    parser_servidor.add_argument("--host", default="127.0.0.1", help="Direccion de escucha")
+    parser_servidor.add_argument("--puerto", type=int, default=8080, help="Puerto de escucha")
+    parser_servidor.add_argument("--raiz-importacion", default=None, metavar="DIRECTORIO",
+                                 help="Aceptar altas con \"ruta\" a archivos dentro de DIRECTORIO "
+                                      "(por defecto solo se acepta \"contenido\")")
+
+    parser_fsck = subparsers.add_parser(
+        "fsck", help="Conciliar el almacen de archivos con el catalogo")
+    parser_fsck.add_argument("--reparar", action="store_true",
+                             help="Borrar huerfanos y temporales y reubicar archivos planos")
+    parser_fsck.add_argument("--verificar", action="store_true",
+                             help="Rehashear cada archivo y comparar con su hash_id")
+
+    parser_similares = subparsers.add_parser(
+        "similares", help="Listar los grupos de articulos casi duplicados")
+    parser_similares.add_argument("--umbral", type=float, default=None,
+                                  help="Similitud minima (por defecto --umbral-similitud o 0.9)")
+
+    parser_renombrar = subparsers.add_parser(
+        "renombrar-autor", help="Reemplazar un autor en todos sus articulos (transaccional)")
+    parser_renombrar.add_argument("actual", help="Autor a reemplazar")
+    parser_renombrar.add_argument("nuevo", help="Nuevo nombre")
+
+    parser_aproximado = subparsers.add_parser(
+        "buscar-aproximado", help="Buscar autores y titulos parecidos (tolera errores y acentos)")
+    parser_aproximado.add_argument("consulta", help="Texto a buscar")
+    parser_aproximado.add_argument("--campo", choices=("autor", "titulo"), default=None,
+                                   help="Comparar solo contra autores o solo contra titulos")
+    parser_aproximado.add_argument("--limite", type=int, default=20, help="Cantidad de resultados")
+    parser_aproximado.add_argument("--umbral", type=float, default=0.5,
+                                   help="Fraccion minima de trigramas de la consulta presentes "
+                                        "en el autor o titulo (0 a 1)")
+
+    parser_reporte = subparsers.add_parser(
+        "reporte", help="Estadisticas del catalogo: autores, años y titulos")
+    parser_reporte.add_argument("--top", type=int, default=20,
+                                help="Cantidad de autores del ranking")
+    parser_reporte.add_argument("--autor", default=None,
+                                help="Histograma por año de un autor individual")
+    parser_reporte.add_argument("--ancho", type=int, default=1,
+                                help="Años por intervalo del histograma")
+    parser_reporte.add_argument("--json", action="store_true", help="Salida en JSON")
+
+    formatos = sorted(set(FORMATOS_EXPORTACION.values()))
+    parser_exportar = subparsers.add_parser(
+        "exportar", help="Exportar el catalogo a JSONL, columnar (.acb), Parquet o Arrow")
+    parser_exportar.add_argument("destino", help="Archivo a escribir")
+    parser_exportar.add_argument("--formato", choices=formatos, default=None,
+                                 help="Formato (por defecto, segun la extension del destino)")
+    parser_exportar.add_argument("--contenidos", action="store_true",
+                                 help="Incluir el cuerpo de cada articulo")
+
+    parser_importar_catalogo = subparsers.add_parser(
+        "importar-catalogo", help="Cargar una exportacion en el catalogo")
+    parser_importar_catalogo.add_argument("origen", help="Archivo exportado")
+    parser_importar_catalogo.add_argument("--formato", choices=formatos, default=None,
+                                          help="Formato (por defecto, segun la extension)")
+
+    parser_reparticionar = subparsers.add_parser(
+        "reparticionar", help="Redistribuir el catalogo --particionado (cerrado) en N particiones")
+    parser_reparticionar.add_argument("cantidad", type=int, help="Nueva cantidad de particiones")
+
+    parser_migrar = subparsers.add_parser(
+        "migrar", help="Copiar la base de texto (--db) a un archivo SQLite nuevo")
+    parser_migrar.add_argument("destino", help="Archivo SQLite a crear")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "migrar":
+        try:
+            total = migrar_a_sqlite(args.db, args.destino, args.dir)
+        except FileExistsError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Migrados {total} articulos a {args.destino}")
+        return 0
+
+    if args.comando == "reparticionar":
+        if args.particionado is None:
+            print("reparticionar requiere --particionado", file=sys.stderr)
+            return 2
+        try:
+            total = reparticionar(args.particionado, args.cantidad, args.almacenamiento)
+        except (FileNotFoundError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"Redistribuidos {total} articulos en {args.cantidad} particiones")
+        return 0
+
+    umbral = args.umbral_similitud
+    if args.comando == "similares":
+        umbral = args.umbral or umbral or 0.9
+    if args.particionado is not None:
+        if args.comando not in ("servidor", "importar", "renombrar-autor", "buscar-aproximado"):
+            print(f"{args.comando or 'La interfaz grafica'} no esta disponible con --particionado",
+                  file=sys.stderr)
+            return 2
+        try:
+            gestor = CatalogoParticionado(args.particionado, args.particiones,
+                                          carga_perezosa=args.perezosa,
+                                          almacenamiento=args.almacenamiento,
+                                          umbral_similitud=umbral,
+                                          rechazar_similares=args.rechazar_similares,
+                                          instantanea=not args.sin_instantanea)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+    else:
+        gestor = GestorArticulos(args.db, args.dir, carga_perezosa=args.perezosa,
+                                 almacenamiento=args.almacenamiento, umbral_similitud=umbral,
+                                 rechazar_similares=args.rechazar_similares,
+                                 metricas=args.metricas is not None,
+                                 instantanea=not args.sin_instantanea)
+
+    try:
+        if args.comando is None:
+            app = InterfazGrafica(gestor)
+            app.run()
+            return 0
+
+        if args.comando == "importar":
+            reporte = gestor.importar_lote(args.origen, args.trabajadores, args.autores, args.año,
+                                           enlazar=args.enlazar)
+            for ruta, error in reporte["fallos"]:
+                print(f"Fallo: {ruta}: {error}", file=sys.stderr)
+            for ruta, _, parecido, similitud in reporte["similares"]:
+                print(f"Similar: {ruta}: {parecido} ({similitud:.2f})", file=sys.stderr)
+            print(f"Importados: {reporte['importados']}  Duplicados: {len(reporte['duplicados'])}  "
+                  f"Fallos: {len(reporte['fallos'])}  Tiempo: {reporte['segundos']:.2f} s  "
+                  f"({reporte.get('articulos_por_segundo', 0):.1f} archivos/s, "
+                  f"{reporte.get('mb_por_segundo', 0):.2f} MB/s)")
+            return 1 if reporte["fallos"] else 0
+
+        if args.comando == "similares":
+            grupos = gestor.casi_duplicados()
+            for numero, grupo in enumerate(grupos, 1):
+                print(f"Grupo {numero} ({len(grupo)} articulos)")
+                for articulo in grupo:
+                    print(f"  {articulo.hash_id}  {articulo.titulo}  ({articulo.autores}, {articulo.año})")
+            print(f"{len(grupos)} grupos, {sum(map(len, grupos))} articulos casi duplicados")
+            return 0
+
+        if args.comando == "renombrar-autor":
+            exito, mensaje = gestor.renombrar_autor(args.actual, args.nuevo)
+            print(mensaje, file=sys.stdout if exito else sys.stderr)
+            return 0 if exito else 1
+
+        if args.comando == "buscar-aproximado":
+            try:
+                resultados = gestor.buscar_aproximado(args.consulta, args.campo, args.limite,
+                                                      args.umbral)
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                return 2
+            for articulo, similitud in resultados:
+                print(f"{similitud:.2f}  {articulo.hash_id}  {articulo.titulo}  "
+                      f"({articulo.autores}, {articulo.año})")
+            return 0 if resultados else 1
+
+        if args.comando == "reporte":
+            reporte = gestor.reporte_catalogo(args.top, args.autor, args.ancho)
+            if args.json:
+                json.dump(reporte, sys.stdout, ensure_ascii=False, indent=2)
+                print()
+            else:
+                _imprimir_reporte(reporte)
+            return 0
+
+        if args.comando == "exportar":
+            try:
+                reporte = gestor.exportar(args.destino, args.formato, args.contenidos)
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                return 1
+            for hash_id in reporte["sin_contenido"]:
+                print(f"Sin contenido: {hash_id}", file=sys.stderr)
+            print(f"Exportados: {reporte['registros']}  Formato: {reporte['formato']}  "
+                  f"Tamaño: {reporte['bytes'] / (1 << 20):.2f} MB  "
+                  f"Tiempo: {reporte['segundos']:.2f} s")
+            return 1 if reporte["sin_contenido"] else 0
+
+        if args.comando == "importar-catalogo":
+            try:
+                reporte = gestor.importar_catalogo(args.origen, args.formato)
+            except (OSError, ValueError) as e:
+                print(e, file=sys.stderr)
+                return 1
+            for hash_id, error in reporte["fallos"]:
+                print(f"Fallo: {hash_id}: {error}", file=sys.stderr)
+            print(f"Importados: {reporte['importados']}  Duplicados: {reporte['duplicados']}  "
+                  f"Fallos: {len(reporte['fallos'])}  Tiempo: {reporte['segundos']:.2f} s  "
+                  f"({reporte.get('registros_por_segundo', 0):.0f} registros/s)")
+            return 1 if reporte["fallos"] else 0
+
+        if args.comando == "fsck":
+            reporte = gestor.verificar_almacen(args.reparar, args.verificar)
+            for clave in ("faltantes", "corruptos", "huerfanos", "temporales", "desconocidos", "planos"):
+                for elemento in reporte[clave]:
+                    print(f"{clave}: {elemento}")
+            resumen = "  ".join(f"{clave}: {len(valor) if isinstance(valor, list) else valor}"
+                                for clave, valor in reporte.items())
+            print(resumen)
+            return 1 if reporte["faltantes"] or reporte["corruptos"] else 0
+
+        if args.comando == "servidor":
+            servidor = ServidorArticulos(gestor, args.host, args.puerto,
+                                         raiz_importacion=args.raiz_importacion)
+            print(f"Sirviendo en http://{args.host}:{args.puerto}", file=sys.stderr)
+            try:
+                asyncio.run(servidor.servir())
+            except KeyboardInterrupt:
+                pass
+            return 0
+
+    finally:
+        # Compactar el journal, actualizar la instantanea y los indices en
+        # disco y cerrar el almacenamiento (con --particionado, ademas,
+        # terminar sus procesos); la interfaz grafica ya lo hace al cerrarse
+        if args.comando is not None:
+            gestor.cerrar()
+        if args.metricas is not None and gestor.metricas is not None:
+            _volcar_metricas(gestor.metricas, args.metricas)
+
 # Funcion principal
 if __name__ == "__main__":
-    app = InterfazGrafica()
-    app.run()
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from proyecto2 import GestorArticulos
+
+
+class CasoCatalogo(unittest.TestCase):
+    """Caso con un directorio temporal para la base, el almacen y los archivos
+
+    ``self.gestor`` se cierra al terminar si quedo asignado.
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.directorio, "articulos_db.txt")
+        self.articulos_dir = os.path.join(self.directorio, "articulos")
+        self.gestor = None
+
+    def tearDown(self):
+        if self.gestor is not None:
+            self.gestor.cerrar()
+        shutil.rmtree(self.directorio)
+
+    def abrir(self, **opciones):
+        return GestorArticulos(self.db_file, self.articulos_dir, **opciones)
+
+    def archivo(self, nombre, contenido):
+        """Crear un archivo de entrada (texto o bytes) y devolver su ruta"""
+        ruta = os.path.join(self.directorio, nombre)
+        if isinstance(contenido, str):
+            contenido = contenido.encode("utf-8")
+        with open(ruta, "wb") as file:
+            file.write(contenido)
+        return ruta
+
+    def agregar(self, titulo, autores, año, contenido, gestor=None):
+        """Agregar un articulo con ``contenido`` como cuerpo y devolver su hash_id"""
+        gestor = self.gestor if gestor is None else gestor
+        exito, mensaje = gestor.agregar_articulo(
+            titulo, autores, año, self.archivo(f"{titulo}.txt", contenido))
+        self.assertTrue(exito, mensaje)
+        return gestor.buscar(titulo_prefijo=titulo)[0].hash_id
+
+    def articulos(self, gestor=None):
+        """{hash_id: (titulo, autores, año)} de la tabla hash"""
+        gestor = self.gestor if gestor is None else gestor
+        return {articulo.hash_id: (articulo.titulo, articulo.autores, articulo.año)
+                for articulo in gestor.tabla_hash.get_all_values()}
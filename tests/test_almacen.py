@@ -0,0 +1,159 @@
+import os
+import unittest
+
+from proyecto2 import hash_archivo_fnv, ingresar_archivo, ruta_en_almacen
+from tests.base import CasoCatalogo
+
+
+def hash_modo_texto(ruta):
+    """hash_id historico: FNV-1 de 32 bits del archivo leido en modo texto"""
+    with open(ruta, encoding="utf-8") as file:
+        contenido = file.read()
+    valor = 2166136261
+    for byte in contenido.encode("utf-8"):
+        valor = (valor * 16777619) % (2 ** 32) ^ byte
+    return str(valor)
+
+
+class TestHashYAlmacen(CasoCatalogo):
+
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.articulos_dir)
+
+    def test_ruta_fragmentada(self):
+        self.assertEqual(ruta_en_almacen("255"), "00/00/255")
+        self.assertEqual(ruta_en_almacen(str(0xabcdef12)), f"ab/cd/{0xabcdef12}")
+        self.assertEqual(ruta_en_almacen(str(0xabcdef1234), "fnv1-64"),
+                         f"00/00/{0xabcdef1234}")
+
+    def test_texto_conserva_el_hash_historico(self):
+        for nombre, contenido in (("lf", b"una linea\notra\n"),
+                                  ("crlf", b"una linea\r\notra\r\n"),
+                                  ("cr", b"una linea\rotra\r"),
+                                  ("acentos", "Platón y Sócrates\r\n".encode("utf-8"))):
+            with self.subTest(nombre):
+                ruta = self.archivo(nombre, contenido)
+                self.assertEqual(hash_archivo_fnv(ruta), hash_modo_texto(ruta))
+                # Un \r\n cortado entre bloques cuenta como un solo salto
+                self.assertEqual(hash_archivo_fnv(ruta, tamaño_bloque=3), hash_modo_texto(ruta))
+        self.assertEqual(hash_archivo_fnv(self.archivo("a", b"x\r\ny")),
+                         hash_archivo_fnv(self.archivo("b", b"x\ny")))
+
+    def test_binarios_con_crlf_y_lf_no_colisionan(self):
+        for prefijo in (b"%PDF-1.4\r\n\x00\x01\x02", b"\xff\xfe\xfa"):
+            with self.subTest(prefijo=prefijo):
+                crlf = self.archivo("crlf.bin", prefijo + b"\r\nfin\r\n")
+                lf = self.archivo("lf.bin", prefijo.replace(b"\r\n", b"\n") + b"\nfin\n")
+                self.assertNotEqual(hash_archivo_fnv(crlf), hash_archivo_fnv(lf))
+                self.assertEqual(hash_archivo_fnv(crlf, tamaño_bloque=2), hash_archivo_fnv(crlf))
+                self.assertNotEqual(ingresar_archivo(crlf, self.articulos_dir)[0],
+                                    ingresar_archivo(lf, self.articulos_dir)[0])
+
+    def test_solo_la_muestra_decide_si_es_texto(self):
+        # Un nulo despues de los primeros MUESTRA_TEXTO bytes no lo vuelve binario
+        contenido = b"a\r\n" * 4000
+        ruta = self.archivo("largo", contenido + b"\x00")
+        self.assertEqual(hash_archivo_fnv(ruta),
+                         hash_archivo_fnv(self.archivo("largo_lf", b"a\n" * 4000 + b"\x00")))
+
+    def test_ingresar_archivo(self):
+        contenido = b"cuerpo\r\ncon saltos de windows\r\n"
+        ruta = self.archivo("entrada.txt", contenido)
+        hash_id, archivo_nombre, tamaño = ingresar_archivo(ruta, self.articulos_dir)
+        self.assertEqual(hash_id, hash_modo_texto(ruta))
+        self.assertEqual(archivo_nombre, ruta_en_almacen(hash_id))
+        self.assertEqual(tamaño, len(contenido))
+        with open(os.path.join(self.articulos_dir, archivo_nombre), "rb") as file:
+            self.assertEqual(file.read(), contenido)  # Se guardan los bytes originales
+
+        # El mismo contenido no se copia dos veces ni deja temporales
+        self.assertEqual(ingresar_archivo(ruta, self.articulos_dir)[1], archivo_nombre)
+        archivos = [nombre for _, _, nombres in os.walk(self.articulos_dir) for nombre in nombres]
+        self.assertEqual(archivos, [hash_id])
+
+    def test_ingresar_enlazando(self):
+        ruta = self.archivo("entrada.txt", "enlazado")
+        hash_id, archivo_nombre, _ = ingresar_archivo(ruta, self.articulos_dir, enlazar=True)
+        destino = os.path.join(self.articulos_dir, archivo_nombre)
+        self.assertTrue(os.path.samefile(ruta, destino))
+        self.assertEqual(hash_id, hash_archivo_fnv(ruta))
+
+
+class TestVerificarAlmacen(CasoCatalogo):
+
+    def setUp(self):
+        super().setUp()
+        self.gestor = self.abrir()
+        self.gestor.GRACIA_SEGUNDOS = -1  # Los archivos recien creados tambien cuentan
+        self.ids = [self.agregar(f"Titulo {i}", "Ana", 2000 + i, f"contenido {i}")
+                    for i in range(3)]
+
+    def _ruta(self, hash_id):
+        return os.path.join(self.articulos_dir,
+                            self.gestor.obtener_articulo(hash_id).archivo_nombre)
+
+    def _crear(self, relativa, contenido=b"x"):
+        ruta = os.path.join(self.articulos_dir, relativa)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, "wb") as file:
+            file.write(contenido)
+        return ruta
+
+    def test_almacen_sano(self):
+        reporte = self.gestor.verificar_almacen(verificar_contenido=True)
+        self.assertEqual(reporte["revisados"], 3)
+        for clave in ("faltantes", "corruptos", "huerfanos", "temporales", "desconocidos",
+                      "planos"):
+            self.assertEqual(reporte[clave], [], clave)
+
+    def test_detecta_y_repara(self):
+        os.remove(self._ruta(self.ids[0]))
+        with open(self._ruta(self.ids[1]), "ab") as file:
+            file.write(b" alterado")
+        huerfano = self._crear(os.path.join("12", "34", "123"))
+        temporal = self._crear(os.path.join("12", "99", "abc.tmp"))
+        desconocido = self._crear("notas.md")
+
+        reporte = self.gestor.verificar_almacen(verificar_contenido=True)
+        self.assertEqual(reporte["faltantes"], [self.ids[0]])
+        self.assertEqual(reporte["corruptos"], [self.ids[1]])
+        self.assertEqual(reporte["huerfanos"], [os.path.join("12", "34", "123")])
+        self.assertEqual(reporte["temporales"], [os.path.join("12", "99", "abc.tmp")])
+        self.assertEqual(reporte["desconocidos"], ["notas.md"])
+
+        reporte = self.gestor.verificar_almacen(reparar=True)
+        self.assertFalse(os.path.exists(huerfano))
+        self.assertFalse(os.path.exists(temporal))
+        self.assertFalse(os.path.isdir(os.path.join(self.articulos_dir, "12")))
+        self.assertTrue(os.path.exists(desconocido))
+        self.assertTrue(os.path.exists(self._ruta(self.ids[2])))
+
+    def test_reubica_archivos_planos(self):
+        self.gestor.cerrar()
+        hash_id = hash_archivo_fnv(self.archivo("plano.txt", "formato anterior"))
+        self._crear(f"{hash_id}.txt", b"formato anterior")
+        with open(self.db_file, "a", encoding="utf-8") as file:
+            file.write(f"{hash_id}|Plano|Bo|1990|{hash_id}.txt\n")
+        self.gestor = self.abrir()
+        self.gestor.GRACIA_SEGUNDOS = -1
+
+        reporte = self.gestor.verificar_almacen(reparar=True, verificar_contenido=True)
+        self.assertEqual(reporte["planos"], [hash_id])
+        self.assertEqual(reporte["corruptos"], [])
+        self.assertEqual(self.gestor.obtener_articulo(hash_id).archivo_nombre,
+                         ruta_en_almacen(hash_id))
+        self.assertTrue(os.path.exists(self._ruta(hash_id)))
+        self.assertFalse(os.path.exists(os.path.join(self.articulos_dir, f"{hash_id}.txt")))
+
+        # La reubicacion quedo persistida
+        self.gestor.cerrar()
+        self.gestor = self.abrir()
+        self.gestor.GRACIA_SEGUNDOS = -1
+        self.assertEqual(self.gestor.obtener_articulo(hash_id).archivo_nombre,
+                         ruta_en_almacen(hash_id))
+        self.assertEqual(self.gestor.verificar_almacen()["planos"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import random
+import unittest
+from collections import Counter
+from unittest import mock
+
+import proyecto2
+from proyecto2 import AnaliticaCatalogo, Articulo, separar_autores
+
+AUTORES = ["Ana Perez", "Bo Li", "Cy Reyes", "Di Sol", "Eva Luna", "Fe Paz", "Gil Mar"]
+
+
+def articulos(cantidad, semilla=0, desde=0):
+    rng = random.Random(semilla)
+    return [Articulo(str(desde + i), "t" * rng.randint(1, 60),
+                     " y ".join(rng.sample(AUTORES, rng.randint(1, 4))),
+                     rng.randrange(1950, 2020), f"{desde + i}.txt")
+            for i in range(cantidad)]
+
+
+class TestAnaliticaCatalogo(unittest.TestCase):
+    """El motor de NumPy y el de ``array`` tienen que dar resultados identicos"""
+
+    def setUp(self):
+        proyecto2._cargar_numpy()  # Despues de buscarlo, np = None fuerza el motor de Python
+
+    def _motor(self, usar_numpy):
+        if usar_numpy and proyecto2.np is None:
+            self.skipTest("NumPy no esta instalado")
+        return mock.patch.object(proyecto2, "np", proyecto2.np if usar_numpy else None)
+
+    def _consultas(self, analitica):
+        return {
+            "resumen": analitica.resumen(top=5),
+            "largo": len(analitica),
+            "top_todos": analitica.top_autores(k=100),
+            "top_rango": [analitica.top_autores(k, 1970, 1990) for k in (1, 3, 0)],
+            "top_desde": analitica.top_autores(3, año_desde=2000),
+            "histogramas": [analitica.histograma_años(autor, ancho)
+                            for autor in (None, "ana perez", "BO  LI", "nadie")
+                            for ancho in (1, 7)],
+            "titulos": analitica.estadisticas_titulos(ancho=9),
+        }
+
+    def _ejecutar(self, usar_numpy, mutar=None):
+        with self._motor(usar_numpy):
+            analitica = AnaliticaCatalogo(articulos(300))
+            if mutar is not None:
+                mutar(analitica)
+            resultados = self._consultas(analitica)
+            json.dumps(resultados)  # Solo tipos de Python, con cualquier motor
+        self.assertEqual(resultados["resumen"].pop("motor"), "numpy" if usar_numpy else "python")
+        return resultados
+
+    def _comparar(self, mutar=None):
+        self.assertEqual(self._ejecutar(True, mutar), self._ejecutar(False, mutar))
+
+    def test_motores_identicos(self):
+        self._comparar()
+
+    def test_motores_identicos_tras_altas_y_bajas(self):
+        def mutar(analitica):
+            for articulo in articulos(100, semilla=1, desde=1000):
+                analitica.agregar(articulo)
+            for i in range(0, 300, 3):
+                analitica.quitar(str(i))
+            analitica.quitar("inexistente")
+            analitica.agregar(Articulo("1", "reemplazado", "Zoe Rey", 2019, "1.txt"))
+
+        self._comparar(mutar)
+
+    def test_motores_identicos_tras_compactar(self):
+        def mutar(analitica):
+            analitica.COMPACTAR_DESDE = 10
+            for i in range(250):
+                analitica.quitar(str(i))
+            self.assertLess(analitica._años.n, 300)  # Se compacto al bajar de la mitad
+
+        self._comparar(mutar)
+
+    def test_años_fuera_de_int16(self):
+        def mutar(analitica):
+            analitica.agregar(Articulo("grande", "t", "Ana Perez", 40000, "g.txt"))
+            analitica.agregar(Articulo("negativo", "t", "Bo Li", -40000, "n.txt"))
+
+        self._comparar(mutar)
+        with self._motor(False):
+            analitica = AnaliticaCatalogo()
+            mutar(analitica)
+            self.assertEqual(analitica.conteo_por_año(), [(-40000, 1), (40000, 1)])
+
+    def test_vacio(self):
+        for usar_numpy in (True, False):
+            with self.subTest(numpy=usar_numpy), self._motor(usar_numpy):
+                analitica = AnaliticaCatalogo()
+                self.assertEqual(analitica.conteo_por_año(), [])
+                self.assertEqual(analitica.top_autores(), [])
+                self.assertEqual(analitica.histograma_años(), [])
+                self.assertEqual(analitica.estadisticas_titulos(), {"articulos": 0})
+
+    def test_igual_a_contar_a_mano(self):
+        lista = articulos(300)
+        por_autor = Counter(nombre for articulo in lista
+                            for nombre in separar_autores(articulo.autores))
+        with self._motor(False):
+            analitica = AnaliticaCatalogo(lista)
+            self.assertEqual(analitica.conteo_por_año(),
+                             sorted(Counter(articulo.año for articulo in lista).items()))
+            self.assertEqual(analitica.top_autores(),
+                             sorted(por_autor.items(), key=lambda par: (-par[1], par[0])))
+            self.assertEqual(analitica.cantidad_autores(), len(por_autor))
+            largos = sorted(len(articulo.titulo) for articulo in lista)
+            self.assertEqual(analitica.estadisticas_titulos()["mediana"],
+                             (largos[149] + largos[150]) / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
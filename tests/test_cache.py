@@ -0,0 +1,103 @@
+import mmap
+import os
+import unittest
+
+from proyecto2 import CacheContenidos
+from tests.base import CasoCatalogo
+
+
+class TestCacheContenidos(CasoCatalogo):
+
+    def setUp(self):
+        super().setUp()
+        self.rutas = [self.archivo(f"cuerpo{i}", bytes([65 + i]) * 100) for i in range(4)]
+        self.cache = CacheContenidos(presupuesto=250, umbral_mmap=1 << 20)
+
+    def tearDown(self):
+        self.cache.cerrar()
+        super().tearDown()
+
+    def _leer(self, ruta):
+        with open(ruta, "rb") as file:
+            return file.read()
+
+    def _guardadas(self):
+        return list(self.cache._entradas)
+
+    def test_presupuesto_y_desalojo_lru(self):
+        for ruta in self.rutas[:2]:
+            self.assertEqual(self.cache.obtener(ruta), self._leer(ruta))
+        self.cache.obtener(self.rutas[0])  # Pasa a ser la mas reciente
+        self.cache.obtener(self.rutas[2])  # Desaloja la 1, la menos usada
+        self.assertEqual(self._guardadas(), [self.rutas[0], self.rutas[2]])
+        estadisticas = self.cache.estadisticas()
+        self.assertEqual((estadisticas["bytes"], estadisticas["desalojos"]), (200, 1))
+        self.assertEqual((estadisticas["aciertos"], estadisticas["fallos"]), (1, 3))
+
+        for ruta in self.rutas * 3:
+            self.cache.obtener(ruta)
+            self.assertLessEqual(self.cache.estadisticas()["bytes"], 250)
+        self.assertEqual(self._guardadas(), self.rutas[2:])
+
+    def test_archivo_mayor_que_el_presupuesto_no_se_guarda(self):
+        grande = self.archivo("grande", b"x" * 300)
+        self.cache.obtener(self.rutas[0])
+        self.assertEqual(len(self.cache.obtener(grande)), 300)
+        self.assertEqual(self._guardadas(), [self.rutas[0]])
+        self.assertEqual(self.cache.estadisticas()["desalojos"], 0)
+
+    def test_mapeo_de_archivos_grandes(self):
+        cache = CacheContenidos(presupuesto=1000, umbral_mmap=150)
+        self.addCleanup(cache.cerrar)
+        mapeado = self.archivo("mapeado", b"m" * 200)
+        datos = cache.obtener(mapeado)
+        self.assertIsInstance(datos, mmap.mmap)
+        self.assertEqual(datos[:], b"m" * 200)
+        self.assertIsInstance(cache.obtener(self.rutas[0]), bytes)
+        self.assertEqual(cache.obtener(self.archivo("vacio", b"")), b"")
+        estadisticas = cache.estadisticas()
+        self.assertEqual((estadisticas["mapeadas"], estadisticas["bytes"]), (1, 300))
+
+    def test_invalidar(self):
+        self.cache.obtener(self.rutas[0])
+        self.cache.obtener(self.rutas[1])
+        self.cache.invalidar(self.rutas[0])
+        self.cache.invalidar("inexistente")
+        self.assertEqual(self._guardadas(), [self.rutas[1]])
+        self.assertEqual(self.cache.estadisticas()["bytes"], 100)
+
+    def test_precargar(self):
+        self.cache.precargar(self.rutas[:2] + [self.rutas[0]])
+        for ruta in self.rutas[:2]:
+            self.assertEqual(self.cache.obtener(ruta), self._leer(ruta))
+        estadisticas = self.cache.estadisticas()
+        self.assertEqual((estadisticas["aciertos"], estadisticas["fallos"]), (2, 0))
+        self.assertEqual(estadisticas["precargados"], 2)
+
+        faltante = os.path.join(self.directorio, "faltante")
+        self.cache.precargar([faltante])
+        with self.assertRaises(OSError):
+            self.cache.obtener(faltante)
+        self.assertEqual(self.cache._en_curso, {})
+
+
+class TestCacheEnElGestor(CasoCatalogo):
+
+    def test_vista_previa_usa_la_cache_y_las_bajas_la_invalidan(self):
+        self.gestor = self.abrir(presupuesto_contenidos=1 << 10)
+        hash_id = self.agregar("Republica", "Platon", 1900, "justicia " * 10)
+        otro = self.agregar("Banquete", "Platon", 1900, "amor " * 100)
+        self.assertEqual(self.gestor.vista_previa(hash_id, 8), "justicia\n[...]")
+        self.gestor.vista_previa(hash_id)
+        self.gestor.vista_previa(otro)
+        estadisticas = self.gestor.contenidos.estadisticas()
+        self.assertEqual((estadisticas["aciertos"], estadisticas["fallos"]), (1, 2))
+        self.assertEqual((estadisticas["entradas"], estadisticas["bytes"]), (2, 590))
+
+        self.assertTrue(self.gestor.eliminar_articulo(hash_id)[0])
+        self.assertEqual(self.gestor.contenidos.estadisticas()["entradas"], 1)
+        self.assertIsNone(self.gestor.vista_previa(hash_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import unittest
+
+from proyecto2 import GestorArticulos, escribir_exportacion, leer_exportacion
+from tests.base import CasoCatalogo
+
+FORMATOS = (".jsonl", ".acb")
+
+
+class TestExportacion(CasoCatalogo):
+
+    def setUp(self):
+        super().setUp()
+        self.gestor = self.abrir()
+        self.agregar("Republica", "Platón", 1900, "justicia y ciudad")
+        self.agregar("Etica", "Spinoza y Descartes", 1677, "more geometrico\r\nsegunda linea\r\n")
+        self.agregar("Binario", "Anónimo", 2001, b"%PDF-1.4\r\n\x00\xff\xfe\x01fin\r\n")
+        self.agregar("Acentos", "René Descartes", 1641, "cogito, ergo sum: pensé")
+        self.destino = None
+
+    def tearDown(self):
+        if self.destino is not None:
+            self.destino.cerrar()
+        super().tearDown()
+
+    def _contenidos(self, gestor):
+        contenidos = {}
+        for articulo in gestor.tabla_hash.get_all_values():
+            with open(os.path.join(gestor.articulos_dir, articulo.archivo_nombre), "rb") as file:
+                contenidos[articulo.hash_id] = file.read()
+        return contenidos
+
+    def _ida_y_vuelta(self, extension, contenidos):
+        ruta = os.path.join(self.directorio, f"exportacion{extension}")
+        reporte = self.gestor.exportar(ruta, contenidos=contenidos)
+        self.assertEqual(reporte["registros"], 4)
+        self.assertEqual(reporte["sin_contenido"], [])
+        self.assertFalse(os.path.exists(ruta + ".tmp"))
+
+        # Sin contenidos los cuerpos ya tienen que estar en el almacen destino
+        nombre = ("contenidos" if contenidos else "sin_contenidos") + extension
+        articulos_dir = (os.path.join(self.directorio, nombre, "articulos") if contenidos
+                         else self.articulos_dir)
+        self.destino = GestorArticulos(os.path.join(self.directorio, f"{nombre}.txt"),
+                                       articulos_dir)
+        reporte = self.destino.importar_catalogo(ruta)
+        self.assertEqual((reporte["importados"], reporte["duplicados"], reporte["fallos"]),
+                         (4, 0, []))
+        self.assertEqual(self.articulos(self.destino), self.articulos())
+        self.assertEqual(self._contenidos(self.destino), self._contenidos(self.gestor))
+        for hash_id in self.articulos():
+            self.assertEqual(self.destino.vista_previa(hash_id),
+                             self.gestor.vista_previa(hash_id))
+
+        # Importar de nuevo solo cuenta duplicados
+        reporte = self.destino.importar_catalogo(ruta)
+        self.assertEqual((reporte["importados"], reporte["duplicados"]), (0, 4))
+
+        # La importacion quedo persistida
+        self.destino.cerrar()
+        self.destino = GestorArticulos(os.path.join(self.directorio, f"{nombre}.txt"),
+                                       articulos_dir)
+        self.assertEqual(self.articulos(self.destino), self.articulos())
+
+    def test_ida_y_vuelta(self):
+        for extension in FORMATOS:
+            for contenidos in (False, True):
+                with self.subTest(formato=extension, contenidos=contenidos):
+                    self._ida_y_vuelta(extension, contenidos)
+                    self.destino.cerrar()
+                    self.destino = None
+
+    def test_contenido_binario_en_jsonl(self):
+        ruta = os.path.join(self.directorio, "exportacion.jsonl")
+        self.gestor.exportar(ruta, contenidos=True)
+        with open(ruta, encoding="utf-8") as file:
+            lineas = file.read()
+        self.assertEqual(lineas.count('"contenido_base64"'), 1)
+        self.assertEqual(lineas.count('"contenido"'), 3)
+        leidos = {registro[0]: registro[5] for registro in leer_exportacion(ruta)}
+        self.assertEqual(leidos, self._contenidos(self.gestor))
+
+    def test_contenido_alterado_no_se_importa(self):
+        ruta = os.path.join(self.directorio, "exportacion.jsonl")
+        registros = [registro[:5] + (b"otro cuerpo",) if registro[1] == "Republica" else registro
+                     for registro in self.gestor.registros_exportacion(True)]
+        escribir_exportacion(ruta, registros, contenidos=True)
+        self.destino = GestorArticulos(os.path.join(self.directorio, "destino.txt"),
+                                       os.path.join(self.directorio, "destino"))
+        reporte = self.destino.importar_catalogo(ruta)
+        self.assertEqual(reporte["importados"], 3)
+        self.assertEqual([hash_id for hash_id, _ in reporte["fallos"]],
+                         [self.gestor.buscar(titulo_prefijo="Republica")[0].hash_id])
+
+    def test_exportacion_fallida_conserva_el_archivo_anterior(self):
+        def registros():
+            yield from self.gestor.registros_exportacion(True)
+            raise OSError("disco lleno")
+
+        for extension in FORMATOS:
+            with self.subTest(formato=extension):
+                ruta = os.path.join(self.directorio, f"anterior{extension}")
+                self.gestor.exportar(ruta)
+                with open(ruta, "rb") as file:
+                    anterior = file.read()
+                with self.assertRaises(OSError):
+                    escribir_exportacion(ruta, registros(), contenidos=True, lote=2)
+                with open(ruta, "rb") as file:
+                    self.assertEqual(file.read(), anterior)
+                self.assertFalse(os.path.exists(ruta + ".tmp"))
+                self.assertEqual(len(list(leer_exportacion(ruta))), 4)
+
+    def test_columnar_truncado(self):
+        ruta = os.path.join(self.directorio, "exportacion.acb")
+        self.gestor.exportar(ruta, contenidos=True)
+        with open(ruta, "rb") as file:
+            datos = file.read()
+        for largo in (3, len(datos) // 2, len(datos) - 1):
+            with self.subTest(largo=largo):
+                with open(ruta, "wb") as file:
+                    file.write(datos[:largo])
+                with self.assertRaises(ValueError):
+                    list(leer_exportacion(ruta))
+
+        self.destino = GestorArticulos(os.path.join(self.directorio, "destino.txt"),
+                                       os.path.join(self.directorio, "destino"))
+        with self.assertRaises(ValueError):
+            self.destino.importar_catalogo(ruta)
+
+    def test_formato_desconocido(self):
+        with self.assertRaises(ValueError):
+            self.gestor.exportar(os.path.join(self.directorio, "exportacion.csv"))
+        self.assertFalse(os.path.exists(os.path.join(self.directorio, "exportacion.csv")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import random
+import unittest
+
+from proyecto2 import HashTable
+
+
+class _CasosHashTable:
+    """Casos comunes a ambos almacenamientos; las subclases fijan ``OPEN_ADDRESSING``"""
+
+    OPEN_ADDRESSING = False
+
+    def tabla(self, size=16, **opciones):
+        return HashTable(size, open_addressing=self.OPEN_ADDRESSING, **opciones)
+
+    def _llenar_hasta_rehash(self, tabla, claves):
+        """Insertar ``claves`` hasta que empiece un rehash; devuelve las insertadas"""
+        insertadas = []
+        for clave in claves:
+            tabla.insert(clave, f"v{clave}")
+            insertadas.append(clave)
+            if tabla.rehashing:
+                return insertadas
+        self.fail("La tabla nunca empezo a redimensionarse")
+
+    def _verificar(self, tabla, esperado):
+        self.assertEqual(len(tabla), len(esperado))
+        self.assertEqual(sorted(tabla.keys()), sorted(esperado))
+        for clave, valor in esperado.items():
+            self.assertEqual(tabla.get(clave), valor)
+
+    def test_operaciones_durante_el_rehash(self):
+        tabla = self.tabla()
+        esperado = {clave: f"v{clave}"
+                    for clave in self._llenar_hasta_rehash(tabla, range(1000))}
+        vistos_en_rehash = 0
+        rng = random.Random(7)
+        for paso in range(2000):
+            clave = rng.randrange(200)
+            if rng.random() < 0.6:
+                tabla.insert(clave, paso)
+                esperado[clave] = paso
+            else:
+                self.assertEqual(tabla.delete(clave), esperado.pop(clave, None) is not None)
+            if tabla.rehashing:
+                vistos_en_rehash += 1
+                for clave in esperado:
+                    self.assertTrue(tabla.exists(clave))
+        self.assertGreater(vistos_en_rehash, 0)
+        self._verificar(tabla, esperado)
+
+    def test_lecturas_no_avanzan_el_rehash(self):
+        tabla = self.tabla()
+        claves = self._llenar_hasta_rehash(tabla, range(1000))
+        posicion = tabla._rehash_pos
+        for clave in claves:
+            self.assertEqual(tabla.get(clave), f"v{clave}")
+        list(tabla.items())
+        self.assertTrue(tabla.rehashing)
+        self.assertEqual(tabla._rehash_pos, posicion)
+
+    def test_actualizar_durante_el_rehash_no_duplica(self):
+        tabla = self.tabla()
+        claves = self._llenar_hasta_rehash(tabla, range(1000))
+        for clave in claves:
+            tabla.insert(clave, "nuevo")
+        self.assertEqual(len(tabla), len(claves))
+        self.assertEqual(sorted(tabla.keys()), sorted(claves))
+        self.assertTrue(all(valor == "nuevo" for _, valor in tabla.items()))
+
+    def test_crece_y_se_reduce(self):
+        tabla = self.tabla()
+        esperado = {clave: clave * 2 for clave in range(500)}
+        for clave, valor in esperado.items():
+            tabla.insert(clave, valor)
+        self.assertGreater(tabla.size, 500)
+        grande = tabla.size
+        for clave in range(480):
+            self.assertTrue(tabla.delete(clave))
+            del esperado[clave]
+        self.assertLess(tabla.size, grande)
+        self.assertGreaterEqual(tabla.size, tabla.initial_size)
+        self._verificar(tabla, esperado)
+        self.assertFalse(tabla.delete(0))
+
+    def test_reserve(self):
+        tabla = self.tabla(8)
+        tabla.insert("a", 1)
+        tabla.reserve(1000)
+        self.assertFalse(tabla.rehashing)
+        self.assertGreaterEqual(tabla.size * tabla.max_load_factor, 1000)
+        self.assertEqual(tabla.get("a"), 1)
+        redimensiones = tabla.resize_count
+        for clave in range(999):
+            tabla.insert(clave, clave)
+        self.assertEqual(tabla.resize_count, redimensiones)
+        self.assertEqual(len(tabla), 1000)
+
+    def test_reserve_termina_un_rehash_en_curso(self):
+        tabla = self.tabla()
+        claves = self._llenar_hasta_rehash(tabla, range(1000))
+        tabla.reserve(4096)
+        self.assertFalse(tabla.rehashing)
+        self._verificar(tabla, {clave: f"v{clave}" for clave in claves})
+
+    def test_reserve_menor_no_reduce(self):
+        tabla = self.tabla(64)
+        tabla.reserve(10)
+        self.assertEqual(tabla.size, 64)
+        self.assertEqual(tabla.resize_count, 0)
+
+
+class TestHashTableEncadenada(_CasosHashTable, unittest.TestCase):
+    OPEN_ADDRESSING = False
+
+
+class TestHashTableDireccionamientoAbierto(_CasosHashTable, unittest.TestCase):
+    OPEN_ADDRESSING = True
+
+    def test_factor_de_carga_invalido(self):
+        with self.assertRaises(ValueError):
+            self.tabla(max_load_factor=1.0)
+
+    def test_lapida_se_reutiliza(self):
+        tabla = self.tabla()
+        tabla.insert(1, "uno")
+        tabla.insert(17, "diecisiete")  # Misma casilla inicial: queda en la siguiente
+        self.assertTrue(tabla.delete(1))
+        self.assertEqual(tabla._store.tombstones, 1)
+        self.assertEqual(tabla.get(17), "diecisiete")  # La lapida no corta el sondeo
+        tabla.insert(33, "treinta y tres")
+        self.assertEqual(tabla._store.keys[1], 33)
+        self.assertEqual(tabla._store.tombstones, 0)
+
+    def test_lapidas_no_hacen_crecer_la_tabla(self):
+        tabla = self.tabla()
+        for clave in range(5000):
+            tabla.insert(clave, clave)
+            tabla.delete(clave)
+        self.assertEqual(tabla.size, 16)
+        self.assertGreater(tabla.resize_count, 0)  # Reconstrucciones al mismo tamaño
+        self.assertEqual(len(tabla), 0)
+
+    def test_migrar_no_corta_el_sondeo(self):
+        # 7 y 23 comparten la casilla 7: 23 queda en la 8. Al migrar las
+        # casillas 0-7, la 8 sigue en la tabla anterior y se llega a ella
+        # sondeando desde la 7 (regresion: vaciar la casilla 7 cortaba el sondeo)
+        tabla = self.tabla()
+        claves = [7, 23] + list(range(10, 21))
+        self.assertEqual(self._llenar_hasta_rehash(tabla, claves), claves)
+        tabla.insert(100, "v100")  # Primer paso del rehash
+        self.assertTrue(tabla.rehashing)
+        self.assertEqual(tabla.get(23), "v23")
+        tabla.insert(23, "otro")
+        self.assertEqual(sorted(tabla.keys()).count(23), 1)
+        self.assertEqual(len(tabla), len(claves) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
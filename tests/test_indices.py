@@ -0,0 +1,171 @@
+import bisect
+import random
+import unittest
+from unittest import mock
+
+from proyecto2 import ListaOrdenada, separar_autores
+from tests.base import CasoCatalogo
+
+
+class ListaChica(ListaOrdenada):
+    TAMAÑO_BLOQUE = 4  # Bloques chicos para que se partan y se vacien seguido
+
+
+class TestListaOrdenada(unittest.TestCase):
+
+    def _verificar(self, lista, esperado):
+        self.assertEqual(len(lista), len(esperado))
+        self.assertEqual(list(lista), esperado)
+        self.assertEqual(lista._maximos, [bloque[-1] for bloque in lista._bloques])
+        self.assertTrue(all(bloque for bloque in lista._bloques))
+        for valor in (-1, 0, 17, 50, 99, 1000):
+            self.assertEqual(list(lista.iterar_desde((valor,))),
+                             esperado[bisect.bisect_left(esperado, (valor,)):])
+            self.assertEqual(lista.posicion((valor,)), bisect.bisect_left(esperado, (valor,)))
+        for offset, limit in ((0, None), (0, 5), (3, 7), (len(esperado) - 2, 10),
+                              (len(esperado) + 5, 3), (2, 0)):
+            stop = None if limit is None else offset + limit
+            self.assertEqual(lista.rebanada(offset, limit), esperado[offset:stop])
+
+    def test_igual_a_una_lista_ordenada(self):
+        rng = random.Random(5)
+        lista = ListaChica()
+        esperado = []
+        for paso in range(1500):
+            elemento = (rng.randrange(100), rng.randrange(3))
+            if rng.random() < 0.6:
+                lista.agregar(elemento)
+                bisect.insort(esperado, elemento)
+            else:
+                self.assertEqual(lista.eliminar(elemento), elemento in esperado)
+                if elemento in esperado:
+                    esperado.remove(elemento)
+            if paso % 100 == 0:
+                self._verificar(lista, esperado)
+        self._verificar(lista, esperado)
+        self.assertGreater(len(lista._bloques), 2)
+
+    def test_construir_desde_elementos(self):
+        elementos = [(i % 13, i) for i in range(50)]
+        lista = ListaChica(elementos)
+        self.assertEqual([len(bloque) for bloque in lista._bloques], [4] * 12 + [2])
+        self._verificar(lista, sorted(elementos))
+
+    def test_vaciar(self):
+        lista = ListaChica([(i,) for i in range(10)])
+        for i in range(10):
+            self.assertTrue(lista.eliminar((i,)))
+        self.assertFalse(lista.eliminar((0,)))
+        self._verificar(lista, [])
+        lista.agregar((3,))
+        self._verificar(lista, [(3,)])
+
+
+class TestSepararAutores(unittest.TestCase):
+
+    def test_separadores(self):
+        self.assertEqual(separar_autores("Ana Perez, Bo; Cy & Di y Ed and Fe"),
+                         ["ana perez", "bo", "cy", "di", "ed", "fe"])
+        self.assertEqual(separar_autores("  Ana   Perez  Y  Bo AND Cy "),
+                         ["ana perez", "bo", "cy"])
+
+    def test_no_corta_dentro_de_palabras(self):
+        self.assertEqual(separar_autores("Reyes, Sandy Bay"), ["reyes", "sandy bay"])
+
+    def test_repetidos_y_vacios(self):
+        self.assertEqual(separar_autores("Ana, ana ,, ANA;"), ["ana"])
+        self.assertEqual(separar_autores(""), [])
+
+
+AUTORES = ["Ana Perez", "Bo Li", "Cy Reyes", "Di Sol", "Eva Luna", "Ana Paula"]
+
+
+class TestBuscarCombinado(CasoCatalogo):
+
+    def setUp(self):
+        super().setUp()
+        self.gestor = self.abrir()
+        rng = random.Random(11)
+        for i in range(60):
+            autores = " y ".join(rng.sample(AUTORES, rng.randint(1, 3)))
+            titulo = f"{rng.choice(['Alfa', 'Beta', 'alfa', 'Gama'])} {rng.randrange(20)} {i}"
+            self.agregar(titulo, autores, rng.randrange(1990, 2010), f"cuerpo {i}")
+
+    def _fuerza_bruta(self, titulo_prefijo=None, autor=None, autor_prefijo=None, coautores=None,
+                      año=None, año_desde=None, año_hasta=None):
+        resultados = []
+        for articulo in self.gestor.tabla_hash.get_all_values():
+            nombres = separar_autores(articulo.autores)
+            if titulo_prefijo and not articulo.titulo.lower().startswith(titulo_prefijo.lower()):
+                continue
+            if any(nombre.lower() not in nombres for nombre in ([autor] if autor else [])
+                   + list(coautores or [])):
+                continue
+            if autor_prefijo and not any(n.startswith(autor_prefijo.lower()) for n in nombres):
+                continue
+            if año is not None and articulo.año != año:
+                continue
+            if ((año_desde is not None and articulo.año < año_desde)
+                    or (año_hasta is not None and articulo.año > año_hasta)):
+                continue
+            resultados.append(articulo)
+        resultados.sort(key=lambda a: (a.titulo.lower(), a.hash_id))
+        return [articulo.hash_id for articulo in resultados]
+
+    CRITERIOS = [
+        {}, {"titulo_prefijo": "alfa"}, {"titulo_prefijo": "ALFA 1"}, {"autor": "ana perez"},
+        {"autor": "Bo Li", "coautores": ["Cy Reyes"]}, {"autor_prefijo": "ana"},
+        {"año": 2000}, {"año_desde": 1995, "año_hasta": 1999}, {"año_hasta": 1992},
+        {"titulo_prefijo": "beta", "autor": "Eva Luna", "año_desde": 2000},
+        {"autor_prefijo": "d", "año_desde": 2005, "titulo_prefijo": "g"},
+        {"autor": "Nadie"}, {"titulo_prefijo": "zeta"}, {"año_desde": 2020},
+    ]
+
+    def _verificar(self):
+        for criterios in self.CRITERIOS:
+            esperado = self._fuerza_bruta(**criterios)
+            with self.subTest(**criterios):
+                self.assertEqual([a.hash_id for a in self.gestor.buscar(**criterios)], esperado)
+                for offset, limit in ((0, 3), (2, 5), (len(esperado), 3)):
+                    self.assertEqual(
+                        [a.hash_id for a in self.gestor.buscar(offset=offset, limit=limit,
+                                                               **criterios)],
+                        esperado[offset:offset + limit])
+
+    def test_igual_a_fuerza_bruta(self):
+        self.assertGreater(len(self._fuerza_bruta(titulo_prefijo="beta", autor="Eva Luna")), 0)
+        self._verificar()
+
+    def test_igual_a_fuerza_bruta_sobre_la_instantanea(self):
+        self.gestor.cerrar()
+        self.gestor = self.abrir()
+        self.assertTrue(self.gestor.consultas_delegadas)
+        self._verificar()
+
+    def test_sigue_las_mutaciones(self):
+        self.gestor.buscar(autor="Bo Li")  # Construye los indices
+        hash_id = self.gestor.buscar(autor="Bo Li")[0].hash_id
+        self.assertTrue(self.gestor.modificar_articulo(hash_id, "Zoe Rey", 1980)[0])
+        self.assertNotIn(hash_id, [a.hash_id for a in self.gestor.buscar(autor="Bo Li")])
+        self.assertEqual([a.hash_id for a in self.gestor.buscar(autor="zoe rey", año=1980)],
+                         [hash_id])
+        self._verificar()
+
+    def test_recorre_el_filtro_mas_selectivo(self):
+        self.gestor.buscar()  # Construye los indices
+        titulo = self.gestor.listar_por_titulo(limit=1)[0].titulo
+        with mock.patch.object(self.gestor, "_articulos_por_ids",
+                               wraps=self.gestor._articulos_por_ids) as por_ids:
+            # Un solo titulo con ese prefijo: no se materializan los de autor
+            self.gestor.buscar(titulo_prefijo=titulo, autor_prefijo="a")
+            por_ids.assert_not_called()
+            # Un autor inexistente corta sin recorrer nada
+            self.assertEqual(self.gestor.buscar(autor="Nadie", año_desde=1990), [])
+            por_ids.assert_not_called()
+            # El rango cubre todo el catalogo: se recorren los del autor
+            self.gestor.buscar(autor="Di Sol", año_desde=1990)
+            por_ids.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import unittest
+
+from tests.base import CasoCatalogo
+
+
+class TestInstantanea(CasoCatalogo):
+    """Una instantanea vencida o corrupta se ignora y se parsea la base de texto"""
+
+    def setUp(self):
+        super().setUp()
+        gestor = self.abrir()
+        for i in range(20):
+            self.agregar(f"Titulo {i:02}", f"Autor {i % 3}", 2000 + i, f"contenido {i}", gestor)
+        self.esperado = self.articulos(gestor)
+        gestor.cerrar()
+
+    def test_instantanea_al_dia(self):
+        self.gestor = self.abrir()
+        self.assertIsNotNone(self.gestor.instantanea)
+        self.assertEqual(self.articulos(), self.esperado)
+
+    def test_instantanea_vencida(self):
+        # Otro proceso sin instantanea cambia la base y la compacta
+        gestor = self.abrir(instantanea=False)
+        self.agregar("Nuevo", "Autor 9", 2030, "contenido nuevo", gestor)
+        esperado = self.articulos(gestor)
+        gestor.cerrar()
+
+        self.gestor = self.abrir()
+        self.assertIsNone(self.gestor.instantanea)
+        self.assertEqual(self.articulos(), esperado)
+        self.assertEqual(len(self.gestor.buscar(autor="autor 9")), 1)
+
+    def test_instantanea_corrupta(self):
+        ruta = self.db_file + ".snap"
+        with open(ruta, "r+b") as file:
+            file.seek(os.path.getsize(ruta) // 2)
+            byte = file.read(1)
+            file.seek(-1, os.SEEK_CUR)
+            file.write(bytes([byte[0] ^ 0xFF]))
+
+        self.gestor = self.abrir(metricas=True)
+        self.assertIsNone(self.gestor.instantanea)
+        self.assertEqual(self.articulos(), self.esperado)
+        self.assertEqual([operacion for _, operacion, _ in self.gestor.metricas.errores],
+                         ["cargar_instantanea_del_catalogo"])
+
+    def test_instantanea_truncada(self):
+        ruta = self.db_file + ".snap"
+        with open(ruta, "r+b") as file:
+            file.truncate(os.path.getsize(ruta) // 3)
+
+        self.gestor = self.abrir()
+        self.assertIsNone(self.gestor.instantanea)
+        self.assertEqual(self.articulos(), self.esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import unittest
+
+from tests.base import CasoCatalogo
+
+
+class TestJournal(CasoCatalogo):
+    """Las mutaciones van al journal y se reaplican si el proceso no cerro"""
+
+    def setUp(self):
+        super().setUp()
+        self.gestor = self.abrir()
+
+    def test_reaplicar_tras_caida_antes_de_compactar(self):
+        for i in range(3):
+            self.agregar(f"Titulo {i}", "Ana y Bo", 2000 + i, f"contenido {i}")
+        self.gestor.compactar()
+        borrado, modificado = [articulo.hash_id for articulo in
+                               self.gestor.buscar(titulo_prefijo="Titulo")][:2]
+        self.assertTrue(self.gestor.eliminar_articulo(borrado)[0])
+        self.assertTrue(self.gestor.modificar_articulo(modificado, "Carla", 1999)[0])
+        self.agregar("Nuevo", "Dario", 2010, "otro contenido")
+        esperado = self.articulos()
+        self.assertGreater(os.path.getsize(self.db_file + ".log"), 0)
+
+        # Caida: el gestor se abandona sin cerrar, la base quedo como al compactar
+        self.gestor = self.abrir()
+        self.assertEqual(self.gestor.almacenamiento.registros_journal, 3)
+        self.assertEqual(self.articulos(), esperado)
+        self.assertNotIn(borrado, self.articulos())
+        self.assertEqual([a.hash_id for a in self.gestor.buscar(autor="carla")], [modificado])
+        self.assertEqual(len(self.gestor.buscar(titulo_prefijo="Nuevo")), 1)
+
+    def test_rechaza_duplicado_exacto(self):
+        self.agregar("Original", "Ana", 2000, "mismo contenido")
+        tamaño_journal = os.path.getsize(self.db_file + ".log")
+
+        copia = self.archivo("copia.txt", "mismo contenido")
+        exito, mensaje = self.gestor.agregar_articulo("Otro titulo", "Bo", 2001, copia)
+        self.assertFalse(exito)
+        self.assertEqual(mensaje, "El articulo ya existe en el sistema")
+        self.assertEqual(len(self.articulos()), 1)
+        self.assertEqual(os.path.getsize(self.db_file + ".log"), tamaño_journal)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import unittest
+
+from proyecto2 import CatalogoParticionado, GestorArticulos, particion_de, reparticionar
+from tests.base import CasoCatalogo
+
+ARTICULOS = [
+    ("Republica", "Platón", 1900, "justicia y ciudad"),
+    ("Banquete", "Platón", 1900, "sobre el amor"),
+    ("Metafisica", "Aristóteles", 1920, "el ser en cuanto ser"),
+    ("Etica", "Aristóteles y Platón", 1920, "la virtud"),
+    ("ETICA", "Spinoza", 1677, "more geometrico"),  # Empata con "Etica" por titulo
+    ("Zaratustra", "Friedrich Nietzsche", 1883, "superhombre"),
+    ("Aurora", "Friedrich Nietzsche", 1881, "prejuicios morales"),
+    ("Critica", "Immanuel Kant", 1781, "razon pura"),
+    ("Meditaciones", "René Descartes", 1641, "cogito"),
+    ("Discurso", "René Descartes y Spinoza", 1637, "metodo"),
+    ("Leviatan", "Hobbes", 1651, "estado de naturaleza"),
+    ("Ensayo", "Locke", 1690, "entendimiento humano"),
+]
+
+
+def ids(articulos):
+    return [articulo.hash_id for articulo in articulos]
+
+
+class _CasosParticionado:
+    """Un catalogo de 2 particiones comparado con un GestorArticulos con los
+    mismos articulos; las subclases fijan ``PROCESOS``"""
+
+    PROCESOS = False
+
+    def setUp(self):
+        super().setUp()
+        self.particionado_dir = os.path.join(self.directorio, "particionado")
+        self.catalogo = None
+        self.gestor = self.abrir()
+        for titulo, autores, año, contenido in ARTICULOS:
+            self.agregar(titulo, autores, año, contenido)
+        self.catalogo = self._abrir_catalogo(2)
+        for titulo, autores, año, _ in ARTICULOS:
+            exito, mensaje = self.catalogo.agregar_articulo(
+                titulo, autores, año, os.path.join(self.directorio, f"{titulo}.txt"))
+            self.assertTrue(exito, mensaje)
+
+    def tearDown(self):
+        if self.catalogo is not None:
+            self.catalogo.cerrar()
+        super().tearDown()
+
+    def _abrir_catalogo(self, particiones=None):
+        return CatalogoParticionado(self.particionado_dir, particiones, procesos=self.PROCESOS)
+
+    def _verificar_consultas(self, catalogo):
+        self.assertEqual(len(catalogo), len(self.gestor))
+        self.assertEqual(ids(catalogo.listar_por_titulo()), ids(self.gestor.listar_por_titulo()))
+        self.assertEqual(ids(catalogo.listar_por_autor()), ids(self.gestor.listar_por_autor()))
+        for offset, limit in ((0, 3), (2, 4), (10, 5)):
+            with self.subTest(offset=offset, limit=limit):
+                self.assertEqual(ids(catalogo.listar_por_titulo(offset, limit)),
+                                 ids(self.gestor.listar_por_titulo(offset, limit)))
+        for criterios in ({"autor": "Platón"}, {"autor_prefijo": "ren"},
+                          {"año_desde": 1650, "año_hasta": 1900}, {"titulo_prefijo": "et"},
+                          {"autor": "Spinoza", "año_hasta": 1650}, {"año": 1920}):
+            with self.subTest(**criterios):
+                self.assertEqual(ids(catalogo.buscar(**criterios)),
+                                 ids(self.gestor.buscar(**criterios)))
+                self.assertEqual(ids(catalogo.buscar(offset=1, limit=2, **criterios)),
+                                 ids(self.gestor.buscar(offset=1, limit=2, **criterios)))
+
+    def test_consultas_iguales_a_un_solo_gestor(self):
+        self._verificar_consultas(self.catalogo)
+        self.assertEqual(ids(self.catalogo.buscar_por_autor("Friedrich Nietzsche")),
+                         ids(self.gestor.buscar_por_autor("Friedrich Nietzsche")))
+        self.assertEqual(self.catalogo.conteo_por_año(), self.gestor.conteo_por_año())
+
+    def test_cada_articulo_en_su_particion(self):
+        self.catalogo.cerrar()
+        self.catalogo = None
+        repartidos = {}
+        for numero in range(2):
+            db_file, articulos_dir = CatalogoParticionado.rutas(self.particionado_dir, numero)
+            gestor = GestorArticulos(db_file, articulos_dir)
+            try:
+                for hash_id in self.articulos(gestor):
+                    self.assertEqual(particion_de(hash_id, 2), numero)
+                    self.assertNotIn(hash_id, repartidos)
+                    repartidos[hash_id] = self.articulos(gestor)[hash_id]
+            finally:
+                gestor.cerrar()
+        self.assertEqual(repartidos, self.articulos())
+        self.assertEqual({particion_de(hash_id, 2) for hash_id in repartidos}, {0, 1})
+
+    def test_operaciones_por_hash_id(self):
+        hash_id = self.gestor.buscar(titulo_prefijo="Leviatan")[0].hash_id
+        self.assertEqual(self.catalogo.obtener_articulo(hash_id).titulo, "Leviatan")
+        self.assertTrue(self.catalogo.modificar_articulo(hash_id, "Thomas Hobbes")[0])
+        self.assertEqual(ids(self.catalogo.buscar(autor="Thomas Hobbes")), [hash_id])
+        self.assertTrue(self.catalogo.eliminar_articulo(hash_id)[0])
+        self.assertIsNone(self.catalogo.obtener_articulo(hash_id))
+        self.assertEqual(len(self.catalogo), len(ARTICULOS) - 1)
+
+    def test_cantidad_de_particiones_fija(self):
+        self.catalogo.cerrar()
+        self.catalogo = None
+        with self.assertRaises(ValueError):
+            self._abrir_catalogo(3)
+
+    def test_reparticionar_conserva_todo(self):
+        self.catalogo.cerrar()
+        self.catalogo = None
+        self.assertEqual(reparticionar(self.particionado_dir, 3), len(ARTICULOS))
+        self.assertFalse(os.path.exists(self.particionado_dir + ".nuevo"))
+        self.assertFalse(os.path.exists(self.particionado_dir + ".viejo"))
+        self.assertEqual(reparticionar(self.particionado_dir, 3), 0)
+
+        self.catalogo = self._abrir_catalogo()
+        self.assertEqual(self.catalogo.cantidad, 3)
+        self._verificar_consultas(self.catalogo)
+        for hash_id in self.articulos():
+            self.assertEqual(self.catalogo.vista_previa(hash_id),
+                             self.gestor.vista_previa(hash_id))
+
+
+class TestCatalogoParticionado(_CasosParticionado, CasoCatalogo):
+    PROCESOS = False
+
+
+class TestCatalogoParticionadoEnProcesos(_CasosParticionado, CasoCatalogo):
+    PROCESOS = True
+
+
+if __name__ == "__main__":
+    unittest.main()
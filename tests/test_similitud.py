@@ -0,0 +1,155 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from proyecto2 import IndiceSimilitud, firma_minhash, parametros_lsh, shingles
+from tests.base import CasoCatalogo
+
+_PALABRAS = random.Random(3).sample([f"palabra{i}" for i in range(5000)], 2000)
+
+
+def texto(semilla, largo=200):
+    rng = random.Random(semilla)
+    return " ".join(rng.choice(_PALABRAS) for _ in range(largo))
+
+
+def variante(original, cambios, semilla=0):
+    """``original`` con ``cambios`` palabras reemplazadas"""
+    rng = random.Random(semilla)
+    terminos = original.split()
+    for posicion in rng.sample(range(len(terminos)), cambios):
+        terminos[posicion] = "distinta"
+    return " ".join(terminos)
+
+
+def jaccard(texto_a, texto_b):
+    a, b = shingles(texto_a), shingles(texto_b)
+    return len(a & b) / len(a | b)
+
+
+class TestIndiceSimilitud(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "similitud.mnh")
+        self.errores = []
+        self.indice = self._abrir()
+        self.a = texto(1)
+        self.b = texto(2)
+        self.textos = {"a": self.a, "a2": variante(self.a, 1),
+                       "b": self.b, "b2": variante(self.b, 1, 1), "b3": variante(self.b, 2, 2),
+                       "c": texto(3)}
+        for hash_id, contenido in self.textos.items():
+            self.indice.agregar(hash_id, firma_minhash(contenido))
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def _abrir(self):
+        return IndiceSimilitud(self.ruta, umbral=0.8, reportar_error=lambda operacion, error:
+                               self.errores.append((operacion, error)))
+
+    def test_parametros_lsh(self):
+        for umbral in (0.5, 0.8, 0.9):
+            with self.subTest(umbral=umbral):
+                bandas, filas = parametros_lsh(umbral, 128)
+                self.assertEqual(bandas * filas, 128)
+                self.assertLessEqual((1 / bandas) ** (1 / filas), umbral)
+        with self.assertRaises(ValueError):
+            IndiceSimilitud(self.ruta, umbral=0)
+
+    def test_firma_estima_jaccard(self):
+        for otro in ("a2", "c"):
+            with self.subTest(otro=otro):
+                estimada = IndiceSimilitud.similitud(firma_minhash(self.a),
+                                                     firma_minhash(self.textos[otro]))
+                self.assertAlmostEqual(estimada, jaccard(self.a, self.textos[otro]), delta=0.1)
+        self.assertIsNone(firma_minhash("   "))
+        self.assertEqual(firma_minhash("Uno, DOS tres cuatro cinco seis"),
+                         firma_minhash("uno dos   tres cuatro cinco seis"))
+
+    def test_candidatos_solo_los_parecidos(self):
+        firma = firma_minhash(self.a)
+        self.assertEqual(self.indice._candidatos(firma), {"a", "a2"})
+        self.assertEqual([hash_id for hash_id, _ in self.indice.similares(firma, excluir="a")],
+                         ["a2"])
+        self.assertEqual(self.indice.similares(firma_minhash(texto(4))), [])
+        similares = self.indice.similares(firma_minhash(self.b))
+        self.assertEqual(similares[0], ("b", 1.0))
+        self.assertEqual({hash_id for hash_id, _ in similares}, {"b", "b2", "b3"})
+        self.assertEqual([s for _, s in similares], sorted((s for _, s in similares),
+                                                           reverse=True))
+
+    def test_grupos(self):
+        grupos = [sorted(grupo) for grupo in self.indice.grupos()]
+        self.assertEqual(grupos, [["b", "b2", "b3"], ["a", "a2"]])
+        self.assertEqual(self.indice.grupos(umbral=1.0), [])
+
+    def test_eliminar_limpia_las_cubetas(self):
+        for hash_id in list(self.textos):
+            self.indice.eliminar(hash_id)
+        self.assertEqual(self.indice.documentos(), set())
+        self.assertTrue(all(not cubeta for cubeta in self.indice._cubetas))
+        self.indice.eliminar("inexistente")
+
+    def test_ida_y_vuelta_por_archivo(self):
+        self.indice.guardar()
+        self.assertFalse(self.indice.modificado)
+        indice = self._abrir()
+        self.assertEqual(indice.documentos(), set(self.textos))
+        self.assertEqual(indice.firmas, self.indice.firmas)
+        self.assertEqual(sorted(map(sorted, indice.grupos())),
+                         sorted(map(sorted, self.indice.grupos())))
+        self.assertEqual(self.errores, [])
+
+
+class TestCasiDuplicadosEnElGestor(CasoCatalogo):
+
+    def _archivos_en_almacen(self):
+        return sorted(nombre for _, _, nombres in os.walk(self.articulos_dir)
+                      for nombre in nombres)
+
+    def test_rechazar_similares(self):
+        self.gestor = self.abrir(umbral_similitud=0.8, rechazar_similares=True)
+        original = self.agregar("Original", "Ana", 2000, texto(1))
+        antes = self._archivos_en_almacen()
+        exito, mensaje = self.gestor.agregar_articulo(
+            "Copia", "Bo", 2001, self.archivo("Copia.txt", variante(texto(1), 1)))
+        self.assertFalse(exito)
+        self.assertTrue(mensaje.startswith(f"Casi duplicado de {original}"), mensaje)
+        self.assertEqual(len(self.gestor), 1)
+        self.assertEqual(self._archivos_en_almacen(), antes)
+        self.agregar("Distinto", "Bo", 2001, texto(2))
+        self.assertEqual(len(self.gestor), 2)
+
+    def test_aceptar_e_informar_similares(self):
+        self.gestor = self.abrir(umbral_similitud=0.8)
+        original = self.agregar("Original", "Ana", 2000, texto(1))
+        exito, mensaje = self.gestor.agregar_articulo(
+            "Copia", "Bo", 2001, self.archivo("Copia.txt", variante(texto(1), 1)))
+        self.assertTrue(exito, mensaje)
+        self.assertIn(f"similar a {original}", mensaje)
+        copia = self.gestor.buscar(titulo_prefijo="Copia")[0].hash_id
+        self.agregar("Distinto", "Bo", 2001, texto(2))
+
+        grupos = self.gestor.casi_duplicados()
+        self.assertEqual([sorted(a.hash_id for a in grupo) for grupo in grupos],
+                         [sorted([original, copia])])
+
+        # Las firmas se persisten y siguen a las bajas
+        self.gestor.cerrar()
+        self.gestor = self.abrir(umbral_similitud=0.8)
+        self.assertEqual(len(self.gestor.casi_duplicados()), 1)
+        self.assertTrue(self.gestor.eliminar_articulo(copia)[0])
+        self.assertEqual(self.gestor.casi_duplicados(), [])
+
+    def test_sin_indice(self):
+        self.gestor = self.abrir()
+        with self.assertRaises(ValueError):
+            self.gestor.casi_duplicados()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from proyecto2 import IndiceTextoCompleto, tokenizar
+
+DOCUMENTOS = {
+    "1": "el zorro marron salta sobre el perro perezoso",
+    "2": "el perro duerme y el zorro marron mira al perro",
+    "3": "un gato marron duerme todo el dia",
+    "4": "zorro zorro zorro",
+    "5": "texto sin coincidencias relevantes",
+}
+
+
+def bm25(documentos, consulta):
+    """Puntajes BM25 calculados desde los textos, sin indice"""
+    tokens = {hash_id: tokenizar(texto) for hash_id, texto in documentos.items()}
+    promedio = sum(map(len, tokens.values())) / len(tokens)
+    puntajes = {}
+    for termino in dict.fromkeys(tokenizar(consulta)):
+        con_termino = [hash_id for hash_id, lista in tokens.items() if termino in lista]
+        idf = math.log((len(tokens) - len(con_termino) + 0.5) / (len(con_termino) + 0.5) + 1)
+        for hash_id in con_termino:
+            tf = tokens[hash_id].count(termino)
+            k1, b = IndiceTextoCompleto.K1, IndiceTextoCompleto.B
+            puntajes[hash_id] = puntajes.get(hash_id, 0.0) + idf * tf * (k1 + 1) / (
+                tf + k1 * (1 - b + b * len(tokens[hash_id]) / promedio))
+    return puntajes
+
+
+class TestIndiceTextoCompleto(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "indice.fti")
+        self.errores = []
+        self.indice = self._abrir()
+        self.documentos = dict(DOCUMENTOS)
+        for hash_id, texto in self.documentos.items():
+            self.indice.agregar(hash_id, texto)
+
+    def tearDown(self):
+        self.indice.cerrar()
+        shutil.rmtree(self.directorio)
+
+    def _abrir(self):
+        return IndiceTextoCompleto(self.ruta, lambda operacion, error: self.errores.append(
+            (operacion, error)))
+
+    def _reabrir(self):
+        self.indice.guardar()
+        self.indice.cerrar()
+        self.indice = self._abrir()
+
+    def _verificar_bm25(self):
+        for consulta in ("zorro", "perro marron", "duerme gato", "el", "inexistente"):
+            with self.subTest(consulta=consulta):
+                esperado = bm25(self.documentos, consulta)
+                obtenido = dict(self.indice.buscar(consulta, limit=len(self.documentos)))
+                self.assertEqual(obtenido.keys(), esperado.keys())
+                for hash_id, puntaje in esperado.items():
+                    self.assertAlmostEqual(obtenido[hash_id], puntaje)
+
+    def test_ranking_bm25(self):
+        self._verificar_bm25()
+        resultados = self.indice.buscar("zorro")
+        self.assertEqual(resultados[0][0], "4")  # Mayor tf en el documento mas corto
+        self.assertEqual([p for _, p in resultados], sorted((p for _, p in resultados),
+                                                            reverse=True))
+        self.assertEqual(len(self.indice.buscar("el", limit=2)), 2)
+
+    def test_ida_y_vuelta_por_archivo(self):
+        postings = {termino: self.indice.postings(termino)
+                    for termino in ("zorro", "perro", "marron", "dia")}
+        self._reabrir()
+        self.assertIsNotNone(self.indice._mapa)
+        self.assertEqual(self.indice._delta, {})
+        self.assertEqual(self.indice.documentos(), set(self.documentos))
+        for termino, esperado in postings.items():
+            self.assertEqual(self.indice.postings(termino), esperado)
+        self._verificar_bm25()
+        self.assertEqual(self.errores, [])
+
+    def test_frases(self):
+        self._reabrir()
+        self.assertEqual({h for h, _ in self.indice.buscar('"zorro marron"')}, {"1", "2"})
+        self.assertEqual(self.indice.buscar('"marron zorro"'), [])
+        self.assertEqual({h for h, _ in self.indice.buscar('"el perro" duerme')}, {"1", "2"})
+
+    def test_bajas_sobre_la_base_y_el_delta(self):
+        self._reabrir()
+        self.indice.agregar("6", "un zorro nuevo en el delta")
+        self.documentos["6"] = "un zorro nuevo en el delta"
+        self.indice.eliminar("1")  # Del archivo base
+        self.indice.eliminar("6")  # Del delta
+        del self.documentos["1"], self.documentos["6"]
+        self.assertEqual(self.indice._borrados, {"1"})
+        self.assertNotIn("1", self.indice)
+        self.assertNotIn("6", self.indice)
+        self._verificar_bm25()
+
+        self._reabrir()
+        self.assertEqual(self.indice._borrados, set())
+        self.assertEqual(self.indice.documentos(), set(self.documentos))
+        self._verificar_bm25()
+
+    def test_reindexar_documento_de_la_base(self):
+        self._reabrir()
+        self.indice.agregar("3", "ahora habla de un perro")
+        self.documentos["3"] = "ahora habla de un perro"
+        self.assertEqual(self.indice.buscar("gato"), [])
+        self._verificar_bm25()
+        self._reabrir()
+        self._verificar_bm25()
+
+    def test_tokens_de_mas_de_100_caracteres(self):
+        largo = "x" * 150
+        limite = "y" * 100
+        self.assertEqual(tokenizar(f"{largo} palabra {limite}"), ["palabra", limite])
+        self.indice.agregar("7", f"{largo} palabra {limite}")
+        self._reabrir()
+        self.assertEqual(self.errores, [])
+        self.assertEqual([h for h, _ in self.indice.buscar("palabra")], ["7"])
+        self.assertEqual([h for h, _ in self.indice.buscar(limite)], ["7"])
+        self.assertEqual(self.indice.buscar(largo), [])
+
+    def test_archivo_corrupto_se_informa(self):
+        self._reabrir()
+        self.indice.cerrar()
+        with open(self.ruta, "r+b") as file:
+            file.write(b"XXXX")
+        self.indice = self._abrir()
+        self.assertEqual([operacion for operacion, _ in self.errores],
+                         ["cargar_indice_de_texto_completo"])
+        self.assertEqual(self.indice.documentos(), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
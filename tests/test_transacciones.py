@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from tests.base import CasoCatalogo
+
+
+class TestTransacciones(CasoCatalogo):
+    """Rollback de ``transaccion()``: la memoria y el journal quedan como antes"""
+
+    def setUp(self):
+        super().setUp()
+        self.gestor = self.abrir()
+        self.existente = self.agregar("Republica", "Platon", 1900, "dialogo sobre la justicia")
+
+    def _estado(self):
+        """Contenido de la tabla hash y de los indices por autor y por año"""
+        autores = {clave: [articulo.hash_id for articulo in lista]
+                   for clave, lista in self.gestor.indice_autores.items() if lista}
+        años = {clave: [articulo.hash_id for articulo in lista]
+                for clave, lista in self.gestor.indice_años.items() if lista}
+        return self.articulos(), autores, años
+
+    def test_rollback_restaura_tabla_e_indices(self):
+        antes = self._estado()
+        with self.assertRaises(RuntimeError):
+            with self.gestor.transaccion():
+                self.agregar("Etica", "Aristoteles", 1950, "sobre la virtud")
+                exito, mensaje = self.gestor.modificar_articulo(self.existente, "Socrates", 1800)
+                self.assertTrue(exito, mensaje)
+                raise RuntimeError("falla a mitad de la transaccion")
+
+        self.assertEqual(self._estado(), antes)
+        self.assertEqual(self.gestor.buscar(autor="aristoteles"), [])
+        self.assertEqual(self.gestor.buscar(año=1800), [])
+        self.assertEqual([a.hash_id for a in self.gestor.buscar(autor="platon")],
+                         [self.existente])
+
+    def test_rollback_de_una_baja(self):
+        antes = self._estado()
+        with self.assertRaises(RuntimeError):
+            with self.gestor.transaccion():
+                exito, mensaje = self.gestor.eliminar_articulo(self.existente)
+                self.assertTrue(exito, mensaje)
+                raise RuntimeError("falla despues de la baja")
+
+        self.assertEqual(self._estado(), antes)
+        articulo = self.gestor.tabla_hash.get(self.existente)
+        self.assertTrue(os.path.exists(os.path.join(self.articulos_dir,
+                                                    articulo.archivo_nombre)))
+
+    def test_rollback_no_llega_al_journal(self):
+        with self.assertRaises(RuntimeError):
+            with self.gestor.transaccion():
+                self.agregar("Etica", "Aristoteles", 1950, "sobre la virtud")
+                raise RuntimeError("falla antes de confirmar")
+        articulos = self.articulos()
+
+        self.gestor.cerrar()
+        self.gestor = self.abrir()
+        self.assertEqual(self.articulos(), articulos)
+        self.assertEqual(self.gestor.buscar(autor="aristoteles"), [])
+
+    def test_punto_de_guardado(self):
+        with self.gestor.transaccion():
+            self.agregar("Etica", "Aristoteles", 1950, "sobre la virtud")
+            with self.assertRaises(RuntimeError):
+                with self.gestor.transaccion():
+                    self.agregar("Fedon", "Platon", 1960, "sobre el alma")
+                    raise RuntimeError("falla la transaccion interior")
+
+        self.assertEqual(len(self.gestor.buscar(autor="aristoteles")), 1)
+        self.assertEqual(self.gestor.buscar(titulo_prefijo="Fedon"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+
+from proyecto2 import IndiceTrigramas, plegar_acentos, trigramas
+from tests.base import CasoCatalogo
+
+TERMINOS = ["platon", "plotino", "platero", "aristoteles", "friedrich nietzsche",
+            "rene descartes", "immanuel kant", "hannah arendt", "simone de beauvoir",
+            "plácido domingo", "kant", "pla"]
+
+
+class TestIndiceTrigramas(unittest.TestCase):
+
+    def setUp(self):
+        self.indice = IndiceTrigramas()
+        for i, termino in enumerate(TERMINOS):
+            self.indice.agregar(termino, str(i))
+
+    def _fuerza_bruta(self, consulta, umbral, prefijo=False):
+        """Mismo orden que ``buscar`` comparando la consulta con cada termino"""
+        q = trigramas(consulta, prefijo)
+        puntuados = []
+        for termino in TERMINOS:
+            t = trigramas(termino)
+            similitud = len(q & t) / len(q)
+            if similitud >= umbral:
+                puntuados.append((-similitud, len(t), termino))
+        return [(termino, -similitud) for similitud, _, termino in sorted(puntuados)]
+
+    def test_plegar_acentos(self):
+        self.assertEqual(plegar_acentos("  Platón   SÓCRATES "), "platon socrates")
+        self.assertEqual(plegar_acentos("Nietzsche"), "nietzsche")
+
+    def test_trigramas_con_relleno_y_prefijo(self):
+        self.assertEqual(trigramas("Ab"), {"  a", " ab", "ab "})
+        self.assertEqual(trigramas("ab", prefijo=True), {"  a", " ab"})
+        self.assertEqual(trigramas("ab ", prefijo=True), trigramas("ab"))
+        self.assertEqual(trigramas("Platón"), trigramas("platon"))
+
+    def test_acentos_y_mayusculas(self):
+        encontrados = self.indice.buscar("PLÁCIDO Domingo", limite=1)
+        self.assertEqual([(t, s) for t, s, _ in encontrados], [("plácido domingo", 1.0)])
+
+    def test_filtro_igual_a_fuerza_bruta(self):
+        for consulta in ("platon", "plat", "nietszche", "kant", "imanuel kan", "arendt h"):
+            for umbral in (0.3, 0.5, 0.8, 1.0):
+                for prefijo in (False, True):
+                    with self.subTest(consulta=consulta, umbral=umbral, prefijo=prefijo):
+                        encontrados = self.indice.buscar(consulta, len(TERMINOS), umbral,
+                                                         prefijo)
+                        self.assertEqual([(t, s) for t, s, _ in encontrados],
+                                         self._fuerza_bruta(consulta, umbral, prefijo))
+
+    def test_umbral(self):
+        self.assertEqual(self.indice.buscar("zzzz"), [])
+        self.assertEqual(self.indice.buscar("nietszche", umbral=0.9), [])
+        self.assertEqual(self.indice.buscar("nietszche", umbral=0.5)[0][0], "friedrich nietzsche")
+        with self.assertRaises(ValueError):
+            self.indice.buscar("kant", umbral=0)
+
+    def test_prefijo(self):
+        self.assertEqual(self.indice.buscar("plat", 1, prefijo=True)[0][:2], ("platon", 1.0))
+        self.assertLess(self.indice.buscar("plat", 1)[0][1], 1.0)
+
+    def test_empates(self):
+        consulta = "pla"
+        sin_empates = self.indice.buscar(consulta, 1, prefijo=True)
+        con_empates = self.indice.buscar(consulta, 1, prefijo=True, empates=True)
+        self.assertEqual(len(sin_empates), 1)
+        self.assertEqual(con_empates, self.indice.buscar(consulta, len(TERMINOS), 1.0,
+                                                         prefijo=True))
+
+    def test_sugerir_devuelve_la_grafia_original(self):
+        indice = IndiceTrigramas()
+        indice.agregar("platón", "1", "Platón")
+        indice.agregar("platón", "2", "PLATÓN")  # Se conserva la primera grafia
+        self.assertEqual(indice.sugerir("plat"), [("Platón", 1.0)])
+        self.assertEqual(indice.buscar("platon")[0][0], "Platón")
+
+    def test_cache_de_sugerencias(self):
+        self.assertEqual([t for t, _ in self.indice.sugerir("hann")], ["hannah arendt"])
+        self.indice.agregar("hannibal", "99")
+        self.assertIn("hannibal", [t for t, _ in self.indice.sugerir("hann")])
+        self.indice.quitar("hannibal", "99")
+        self.assertEqual([t for t, _ in self.indice.sugerir("hann")], ["hannah arendt"])
+
+    def test_quitar_libera_el_termino_al_quedar_sin_articulos(self):
+        self.indice.agregar("kant", "otro")
+        self.indice.quitar("kant", "10")
+        self.assertEqual(self.indice.buscar("kant", 1)[0][2], {"otro"})
+        self.indice.quitar("kant", "otro")
+        self.assertNotIn("kant", [t for t, _, _ in self.indice.buscar("kant")])
+        self.assertEqual(len(self.indice), len(TERMINOS) - 1)
+
+
+class TestBusquedaAproximada(CasoCatalogo):
+
+    def setUp(self):
+        super().setUp()
+        self.gestor = self.abrir()
+        self.republica = self.agregar("República", "Platón y Aristóteles", 1900, "justicia")
+        self.agregar("Así habló Zaratustra", "Friedrich Nietzsche", 1883, "superhombre")
+
+    def test_sugerir_autores_con_grafia_original(self):
+        self.assertEqual(self.gestor.sugerir_autores("plat"), [("Platón", 1.0)])
+        nombre = self.gestor.sugerir_autores("aristot")[0][0]
+        self.assertEqual(nombre, "Aristóteles")
+        self.assertEqual([a.hash_id for a in self.gestor.buscar(autor=nombre)],
+                         [self.republica])
+
+    def test_buscar_aproximado(self):
+        resultados = self.gestor.buscar_aproximado("platon", campo="autor")
+        self.assertEqual([(a.hash_id, s) for a, s in resultados], [(self.republica, 1.0)])
+        self.assertEqual(self.gestor.buscar_aproximado("nietszche")[0][0].autores,
+                         "Friedrich Nietzsche")
+        with self.assertRaises(ValueError):
+            self.gestor.buscar_aproximado("platon", campo="año")
+
+    def test_indice_sigue_las_mutaciones(self):
+        self.gestor.sugerir_autores("plat")  # Construye los indices de trigramas
+        self.assertTrue(self.gestor.modificar_articulo(self.republica, "Sócrates")[0])
+        self.assertEqual(self.gestor.sugerir_autores("plat"), [])
+        self.assertEqual(self.gestor.sugerir_autores("socr"), [("Sócrates", 1.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()